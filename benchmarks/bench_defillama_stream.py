@@ -0,0 +1,193 @@
+"""Benchmark: full json.loads vs streaming extraction on DeFiLlama payloads.
+
+Measures parse time and peak Python allocation (tracemalloc) for the three
+payloads the on-chain/protocol providers consume.
+
+Usage:
+    # Record real payloads once (needs network), then benchmark them
+    python benchmarks/bench_defillama_stream.py --record data/bench/defillama
+    python benchmarks/bench_defillama_stream.py --payload-dir data/bench/defillama
+
+    # Without recordings, synthetic payloads of realistic shape are generated
+    python benchmarks/bench_defillama_stream.py
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import time
+import tracemalloc
+from collections.abc import Callable, Iterator
+from pathlib import Path
+
+from cryptoagent.dataflows.jsonstream import extract_fields, iter_array_items, tail_array
+
+_CHUNK = 65536
+_BASE_URL = "https://api.llama.fi"
+_PROTOCOL_SLUG = "aave"
+
+
+def _chunks(text: str) -> Iterator[str]:
+    """Yield the payload in network-sized pieces, like ``response.iter_text()``."""
+    for i in range(0, len(text), _CHUNK):
+        yield text[i : i + _CHUNK]
+
+
+def _synthetic_payloads(seed: int = 7) -> dict[str, str]:
+    rng = random.Random(seed)
+    days = [1_600_000_000 + i * 86_400 for i in range(1_800)]
+    tokens = [f"TKN{i}" for i in range(12)]
+
+    chains = [
+        {
+            "gecko_id": f"chain-{i}",
+            "tvl": rng.random() * 1e9,
+            "tokenSymbol": f"C{i}",
+            "cmcId": str(i),
+            "name": f"Chain{i}",
+            "chainId": i,
+        }
+        for i in range(420)
+    ]
+    chains.insert(rng.randrange(len(chains)), {**chains[0], "name": "Solana", "tokenSymbol": "SOL"})
+
+    history = [{"date": d, "tvl": rng.random() * 1e10} for d in days]
+
+    def token_series() -> list[dict]:
+        return [
+            {"date": d, "tokens": {t: rng.random() * 1e6 for t in tokens}} for d in days
+        ]
+
+    chain_names = [f"Chain{i}" for i in range(8)]
+    protocol = {
+        "id": "1",
+        "name": "Aave",
+        "url": "https://aave.com",
+        "description": "Lending protocol " * 20,
+        "category": "Lending",
+        "chains": chain_names,
+        "tvl": [{"date": d, "totalLiquidityUSD": rng.random() * 1e10} for d in days],
+        "chainTvls": {
+            c: {
+                "tvl": [{"date": d, "totalLiquidityUSD": rng.random() * 1e9} for d in days],
+                "tokensInUsd": token_series(),
+                "tokens": token_series(),
+            }
+            for c in chain_names
+        },
+        "currentChainTvls": {c: rng.random() * 1e9 for c in chain_names},
+        "tokensInUsd": token_series(),
+        "tokens": token_series(),
+    }
+    return {
+        "chains": json.dumps(chains),
+        "history": json.dumps(history),
+        "protocol": json.dumps(protocol),
+    }
+
+
+def _record(target: Path) -> None:
+    import httpx
+
+    target.mkdir(parents=True, exist_ok=True)
+    urls = {
+        "chains": f"{_BASE_URL}/v2/chains",
+        "history": f"{_BASE_URL}/v2/historicalChainTvl/Solana",
+        "protocol": f"{_BASE_URL}/protocol/{_PROTOCOL_SLUG}",
+    }
+    with httpx.Client(timeout=60) as client:
+        for name, url in urls.items():
+            resp = client.get(url)
+            resp.raise_for_status()
+            (target / f"{name}.json").write_text(resp.text)
+            print(f"recorded {name}: {len(resp.text) / 1e6:.2f} MB")
+
+
+def _load(payload_dir: Path) -> dict[str, str]:
+    return {
+        name: (payload_dir / f"{name}.json").read_text()
+        for name in ("chains", "history", "protocol")
+    }
+
+
+def _measure(fn: Callable[[], object], repeat: int) -> tuple[float, float]:
+    """Return (best wall time in ms, peak traced allocation in MB)."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    tracemalloc.start()
+    fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return best * 1000, peak / 1e6
+
+
+def _cases(payloads: dict[str, str]) -> dict[str, tuple[Callable, Callable]]:
+    chains, history, protocol = payloads["chains"], payloads["history"], payloads["protocol"]
+
+    def chains_full():
+        return next(c for c in json.loads(chains) if c.get("name", "").lower() == "solana")
+
+    def chains_stream():
+        return next(
+            c for c in iter_array_items(_chunks(chains)) if c.get("name", "").lower() == "solana"
+        )
+
+    def history_full():
+        return json.loads(history)[-7:]
+
+    def history_stream():
+        return tail_array(_chunks(history), 7)
+
+    def protocol_full():
+        data = json.loads(protocol)
+        return data["name"], data["currentChainTvls"], data["tvl"][-7:]
+
+    def protocol_stream():
+        return extract_fields(
+            _chunks(protocol),
+            fields=("name", "category", "chains", "currentChainTvls"),
+            tails={"tvl": 7},
+        )
+
+    return {
+        "v2/chains (find one)": (chains_full, chains_stream),
+        "historicalChainTvl (last 7)": (history_full, history_stream),
+        "protocol/{slug} (fields)": (protocol_full, protocol_stream),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--payload-dir", type=Path, help="Directory of recorded payloads")
+    parser.add_argument("--record", type=Path, help="Download real payloads into this directory")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    if args.record:
+        _record(args.record)
+        args.payload_dir = args.record
+
+    payloads = _load(args.payload_dir) if args.payload_dir else _synthetic_payloads()
+    source = str(args.payload_dir) if args.payload_dir else "synthetic"
+    print(f"Payloads: {source}")
+    for name, text in payloads.items():
+        print(f"  {name:<10} {len(text) / 1e6:6.2f} MB")
+
+    print(f"\n{'case':<30}{'json.loads':>22}{'stream':>22}")
+    for case, (full, stream) in _cases(payloads).items():
+        assert full() is not None and stream() is not None
+        full_ms, full_mb = _measure(full, args.repeat)
+        stream_ms, stream_mb = _measure(stream, args.repeat)
+        print(
+            f"{case:<30}{full_ms:9.1f} ms {full_mb:7.1f} MB"
+            f"{stream_ms:9.1f} ms {stream_mb:7.1f} MB"
+        )
+
+
+if __name__ == "__main__":
+    main()
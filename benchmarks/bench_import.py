@@ -0,0 +1,109 @@
+"""Benchmark: cold-start import time of the main entry points.
+
+Each entry point is imported in a fresh interpreter (so nothing is already
+in ``sys.modules``), several times, and the median wall time is reported
+together with the slowest modules from ``python -X importtime``. Exits
+with status 1 if any entry point exceeds ``--max-ms`` or pulls in one of
+the heavy dependencies that are meant to load on first use, so it can
+gate CI against cold-start regressions.
+
+Usage:
+    python benchmarks/bench_import.py
+    python benchmarks/bench_import.py --runs 10 --max-ms 800 --top 5
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+ENTRY_POINTS = (
+    "cryptoagent.cli.main",
+    "cryptoagent.graph.builder",
+    "cryptoagent.dataflows.aggregator",
+    "cryptoagent.llm.client",
+)
+# Loaded on first use only: graph compilation, LLM calls, provider fetches, Postgres
+HEAVY = ("litellm", "langgraph", "ccxt", "pandas", "numpy", "ta", "httpx", "psycopg2")
+
+_ROOT = Path(__file__).resolve().parent.parent
+_PROBE = """\
+import json, sys, time
+start = time.perf_counter()
+import {module}
+ms = (time.perf_counter() - start) * 1000
+print(json.dumps({{"ms": ms, "modules": sorted({{m.split(".")[0] for m in sys.modules}})}}))
+"""
+
+
+def _env() -> dict[str, str]:
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [str(_ROOT), env.get("PYTHONPATH")]))
+    # Never let an accidental LiteLLM import go to the network for its price map
+    env.setdefault("LITELLM_LOCAL_MODEL_COST_MAP", "True")
+    return env
+
+
+def probe(module: str) -> tuple[float, set[str]]:
+    """Import ``module`` in a fresh interpreter; returns (ms, top-level modules loaded)."""
+    out = subprocess.run(
+        [sys.executable, "-c", _PROBE.format(module=module)],
+        capture_output=True, text=True, check=True, env=_env(), cwd=_ROOT,
+    )
+    result = json.loads(out.stdout.strip().splitlines()[-1])
+    return result["ms"], set(result["modules"])
+
+
+def slowest(module: str, top: int) -> list[tuple[int, str]]:
+    """The ``top`` modules with the largest cumulative import time (microseconds)."""
+    out = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True, text=True, check=True, env=_env(), cwd=_ROOT,
+    )
+    rows = []
+    for line in out.stderr.splitlines():
+        # "import time: self [us] | cumulative | imported package"
+        parts = line.removeprefix("import time:").split("|")
+        if len(parts) != 3 or not parts[1].strip().isdigit():
+            continue
+        rows.append((int(parts[1]), parts[2].strip()))
+    return sorted(rows, reverse=True)[1 : top + 1]  # [0] is the module itself
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5, help="fresh interpreters per entry point")
+    parser.add_argument("--max-ms", type=float, default=1000.0, help="budget per entry point")
+    parser.add_argument("--top", type=int, default=3, help="slowest imports to list")
+    args = parser.parse_args()
+
+    failures = []
+    print(f"{'entry point':<36}{'median ms':>11}{'max ms':>9}  heavy modules loaded")
+    for module in ENTRY_POINTS:
+        times, heavy = [], set()
+        for _ in range(args.runs):
+            ms, modules = probe(module)
+            times.append(ms)
+            heavy |= modules & set(HEAVY)
+        median = statistics.median(times)
+        print(f"{module:<36}{median:>11.0f}{max(times):>9.0f}  {', '.join(sorted(heavy)) or '-'}")
+        for cumulative, name in slowest(module, args.top):
+            print(f"    {name:<40}{cumulative / 1000:>8.0f} ms")
+        if median > args.max_ms:
+            failures.append(f"{module} took {median:.0f} ms (budget {args.max_ms:.0f} ms)")
+        if heavy:
+            failures.append(f"{module} eagerly imports {', '.join(sorted(heavy))}")
+
+    if failures:
+        print("\nFAIL\n  " + "\n  ".join(failures))
+        sys.exit(1)
+    print("\nOK")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,174 @@
+"""Benchmark: end-to-end TradingGraph cycles against the fake LLM backend.
+
+Every agent uses a ``fake/<profile>`` model, so no provider or API key is
+needed. By default the data layer is replaced with synthetic snapshots as
+well, leaving orchestration, prompt building, persistence, and accounting
+as the measured work.
+
+Usage:
+    # 200 synchronous cycles with no LLM delay
+    python benchmarks/bench_pipeline.py --cycles 200
+
+    # Provider-like latency, 8 tokens at a time through arun_many
+    python benchmarks/bench_pipeline.py --profile realistic --concurrency 8 --cycles 64
+
+    # Real data providers (needs network), fake LLMs
+    python benchmarks/bench_pipeline.py --live-data --cycles 5
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import os
+import random
+import statistics
+import tempfile
+import time
+from collections import defaultdict
+from collections.abc import Iterator
+from contextlib import contextmanager
+from pathlib import Path
+
+_AGENTS = ("research", "sentiment", "brain", "trader", "macro", "reflection")
+_TOKENS = ["SOL", "ETH", "BTC", "AVAX", "LINK", "JUP", "BONK", "PYTH"]
+
+
+def _market_data(rng: random.Random, token: str) -> dict:
+    price = rng.uniform(1, 60_000)
+    return {
+        "token": token,
+        "current_price": round(price, 4),
+        "price_change_24h_pct": round(rng.uniform(-8, 8), 2),
+        "volume_24h": rng.uniform(1e7, 5e9),
+        "price_vs_sma20": rng.choice(["above", "below"]),
+        "price_vs_sma50": rng.choice(["above", "below"]),
+        "indicators": {
+            "rsi_14": rng.uniform(20, 80),
+            "macd_histogram": rng.uniform(-2, 2),
+            "sma_20": price * rng.uniform(0.95, 1.05),
+            "sma_50": price * rng.uniform(0.9, 1.1),
+            "atr_14": price * rng.uniform(0.01, 0.05),
+        },
+    }
+
+
+@contextmanager
+def _synthetic_data(seed: int) -> Iterator[None]:
+    """Replace the DataAggregator fetchers with seeded synthetic snapshots."""
+    from cryptoagent.dataflows.aggregator import DataAggregator
+
+    rng = random.Random(seed)
+    fetchers = {
+        "get_market_data": lambda self, token: _market_data(rng, token),
+        "get_onchain_data": lambda self, token: {
+            "source": "synthetic",
+            "defillama": {"solana_tvl_change_7d": rng.uniform(-10, 10)},
+        },
+        "get_sentiment_data": lambda self, token: {
+            "fear_greed_index": rng.randint(5, 95),
+            "fear_greed_label": "Neutral",
+        },
+        "get_macro_data": lambda self: {"fed_funds_rate": 4.33, "source": "synthetic"},
+        "get_news_data": lambda self, token: {"source": "synthetic", "headlines": []},
+        "get_protocol_data": lambda self, token: {"source": "stub"},
+        "get_market_regime": lambda self, market: {
+            "regime": rng.choice(["bull", "bear", "sideways"]),
+            "confidence": rng.randint(3, 8),
+        },
+    }
+    originals = {name: getattr(DataAggregator, name) for name in fetchers}
+    for name, fn in fetchers.items():
+        setattr(DataAggregator, name, fn)
+    try:
+        yield
+    finally:
+        for name, fn in originals.items():
+            setattr(DataAggregator, name, fn)
+
+
+def _run(graph, tokens: list[str], concurrency: int) -> list[tuple[dict, float]]:
+    """Run one cycle per token; returns (state, seconds) per cycle."""
+    if concurrency <= 1:
+        results = []
+        for token in tokens:
+            start = time.perf_counter()
+            results.append((graph.run(token), time.perf_counter() - start))
+        return results
+
+    async def timed(token: str) -> tuple[dict, float]:
+        start = time.perf_counter()
+        state = await graph.arun(token)
+        return state, time.perf_counter() - start
+
+    async def batches() -> list[tuple[dict, float]]:
+        results = []
+        for i in range(0, len(tokens), concurrency):
+            results += await asyncio.gather(*map(timed, tokens[i : i + concurrency]))
+        return results
+
+    return asyncio.run(batches())
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--cycles", type=int, default=50)
+    parser.add_argument("--profile", default="instant", help="fake LLM latency profile")
+    parser.add_argument("--concurrency", type=int, default=1, help="tokens run at once (async)")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--live-data", action="store_true", help="use the real data providers")
+    parser.add_argument("--db", type=Path, help="database file (default: a temporary one)")
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix="bench-pipeline-")
+    os.environ.setdefault("LITELLM_LOCAL_MODEL_COST_MAP", "True")
+    for agent in _AGENTS:
+        os.environ[f"CA_{agent.upper()}_MODEL"] = f"fake/{args.profile}"
+    os.environ["CA_LLM_FAKE_SEED"] = str(args.seed)
+    os.environ["CA_DB_PATH"] = str(args.db or Path(workdir) / "bench.db")
+    os.environ["CA_LLM_CACHE_MODE"] = "off"
+
+    from cryptoagent.graph.builder import TradingGraph
+
+    tokens = [_TOKENS[i % len(_TOKENS)] for i in range(args.cycles)]
+    data = "live" if args.live_data else "synthetic"
+    print(
+        f"{args.cycles} cycles, profile={args.profile}, concurrency={args.concurrency}, "
+        f"data={data}"
+    )
+
+    graph = TradingGraph()
+    graph.warm_up()  # keep the one-off imports out of the cycle timings
+    try:
+        context = _synthetic_data(args.seed) if not args.live_data else _nullcontext()
+        with context:
+            start = time.perf_counter()
+            results = _run(graph, tokens, args.concurrency)
+            elapsed = time.perf_counter() - start
+        usage = [graph.llm_usage(state["cycle_id"]) for state, _ in results if "cycle_id" in state]
+    finally:
+        graph.close()
+
+    latencies = sorted(seconds for _, seconds in results)
+    print(f"\nthroughput   {len(results) / elapsed * 60:10.1f} cycles/min")
+    print(f"cycle p50    {statistics.median(latencies) * 1000:10.1f} ms")
+    print(f"cycle p95    {latencies[int(len(latencies) * 0.95) - 1] * 1000:10.1f} ms")
+
+    # Rows are per (agent, model); an agent's fallback models are summed together
+    per_agent: dict[str, list[float]] = defaultdict(lambda: [0, 0.0])
+    for rows in usage:
+        for row in rows:
+            per_agent[row["agent"]][0] += row["calls"]
+            per_agent[row["agent"]][1] += row["latency_ms"]
+    print(f"\n{'agent':<12}{'calls':>8}{'mean LLM ms':>14}")
+    for agent, (calls, latency_ms) in sorted(per_agent.items()):
+        print(f"{agent:<12}{calls:>8}{latency_ms / calls:>14.1f}")
+
+
+@contextmanager
+def _nullcontext() -> Iterator[None]:
+    yield
+
+
+if __name__ == "__main__":
+    main()
@@ -5,9 +5,17 @@ from __future__ import annotations
 import json
 import logging
 
+from cryptoagent.agents.schemas import BrainDecision
+from cryptoagent.agents.trader import prefetch_validation
 from cryptoagent.config import AgentConfig
 from cryptoagent.graph.state import AgentState
-from cryptoagent.llm.client import call_llm_json
+from cryptoagent.llm.client import (
+    acall_llm_json,
+    astream_llm_json,
+    call_llm_json,
+    stream_llm_json,
+)
+from cryptoagent.llm.prompt import PromptBuilder
 
 logger = logging.getLogger(__name__)
 
@@ -60,10 +68,30 @@ at 7d may not be useful for short-term decisions.
    - "regime": one of "bull", "bear", "sideways"
    - "rationale": 2-3 sentence explanation of your reasoning
 
+Emit the fields in the order listed, with "rationale" last.
 For HOLD decisions, set size_pct to 0.
+
+Based on all the evidence provided, make your trading decision.
 """
 
 
+# Fields that settle the trade; streamed decisions act on them before the rationale
+_DECISION_FIELDS = ("action", "asset", "size_pct", "confidence")
+
+# Per-section token budgets; see llm.prompt.PromptBuilder
+_BUDGETS = {
+    "research": 1200,
+    "sentiment": 1000,
+    "macro": 800,
+    "onchain": 400,
+    "signals": 600,
+    "cross_trial": 400,
+    "portfolio": 400,
+    "history": 600,
+}
+_MAX_ROWS = 5
+
+
 def _build_user_prompt(
     token: str,
     research_report: str,
@@ -75,93 +103,80 @@ def _build_user_prompt(
     market_regime: str = "unknown",
     regime_confidence: int = 0,
     fear_greed_index: int = 50,
-    cross_trial_reflections: list[str] | None = None,
     macro_report: str = "",
     macro_regime: str = "unknown",
-    signal_report: str = "",
 ) -> str:
-    portfolio_str = json.dumps(portfolio_state, indent=2, default=str)
-    memory_str = (
-        "\n".join(reflection_memory[-5:])
-        if reflection_memory
-        else "No prior decisions."
-    )
+    """This cycle's evidence; stable context goes in ``_build_context``."""
+    builder = PromptBuilder()
 
     price_info = ""
     if market_data:
         price_info = (
-            f"Current price: ${market_data.get('current_price', 'N/A')}\n"
+            f"\nCurrent price: ${market_data.get('current_price', 'N/A')}\n"
             f"24h change: {market_data.get('price_change_24h_pct', 'N/A')}%"
         )
+    builder.text(f"## Target Asset: {token}{price_info}")
 
-    # On-chain section
-    onchain_section = ""
-    if onchain_data and onchain_data.get("source") != "stub":
-        onchain_section = (
-            f"\n## On-Chain Data\n{json.dumps(onchain_data, indent=2, default=str)}\n"
-        )
-    else:
-        onchain_section = "\n## On-Chain Data\nNot available for this cycle.\n"
-
-    # Macro analysis section
-    macro_section = ""
+    builder.section("Research Report", research_report, _BUDGETS["research"])
+    builder.section("Sentiment Report", sentiment_report, _BUDGETS["sentiment"])
     if macro_report:
-        macro_section = f"\n## Macro Analysis\n{macro_report}\n"
+        builder.section("Macro Analysis", macro_report, _BUDGETS["macro"])
+
+    if not onchain_data or onchain_data.get("source") == "stub":
+        onchain_data = {}
+    builder.section("On-Chain Data", onchain_data, _BUDGETS["onchain"], max_rows=_MAX_ROWS)
 
     # Regime section — both market and macro regimes
-    regime_section = (
-        f"\n## Market Context\n"
+    builder.text(
+        f"## Market Context\n"
         f"Market Regime: {market_regime} (confidence: {regime_confidence}/10)\n"
         f"Macro Regime: {macro_regime}\n"
-        f"Fear & Greed Index: {fear_greed_index}/100\n"
+        f"Fear & Greed Index: {fear_greed_index}/100"
     )
 
-    # Signal accuracy report
-    signal_section = ""
-    if signal_report:
-        signal_section = f"\n## Signal Accuracy Report\n{signal_report}\n"
-
-    # Cross-trial reflections
-    cross_trial_str = ""
-    if cross_trial_reflections:
-        cross_trial_str = (
-            "\n## Cross-Trial Reflections (Lessons from Prior Sessions)\n"
-            + "\n".join(f"- {r}" for r in cross_trial_reflections)
-            + "\n"
-        )
-
-    return f"""\
-## Target Asset: {token}
-{price_info}
-
-## Research Report
-{research_report}
-
-## Sentiment Report
-{sentiment_report}
-{macro_section}{onchain_section}{regime_section}{signal_section}{cross_trial_str}
-## Current Portfolio
-{portfolio_str}
-
-## Recent Decision History
-{memory_str}
+    # Trade history is cut to the latest trades so the prompt stays bounded
+    builder.section("Current Portfolio", portfolio_state, _BUDGETS["portfolio"], max_rows=_MAX_ROWS)
+    builder.section(
+        "Recent Decision History",
+        "\n".join(reflection_memory[-5:]),
+        _BUDGETS["history"],
+        truncate="tail",
+        empty="No prior decisions.",
+    )
 
-Based on all the above evidence, make your trading decision.
-"""
+    logger.info("[Brain Agent] Prompt size %s", builder.summary())
+    return builder.build()
 
 
-def brain_node(state: AgentState) -> dict:
-    """LangGraph node: Brain Agent.
+def _build_context(
+    cross_trial_reflections: list[str] | None = None,
+    signal_report: str = "",
+) -> str:
+    """Context that changes between sessions, not cycles.
 
-    Synthesizes research + sentiment + on-chain + regime and makes a structured trading decision.
+    Sent as the prompt prefix, ahead of the per-cycle evidence, so providers
+    that cache prompt prefixes can reuse it across cycles.
     """
-    agent_config = AgentConfig()
-    token = state["token"]
+    builder = PromptBuilder()
+    if signal_report:
+        builder.section("Signal Accuracy Report", signal_report, _BUDGETS["signals"])
+    if cross_trial_reflections:
+        builder.section(
+            "Cross-Trial Reflections (Lessons from Prior Sessions)",
+            "\n".join(f"- {r}" for r in cross_trial_reflections),
+            _BUDGETS["cross_trial"],
+        )
+    return builder.build().strip()
 
-    logger.info("[Brain Agent] Reasoning about %s", token)
 
-    user_prompt = _build_user_prompt(
-        token=token,
+def _prompt(state: AgentState) -> tuple[str, str]:
+    """The ``(prefix, user)`` prompt pair for this cycle."""
+    prefix = _build_context(
+        cross_trial_reflections=state.get("cross_trial_reflections"),
+        signal_report=state.get("signal_report", ""),
+    )
+    return prefix, _build_user_prompt(
+        token=state["token"],
         research_report=state.get("research_report", "No research report available."),
         sentiment_report=state.get(
             "sentiment_report", "No sentiment report available."
@@ -173,37 +188,125 @@ def brain_node(state: AgentState) -> dict:
         market_regime=state.get("market_regime", "unknown"),
         regime_confidence=state.get("regime_confidence", 0),
         fear_greed_index=state.get("fear_greed_index", 50),
-        cross_trial_reflections=state.get("cross_trial_reflections"),
         macro_report=state.get("macro_report", ""),
         macro_regime=state.get("macro_regime", "unknown"),
-        signal_report=state.get("signal_report", ""),
     )
 
-    logger.info("[Brain Agent] Calling LLM: %s", agent_config.brain_model)
-    decision = call_llm_json(
-        model=agent_config.brain_model,
-        system=SYSTEM_PROMPT,
-        user=user_prompt,
-    )
 
-    # Validate required fields
-    required = ["action", "asset", "size_pct", "confidence", "regime", "rationale"]
-    for field in required:
-        if field not in decision:
-            decision[field] = {
-                "action": "HOLD",
-                "asset": token,
-                "size_pct": 0,
-                "confidence": 1,
-                "regime": "sideways",
-                "rationale": "Missing field, defaulting to HOLD.",
-            }.get(field)
-
-    # Clamp values
+def _clamp(decision: dict) -> dict:
+    """Bound early streamed fields, which arrive before schema validation."""
     decision["size_pct"] = max(0, min(100, float(decision.get("size_pct", 0))))
     decision["confidence"] = max(1, min(10, int(decision.get("confidence", 5))))
+    return decision
+
+
+def _on_decision(state: AgentState):
+    """Callback for the streamed decision fields: log them and start the
+    Trader's validation while the rationale is still being generated."""
 
-    decision_str = json.dumps(decision, indent=2)
+    def on_fields(fields: dict) -> None:
+        try:
+            early = _clamp(dict(fields))
+        except (TypeError, ValueError):
+            return
+        logger.info(
+            "[Brain Agent] Early decision: %s size=%s%% confidence=%s",
+            early.get("action"), early["size_pct"], early["confidence"],
+        )
+        prefetch_validation(state, early)
+
+    return on_fields
+
+
+def _no_decision(error: ValueError, token: str) -> dict:
+    """Every model's answer failed validation, even after repair: HOLD."""
+    logger.error("[Brain Agent] No valid decision: %s", error)
+    return BrainDecision(
+        action="HOLD",
+        asset=token,
+        size_pct=0,
+        confidence=1,
+        regime="sideways",
+        rationale=f"No valid decision from the model, defaulting to HOLD: {error}",
+    ).model_dump()
+
+
+def _finalize(decision: dict) -> dict:
+    """Serialize a schema-validated decision for the graph state."""
     logger.info("[Brain Agent] Decision: %s", decision.get("action"))
+    return {"brain_decision": json.dumps(decision, indent=2)}
+
+
+def brain_node(state: AgentState) -> dict:
+    """LangGraph node: Brain Agent.
+
+    Synthesizes research + sentiment + on-chain + regime and makes a structured trading decision.
+    """
+    agent_config = AgentConfig()
+    token = state["token"]
+
+    logger.info("[Brain Agent] Reasoning about %s", token)
+
+    prefix, user_prompt = _prompt(state)
+
+    logger.info("[Brain Agent] Calling LLM: %s", agent_config.brain_model)
+    try:
+        if agent_config.llm_stream_decisions:
+            decision = stream_llm_json(
+                model=agent_config.brain_model,
+                system=SYSTEM_PROMPT,
+                prefix=prefix,
+                user=user_prompt,
+                schema=BrainDecision,
+                required=_DECISION_FIELDS,
+                on_fields=_on_decision(state),
+                agent="brain",
+            )
+        else:
+            decision = call_llm_json(
+                model=agent_config.brain_model,
+                system=SYSTEM_PROMPT,
+                prefix=prefix,
+                user=user_prompt,
+                schema=BrainDecision,
+                agent="brain",
+            )
+    except ValueError as e:
+        decision = _no_decision(e, token)
+    return _finalize(decision)
+
+
+async def abrain_node(state: AgentState) -> dict:
+    """Async LangGraph node: Brain Agent."""
+    agent_config = AgentConfig()
+    token = state["token"]
+
+    logger.info("[Brain Agent] Reasoning about %s", token)
 
-    return {"brain_decision": decision_str}
+    prefix, user_prompt = _prompt(state)
+
+    logger.info("[Brain Agent] Calling LLM (async): %s", agent_config.brain_model)
+    try:
+        if agent_config.llm_stream_decisions:
+            decision = await astream_llm_json(
+                model=agent_config.brain_model,
+                system=SYSTEM_PROMPT,
+                prefix=prefix,
+                user=user_prompt,
+                schema=BrainDecision,
+                required=_DECISION_FIELDS,
+                on_fields=_on_decision(state),
+                agent="brain",
+            )
+        else:
+            decision = await acall_llm_json(
+                model=agent_config.brain_model,
+                system=SYSTEM_PROMPT,
+                prefix=prefix,
+                user=user_prompt,
+                schema=BrainDecision,
+                agent="brain",
+            )
+    except ValueError as e:
+        decision = _no_decision(e, token)
+    return _finalize(decision)
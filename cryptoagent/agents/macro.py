@@ -2,13 +2,14 @@
 
 from __future__ import annotations
 
+import asyncio
 import json
 import logging
 
 from cryptoagent.config import AgentConfig
-from cryptoagent.dataflows.aggregator import DataAggregator
+from cryptoagent.dataflows.aggregator import DataAggregator, borrow
 from cryptoagent.graph.state import AgentState
-from cryptoagent.llm.client import call_llm
+from cryptoagent.llm.client import acall_llm, call_llm
 
 logger = logging.getLogger(__name__)
 
@@ -22,40 +23,53 @@ Rules:
 3. Note correlation direction: e.g., "Expanding M2 historically bullish for risk assets."
 4. Keep it under 300 words.
 5. End with a regime recommendation: risk-on / risk-off / neutral.
+
+Assess the macro environment's impact on crypto markets.
 """
 
+USER_PROMPT = "Analyze the macroeconomic data above and produce your macro report."
+
+# Change on every fetch without changing the data; kept out of the cached prefix
+_VOLATILE_KEYS = frozenset({"timestamp", "fetched_at"})
+
+
+def _stable(data):
+    """``data`` without volatile keys, at any depth."""
+    if isinstance(data, dict):
+        return {k: _stable(v) for k, v in data.items() if k not in _VOLATILE_KEYS}
+    if isinstance(data, list):
+        return [_stable(v) for v in data]
+    return data
 
-def _build_user_prompt(macro_data: dict, macro_regime: dict) -> str:
+
+def _build_context(macro_data: dict, macro_regime: dict) -> str:
+    """FRED data and the pre-computed regime, sent as the prompt prefix.
+
+    The series update daily at most, so repeated cycles send an identical
+    prefix that providers can serve from their prompt cache.
+    """
     regime_str = macro_regime.get("macro_regime", "unknown")
     confidence = macro_regime.get("confidence", 0)
-    signals = json.dumps(macro_regime.get("signals", {}), indent=2)
+    signals = json.dumps(_stable(macro_regime.get("signals", {})), indent=2)
 
     return f"""\
-Analyze the following macroeconomic data and produce your macro report.
-
 ## FRED Macro Data
-{json.dumps(macro_data, indent=2, default=str)}
+{json.dumps(_stable(macro_data), indent=2, default=str)}
 
 ## Pre-Computed Macro Regime
 Regime: {regime_str} (confidence: {confidence}/10)
 Signals:
-{signals}
-
-Assess the macro environment's impact on crypto markets.
-"""
+{signals}"""
 
 
-def macro_node(state: AgentState) -> dict:
-    """LangGraph node: Macro Analyst Agent.
-
-    Fetches macro data from FRED, classifies regime, sends to LLM for analysis.
-    """
+def _collect(aggregator: DataAggregator | None = None) -> tuple[AgentConfig, str, str]:
+    """Fetch macro data and build the prompt prefix. Returns (config, prefix, regime label)."""
     agent_config = AgentConfig()
-    aggregator = DataAggregator(exchange=agent_config.exchange, config=agent_config)
 
     logger.info("[Macro Agent] Collecting macro data")
 
-    macro_result = aggregator.get_macro_data()
+    with borrow(aggregator, agent_config) as source:
+        macro_result = source.get_macro_data()
     fred_data = macro_result.get("fred", macro_result)
     macro_regime = macro_result.get("macro_regime", {
         "macro_regime": "unknown",
@@ -63,23 +77,50 @@ def macro_node(state: AgentState) -> dict:
         "signals": {},
     })
 
-    user_prompt = _build_user_prompt(fred_data, macro_regime)
+    prefix = _build_context(fred_data, macro_regime)
+    return agent_config, prefix, macro_regime.get("macro_regime", "unknown")
 
-    logger.info("[Macro Agent] Calling LLM: %s", agent_config.macro_model)
-    report = call_llm(
-        model=agent_config.macro_model,
-        system=SYSTEM_PROMPT,
-        user=user_prompt,
-    )
 
-    regime_label = macro_regime.get("macro_regime", "unknown")
+def _result(report: str, regime_label: str) -> dict:
     logger.info(
         "[Macro Agent] Report generated (%d chars), regime: %s",
         len(report),
         regime_label,
     )
-
     return {
         "macro_report": report,
         "macro_regime": regime_label,
     }
+
+
+def macro_node(state: AgentState, aggregator: DataAggregator | None = None) -> dict:
+    """LangGraph node: Macro Analyst Agent.
+
+    Fetches macro data from FRED, classifies regime, sends to LLM for analysis.
+    """
+    agent_config, prefix, regime_label = _collect(aggregator)
+
+    logger.info("[Macro Agent] Calling LLM: %s", agent_config.macro_model)
+    report = call_llm(
+        model=agent_config.macro_model,
+        system=SYSTEM_PROMPT,
+        prefix=prefix,
+        user=USER_PROMPT,
+        agent="macro",
+    )
+    return _result(report, regime_label)
+
+
+async def amacro_node(state: AgentState, aggregator: DataAggregator | None = None) -> dict:
+    """Async LangGraph node: Macro Analyst Agent."""
+    agent_config, prefix, regime_label = await asyncio.to_thread(_collect, aggregator)
+
+    logger.info("[Macro Agent] Calling LLM (async): %s", agent_config.macro_model)
+    report = await acall_llm(
+        model=agent_config.macro_model,
+        system=SYSTEM_PROMPT,
+        prefix=prefix,
+        user=USER_PROMPT,
+        agent="macro",
+    )
+    return _result(report, regime_label)
@@ -2,13 +2,14 @@
 
 from __future__ import annotations
 
-import json
+import asyncio
 import logging
 
 from cryptoagent.config import AgentConfig
-from cryptoagent.dataflows.aggregator import DataAggregator
+from cryptoagent.dataflows.aggregator import DataAggregator, borrow
 from cryptoagent.graph.state import AgentState
-from cryptoagent.llm.client import call_llm
+from cryptoagent.llm.client import acall_llm, call_llm
+from cryptoagent.llm.prompt import PromptBuilder
 
 logger = logging.getLogger(__name__)
 
@@ -27,71 +28,106 @@ Protocol Fundamentals, Macro Environment.
 """
 
 
+# Per-section token budgets; see llm.prompt.PromptBuilder
+_BUDGETS = {"market": 500, "onchain": 500, "macro": 400, "protocol": 500}
+_MAX_ROWS = 10
+
+
+def _build_context(macro_data: dict) -> str:
+    """Token-independent context, sent as the prompt prefix.
+
+    Macro series update daily at most, so every token's research call in a
+    run shares this prefix and providers can serve it from their cache.
+    """
+    builder = PromptBuilder()
+    builder.section("Macro Environment", macro_data, _BUDGETS["macro"], max_rows=_MAX_ROWS)
+    return builder.build().strip()
+
+
 def _build_user_prompt(
     token: str,
     market_data: dict,
     onchain_data: dict,
-    macro_data: dict,
     protocol_data: dict,
 ) -> str:
-    prompt = f"""\
-Analyze the following data for {token} and produce your research report.
-
-## Market Data
-{json.dumps(market_data, indent=2, default=str)}
-
-## On-Chain Data
-{json.dumps(onchain_data, indent=2, default=str)}
-
-## Macro Environment
-{json.dumps(macro_data, indent=2, default=str)}
-"""
-    if protocol_data and protocol_data.get("source") != "stub":
-        prompt += f"""
-## Protocol Fundamentals
-{json.dumps(protocol_data, indent=2, default=str)}
-"""
-    else:
-        prompt += "\n## Protocol Fundamentals\nNot available for this cycle.\n"
-    return prompt
+    builder = PromptBuilder()
+    builder.text(f"Analyze the following data for {token} and produce your research report.")
+    builder.section("Market Data", market_data, _BUDGETS["market"], max_rows=_MAX_ROWS)
+    builder.section("On-Chain Data", onchain_data, _BUDGETS["onchain"], max_rows=_MAX_ROWS)
+    if not protocol_data or protocol_data.get("source") == "stub":
+        protocol_data = {}
+    builder.section(
+        "Protocol Fundamentals", protocol_data, _BUDGETS["protocol"], max_rows=_MAX_ROWS
+    )
+    logger.info("[Research Agent] Prompt size %s", builder.summary())
+    return builder.build()
 
 
-def research_node(state: AgentState) -> dict:
-    """LangGraph node: Research Agent.
+def _collect(
+    state: AgentState, aggregator: DataAggregator | None = None
+) -> tuple[AgentConfig, str, str, dict]:
+    """Fetch market + on-chain + macro + protocol data and build the prompt.
 
-    Fetches market + on-chain + macro data, sends to LLM for analysis.
+    Returns (config, prefix, user prompt, data).
     """
     agent_config = AgentConfig()
     token = state["token"]
-    aggregator = DataAggregator(exchange=agent_config.exchange)
 
     logger.info("[Research Agent] Collecting data for %s", token)
 
-    market_data = aggregator.get_market_data(token)
-    onchain_data = aggregator.get_onchain_data(token)
-    macro_data = aggregator.get_macro_data()
-    protocol_data = aggregator.get_protocol_data(token)
-
-    user_prompt = _build_user_prompt(
-        token,
-        market_data,
-        onchain_data,
-        macro_data,
-        protocol_data,
-    )
+    with borrow(aggregator, agent_config) as source:
+        market_data = source.get_market_data(token)
+        onchain_data = source.get_onchain_data(token)
+        macro_data = source.get_macro_data()
+        protocol_data = source.get_protocol_data(token)
+
+    prefix = _build_context(macro_data)
+    user_prompt = _build_user_prompt(token, market_data, onchain_data, protocol_data)
+    data = {
+        "market_data": market_data,
+        "onchain_data": onchain_data,
+        "protocol_data": protocol_data,
+    }
+    return agent_config, prefix, user_prompt, data
+
+
+def research_node(state: AgentState, aggregator: DataAggregator | None = None) -> dict:
+    """LangGraph node: Research Agent.
+
+    Fetches market + on-chain + macro data, sends to LLM for analysis.
+    """
+    agent_config, prefix, user_prompt, data = _collect(state, aggregator)
 
     logger.info("[Research Agent] Calling LLM: %s", agent_config.research_model)
     report = call_llm(
         model=agent_config.research_model,
         system=SYSTEM_PROMPT,
+        prefix=prefix,
         user=user_prompt,
+        agent="research",
     )
 
     logger.info("[Research Agent] Report generated (%d chars)", len(report))
+    return {"research_report": report, **data}
 
-    return {
-        "research_report": report,
-        "market_data": market_data,
-        "onchain_data": onchain_data,
-        "protocol_data": protocol_data,
-    }
+
+async def aresearch_node(state: AgentState, aggregator: DataAggregator | None = None) -> dict:
+    """Async LangGraph node: Research Agent.
+
+    Data collection runs in a worker thread; the LLM call awaits on the loop.
+    """
+    agent_config, prefix, user_prompt, data = await asyncio.to_thread(
+        _collect, state, aggregator
+    )
+
+    logger.info("[Research Agent] Calling LLM (async): %s", agent_config.research_model)
+    report = await acall_llm(
+        model=agent_config.research_model,
+        system=SYSTEM_PROMPT,
+        prefix=prefix,
+        user=user_prompt,
+        agent="research",
+    )
+
+    logger.info("[Research Agent] Report generated (%d chars)", len(report))
+    return {"research_report": report, **data}
@@ -0,0 +1,44 @@
+"""Response schemas for the agents that return structured JSON.
+
+Passed to ``call_llm_json`` / ``stream_llm_json`` as ``schema``: models
+that support it get the schema as their native response format, and every
+answer is validated against it before the agent sees it.
+"""
+
+from __future__ import annotations
+
+from typing import Literal
+
+from pydantic import BaseModel, Field, field_validator
+
+
+class BrainDecision(BaseModel):
+    """The Brain's trading decision. Field order matches SYSTEM_PROMPT (rationale last)."""
+
+    action: Literal["BUY", "SELL", "HOLD"]
+    asset: str
+    size_pct: float = Field(ge=0, le=100, description="Percent of available capital")
+    stop_loss_pct: float = Field(default=0, ge=0, description="Percent below entry")
+    take_profit_pct: float = Field(default=0, ge=0, description="Percent above entry")
+    confidence: int = Field(ge=1, le=10)
+    regime: Literal["bull", "bear", "sideways"]
+    rationale: str
+
+    @field_validator("action", "asset", mode="before")
+    @classmethod
+    def _upper(cls, value: object) -> object:
+        return value.strip().upper() if isinstance(value, str) else value
+
+    @field_validator("regime", mode="before")
+    @classmethod
+    def _lower(cls, value: object) -> object:
+        return value.strip().lower() if isinstance(value, str) else value
+
+
+class TraderValidation(BaseModel):
+    """The Trader's verdict on a Brain decision."""
+
+    execute: bool
+    modified_size_pct: float = Field(ge=0, le=100)
+    order_type: Literal["market", "limit"] = "market"
+    reason: str
@@ -2,12 +2,13 @@
 
 from __future__ import annotations
 
+import asyncio
 import logging
 
 from cryptoagent.config import AgentConfig
-from cryptoagent.dataflows.aggregator import DataAggregator
+from cryptoagent.dataflows.aggregator import DataAggregator, borrow
 from cryptoagent.graph.state import AgentState
-from cryptoagent.llm.client import call_llm
+from cryptoagent.llm.client import acall_llm, call_llm
 
 logger = logging.getLogger(__name__)
 
@@ -21,11 +22,14 @@ Rules:
 2. Assess overall sentiment direction: Strong Bearish / Bearish / Neutral / Bullish / Strong Bullish.
 3. Rate sentiment intensity from 1 (very weak signal) to 10 (very strong signal).
 4. Note any divergences between different sentiment sources (Reddit vs Twitter vs Fear & Greed).
-5. When real Reddit data is available, analyze the specific post titles and engagement levels.
+5. When real Reddit data is available, analyze the specific post titles and engagement levels, \
+and whether engagement is rising or fading across the time series.
 6. When Twitter data is available, reference the sentiment ratio (bullish/bearish/neutral split).
 7. Always anchor on the Fear & Greed Index as a baseline, then layer social signals on top.
 8. Keep it under 400 words.
 9. When news headlines are available, note recurring themes and any breaking developments.
+
+Produce a concise sentiment report with direction, intensity, and key observations.
 """
 
 
@@ -51,6 +55,26 @@ def _build_user_prompt(token: str, sentiment_data: dict, news_data: dict | None
                     f"- [{p.get('score', 0)} pts, {p.get('num_comments', 0)} comments] "
                     f"{p.get('title', '')}"
                 )
+        title_ratio = reddit.get("title_sentiment_ratio")
+        if title_ratio:
+            sections.append(
+                f"Title sentiment: Bullish {title_ratio['bullish']:.0%} / "
+                f"Bearish {title_ratio['bearish']:.0%} / Neutral {title_ratio['neutral']:.0%}"
+            )
+        if "new_posts" in reddit:
+            sections.append(
+                f"Since last cycle: {reddit['new_posts']} new posts, "
+                f"{reddit['updated_posts']} with changed engagement"
+            )
+        series = reddit.get("engagement_series", [])
+        if any(b["posts"] for b in series):
+            sections.append("Engagement over time (oldest first):")
+            for b in series:
+                ratio = b["weighted_upvote_ratio"]
+                sections.append(
+                    f"- {b['start'][5:16]}: {b['posts']} posts, {b['engagement']} engagement, "
+                    f"weighted upvote ratio {ratio if ratio is not None else 'n/a'}"
+                )
         sections.append("")
     else:
         sections.append("## Reddit Sentiment\nData unavailable.\n")
@@ -85,38 +109,33 @@ def _build_user_prompt(token: str, sentiment_data: dict, news_data: dict | None
             sections.append(f"(Filtered for {token})")
         for h in headlines:
             pub = h.get("pub_date", "")
-            sections.append(f"- {h.get('title', '')} [{pub}]")
+            tag = f" ({h['sentiment']})" if h.get("sentiment") else ""
+            sections.append(f"- {h.get('title', '')} [{pub}]{tag}")
         sections.append("")
     else:
         sections.append("## Crypto News Headlines\nCrypto news data unavailable.\n")
 
-    sections.append("Produce a concise sentiment report with direction, intensity, and key observations.")
     return "\n".join(sections)
 
 
-def sentiment_node(state: AgentState) -> dict:
-    """LangGraph node: Sentiment Agent.
-
-    Fetches real social/news sentiment data, sends to LLM for analysis.
-    """
+def _collect(
+    state: AgentState, aggregator: DataAggregator | None = None
+) -> tuple[AgentConfig, str, dict, dict]:
+    """Fetch social/news data and build the user prompt."""
     agent_config = AgentConfig()
     token = state["token"]
-    aggregator = DataAggregator(exchange=agent_config.exchange, config=agent_config)
 
     logger.info("[Sentiment Agent] Collecting sentiment data for %s", token)
 
-    sentiment_data = aggregator.get_sentiment_data(token)
-    news_data = aggregator.get_news_data(token)
+    with borrow(aggregator, agent_config) as source:
+        sentiment_data = source.get_sentiment_data(token)
+        news_data = source.get_news_data(token)
 
     user_prompt = _build_user_prompt(token, sentiment_data, news_data)
+    return agent_config, user_prompt, sentiment_data, news_data
 
-    logger.info("[Sentiment Agent] Calling LLM: %s", agent_config.sentiment_model)
-    report = call_llm(
-        model=agent_config.sentiment_model,
-        system=SYSTEM_PROMPT,
-        user=user_prompt,
-    )
 
+def _result(report: str, sentiment_data: dict, news_data: dict) -> dict:
     logger.info("[Sentiment Agent] Report generated (%d chars)", len(report))
 
     fng = sentiment_data.get("fear_greed_index", 50)
@@ -126,3 +145,36 @@ def sentiment_node(state: AgentState) -> dict:
         "fear_greed_index": fng,
         "news_data": news_data,
     }
+
+
+def sentiment_node(state: AgentState, aggregator: DataAggregator | None = None) -> dict:
+    """LangGraph node: Sentiment Agent.
+
+    Fetches real social/news sentiment data, sends to LLM for analysis.
+    """
+    agent_config, user_prompt, sentiment_data, news_data = _collect(state, aggregator)
+
+    logger.info("[Sentiment Agent] Calling LLM: %s", agent_config.sentiment_model)
+    report = call_llm(
+        model=agent_config.sentiment_model,
+        system=SYSTEM_PROMPT,
+        user=user_prompt,
+        agent="sentiment",
+    )
+    return _result(report, sentiment_data, news_data)
+
+
+async def asentiment_node(state: AgentState, aggregator: DataAggregator | None = None) -> dict:
+    """Async LangGraph node: Sentiment Agent."""
+    agent_config, user_prompt, sentiment_data, news_data = await asyncio.to_thread(
+        _collect, state, aggregator
+    )
+
+    logger.info("[Sentiment Agent] Calling LLM (async): %s", agent_config.sentiment_model)
+    report = await acall_llm(
+        model=agent_config.sentiment_model,
+        system=SYSTEM_PROMPT,
+        user=user_prompt,
+        agent="sentiment",
+    )
+    return _result(report, sentiment_data, news_data)
@@ -2,13 +2,18 @@
 
 from __future__ import annotations
 
+import contextvars
 import json
 import logging
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
 
+from cryptoagent.agents.schemas import TraderValidation
 from cryptoagent.config import AgentConfig
 from cryptoagent.execution.router import execute_trade
 from cryptoagent.graph.state import AgentState
 from cryptoagent.llm.client import call_llm_json
+from cryptoagent.llm.prompt import PromptBuilder
 
 logger = logging.getLogger(__name__)
 
@@ -28,27 +33,107 @@ Respond with a JSON object:
 - "reason": brief explanation of your execution decision
 
 If the Brain's action is HOLD, set execute to false with reason "HOLD — no trade needed".
+
+Validate the decision below and decide on execution.
 """
 
 
+_PORTFOLIO_BUDGET = 400
+_MAX_TRADES = 5  # most recent trades shown from trade_history
+
+
 def _build_user_prompt(
     brain_decision: dict,
     portfolio_state: dict,
     market_data: dict,
 ) -> str:
-    return f"""\
-## Brain's Trading Decision
-{json.dumps(brain_decision, indent=2)}
+    builder = PromptBuilder()
+    builder.text(f"## Brain's Trading Decision\n{json.dumps(brain_decision, indent=2)}")
+    builder.section(
+        "Current Portfolio", portfolio_state, _PORTFOLIO_BUDGET, max_rows=_MAX_TRADES
+    )
+    builder.text(
+        f"## Current Market\n"
+        f"Price: ${market_data.get('current_price', 'N/A')}\n"
+        f"24h Volume: {market_data.get('volume_24h', 'N/A')}"
+    )
+    return builder.build()
 
-## Current Portfolio
-{json.dumps(portfolio_state, indent=2, default=str)}
 
-## Current Market
-Price: ${market_data.get('current_price', 'N/A')}
-24h Volume: {market_data.get('volume_24h', 'N/A')}
+# Validations started from the Brain's streamed early fields, keyed by cycle id
+_prefetch_pool = ThreadPoolExecutor(max_workers=4, thread_name_prefix="trader-prefetch")
+_prefetched: dict[str, tuple[tuple, Future]] = {}
+_prefetch_lock = threading.Lock()
+_MAX_PREFETCHED = 32
 
-Validate and decide on execution.
-"""
+
+def _decision_key(decision: dict) -> tuple:
+    return (decision.get("action"), decision.get("asset"), float(decision.get("size_pct", 0)))
+
+
+def _validate(brain_decision: dict, portfolio_state: dict, market_data: dict) -> dict:
+    agent_config = AgentConfig()
+    user_prompt = _build_user_prompt(brain_decision, portfolio_state, market_data)
+
+    logger.info("[Trader Agent] Calling LLM: %s", agent_config.trader_model)
+    try:
+        return call_llm_json(
+            model=agent_config.trader_model,
+            system=SYSTEM_PROMPT,
+            user=user_prompt,
+            schema=TraderValidation,
+            agent="trader",
+        )
+    except ValueError as e:
+        # Never execute on a verdict we could not read
+        logger.error("[Trader Agent] No valid validation: %s", e)
+        return {
+            "execute": False,
+            "modified_size_pct": 0,
+            "order_type": "market",
+            "reason": f"Trader validation unavailable: {e}",
+        }
+
+
+def prefetch_validation(state: AgentState, early_decision: dict) -> None:
+    """Start validating a BUY/SELL from the Brain's early fields in the background.
+
+    Called while the Brain's rationale is still streaming. ``trader_node``
+    uses the result if the final decision matches the early one, so the
+    Trader's LLM call overlaps the end of the Brain's.
+    """
+    cycle_id = state.get("cycle_id")
+    if not cycle_id or early_decision.get("action") not in ("BUY", "SELL"):
+        return
+    future = _prefetch_pool.submit(
+        contextvars.copy_context().run,
+        _validate,
+        early_decision,
+        state.get("portfolio_state", {}),
+        state.get("market_data", {}),
+    )
+    with _prefetch_lock:
+        _prefetched[cycle_id] = (_decision_key(early_decision), future)
+        # Drop entries whose cycle never reached the Trader
+        while len(_prefetched) > _MAX_PREFETCHED:
+            del _prefetched[next(iter(_prefetched))]
+
+
+def _take_prefetched(cycle_id: str | None, brain_decision: dict) -> dict | None:
+    with _prefetch_lock:
+        entry = _prefetched.pop(cycle_id, None) if cycle_id else None
+    if entry is None:
+        return None
+    key, future = entry
+    if key != _decision_key(brain_decision):
+        logger.info("[Trader Agent] Final decision differs from early fields, revalidating")
+        future.cancel()
+        return None
+    try:
+        return future.result()
+    except Exception as e:
+        logger.warning("[Trader Agent] Prefetched validation failed, retrying: %s", e)
+        return None
 
 
 def trader_node(state: AgentState) -> dict:
@@ -69,6 +154,8 @@ def trader_node(state: AgentState) -> dict:
 
     logger.info("[Trader Agent] Evaluating decision: %s", brain_decision.get("action"))
 
+    prefetched = _take_prefetched(state.get("cycle_id"), brain_decision)
+
     # For HOLD, skip LLM call
     if brain_decision.get("action") == "HOLD":
         result = {
@@ -78,15 +165,8 @@ def trader_node(state: AgentState) -> dict:
         }
         return {"trade_result": json.dumps(result, indent=2)}
 
-    # Validate via LLM
-    user_prompt = _build_user_prompt(brain_decision, portfolio_state, market_data)
-
-    logger.info("[Trader Agent] Calling LLM: %s", agent_config.trader_model)
-    validation = call_llm_json(
-        model=agent_config.trader_model,
-        system=SYSTEM_PROMPT,
-        user=user_prompt,
-    )
+    # Validate via LLM, unless already validated from the Brain's early fields
+    validation = prefetched or _validate(brain_decision, portfolio_state, market_data)
 
     should_execute = validation.get("execute", False)
     final_size_pct = float(validation.get("modified_size_pct", brain_decision.get("size_pct", 0)))
@@ -14,7 +14,6 @@ from rich.panel import Panel
 from rich.table import Table
 
 from cryptoagent.config import AgentConfig
-from cryptoagent.graph.builder import TradingGraph
 
 app = typer.Typer(name="cryptoagent", help="Multi-agent LLM trading system", invoke_without_command=True)
 console = Console()
@@ -89,6 +88,9 @@ def analyze(
     ))
 
     try:
+        # Imported here so --help and other commands start without the pipeline's imports
+        from cryptoagent.graph.builder import TradingGraph
+
         graph = TradingGraph(config=config)
         portfolio_state = None
         reflection_memory: list[str] = []
@@ -106,6 +108,8 @@ def analyze(
 
             # Display results for this cycle
             _display_results(result, token)
+            if result.get("cycle_id"):
+                _display_llm_usage(graph.llm_usage(result["cycle_id"]))
 
             # Carry forward portfolio and reflections
             portfolio_state = result.get("portfolio_state")
@@ -217,6 +221,55 @@ def _display_results(result: dict, token: str) -> None:
         ))
 
 
+def _display_llm_usage(rows: list[dict]) -> None:
+    """Print per-agent (and per-model) LLM tokens, cost, and latency for a cycle."""
+    if not rows:
+        return
+
+    table = Table(title="LLM Usage", border_style="dim")
+    table.add_column("Agent", style="bold")
+    table.add_column("Model")
+    table.add_column("Calls", justify="right")
+    table.add_column("Prompt Tok", justify="right")
+    table.add_column("Cached %", justify="right")
+    table.add_column("Compl. Tok", justify="right")
+    table.add_column("Cost", justify="right")
+    table.add_column("Latency", justify="right")
+    table.add_column("To Decision", justify="right")
+
+    def add(name: str, model: str, row: dict) -> None:
+        calls = f"{row['calls']}" + (f" ({row['cached']} cached)" if row["cached"] else "")
+        cached_pct = 100 * (row.get("cached_prompt_tokens") or 0) / max(row["prompt_tokens"], 1)
+        table.add_row(
+            name,
+            model,
+            calls,
+            f"{row['prompt_tokens']:,}",
+            f"{cached_pct:.0f}%" if row["prompt_tokens"] else "-",
+            f"{row['completion_tokens']:,}",
+            f"${row['cost_usd']:.4f}",
+            f"{row['latency_ms'] / 1000:.1f}s",
+            f"{row['decision_ms'] / 1000:.1f}s" if row.get("decision_ms") is not None else "-",
+        )
+
+    for row in rows:
+        add(row["agent"], row["model"], row)
+    summed = (
+        "calls",
+        "cached",
+        "prompt_tokens",
+        "cached_prompt_tokens",
+        "completion_tokens",
+        "cost_usd",
+        "latency_ms",
+    )
+    totals = {key: sum(r.get(key) or 0 for r in rows) for key in summed}
+    decision = [r["decision_ms"] for r in rows if r.get("decision_ms") is not None]
+    totals["decision_ms"] = sum(decision) if decision else None
+    add("[bold]Total[/bold]", "", totals)
+    console.print(table)
+
+
 def main() -> None:
     """Entry point."""
     app()
@@ -15,6 +15,42 @@ class AgentConfig(BaseSettings):
     trader_model: str = "openai/gpt-4o-mini"
     macro_model: str = "openai/gpt-4o-mini"
 
+    # Async LLM concurrency: max in-flight calls per provider (e.g. {"openai": 16})
+    llm_max_concurrency: int = 8
+    llm_provider_concurrency: dict[str, int] = {}
+
+    # LLM response cache: "off", "read" (serve hits only), or "readwrite";
+    # per-agent overrides by agent name (e.g. {"reflection": "readwrite"})
+    llm_cache_mode: Literal["off", "read", "readwrite"] = "off"
+    llm_cache_agent_modes: dict[str, str] = {}
+    llm_cache_path: str = "data/llm_cache.db"
+    llm_cache_max_entries: int = 10_000
+    llm_cache_max_mb: int = 100
+
+    # Fallback models per agent, tried after its primary (e.g. {"brain": ["anthropic/..."]}).
+    # The next model is also started (hedged) once the current one exceeds its
+    # observed p95 latency, bounded below by llm_hedge_min_s; models with too few
+    # samples wait llm_hedge_default_s.
+    llm_fallback_models: dict[str, list[str]] = {}
+    llm_hedge_min_s: float = 2.0
+    llm_hedge_default_s: float = 30.0
+
+    # Stream the Brain's decision and start the Trader once its key fields arrive
+    llm_stream_decisions: bool = True
+
+    # Rate-limit budgets per provider or model, e.g.
+    # {"openai": {"rpm": 500, "tpm": 200000}, "openai/gpt-4o": {"tpm": 30000}}.
+    # Calls that would exceed them wait, Brain/Trader first and reflections last
+    # (override with llm_agent_priorities; lower runs first). 429s are retried
+    # llm_max_retries times with exponential backoff from llm_backoff_base_s.
+    llm_rate_limits: dict[str, dict[str, int]] = {}
+    llm_agent_priorities: dict[str, int] = {}
+    llm_max_retries: int = 4
+    llm_backoff_base_s: float = 1.0
+
+    # Seed for the offline "fake/<profile>" models (see llm.fake)
+    llm_fake_seed: int = 0
+
     # Asset
     asset_type: Literal["crypto", "equity"] = "crypto"
     target_token: str = "SOL"
@@ -35,6 +71,9 @@ class AgentConfig(BaseSettings):
     # Reflection
     reflection_model: str = "openai/gpt-4o-mini"
     reflection_cycle_length: int = 5  # Generate Level 2 every N cycles
+    # "deferred" queues reflections and generates them on a background thread
+    # after the cycle returns, instead of before
+    reflection_mode: Literal["sync", "deferred"] = "sync"
 
     # Risk management
     max_daily_loss_pct: float = 5.0
@@ -44,6 +83,8 @@ class AgentConfig(BaseSettings):
     # On-chain data
     solana_rpc_url: str = "https://api.mainnet-beta.solana.com"
     defillama_base_url: str = "https://api.llama.fi"
+    whale_addresses: list[str] = []  # Solana wallets to track; empty = built-in list
+    whale_windows_hours: list[int] = [1, 24, 168]  # Activity rate windows
 
     # Social sentiment
     twitter_bearer_token: str = ""
@@ -53,6 +94,9 @@ class AgentConfig(BaseSettings):
     # Macro data
     fred_api_key: str = ""
 
+    # Protocol fundamentals
+    github_token: str = ""  # Optional; raises the GitHub API limit from 60 to 5000 requests/hour
+
     model_config = SettingsConfigDict(
         env_file=".env",
         env_prefix="CA_",
@@ -1,24 +1,27 @@
-"""Unified data interface for all agents."""
+"""Unified data interface for all agents.
+
+Provider modules are imported inside the methods that use them: between
+them they pull in httpx, ccxt, pandas, and ta, which most entry points
+(the CLI's simple commands, tests, the API sidecar) never need.
+"""
 
 from __future__ import annotations
 
 import logging
+import threading
+from collections.abc import Iterator
+from contextlib import contextmanager
 from datetime import datetime, timezone
+from typing import TYPE_CHECKING
 
 from cryptoagent.config import AgentConfig
-from cryptoagent.dataflows.macro.classifier import classify_macro
-from cryptoagent.dataflows.macro.fred import get_all_macro_data as fred_get_all
-from cryptoagent.dataflows.market.ccxt_provider import get_market_snapshot
-from cryptoagent.dataflows.news.cryptopanic import get_crypto_news
-from cryptoagent.dataflows.onchain.defillama import get_all_onchain_data
-from cryptoagent.dataflows.onchain.fear_greed import get_fear_greed_index
-from cryptoagent.dataflows.onchain.solana_rpc import get_solana_network_data
-from cryptoagent.dataflows.protocol.defillama_protocol import get_protocol_fundamentals
-from cryptoagent.dataflows.protocol.dev_activity import get_dev_activity
-from cryptoagent.dataflows.protocol.governance import get_governance_activity
-from cryptoagent.dataflows.social.reddit import get_reddit_sentiment
-from cryptoagent.dataflows.social.twitter import get_twitter_sentiment
 from cryptoagent.dataflows import regime
+from cryptoagent.persistence.database import Database
+
+if TYPE_CHECKING:
+    from cryptoagent.dataflows.news.cryptopanic import NewsIngestor
+    from cryptoagent.dataflows.onchain.tvl_store import TvlStore
+    from cryptoagent.dataflows.onchain.whale_tracker import WhaleTracker
 
 logger = logging.getLogger(__name__)
 
@@ -66,36 +69,135 @@ _PROTOCOL_STUB = {
 
 
 class DataAggregator:
-    """Collects data from all sources — real providers with stub fallbacks."""
+    """Collects data from all sources — real providers with stub fallbacks.
+
+    One instance is meant to be shared by every agent node in a run (see
+    ``TradingGraph``), so the local stores keep their in-memory state and
+    all of them write through one database connection.
+    """
 
     def __init__(
-        self, exchange: str = "binance", config: AgentConfig | None = None
+        self,
+        exchange: str = "binance",
+        config: AgentConfig | None = None,
+        db: Database | None = None,
     ) -> None:
         self.exchange = exchange
         self._config = config or AgentConfig()
+        self._db = db
+        self._owns_db = False
+        # Agent nodes run in parallel threads; guards the lazily built stores
+        self._lock = threading.RLock()
+        self._tvl_store: TvlStore | None = None
+        self._whale_tracker: WhaleTracker | None = None
+        self._news_ingestor: NewsIngestor | None = None
+
+    @property
+    def db(self) -> Database:
+        """Database backing the local data stores (opened lazily from config)."""
+        with self._lock:
+            if self._db is None:
+                self._db = Database(self._config.database_url or self._config.db_path)
+                self._owns_db = True
+            return self._db
+
+    def close(self) -> None:
+        """Close the database if this aggregator opened it (an injected one is left open)."""
+        with self._lock:
+            if self._owns_db and self._db is not None:
+                self._db.close()
+                self._db = None
+                self._owns_db = False
+            self._tvl_store = self._whale_tracker = self._news_ingestor = None
+
+    @property
+    def tvl_store(self) -> TvlStore:
+        """Local chain/protocol TVL history, shared across calls so its series stay in memory."""
+        with self._lock:
+            if self._tvl_store is None:
+                from cryptoagent.dataflows.onchain.tvl_store import TvlStore
+
+                self._tvl_store = TvlStore(self.db)
+            return self._tvl_store
+
+    @property
+    def whale_tracker(self) -> WhaleTracker:
+        """Incremental tracker for the configured Solana whale wallets."""
+        with self._lock:
+            if self._whale_tracker is None:
+                from cryptoagent.dataflows.onchain.solana_rpc import get_client
+                from cryptoagent.dataflows.onchain.whale_tracker import WhaleTracker
+
+                client = get_client(self._config.solana_rpc_url)
+                self._whale_tracker = WhaleTracker(self.db, client)
+            return self._whale_tracker
+
+    @property
+    def news_ingestor(self) -> NewsIngestor:
+        """CryptoPanic feed ingestor backed by the local news store."""
+        with self._lock:
+            if self._news_ingestor is None:
+                from cryptoagent.dataflows.http_cache import HttpCache
+                from cryptoagent.dataflows.news.cryptopanic import NewsIngestor
+                from cryptoagent.dataflows.news.news_store import NewsStore
+
+                self._news_ingestor = NewsIngestor(
+                    NewsStore(self.db),
+                    HttpCache(self.db),
+                    tokens=[self._config.target_token],
+                )
+            return self._news_ingestor
 
     def get_market_data(self, token: str) -> dict:
         """Fetch real market data via CCXT."""
+        from cryptoagent.dataflows.market.ccxt_provider import get_market_snapshot
+
         logger.info("Fetching market data for %s", token)
         return get_market_snapshot(token, self.exchange)
 
     def get_onchain_data(self, token: str) -> dict:
-        """Fetch real on-chain data from DeFiLlama + Solana RPC.
+        """Fetch real on-chain data from DeFiLlama (+ Solana RPC for Solana tokens).
 
-        Falls back to stub on any failure.
+        The token is mapped to its chain; DeFiLlama responses are cached per
+        chain, so tokens sharing a chain share one set of requests. Falls back
+        to stub for unmapped tokens or on any failure.
         """
-        logger.info("Fetching on-chain data for %s", token)
-        try:
-            defillama = get_all_onchain_data(self._config.defillama_base_url)
-            solana = get_solana_network_data(self._config.solana_rpc_url)
+        from cryptoagent.dataflows.onchain.defillama import (
+            chain_for_token,
+            get_all_onchain_data,
+        )
+        from cryptoagent.dataflows.onchain.solana_rpc import get_solana_network_data
 
+        logger.info("Fetching on-chain data for %s", token)
+        chain = chain_for_token(token)
+        if chain is None:
+            logger.info("No chain mapping for %s, using on-chain stub", token)
             return {
+                **_ONCHAIN_STUB,
+                "note": f"No chain mapping for {token.upper()}. Using placeholder values.",
+                "token": token.upper(),
+                "timestamp": datetime.now(timezone.utc).isoformat(),
+            }
+
+        try:
+            defillama = get_all_onchain_data(
+                self._config.defillama_base_url, chain, store=self.tvl_store
+            )
+            result = {
                 "source": "real",
                 "token": token.upper(),
+                "chain": chain,
                 "timestamp": datetime.now(timezone.utc).isoformat(),
                 "defillama": defillama,
-                "solana_network": solana,
             }
+            if chain == "Solana":
+                result["solana_network"] = get_solana_network_data(
+                    self._config.solana_rpc_url,
+                    addresses=self._config.whale_addresses or None,
+                    tracker=self.whale_tracker,
+                    windows_hours=self._config.whale_windows_hours,
+                )
+            return result
         except Exception as e:
             logger.warning("On-chain data fetch failed, using stub: %s", e)
             return {
@@ -109,18 +211,25 @@ class DataAggregator:
 
         Falls back to stub on any failure.
         """
+        from cryptoagent.dataflows.onchain.fear_greed import get_fear_greed_index
+        from cryptoagent.dataflows.onchain.fear_greed_store import FearGreedStore
+        from cryptoagent.dataflows.social.reddit import get_reddit_sentiment
+        from cryptoagent.dataflows.social.reddit_store import RedditStore
+        from cryptoagent.dataflows.social.twitter import get_twitter_sentiment
+
         logger.info("Fetching sentiment data for %s", token)
         try:
             reddit = get_reddit_sentiment(
                 subreddits=self._config.reddit_subreddits,
                 token=token,
+                store=RedditStore(self.db),
             )
             twitter = get_twitter_sentiment(
                 token=token,
                 bearer_token=self._config.twitter_bearer_token,
                 scrape_url=self._config.twitter_scrape_url,
             )
-            fng = get_fear_greed_index()
+            fng = get_fear_greed_index(store=FearGreedStore(self.db))
 
             fng_value = fng.get("value", 50) if fng.get("source") != "error" else 50
             fng_label = (
@@ -153,10 +262,14 @@ class DataAggregator:
         return regime.classify(indicators)
 
     def get_macro_data(self) -> dict:
-        """Fetch real macro data from FRED, with stub fallback."""
+        """Fetch macro data from the local FRED store (synced incrementally), with stub fallback."""
+        from cryptoagent.dataflows.macro.classifier import classify_macro
+        from cryptoagent.dataflows.macro.fred import get_all_macro_data as fred_get_all
+        from cryptoagent.dataflows.macro.fred_store import FredStore
+
         logger.info("Fetching macro data from FRED")
         try:
-            fred_data = fred_get_all(self._config.fred_api_key)
+            fred_data = fred_get_all(self._config.fred_api_key, store=FredStore(self.db))
             if fred_data.get("source") == "error":
                 logger.warning("FRED returned error: %s", fred_data.get("message"))
                 stub = {
@@ -176,10 +289,12 @@ class DataAggregator:
             return {**_MACRO_STUB, "timestamp": datetime.now(timezone.utc).isoformat()}
 
     def get_news_data(self, token: str) -> dict:
-        """Fetch crypto news headlines from CryptoPanic RSS."""
+        """Fetch crypto news headlines from CryptoPanic RSS (via the local news store)."""
+        from cryptoagent.dataflows.news.cryptopanic import get_crypto_news
+
         logger.info("Fetching news data for %s", token)
         try:
-            return get_crypto_news(token)
+            return get_crypto_news(token, ingestor=self.news_ingestor)
         except Exception as e:
             logger.warning("News data fetch failed, using stub: %s", e)
             return {**_NEWS_STUB, "token": token.upper()}
@@ -190,14 +305,24 @@ class DataAggregator:
         Combines DeFiLlama protocol data, Snapshot governance, and GitHub metrics.
         Falls back to stub on any failure.
         """
+        from cryptoagent.dataflows.protocol.defillama_protocol import get_protocol_fundamentals
+        from cryptoagent.dataflows.protocol.dev_activity import get_dev_activity
+        from cryptoagent.dataflows.protocol.github_store import GithubStore
+        from cryptoagent.dataflows.protocol.governance import get_governance_activity
+
         logger.info("Fetching protocol data for %s", token)
         try:
             protocol = get_protocol_fundamentals(
                 token,
                 self._config.defillama_base_url,
+                store=self.tvl_store,
             )
             governance = get_governance_activity(token)
-            dev = get_dev_activity(token)
+            dev = get_dev_activity(
+                token,
+                store=GithubStore(self.db),
+                github_token=self._config.github_token,
+            )
 
             return {
                 "source": "real",
@@ -210,3 +335,20 @@ class DataAggregator:
         except Exception as e:
             logger.warning("Protocol data fetch failed, using stub: %s", e)
             return {**_PROTOCOL_STUB, "token": token.upper()}
+
+
+@contextmanager
+def borrow(aggregator: DataAggregator | None, config: AgentConfig) -> Iterator[DataAggregator]:
+    """Yield ``aggregator``, or a temporary one that is closed on exit.
+
+    Agent nodes get the run's shared aggregator from ``TradingGraph``; a
+    node called on its own still cleans up the database it opens.
+    """
+    if aggregator is not None:
+        yield aggregator
+        return
+    temporary = DataAggregator(exchange=config.exchange, config=config)
+    try:
+        yield temporary
+    finally:
+        temporary.close()
@@ -0,0 +1,95 @@
+"""In-process TTL cache shared by data providers across agents and tokens."""
+
+from __future__ import annotations
+
+import threading
+import time
+from collections.abc import Callable, Hashable
+from typing import Any, TypeVar
+
+T = TypeVar("T")
+
+
+class _KeyLock:
+    """Per-key load lock plus the number of callers holding or waiting on it."""
+
+    __slots__ = ("lock", "users")
+
+    def __init__(self) -> None:
+        self.lock = threading.Lock()
+        self.users = 0
+
+
+class TTLCache:
+    """Thread-safe cache with per-entry expiry and single-flight loading.
+
+    Concurrent callers asking for the same missing key wait on one load, so
+    parallel agents (or tokens in a multi-token run) share a single upstream
+    request. Loader exceptions propagate and are never cached. A key's load
+    lock lives only while someone is loading or waiting on that key.
+    """
+
+    def __init__(self, ttl_seconds: float, max_entries: int = 1024) -> None:
+        self._ttl = ttl_seconds
+        self._max_entries = max_entries
+        self._entries: dict[Hashable, tuple[float, Any]] = {}
+        self._key_locks: dict[Hashable, _KeyLock] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> Any | None:
+        """Return the cached value for ``key``, or None if missing or expired."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at < time.monotonic():
+                del self._entries[key]
+                return None
+            return value
+
+    def set(self, key: Hashable, value: Any) -> None:
+        """Store ``value`` under ``key`` for the cache TTL."""
+        with self._lock:
+            if len(self._entries) >= self._max_entries and key not in self._entries:
+                self._evict_locked()
+            self._entries[key] = (time.monotonic() + self._ttl, value)
+
+    def get_or_load(self, key: Hashable, loader: Callable[[], T]) -> T:
+        """Return the cached value, calling ``loader`` once on a miss."""
+        value = self.get(key)
+        if value is not None:
+            return value
+
+        with self._lock:
+            key_lock = self._key_locks.setdefault(key, _KeyLock())
+            key_lock.users += 1
+        try:
+            with key_lock.lock:
+                # Another thread may have loaded it while we waited
+                value = self.get(key)
+                if value is not None:
+                    return value
+                value = loader()
+                self.set(key, value)
+                return value
+        finally:
+            with self._lock:
+                key_lock.users -= 1
+                if key_lock.users == 0:
+                    del self._key_locks[key]
+
+    def clear(self) -> None:
+        """Drop every cached entry."""
+        with self._lock:
+            self._entries.clear()
+
+    def _evict_locked(self) -> None:
+        """Drop expired entries, then the soonest-to-expire ones if still full."""
+        now = time.monotonic()
+        for key in [k for k, (exp, _) in self._entries.items() if exp < now]:
+            del self._entries[key]
+        if len(self._entries) >= self._max_entries:
+            oldest = sorted(self._entries, key=lambda k: self._entries[k][0])
+            for key in oldest[: len(oldest) // 4 or 1]:
+                del self._entries[key]
@@ -0,0 +1,114 @@
+"""Persistent HTTP validator cache — conditional GETs with ETag / Last-Modified.
+
+Providers that poll slow-changing feeds keep the last response's validators
+(and optionally its body) here, so a re-fetch within ``max_age`` costs
+nothing and an unchanged resource costs one ``304 Not Modified``.
+"""
+
+from __future__ import annotations
+
+import logging
+import time
+
+import httpx
+
+from cryptoagent.persistence.database import Database
+
+logger = logging.getLogger(__name__)
+
+
+def cache_key(url: str, params: dict | None = None) -> str:
+    """Canonical cache key for a URL plus query params."""
+    return str(httpx.URL(url, params=params))
+
+
+class HttpCache:
+    """Stores ``(etag, last_modified, body, fetched_at)`` per URL."""
+
+    def __init__(self, db: Database) -> None:
+        self._db = db
+
+    def lookup(self, key: str) -> dict | None:
+        """Return the cached entry for ``key``, or None if never fetched."""
+        row = self._db.conn.execute(
+            "SELECT etag, last_modified, body, fetched_at FROM http_cache WHERE url = ?",
+            (key,),
+        ).fetchone()
+        return dict(row) if row is not None else None
+
+    def is_fresh(self, key: str, max_age: float, now: float | None = None) -> bool:
+        """True if ``key`` was fetched (or revalidated) within ``max_age`` seconds."""
+        entry = self.lookup(key)
+        now = now if now is not None else time.time()
+        return entry is not None and now - entry["fetched_at"] < max_age
+
+    def conditional_headers(self, key: str) -> dict[str, str]:
+        """``If-None-Match`` / ``If-Modified-Since`` headers from the stored validators."""
+        entry = self.lookup(key)
+        if entry is None:
+            return {}
+        headers = {}
+        if entry["etag"]:
+            headers["If-None-Match"] = entry["etag"]
+        if entry["last_modified"]:
+            headers["If-Modified-Since"] = entry["last_modified"]
+        return headers
+
+    def store(self, key: str, response: httpx.Response, body: str | None = None) -> None:
+        """Record a 200 response's validators, and its body if given."""
+        with self._db.transaction() as conn:
+            conn.execute(
+                """INSERT INTO http_cache (url, etag, last_modified, body, fetched_at)
+                   VALUES (?, ?, ?, ?, ?)
+                   ON CONFLICT (url) DO UPDATE SET
+                       etag = excluded.etag,
+                       last_modified = excluded.last_modified,
+                       body = excluded.body,
+                       fetched_at = excluded.fetched_at""",
+                (
+                    key,
+                    response.headers.get("ETag"),
+                    response.headers.get("Last-Modified"),
+                    body,
+                    time.time(),
+                ),
+            )
+
+    def touch(self, key: str) -> None:
+        """Mark ``key`` as revalidated now (after a 304 or a skipped fetch)."""
+        with self._db.transaction() as conn:
+            conn.execute(
+                "UPDATE http_cache SET fetched_at = ? WHERE url = ?",
+                (time.time(), key),
+            )
+
+    def get(
+        self,
+        client: httpx.Client,
+        url: str,
+        params: dict | None = None,
+        headers: dict | None = None,
+        max_age: float = 0,
+    ) -> tuple[str | None, bool]:
+        """Conditional GET returning ``(body, changed)``.
+
+        Within ``max_age`` of the last fetch no request is made. A 304 returns
+        the stored body with ``changed=False``. Non-200, non-304 responses raise.
+        """
+        key = cache_key(url, params)
+        entry = self.lookup(key)
+        if entry is not None and time.time() - entry["fetched_at"] < max_age:
+            return entry["body"], False
+
+        request_headers = dict(headers or {})
+        if entry is not None and entry["body"] is not None:
+            request_headers.update(self.conditional_headers(key))
+
+        resp = client.get(url, params=params, headers=request_headers)
+        if resp.status_code == 304 and entry is not None:
+            logger.debug("HTTP cache: %s not modified", key)
+            self.touch(key)
+            return entry["body"], False
+        resp.raise_for_status()
+        self.store(key, resp, resp.text)
+        return resp.text, True
@@ -0,0 +1,309 @@
+"""Incremental JSON extraction from streamed HTTP responses.
+
+DeFiLlama payloads can be several MB, yet each provider only needs a handful
+of fields. ``JSONStream`` walks a JSON document chunk by chunk: wanted values
+are decoded with the C decoder, unwanted values are skipped with a regex scan
+that never materializes Python objects, and callers can stop reading as soon
+as they have what they need.
+"""
+
+from __future__ import annotations
+
+import json
+import re
+from collections import deque
+from collections.abc import Iterable, Iterator
+from typing import Any
+
+_DECODER = json.JSONDecoder()
+_WS = re.compile(r"[ \t\n\r]*")
+_ARRAY_SEP = re.compile(r"[ \t\n\r]*([,\]])[ \t\n\r]*")
+
+# A complete JSON string literal.
+_STR = r'"[^"\\]*(?:\\.[^"\\]*)*"'
+# Any run of text containing no brackets except flat (non-nested) objects.
+# Skipping consumes these runs inside the regex engine, so the Python loop
+# only iterates on nested containers.
+_FLAT_RUN = re.compile(
+    r'(?:[^{}\[\]"]++|' + _STR + r'|\{(?:[^{}\[\]"]++|' + _STR + r')*+\})*+'
+)
+
+_NUMBER_TAIL = frozenset(".eE+-0123456789")
+_DEFAULT_CHUNK = 65536
+
+
+class JSONStream:
+    """Forward-only reader over an iterable of JSON text chunks."""
+
+    def __init__(self, chunks: Iterable[str], min_buffer: int = _DEFAULT_CHUNK) -> None:
+        self._chunks = iter(chunks)
+        self._buf = ""
+        self._pos = 0
+        self._eof = False
+        self._min_buffer = min_buffer
+
+    # --- buffer management ---
+
+    def _fill(self, want: int) -> bool:
+        """Read chunks until ``want`` unconsumed chars are buffered. False at EOF."""
+        if self._eof:
+            return False
+        if self._pos:
+            self._buf = self._buf[self._pos :]
+            self._pos = 0
+        parts = [self._buf]
+        size = len(self._buf)
+        while size < want:
+            try:
+                chunk = next(self._chunks)
+            except StopIteration:
+                self._eof = True
+                break
+            parts.append(chunk)
+            size += len(chunk)
+        self._buf = "".join(parts)
+        return size > 0
+
+    def _available(self) -> int:
+        return len(self._buf) - self._pos
+
+    def _skip_ws(self) -> None:
+        while True:
+            self._pos = _WS.match(self._buf, self._pos).end()
+            if self._pos < len(self._buf) or not self._fill(self._min_buffer):
+                return
+
+    def peek(self) -> str:
+        """Return the next non-whitespace character ('' at end of stream)."""
+        self._skip_ws()
+        return self._buf[self._pos] if self._pos < len(self._buf) else ""
+
+    def _expect(self, char: str) -> None:
+        found = self.peek()
+        if found != char:
+            raise ValueError(f"Expected {char!r} at stream offset, found {found!r}")
+        self._pos += 1
+
+    # --- value access ---
+
+    def read_value(self) -> Any:
+        """Decode and return the next complete JSON value."""
+        if self._pos >= len(self._buf) or self._buf[self._pos] in " \t\n\r":
+            self._skip_ws()
+        while True:
+            try:
+                value, end = _DECODER.raw_decode(self._buf, self._pos)
+            except json.JSONDecodeError:
+                if self._eof:
+                    raise
+                # Value continues past the buffer — grow geometrically and retry
+                self._fill(max(2 * self._available(), self._min_buffer))
+                continue
+            # A number cut at the buffer edge decodes as a shorter number
+            if not self._eof and (
+                end >= len(self._buf)
+                or (self._buf[end] in _NUMBER_TAIL and type(value) in (int, float))
+            ):
+                self._fill(self._available() + self._min_buffer)
+                continue
+            self._pos = end
+            return value
+
+    def skip_value(self) -> None:
+        """Consume the next JSON value without building Python objects."""
+        if self.peek() not in ("[", "{"):
+            self.read_value()
+            return
+
+        # Open the container by hand; flat runs must never start at depth 0
+        self._pos += 1
+        depth = 1
+        while True:
+            self._pos = _FLAT_RUN.match(self._buf, self._pos).end()
+            if self._pos >= len(self._buf):
+                if not self._fill(self._min_buffer):
+                    raise ValueError("Unexpected end of JSON stream")
+                continue
+            char = self._buf[self._pos]
+            if char in "[{":
+                depth += 1
+            elif char in "]}":
+                depth -= 1
+            elif self._fill(self._available() + self._min_buffer):
+                # String literal split across chunks — retry with more data
+                continue
+            else:
+                raise ValueError("Unterminated string in JSON stream")
+            self._pos += 1
+            if depth == 0:
+                return
+
+    def iter_array(self) -> Iterator[Any]:
+        """Yield decoded elements of the array at the current position."""
+        self._expect("[")
+        if self.peek() == "]":
+            self._pos += 1
+            return
+        while True:
+            yield self.read_value()
+            # Fast path: separator fully inside the buffer
+            match = _ARRAY_SEP.match(self._buf, self._pos)
+            if match and match.end() < len(self._buf):
+                self._pos = match.end()
+                if match.group(1) == "]":
+                    return
+                continue
+            sep = self.peek()
+            self._pos += 1
+            if sep == "]":
+                return
+            if sep != ",":
+                raise ValueError(f"Expected ',' or ']' in array, found {sep!r}")
+
+    def iter_object(self) -> Iterator[str]:
+        """Yield keys of the object at the current position.
+
+        After each key the caller must consume its value with ``read_value``,
+        ``skip_value`` or ``iter_array`` before advancing the iterator.
+        """
+        self._expect("{")
+        if self.peek() == "}":
+            self._pos += 1
+            return
+        while True:
+            key = self.read_value()
+            self._expect(":")
+            yield key
+            sep = self.peek()
+            self._pos += 1
+            if sep == "}":
+                return
+            if sep != ",":
+                raise ValueError(f"Expected ',' or '}}' in object, found {sep!r}")
+
+
+def iter_array_items(chunks: Iterable[str]) -> Iterator[Any]:
+    """Yield elements of a top-level JSON array one at a time."""
+    yield from JSONStream(chunks).iter_array()
+
+
+def tail_array(chunks: Iterable[str], n: int | None) -> list:
+    """Return the last ``n`` elements of a top-level JSON array (all if None)."""
+    return list(deque(iter_array_items(chunks), maxlen=n))
+
+
+def extract_fields(
+    chunks: Iterable[str],
+    fields: Iterable[str],
+    tails: dict[str, int | None] | None = None,
+) -> dict:
+    """Pull selected keys out of a top-level JSON object.
+
+    Args:
+        chunks: JSON text chunks (e.g. ``response.iter_text()``).
+        fields: Keys whose values are decoded in full.
+        tails: Array-valued keys mapped to how many trailing elements to keep
+            (None keeps the whole array).
+
+    Returns:
+        Dict of the keys found. Reading stops once every requested key is seen.
+    """
+    wanted = set(fields)
+    tails = tails or {}
+    remaining = wanted | set(tails)
+    result: dict = {}
+
+    stream = JSONStream(chunks)
+    for key in stream.iter_object():
+        if key in wanted:
+            result[key] = stream.read_value()
+        elif key in tails and stream.peek() == "[":
+            result[key] = list(deque(stream.iter_array(), maxlen=tails[key]))
+        else:
+            stream.skip_value()
+            continue
+        remaining.discard(key)
+        if not remaining:
+            break
+    return result
+
+
+class ObjectFeed:
+    """Push-mode decoder for the top-level members of a JSON object.
+
+    ``JSONStream`` pulls from an iterator; LLM token streams (sync or async)
+    push small deltas instead. Each ``feed`` returns the members completed
+    by that delta, so a caller can act on early keys while later ones (a
+    long rationale string) are still arriving. Text before the opening
+    brace, such as a markdown fence, is ignored.
+    """
+
+    def __init__(self) -> None:
+        self._buf = ""
+        self._pos = -1  # -1 until the opening brace is seen
+        self._key: str | None = None
+        self.fields: dict = {}
+        self.done = False
+
+    def feed(self, text: str) -> dict:
+        """Add streamed text; return members completed by it."""
+        self._buf += text
+        return self._scan(final=False)
+
+    def close(self) -> dict:
+        """Mark end of stream; a trailing number can now be decoded."""
+        return self._scan(final=True)
+
+    def _scan(self, final: bool) -> dict:
+        new: dict = {}
+        if self.done:
+            return new
+        if self._pos < 0:
+            start = self._buf.find("{")
+            if start < 0:
+                return new
+            self._pos = start + 1
+        buf = self._buf
+        while True:
+            pos = _WS.match(buf, self._pos).end()
+            if pos >= len(buf):
+                break
+            char = buf[pos]
+            if self._key is None:
+                if char in ",}":
+                    self._pos = pos + 1
+                    if char == "}":
+                        self.done = True
+                        break
+                    continue
+                try:
+                    key, end = _DECODER.raw_decode(buf, pos)
+                except json.JSONDecodeError:
+                    break
+                colon = _WS.match(buf, end).end()
+                if colon >= len(buf):
+                    break
+                if buf[colon] != ":":
+                    raise ValueError(f"Expected ':' after key {key!r}, found {buf[colon]!r}")
+                self._key = key
+                self._pos = colon + 1
+                continue
+            try:
+                value, end = _DECODER.raw_decode(buf, pos)
+            except json.JSONDecodeError:
+                break
+            # A number at the end of the buffer may still be growing
+            if (
+                type(value) in (int, float)
+                and not final
+                and (end >= len(buf) or buf[end] in _NUMBER_TAIL)
+            ):
+                break
+            self.fields[self._key] = new[self._key] = value
+            self._key = None
+            self._pos = end
+        # Keep memory bounded to the unparsed tail
+        if self._pos > 4096:
+            self._buf = self._buf[self._pos :]
+            self._pos = 0
+        return new
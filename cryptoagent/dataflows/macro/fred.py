@@ -3,44 +3,150 @@
 from __future__ import annotations
 
 import logging
-from datetime import datetime, timezone
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime, timedelta, timezone
+from typing import TYPE_CHECKING
 
 import httpx
 
+if TYPE_CHECKING:
+    from cryptoagent.dataflows.macro.fred_store import FredStore
+
 logger = logging.getLogger(__name__)
 
 _BASE_URL = "https://api.stlouisfed.org/fred/series/observations"
 _TIMEOUT = 10
 
+# Every series consumed by the getters below, synced together.
+FRED_SERIES: tuple[str, ...] = ("M2SL", "FEDFUNDS", "GS10", "GS2", "T10Y2Y")
+# The series update daily at most (most monthly); cycles in between read the store
+SYNC_MAX_AGE_S = 6 * 3600
+# Analyst nodes run in parallel; the first one syncs while the others wait
+_sync_lock = threading.Lock()
+
 
 def _fetch_series(
     api_key: str,
     series_id: str,
-    limit: int = 12,
+    limit: int | None = 12,
+    observation_start: str | None = None,
+    client: httpx.Client | None = None,
 ) -> list[dict]:
-    """Fetch recent observations for a FRED series.
+    """Fetch observations for a FRED series.
+
+    Without ``observation_start``, returns the latest ``limit`` observations,
+    newest first. With ``observation_start`` (YYYY-MM-DD), returns every
+    observation from that date onward, oldest first.
 
-    Returns list of {"date": str, "value": str} dicts, newest first.
+    Returns list of {"date": str, "value": str} dicts.
     """
-    params = {
+    params: dict = {
         "series_id": series_id,
         "api_key": api_key,
         "file_type": "json",
-        "sort_order": "desc",
-        "limit": limit,
     }
-    resp = httpx.get(_BASE_URL, params=params, timeout=_TIMEOUT)
+    if observation_start:
+        params["observation_start"] = observation_start
+        params["sort_order"] = "asc"
+    else:
+        params["sort_order"] = "desc"
+        if limit is not None:
+            params["limit"] = limit
+
+    if client is not None:
+        resp = client.get(_BASE_URL, params=params)
+    else:
+        resp = httpx.get(_BASE_URL, params=params, timeout=_TIMEOUT)
     resp.raise_for_status()
     return resp.json().get("observations", [])
 
 
-def _safe_float(value: str) -> float | None:
+def _next_day(day: str) -> str:
+    """Return the ISO date following ``day``."""
+    return (date.fromisoformat(day) + timedelta(days=1)).isoformat()
+
+
+def sync_series(
+    api_key: str,
+    store: FredStore,
+    series_ids: tuple[str, ...] | list[str] = FRED_SERIES,
+    max_age: float = SYNC_MAX_AGE_S,
+) -> dict[str, int]:
+    """Bring the local store up to date for each series, fetching concurrently.
+
+    Series synced within the last ``max_age`` seconds are skipped. Only
+    observations after the last stored date are requested. An empty store
+    triggers a one-time full-history download for that series.
+
+    Returns:
+        Mapping of each synced series ID to number of new observations
+        (-1 on fetch failure); skipped series are left out.
+    """
+    with _sync_lock:
+        now = time.time()
+        due = [
+            sid for sid in series_ids if now - (store.last_synced(sid) or 0.0) >= max_age
+        ]
+        if not due:
+            return {}
+        return _sync(api_key, store, due)
+
+
+def _sync(api_key: str, store: FredStore, series_ids: list[str]) -> dict[str, int]:
+    starts = {sid: store.latest_date(sid) for sid in series_ids}
+
+    def _fetch(series_id: str) -> list[dict]:
+        last = starts[series_id]
+        if last is None:
+            return _fetch_series(api_key, series_id, limit=None, client=client)
+        return _fetch_series(
+            api_key, series_id, observation_start=_next_day(last), client=client
+        )
+
+    written: dict[str, int] = {}
+    with httpx.Client(timeout=_TIMEOUT) as client:
+        with ThreadPoolExecutor(max_workers=len(series_ids) or 1) as pool:
+            futures = {sid: pool.submit(_fetch, sid) for sid in series_ids}
+            # Only the HTTP fetches run in the pool; store writes happen here and
+            # are serialized with other writers by the database write lock
+            for series_id, future in futures.items():
+                try:
+                    observations = future.result()
+                except Exception as e:
+                    logger.warning("FRED sync for %s failed: %s", series_id, e)
+                    written[series_id] = -1
+                    continue
+                last = starts[series_id]
+                new = [o for o in observations if last is None or o.get("date", "") > last]
+                written[series_id] = store.upsert(series_id, new)
+                store.mark_synced(series_id)
+
+    logger.info("FRED sync complete: %s", written)
+    return written
+
+
+def _observations(
+    api_key: str,
+    series_id: str,
+    limit: int,
+    store: FredStore | None = None,
+    as_of: str | None = None,
+) -> list[dict]:
+    """Latest observations newest first — from the local store when given, else FRED."""
+    if store is not None:
+        return store.get_observations(series_id, limit=limit, as_of=as_of)
+    return _fetch_series(api_key, series_id, limit=limit)
+
+
+def _safe_float(value: str | float | None) -> float | None:
     """Parse FRED value, returning None for missing data ('.')."""
-    if value in (".", ""):
+    if value is None or value in (".", ""):
         return None
     try:
         return float(value)
-    except ValueError:
+    except (TypeError, ValueError):
         return None
 
 
@@ -79,10 +185,14 @@ def _compute_trend(
     return "stable"
 
 
-def get_m2_money_supply(api_key: str) -> dict:
+def get_m2_money_supply(
+    api_key: str,
+    store: FredStore | None = None,
+    as_of: str | None = None,
+) -> dict:
     """Fetch M2 money supply (monthly, seasonally adjusted)."""
     try:
-        obs = _fetch_series(api_key, "M2SL", limit=6)
+        obs = _observations(api_key, "M2SL", 6, store, as_of)
         latest = _safe_float(obs[0]["value"]) if obs else None
         trend = _compute_trend(obs, 3, "expanding", "contracting")
         return {
@@ -98,10 +208,14 @@ def get_m2_money_supply(api_key: str) -> dict:
         return {"source": "error", "series": "M2SL", "message": str(e)}
 
 
-def get_fed_funds_rate(api_key: str) -> dict:
+def get_fed_funds_rate(
+    api_key: str,
+    store: FredStore | None = None,
+    as_of: str | None = None,
+) -> dict:
     """Fetch effective Federal Funds Rate (monthly)."""
     try:
-        obs = _fetch_series(api_key, "FEDFUNDS", limit=8)
+        obs = _observations(api_key, "FEDFUNDS", 8, store, as_of)
         latest = _safe_float(obs[0]["value"]) if obs else None
         trend = _compute_trend(obs, 6, "rising", "falling")
         return {
@@ -117,11 +231,15 @@ def get_fed_funds_rate(api_key: str) -> dict:
         return {"source": "error", "series": "FEDFUNDS", "message": str(e)}
 
 
-def get_treasury_yields(api_key: str) -> dict:
+def get_treasury_yields(
+    api_key: str,
+    store: FredStore | None = None,
+    as_of: str | None = None,
+) -> dict:
     """Fetch 10-Year and 2-Year Treasury yields."""
     try:
-        gs10 = _fetch_series(api_key, "GS10", limit=3)
-        gs2 = _fetch_series(api_key, "GS2", limit=3)
+        gs10 = _observations(api_key, "GS10", 3, store, as_of)
+        gs2 = _observations(api_key, "GS2", 3, store, as_of)
         return {
             "source": "fred",
             "ten_year": _safe_float(gs10[0]["value"]) if gs10 else None,
@@ -135,10 +253,14 @@ def get_treasury_yields(api_key: str) -> dict:
         return {"source": "error", "series": "GS10/GS2", "message": str(e)}
 
 
-def get_yield_spread(api_key: str) -> dict:
+def get_yield_spread(
+    api_key: str,
+    store: FredStore | None = None,
+    as_of: str | None = None,
+) -> dict:
     """Fetch 10Y-2Y yield spread (yield curve inversion signal)."""
     try:
-        obs = _fetch_series(api_key, "T10Y2Y", limit=3)
+        obs = _observations(api_key, "T10Y2Y", 3, store, as_of)
         latest = _safe_float(obs[0]["value"]) if obs else None
         curve_status = "unknown"
         if latest is not None:
@@ -156,14 +278,43 @@ def get_yield_spread(api_key: str) -> dict:
         return {"source": "error", "series": "T10Y2Y", "message": str(e)}
 
 
-def get_all_macro_data(api_key: str) -> dict:
-    """Aggregate all FRED macro data into a single dict."""
+def get_macro_snapshot(store: FredStore, as_of: str | None = None) -> dict:
+    """Build the macro data dict purely from the local store — no network calls.
+
+    Args:
+        store: Local FRED observation store.
+        as_of: Optional YYYY-MM-DD cutoff for historical replays and backtests.
+    """
+    snapshot = {
+        "source": "fred",
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "m2_money_supply": get_m2_money_supply("", store, as_of),
+        "fed_funds_rate": get_fed_funds_rate("", store, as_of),
+        "treasury_yields": get_treasury_yields("", store, as_of),
+        "yield_spread": get_yield_spread("", store, as_of),
+    }
+    if as_of:
+        snapshot["as_of"] = as_of
+    return snapshot
+
+
+def get_all_macro_data(api_key: str, store: FredStore | None = None) -> dict:
+    """Aggregate all FRED macro data into a single dict.
+
+    With a store, series not synced in the last ``SYNC_MAX_AGE_S`` are synced
+    incrementally (concurrently) and the getters answer from local data.
+    Without one, each getter queries FRED.
+    """
     if not api_key:
         return {
             "source": "error",
             "message": "No FRED API key configured",
         }
 
+    if store is not None:
+        sync_series(api_key, store)
+        return get_macro_snapshot(store)
+
     m2 = get_m2_money_supply(api_key)
     fed = get_fed_funds_rate(api_key)
     yields = get_treasury_yields(api_key)
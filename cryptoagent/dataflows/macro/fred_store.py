@@ -0,0 +1,114 @@
+"""Local FRED observation store — full series history kept in the app database."""
+
+from __future__ import annotations
+
+import logging
+import time
+
+from cryptoagent.dataflows.macro.fred import _safe_float
+from cryptoagent.persistence.database import Database
+
+logger = logging.getLogger(__name__)
+
+
+class FredStore:
+    """Stores FRED observations per series and serves them without network calls."""
+
+    def __init__(self, db: Database) -> None:
+        self._db = db
+
+    def latest_date(self, series_id: str) -> str | None:
+        """Return the most recent stored observation date (YYYY-MM-DD) for a series."""
+        cursor = self._db.conn.execute(
+            "SELECT MAX(date) AS last_date FROM fred_observations WHERE series_id = ?",
+            (series_id,),
+        )
+        row = cursor.fetchone()
+        return row["last_date"] if row and row["last_date"] else None
+
+    def last_synced(self, series_id: str) -> float | None:
+        """Epoch seconds of the series' last successful sync from FRED, if any."""
+        cursor = self._db.conn.execute(
+            "SELECT synced_at FROM fred_sync WHERE series_id = ?",
+            (series_id,),
+        )
+        row = cursor.fetchone()
+        return row["synced_at"] if row else None
+
+    def mark_synced(self, series_id: str) -> None:
+        """Record that the series was just synced."""
+        with self._db.transaction() as conn:
+            conn.execute(
+                """INSERT INTO fred_sync (series_id, synced_at) VALUES (?, ?)
+                   ON CONFLICT (series_id) DO UPDATE SET synced_at = excluded.synced_at""",
+                (series_id, time.time()),
+            )
+
+    def upsert(self, series_id: str, observations: list[dict]) -> int:
+        """Insert or update raw FRED observations ({"date": str, "value": str}).
+
+        Missing values ('.') are stored as NULL. Returns the number of rows written.
+        """
+        rows = [
+            (series_id, obs["date"], _safe_float(obs.get("value")))
+            for obs in observations
+            if obs.get("date")
+        ]
+        if not rows:
+            return 0
+
+        with self._db.transaction() as conn:
+            conn.executemany(
+                """INSERT INTO fred_observations (series_id, date, value)
+                   VALUES (?, ?, ?)
+                   ON CONFLICT (series_id, date) DO UPDATE SET value = excluded.value""",
+                rows,
+            )
+        logger.info("FRED store: %d observations written for %s", len(rows), series_id)
+        return len(rows)
+
+    def get_observations(
+        self,
+        series_id: str,
+        limit: int | None = None,
+        as_of: str | None = None,
+    ) -> list[dict]:
+        """Return observations newest first, in the same shape as the FRED API.
+
+        Args:
+            series_id: FRED series ID (e.g. "M2SL").
+            limit: Maximum number of observations to return (None = all).
+            as_of: Optional YYYY-MM-DD cutoff; only observations on or before it.
+        """
+        sql = "SELECT date, value FROM fred_observations WHERE series_id = ?"
+        params: list = [series_id]
+        if as_of:
+            sql += " AND date <= ?"
+            params.append(as_of)
+        sql += " ORDER BY date DESC"
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(limit)
+
+        cursor = self._db.conn.execute(sql, tuple(params))
+        return [{"date": row["date"], "value": row["value"]} for row in cursor.fetchall()]
+
+    def get_history(
+        self,
+        series_id: str,
+        start: str | None = None,
+        end: str | None = None,
+    ) -> list[tuple[str, float | None]]:
+        """Return (date, value) pairs oldest first — full history for backtests."""
+        sql = "SELECT date, value FROM fred_observations WHERE series_id = ?"
+        params: list = [series_id]
+        if start:
+            sql += " AND date >= ?"
+            params.append(start)
+        if end:
+            sql += " AND date <= ?"
+            params.append(end)
+        sql += " ORDER BY date ASC"
+
+        cursor = self._db.conn.execute(sql, tuple(params))
+        return [(row["date"], row["value"]) for row in cursor.fetchall()]
@@ -4,11 +4,21 @@ from __future__ import annotations
 
 import logging
 import re
+import threading
+import time
 import xml.etree.ElementTree as ET
+from collections.abc import Iterable, Iterator
 from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from functools import lru_cache
 
 import httpx
 
+from cryptoagent.dataflows.cache import TTLCache
+from cryptoagent.dataflows.http_cache import HttpCache
+from cryptoagent.dataflows.news.news_store import NewsStore
+from cryptoagent.dataflows.social.lexicon import classify_batch, sentiment_ratio
+
 logger = logging.getLogger(__name__)
 
 _RSS_URL = "https://cryptopanic.com/news/rss/"
@@ -16,6 +26,25 @@ _TIMEOUT = 10
 _HEADERS = {
     "User-Agent": "CryptoAgent/0.3.0 (+https://github.com/cryptoagent)",
 }
+_POLL_INTERVAL = 300  # seconds between feed fetches
+_WINDOW_HOURS = 24  # headlines older than this are not reported
+
+# Common full-name mappings
+_TOKEN_NAMES: dict[str, list[str]] = {
+    "SOL": ["solana"],
+    "BTC": ["bitcoin"],
+    "ETH": ["ethereum"],
+    "BNB": ["binance"],
+    "XRP": ["ripple"],
+    "ADA": ["cardano"],
+    "AVAX": ["avalanche"],
+    "DOT": ["polkadot"],
+    "LINK": ["chainlink"],
+    "ARB": ["arbitrum"],
+}
+
+# Parsed feed for callers without a news store
+_cache = TTLCache(_POLL_INTERVAL)
 
 
 def _sanitize_xml(xml_text: str) -> str:
@@ -27,6 +56,29 @@ def _sanitize_xml(xml_text: str) -> str:
     return cleaned
 
 
+def _item_from_element(item: ET.Element) -> dict | None:
+    """Reduce an RSS ``<item>`` to the fields we keep, keyed by GUID (or link)."""
+    title = (item.findtext("title") or "").strip()
+    if not title:
+        return None
+    link = (item.findtext("link") or "").strip()
+    pub_date = (item.findtext("pubDate") or "").strip()
+    return {
+        "id": (item.findtext("guid") or "").strip() or link or title,
+        "title": title,
+        "link": link,
+        "pub_date": pub_date,
+        "published_utc": _published_utc(pub_date),
+    }
+
+
+def _published_utc(pub_date: str) -> float:
+    try:
+        return parsedate_to_datetime(pub_date).timestamp()
+    except (TypeError, ValueError):
+        return time.time()
+
+
 def _parse_rss(xml_text: str) -> list[dict]:
     """Parse RSS XML and extract items. Tolerant of malformed feeds."""
     try:
@@ -35,76 +87,179 @@ def _parse_rss(xml_text: str) -> list[dict]:
         # Retry after sanitizing common RSS issues
         root = ET.fromstring(_sanitize_xml(xml_text))
 
-    items: list[dict] = []
+    items = (_item_from_element(item) for item in root.iter("item"))
+    return [item for item in items if item is not None]
+
 
-    for item in root.iter("item"):
-        title_el = item.find("title")
-        link_el = item.find("link")
-        pub_date_el = item.find("pubDate")
+def _iter_feed(chunks: Iterable[bytes]) -> Iterator[dict]:
+    """Parse RSS incrementally, yielding each item as soon as it closes.
 
-        if title_el is None or title_el.text is None:
-            continue
+    Finished ``<item>`` elements are cleared so the tree never holds the
+    whole feed. A malformed feed falls back to sanitizing the full document,
+    which may repeat items already yielded; callers dedupe by ``id``.
+    """
+    chunks = iter(chunks)
+    parser = ET.XMLPullParser(events=("end",))
+    received: list[bytes] = []
+    try:
+        for chunk in chunks:
+            received.append(chunk)
+            parser.feed(chunk)
+            yield from _closed_items(parser)
+        parser.close()
+        yield from _closed_items(parser)
+    except ET.ParseError:
+        document = b"".join(received) + b"".join(chunks)
+        yield from _parse_rss(document.decode("utf-8", errors="replace"))
 
-        items.append({
-            "title": title_el.text.strip(),
-            "link": link_el.text.strip() if link_el is not None and link_el.text else "",
-            "pub_date": pub_date_el.text.strip() if pub_date_el is not None and pub_date_el.text else "",
-        })
 
+def _closed_items(parser: ET.XMLPullParser) -> Iterator[dict]:
+    for _, elem in parser.read_events():
+        if elem.tag == "item":
+            item = _item_from_element(elem)
+            elem.clear()
+            if item is not None:
+                yield item
+
+
+def _fetch_feed(client: httpx.Client, http_cache: HttpCache | None = None) -> list[dict] | None:
+    """Stream and parse the feed. Returns None when the server answers 304."""
+    headers = dict(_HEADERS)
+    if http_cache is not None:
+        headers.update(http_cache.conditional_headers(_RSS_URL))
+    with client.stream("GET", _RSS_URL, headers=headers) as resp:
+        if resp.status_code == 304:
+            return None
+        resp.raise_for_status()
+        items = list({item["id"]: item for item in _iter_feed(resp.iter_bytes())}.values())
+    if http_cache is not None:
+        http_cache.store(_RSS_URL, resp)
     return items
 
 
-def _matches_token(title: str, token: str) -> bool:
-    """Check if a headline mentions the token (case-insensitive)."""
-    title_lower = title.lower()
-    token_lower = token.lower()
-
-    # Token symbol match (e.g., "SOL")
-    if f" {token_lower} " in f" {title_lower} ":
-        return True
-
-    # Common full-name mappings
-    token_names: dict[str, list[str]] = {
-        "sol": ["solana"],
-        "btc": ["bitcoin"],
-        "eth": ["ethereum"],
-        "bnb": ["binance"],
-        "xrp": ["ripple"],
-        "ada": ["cardano"],
-        "avax": ["avalanche"],
-        "dot": ["polkadot"],
-        "link": ["chainlink"],
-        "arb": ["arbitrum"],
-    }
-    for name in token_names.get(token_lower, []):
-        if name in title_lower:
-            return True
+def _load_feed() -> list[dict]:
+    with httpx.Client(timeout=_TIMEOUT, follow_redirects=True) as client:
+        return _fetch_feed(client) or []
 
-    return False
 
+class TokenMatcher:
+    """Finds every watched token a headline mentions, in one regex pass.
 
-def get_crypto_news(token: str, max_headlines: int = 10) -> dict:
+    Symbols and full names of all watched tokens are compiled into a single
+    word-bounded pattern, so matching cost does not grow with the token count.
+    """
+
+    def __init__(self, tokens: Iterable[str] = ()) -> None:
+        self.tokens = frozenset({*_TOKEN_NAMES, *(t.upper() for t in tokens)})
+        self._aliases: dict[str, str] = {}
+        for token in self.tokens:
+            self._aliases[token.lower()] = token
+            for name in _TOKEN_NAMES.get(token, []):
+                self._aliases[name] = token
+        # Longest first so a short alias never shadows a longer one at the same position
+        alternation = "|".join(re.escape(a) for a in sorted(self._aliases, key=len, reverse=True))
+        self._pattern = re.compile(rf"\b(?:{alternation})\b")
+
+    def __call__(self, title: str) -> set[str]:
+        return {self._aliases[m] for m in self._pattern.findall(title.lower())}
+
+
+@lru_cache(maxsize=32)
+def _matcher_for(token: str) -> TokenMatcher:
+    return TokenMatcher([token])
+
+
+class NewsIngestor:
+    """Polls the feed at most once per interval and keeps the news store current.
+
+    Fetches use conditional GET, items are deduplicated into the store, and
+    every watched token is matched in one pass at ingest time.
+    """
+
+    def __init__(
+        self,
+        store: NewsStore,
+        http_cache: HttpCache,
+        tokens: Iterable[str] = (),
+        poll_interval: float = _POLL_INTERVAL,
+    ) -> None:
+        self.store = store
+        self._http_cache = http_cache
+        self._poll_interval = poll_interval
+        self._matcher = TokenMatcher()
+        self._lock = threading.Lock()
+        self.watch(tokens)
+
+    def watch(self, tokens: Iterable[str]) -> None:
+        """Add tokens to the matcher, indexing already-stored items for them."""
+        added = {t.upper() for t in tokens} - self._matcher.tokens
+        if not added:
+            return
+        with self._lock:
+            self._matcher = TokenMatcher(self._matcher.tokens | added)
+            self.store.reindex(added, self._matcher)
+
+    def refresh(self) -> int:
+        """Fetch the feed unless polled within the interval. Returns the count of new items."""
+        with self._lock:
+            if self._http_cache.is_fresh(_RSS_URL, self._poll_interval):
+                return 0
+            with httpx.Client(timeout=_TIMEOUT, follow_redirects=True) as client:
+                items = _fetch_feed(client, self._http_cache)
+            if items is None:
+                logger.info("CryptoPanic feed not modified")
+                self._http_cache.touch(_RSS_URL)
+                return 0
+            return len(self.store.add(items, self._matcher))
+
+
+def get_crypto_news(
+    token: str,
+    max_headlines: int = 10,
+    ingestor: NewsIngestor | None = None,
+) -> dict:
     """Fetch crypto news from CryptoPanic RSS, optionally filtered by token.
 
     Args:
         token: Token symbol to filter headlines (e.g., "SOL").
         max_headlines: Maximum number of headlines to return.
+        ingestor: When given, headlines are read from its local store (kept
+            current with at most one conditional fetch per poll interval)
+            and limited to the last ``_WINDOW_HOURS`` hours.
 
     Returns:
         Dict with source, headlines list, and total_count.
     """
     try:
-        resp = httpx.get(_RSS_URL, headers=_HEADERS, timeout=_TIMEOUT)
-        resp.raise_for_status()
-
-        all_items = _parse_rss(resp.text)
-
-        # Filter by token mention
-        filtered = [item for item in all_items if _matches_token(item["title"], token)]
+        if ingestor is not None:
+            ingestor.watch([token])
+            ingestor.refresh()
+            since = time.time() - _WINDOW_HOURS * 3600
+            headlines = ingestor.store.headlines(token, max_headlines, since)
+            filtered_only = bool(headlines)
+            if filtered_only:
+                total = ingestor.store.count(token, since)
+            else:
+                headlines = ingestor.store.headlines(None, max_headlines, since)
+                total = ingestor.store.count(None, since)
+        else:
+            all_items = _cache.get_or_load("feed", _load_feed)
+            match = _matcher_for(token.upper())
+            filtered = [item for item in all_items if token.upper() in match(item["title"])]
+            # If no token-specific news, return all headlines
+            filtered_only = bool(filtered)
+            pool = filtered if filtered_only else all_items
+            total = len(pool)
+            headlines = [
+                {k: item[k] for k in ("title", "link", "pub_date")}
+                for item in pool[:max_headlines]
+            ]
 
-        # If no token-specific news, return all headlines
-        headlines = filtered[:max_headlines] if filtered else all_items[:max_headlines]
-        filtered_only = bool(filtered)
+        labels = classify_batch(
+            [h["title"] for h in headlines],
+            ids=[f"news:{h['link']}" if h["link"] else None for h in headlines],
+        )
+        headlines = [{**h, "sentiment": label} for h, label in zip(headlines, labels)]
 
         return {
             "source": "cryptopanic",
@@ -112,7 +267,8 @@ def get_crypto_news(token: str, max_headlines: int = 10) -> dict:
             "token_filter": token.upper(),
             "token_specific": filtered_only,
             "headlines": headlines,
-            "total_count": len(filtered) if filtered_only else len(all_items),
+            "headline_sentiment_ratio": sentiment_ratio(labels),
+            "total_count": total,
         }
     except Exception as e:
         logger.warning("CryptoPanic RSS fetch failed: %s", e)
@@ -0,0 +1,124 @@
+"""Local news store — deduplicated headlines with a per-token index."""
+
+from __future__ import annotations
+
+import logging
+from collections.abc import Callable, Iterable
+from datetime import datetime, timezone
+
+from cryptoagent.persistence.database import Database
+
+logger = logging.getLogger(__name__)
+
+
+class NewsStore:
+    """Persists feed items keyed by GUID (or link) and indexes them by token.
+
+    Token matching happens once, when an item is first stored, so per-token
+    lookups are index reads rather than scans over every headline.
+    """
+
+    def __init__(self, db: Database) -> None:
+        self._db = db
+
+    def add(self, items: list[dict], match: Callable[[str], set[str]]) -> list[dict]:
+        """Store unseen items and index them by the tokens ``match`` finds in their title.
+
+        Items must carry ``id``, ``title``, ``link``, ``pub_date`` and
+        ``published_utc``. Returns the items that were new.
+        """
+        if not items:
+            return []
+
+        unique = {item["id"]: item for item in items}
+        ids = list(unique)
+        placeholders = ",".join("?" * len(ids))
+        cursor = self._db.conn.execute(
+            f"SELECT id FROM news_items WHERE id IN ({placeholders})",
+            tuple(ids),
+        )
+        known = {row["id"] for row in cursor.fetchall()}
+        new_items = [item for item_id, item in unique.items() if item_id not in known]
+        if not new_items:
+            return []
+
+        now = datetime.now(timezone.utc).isoformat()
+        with self._db.transaction() as conn:
+            conn.executemany(
+                """INSERT INTO news_items (id, title, link, pub_date, published_utc, first_seen)
+                   VALUES (?, ?, ?, ?, ?, ?)
+                   ON CONFLICT (id) DO NOTHING""",
+                [
+                    (i["id"], i["title"], i["link"], i["pub_date"], i["published_utc"], now)
+                    for i in new_items
+                ],
+            )
+            self._insert_tokens(
+                (token, i["id"], i["published_utc"])
+                for i in new_items
+                for token in match(i["title"])
+            )
+        logger.info("News store: %d new items", len(new_items))
+        return new_items
+
+    def reindex(self, tokens: set[str], match: Callable[[str], set[str]]) -> None:
+        """Index already-stored items for newly watched ``tokens``."""
+        if not tokens:
+            return
+        cursor = self._db.conn.execute("SELECT id, title, published_utc FROM news_items")
+        with self._db.transaction():
+            self._insert_tokens(
+                (token, row["id"], row["published_utc"])
+                for row in cursor.fetchall()
+                for token in match(row["title"]) & tokens
+            )
+
+    def _insert_tokens(self, rows: Iterable[tuple[str, str, float]]) -> None:
+        rows = list(rows)
+        if rows:
+            self._db.conn.executemany(
+                """INSERT INTO news_tokens (token, item_id, published_utc) VALUES (?, ?, ?)
+                   ON CONFLICT (token, item_id) DO NOTHING""",
+                rows,
+            )
+
+    def headlines(
+        self,
+        token: str | None = None,
+        limit: int = 10,
+        since_utc: float = 0,
+    ) -> list[dict]:
+        """Most recent headlines published at or after ``since_utc``.
+
+        With ``token``, only headlines mentioning it (read from the token index).
+        """
+        if token is None:
+            cursor = self._db.conn.execute(
+                """SELECT title, link, pub_date FROM news_items
+                   WHERE published_utc >= ?
+                   ORDER BY published_utc DESC LIMIT ?""",
+                (since_utc, limit),
+            )
+        else:
+            cursor = self._db.conn.execute(
+                """SELECT i.title, i.link, i.pub_date
+                   FROM news_tokens t JOIN news_items i ON i.id = t.item_id
+                   WHERE t.token = ? AND t.published_utc >= ?
+                   ORDER BY t.published_utc DESC LIMIT ?""",
+                (token.upper(), since_utc, limit),
+            )
+        return [dict(row) for row in cursor.fetchall()]
+
+    def count(self, token: str | None = None, since_utc: float = 0) -> int:
+        """Number of items published at or after ``since_utc``, optionally for one token."""
+        if token is None:
+            row = self._db.conn.execute(
+                "SELECT COUNT(*) AS n FROM news_items WHERE published_utc >= ?",
+                (since_utc,),
+            ).fetchone()
+        else:
+            row = self._db.conn.execute(
+                "SELECT COUNT(*) AS n FROM news_tokens WHERE token = ? AND published_utc >= ?",
+                (token.upper(), since_utc),
+            ).fetchone()
+        return row["n"]
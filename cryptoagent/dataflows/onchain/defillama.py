@@ -1,4 +1,4 @@
-"""DeFiLlama API — TVL, DEX volume, fees for Solana ecosystem."""
+"""DeFiLlama API — chain-level TVL, DEX volume, and fees for any tracked chain."""
 
 from __future__ import annotations
 
@@ -7,122 +7,281 @@ from datetime import datetime, timezone
 
 import httpx
 
+from cryptoagent.dataflows.cache import TTLCache
+from cryptoagent.dataflows.jsonstream import iter_array_items, tail_array
+from cryptoagent.dataflows.onchain.tvl_store import CHAIN, TvlStore, epoch_to_date
+
 logger = logging.getLogger(__name__)
 
 _TIMEOUT = 10
+_CACHE_TTL = 300  # seconds — one cycle batch shares each response
+
+# Maps token symbols to the DeFiLlama chain whose activity they track.
+# Protocol tokens map to the chain they primarily live on.
+_TOKEN_CHAINS: dict[str, str] = {
+    "SOL": "Solana",
+    "ETH": "Ethereum",
+    "BTC": "Bitcoin",
+    "ARB": "Arbitrum",
+    "OP": "Optimism",
+    "AVAX": "Avalanche",
+    "BNB": "BSC",
+    "POL": "Polygon",
+    "MATIC": "Polygon",
+    "SUI": "Sui",
+    "APT": "Aptos",
+    "NEAR": "Near",
+    "TRX": "Tron",
+    "TON": "TON",
+    "ADA": "Cardano",
+    "SEI": "Sei",
+    "INJ": "Injective",
+    "AAVE": "Ethereum",
+    "UNI": "Ethereum",
+    "LINK": "Ethereum",
+    "MKR": "Ethereum",
+    "PENDLE": "Ethereum",
+    "SNX": "Ethereum",
+    "GMX": "Arbitrum",
+}
+
+# One cache for every DeFiLlama response, keyed by (endpoint, base_url, chain).
+_cache = TTLCache(ttl_seconds=_CACHE_TTL)
+
+
+def chain_for_token(token: str) -> str | None:
+    """Return the DeFiLlama chain name for a token, or None if unmapped."""
+    return _TOKEN_CHAINS.get(token.upper())
+
+
+def _fetch_all_chains(base_url: str) -> dict[str, dict]:
+    """Stream /v2/chains once, keeping only the fields we use, keyed by lowercase name."""
+    chains: dict[str, dict] = {}
+    with httpx.Client(timeout=_TIMEOUT) as client:
+        with client.stream("GET", f"{base_url}/v2/chains") as resp:
+            resp.raise_for_status()
+            for entry in iter_array_items(resp.iter_text()):
+                name = entry.get("name", "")
+                if name:
+                    chains[name.lower()] = {
+                        "name": name,
+                        "tvl": entry.get("tvl", 0),
+                        "token_symbol": entry.get("tokenSymbol"),
+                    }
+    logger.info("DeFiLlama: loaded TVL for %d chains", len(chains))
+    return chains
 
 
-def get_chain_tvl(base_url: str = "https://api.llama.fi") -> dict:
-    """Fetch current TVL for Solana from DeFiLlama.
+def get_all_chain_tvls(base_url: str = "https://api.llama.fi") -> dict[str, dict]:
+    """Current TVL for every chain from a single (cached) /v2/chains response.
 
-    Returns dict with tvl, tvl_change_1d, top protocols, or error dict.
+    Returns a dict keyed by lowercase chain name, or an empty dict on failure.
     """
     try:
-        with httpx.Client(timeout=_TIMEOUT) as client:
-            # Current TVL for all chains
-            resp = client.get(f"{base_url}/v2/chains")
-            resp.raise_for_status()
-            chains = resp.json()
-
-            solana = next((c for c in chains if c.get("name", "").lower() == "solana"), None)
-            if solana is None:
-                return {"source": "error", "message": "Solana not found in chains list"}
-
-            return {
-                "source": "defillama",
-                "timestamp": datetime.now(timezone.utc).isoformat(),
-                "tvl": solana.get("tvl", 0),
-                "token_symbol": solana.get("tokenSymbol", "SOL"),
-            }
+        return _cache.get_or_load(("chains", base_url, None), lambda: _fetch_all_chains(base_url))
     except Exception as e:
-        logger.warning("DeFiLlama chain TVL failed: %s", e)
-        return {"source": "error", "message": str(e)}
+        logger.warning("DeFiLlama chains list failed: %s", e)
+        return {}
 
 
-def get_chain_tvl_history(base_url: str = "https://api.llama.fi") -> dict:
-    """Fetch TVL history for Solana (last 7 data points)."""
-    try:
-        with httpx.Client(timeout=_TIMEOUT) as client:
-            resp = client.get(f"{base_url}/v2/historicalChainTvl/Solana")
+def get_chain_tvl(base_url: str = "https://api.llama.fi", chain: str = "Solana") -> dict:
+    """Fetch current TVL for a chain from DeFiLlama.
+
+    Returns dict with tvl and token symbol, or error dict.
+    """
+    chains = get_all_chain_tvls(base_url)
+    if not chains:
+        return {"source": "error", "message": "DeFiLlama chains list unavailable"}
+
+    entry = chains.get(chain.lower())
+    if entry is None:
+        return {"source": "error", "message": f"{chain} not found in chains list"}
+
+    return {
+        "source": "defillama",
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "chain": entry["name"],
+        "tvl": entry["tvl"],
+        "token_symbol": entry["token_symbol"],
+    }
+
+
+def _fetch_tvl_history(base_url: str, chain: str) -> dict:
+    with httpx.Client(timeout=_TIMEOUT) as client:
+        with client.stream("GET", f"{base_url}/v2/historicalChainTvl/{chain}") as resp:
             resp.raise_for_status()
-            data = resp.json()
-
-            # Take last 7 entries
-            recent = data[-7:] if len(data) >= 7 else data
-            tvl_values = [entry.get("tvl", 0) for entry in recent]
-
-            if len(tvl_values) >= 2:
-                change_pct = ((tvl_values[-1] - tvl_values[0]) / tvl_values[0]) * 100 if tvl_values[0] else 0
-            else:
-                change_pct = 0
-
-            return {
-                "source": "defillama",
-                "tvl_7d_history": tvl_values,
-                "tvl_7d_change_pct": round(change_pct, 2),
-            }
+            # Keep only the last 7 entries while parsing
+            recent = tail_array(resp.iter_text(), 7)
+
+    tvl_values = [entry.get("tvl", 0) for entry in recent]
+
+    if len(tvl_values) >= 2:
+        change_pct = ((tvl_values[-1] - tvl_values[0]) / tvl_values[0]) * 100 if tvl_values[0] else 0
+    else:
+        change_pct = 0
+
+    return {
+        "source": "defillama",
+        "chain": chain,
+        "tvl_7d_history": tvl_values,
+        "tvl_7d_change_pct": round(change_pct, 2),
+    }
+
+
+def _sync_tvl_history(base_url: str, chain: str, store: TvlStore) -> bool:
+    """Append new daily points for a chain to the store (at most once a day)."""
+    if store.synced_today(CHAIN, chain):
+        return True
+    # Only the trailing points past our latest stored day are kept while parsing
+    keep = store.missing_days(CHAIN, chain)
+    with httpx.Client(timeout=_TIMEOUT) as client:
+        with client.stream("GET", f"{base_url}/v2/historicalChainTvl/{chain}") as resp:
+            resp.raise_for_status()
+            recent = tail_array(resp.iter_text(), keep)
+
+    store.append(
+        CHAIN, chain, [(epoch_to_date(e["date"]), e.get("tvl")) for e in recent if "date" in e]
+    )
+    store.mark_synced(CHAIN, chain)
+    return True
+
+
+def _tvl_history_from_store(chain: str, store: TvlStore) -> dict:
+    history = store.get_history(CHAIN, chain)
+    if not history:
+        return {"source": "error", "message": f"No stored TVL history for {chain}"}
+    stats = store.window_stats(CHAIN, chain)
+    return {
+        "source": "defillama",
+        "chain": chain,
+        "tvl_7d_history": [tvl for _, tvl in history[-7:]],
+        **stats,
+        "tvl_7d_change_pct": stats.get("tvl_7d_change_pct") or 0,
+    }
+
+
+def get_chain_tvl_history(
+    base_url: str = "https://api.llama.fi",
+    chain: str = "Solana",
+    store: TvlStore | None = None,
+) -> dict:
+    """Fetch TVL history for a chain (last 7 data points).
+
+    With a ``store``, only new daily points are downloaded and appended, and
+    1d/7d/30d/90d change and volatility are computed from local history.
+    """
+    if store is not None:
+        try:
+            _cache.get_or_load(
+                ("tvl_sync", base_url, chain), lambda: _sync_tvl_history(base_url, chain, store)
+            )
+        except Exception as e:
+            # Serve whatever is stored; the next call retries the sync
+            logger.warning("DeFiLlama TVL history sync for %s failed: %s", chain, e)
+        return _tvl_history_from_store(chain, store)
+
+    try:
+        return _cache.get_or_load(
+            ("tvl_history", base_url, chain), lambda: _fetch_tvl_history(base_url, chain)
+        )
     except Exception as e:
-        logger.warning("DeFiLlama TVL history failed: %s", e)
+        logger.warning("DeFiLlama TVL history for %s failed: %s", chain, e)
         return {"source": "error", "message": str(e)}
 
 
-def get_dex_volume(base_url: str = "https://api.llama.fi") -> dict:
-    """Fetch 24h DEX trading volume for Solana."""
+def _fetch_dex_volume(base_url: str, chain: str) -> dict:
+    with httpx.Client(timeout=_TIMEOUT) as client:
+        resp = client.get(
+            f"{base_url}/overview/dexs/{chain.lower()}",
+            params={
+                "excludeTotalDataChart": "true",
+                "excludeTotalDataChartBreakdown": "true",
+                "dataType": "dailyVolume",
+            },
+        )
+        resp.raise_for_status()
+        data = resp.json()
+
+    total_24h = data.get("total24h", 0)
+    change_1d = data.get("change_1d", 0)
+
+    # Top protocols by volume
+    protocols = data.get("protocols", [])
+    top_protocols = [
+        {"name": p.get("name", ""), "volume_24h": p.get("total24h", 0)}
+        for p in sorted(protocols, key=lambda x: x.get("total24h") or 0, reverse=True)[:5]
+    ]
+
+    return {
+        "source": "defillama",
+        "chain": chain,
+        "dex_volume_24h": total_24h,
+        "dex_volume_change_1d_pct": change_1d,
+        "top_dex_protocols": top_protocols,
+    }
+
+
+def get_dex_volume(base_url: str = "https://api.llama.fi", chain: str = "Solana") -> dict:
+    """Fetch 24h DEX trading volume for a chain."""
     try:
-        with httpx.Client(timeout=_TIMEOUT) as client:
-            resp = client.get("https://api.llama.fi/overview/dexs/solana?excludeTotalDataChart=true&excludeTotalDataChartBreakdown=true&dataType=dailyVolume")
-            resp.raise_for_status()
-            data = resp.json()
-
-            total_24h = data.get("total24h", 0)
-            change_1d = data.get("change_1d", 0)
-
-            # Top protocols by volume
-            protocols = data.get("protocols", [])
-            top_protocols = [
-                {"name": p.get("name", ""), "volume_24h": p.get("total24h", 0)}
-                for p in sorted(protocols, key=lambda x: x.get("total24h") or 0, reverse=True)[:5]
-            ]
-
-            return {
-                "source": "defillama",
-                "dex_volume_24h": total_24h,
-                "dex_volume_change_1d_pct": change_1d,
-                "top_dex_protocols": top_protocols,
-            }
+        return _cache.get_or_load(
+            ("dex_volume", base_url, chain), lambda: _fetch_dex_volume(base_url, chain)
+        )
     except Exception as e:
-        logger.warning("DeFiLlama DEX volume failed: %s", e)
+        logger.warning("DeFiLlama DEX volume for %s failed: %s", chain, e)
         return {"source": "error", "message": str(e)}
 
 
-def get_fees(base_url: str = "https://api.llama.fi") -> dict:
-    """Fetch 24h fee data for Solana chain."""
-    try:
-        with httpx.Client(timeout=_TIMEOUT) as client:
-            resp = client.get("https://api.llama.fi/overview/fees/solana?excludeTotalDataChart=true&excludeTotalDataChartBreakdown=true&dataType=dailyFees")
-            resp.raise_for_status()
-            data = resp.json()
+def _fetch_fees(base_url: str, chain: str) -> dict:
+    with httpx.Client(timeout=_TIMEOUT) as client:
+        resp = client.get(
+            f"{base_url}/overview/fees/{chain.lower()}",
+            params={
+                "excludeTotalDataChart": "true",
+                "excludeTotalDataChartBreakdown": "true",
+                "dataType": "dailyFees",
+            },
+        )
+        resp.raise_for_status()
+        data = resp.json()
 
-            return {
-                "source": "defillama",
-                "fees_24h": data.get("total24h", 0),
-                "fees_change_1d_pct": data.get("change_1d", 0),
-            }
+    return {
+        "source": "defillama",
+        "chain": chain,
+        "fees_24h": data.get("total24h", 0),
+        "fees_change_1d_pct": data.get("change_1d", 0),
+    }
+
+
+def get_fees(base_url: str = "https://api.llama.fi", chain: str = "Solana") -> dict:
+    """Fetch 24h fee data for a chain."""
+    try:
+        return _cache.get_or_load(("fees", base_url, chain), lambda: _fetch_fees(base_url, chain))
     except Exception as e:
-        logger.warning("DeFiLlama fees failed: %s", e)
+        logger.warning("DeFiLlama fees for %s failed: %s", chain, e)
         return {"source": "error", "message": str(e)}
 
 
-def get_all_onchain_data(base_url: str = "https://api.llama.fi") -> dict:
-    """Aggregate all DeFiLlama data into a single dict."""
-    tvl = get_chain_tvl(base_url)
-    tvl_history = get_chain_tvl_history(base_url)
-    dex = get_dex_volume(base_url)
-    fees = get_fees(base_url)
+def get_all_onchain_data(
+    base_url: str = "https://api.llama.fi",
+    chain: str = "Solana",
+    store: TvlStore | None = None,
+) -> dict:
+    """Aggregate all DeFiLlama data for a chain into a single dict.
+
+    Responses are cached per chain, so tokens sharing a chain (and every
+    token's chain TVL) cost one request per cache window. With a ``store``,
+    TVL history is served from the local time series.
+    """
+    tvl = get_chain_tvl(base_url, chain)
+    tvl_history = get_chain_tvl_history(base_url, chain, store)
+    dex = get_dex_volume(base_url, chain)
+    fees = get_fees(base_url, chain)
 
     return {
         "source": "defillama",
         "timestamp": datetime.now(timezone.utc).isoformat(),
+        "chain": chain,
         "tvl": tvl,
         "tvl_history": tvl_history,
         "dex_volume": dex,
@@ -3,38 +3,86 @@
 from __future__ import annotations
 
 import logging
-from datetime import datetime, timezone
+from datetime import date, datetime, timezone
 
 import httpx
 
+from cryptoagent.dataflows.onchain.fear_greed_store import FearGreedStore
+
 logger = logging.getLogger(__name__)
 
 _TIMEOUT = 10
 _URL = "https://api.alternative.me/fng/"
 
 
-def get_fear_greed_index() -> dict:
+def _fetch(limit: int) -> list[dict]:
+    """Fetch the ``limit`` most recent daily entries (0 = full history), newest first."""
+    with httpx.Client(timeout=_TIMEOUT) as client:
+        resp = client.get(_URL, params={"limit": limit})
+        resp.raise_for_status()
+        return resp.json().get("data", [])
+
+
+def sync_fear_greed(store: FearGreedStore) -> int:
+    """Bring the local series up to date. Returns the number of days written.
+
+    An empty store is bulk-loaded with the full history in one request;
+    afterwards only the days since the last stored date are requested, and
+    nothing is requested once today's value is stored.
+    """
+    today = datetime.now(timezone.utc).date()
+    last = store.latest_date()
+    if last is None:
+        limit = 0
+    else:
+        missing = (today - date.fromisoformat(last)).days
+        if missing <= 0:
+            return 0
+        limit = missing + 1  # overlap one day in case the last value was revised
+    return store.upsert(_fetch(limit))
+
+
+def _result(value: int, classification: str, **extra) -> dict:
+    return {
+        "source": "alternative.me",
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "value": value,
+        "classification": classification,
+        **extra,
+    }
+
+
+def get_fear_greed_index(
+    store: FearGreedStore | None = None,
+    as_of: str | None = None,
+) -> dict:
     """Fetch the current Crypto Fear & Greed Index (0-100).
 
     0 = Extreme Fear, 100 = Extreme Greed.
     Returns dict with value, label, and timestamp.
+
+    With a ``store``, the local series is synced (at most once a day) and the
+    value is read from it; ``as_of`` (YYYY-MM-DD) reads a historical value
+    with no network access, for replays.
     """
     try:
-        with httpx.Client(timeout=_TIMEOUT) as client:
-            resp = client.get(_URL, params={"limit": 1})
-            resp.raise_for_status()
-            data = resp.json()
-
-        entry = data.get("data", [{}])[0]
-        value = int(entry.get("value", 50))
-        classification = entry.get("value_classification", "Neutral")
-
-        return {
-            "source": "alternative.me",
-            "timestamp": datetime.now(timezone.utc).isoformat(),
-            "value": value,
-            "classification": classification,
-        }
+        if store is None:
+            entry = _fetch(1)[0]
+            return _result(
+                int(entry.get("value", 50)),
+                entry.get("value_classification", "Neutral"),
+            )
+
+        if as_of is None:
+            try:
+                sync_fear_greed(store)
+            except Exception as e:
+                # Serve the last stored value if the API is down
+                logger.warning("Fear & Greed sync failed: %s", e)
+        entry = store.value_at(as_of)
+        if entry is None:
+            return {"source": "error", "message": "No Fear & Greed data stored"}
+        return _result(entry["value"], entry["classification"], date=entry["date"])
     except Exception as e:
         logger.warning("Fear & Greed Index failed: %s", e)
         return {"source": "error", "message": str(e)}
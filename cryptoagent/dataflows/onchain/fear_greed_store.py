@@ -0,0 +1,86 @@
+"""Local Fear & Greed store — full daily index history kept in the app database."""
+
+from __future__ import annotations
+
+import logging
+from datetime import datetime, timezone
+
+from cryptoagent.persistence.database import Database
+
+logger = logging.getLogger(__name__)
+
+
+class FearGreedStore:
+    """Stores the daily Fear & Greed Index and serves it without network calls."""
+
+    def __init__(self, db: Database) -> None:
+        self._db = db
+
+    def latest_date(self) -> str | None:
+        """Return the most recent stored date (YYYY-MM-DD), or None if empty."""
+        row = self._db.conn.execute("SELECT MAX(date) AS last_date FROM fear_greed").fetchone()
+        return row["last_date"] if row and row["last_date"] else None
+
+    def upsert(self, entries: list[dict]) -> int:
+        """Insert or update raw API entries ({"value", "value_classification", "timestamp"}).
+
+        ``timestamp`` is the entry's UTC epoch seconds. Returns the number of rows written.
+        """
+        rows = []
+        for entry in entries:
+            try:
+                day = _epoch_to_date(entry["timestamp"])
+                value = int(entry["value"])
+            except (KeyError, TypeError, ValueError):
+                continue
+            rows.append((day, value, entry.get("value_classification", "")))
+        if not rows:
+            return 0
+
+        with self._db.transaction() as conn:
+            conn.executemany(
+                """INSERT INTO fear_greed (date, value, classification)
+                   VALUES (?, ?, ?)
+                   ON CONFLICT (date) DO UPDATE SET
+                       value = excluded.value,
+                       classification = excluded.classification""",
+                rows,
+            )
+        logger.info("Fear & Greed store: %d days written", len(rows))
+        return len(rows)
+
+    def value_at(self, as_of: str | None = None) -> dict | None:
+        """Return the latest entry on or before ``as_of`` (YYYY-MM-DD), or None.
+
+        The result is ``{"date", "value", "classification"}``.
+        """
+        sql = "SELECT date, value, classification FROM fear_greed"
+        params: tuple = ()
+        if as_of:
+            sql += " WHERE date <= ?"
+            params = (as_of,)
+        row = self._db.conn.execute(sql + " ORDER BY date DESC LIMIT 1", params).fetchone()
+        return dict(row) if row is not None else None
+
+    def get_history(
+        self,
+        start: str | None = None,
+        end: str | None = None,
+    ) -> list[tuple[str, int]]:
+        """Return (date, value) pairs oldest first — full history for backtests."""
+        sql = "SELECT date, value FROM fear_greed WHERE 1 = 1"
+        params: list = []
+        if start:
+            sql += " AND date >= ?"
+            params.append(start)
+        if end:
+            sql += " AND date <= ?"
+            params.append(end)
+        sql += " ORDER BY date ASC"
+
+        cursor = self._db.conn.execute(sql, tuple(params))
+        return [(row["date"], row["value"]) for row in cursor.fetchall()]
+
+
+def _epoch_to_date(timestamp: str | int) -> str:
+    return datetime.fromtimestamp(int(timestamp), tz=timezone.utc).strftime("%Y-%m-%d")
@@ -2,14 +2,23 @@
 
 from __future__ import annotations
 
+import itertools
 import logging
+import threading
+from collections.abc import Sequence
 from datetime import datetime, timezone
+from typing import TYPE_CHECKING, Any
 
 import httpx
 
+if TYPE_CHECKING:
+    from cryptoagent.dataflows.onchain.whale_tracker import WhaleTracker
+
 logger = logging.getLogger(__name__)
 
 _TIMEOUT = 10
+_MAX_BATCH = 100  # calls per HTTP request; public endpoints reject very large batches
+_MAX_DETAILS = 10  # most active addresses listed in the whale summary
 
 # Known high-value Solana addresses for whale tracking
 _WHALE_ADDRESSES = [
@@ -17,51 +26,176 @@ _WHALE_ADDRESSES = [
 ]
 
 
-def _rpc_call(url: str, method: str, params: list | None = None) -> dict:
-    """Make a JSON-RPC call to the Solana RPC endpoint."""
-    payload = {
-        "jsonrpc": "2.0",
-        "id": 1,
-        "method": method,
-        "params": params or [],
-    }
-    with httpx.Client(timeout=_TIMEOUT) as client:
-        resp = client.post(url, json=payload)
-        resp.raise_for_status()
-        return resp.json()
+class RpcError(Exception):
+    """A JSON-RPC call failed (error object in the response or no response)."""
 
 
-def get_network_tps(rpc_url: str = "https://api.mainnet-beta.solana.com") -> dict:
-    """Fetch recent network TPS from performance samples.
+class SolanaRpcClient:
+    """JSON-RPC client with a pooled connection and batched calls.
 
-    Uses getRecentPerformanceSamples to compute average TPS.
+    ``batch`` packs many calls into as few HTTP requests as possible and
+    demultiplexes the responses by id, so per-call results come back in
+    request order regardless of how the server orders them.
     """
-    try:
-        result = _rpc_call(rpc_url, "getRecentPerformanceSamples", [5])
-        samples = result.get("result", [])
 
-        if not samples:
-            return {"source": "error", "message": "No performance samples returned"}
+    def __init__(
+        self,
+        url: str,
+        max_batch: int = _MAX_BATCH,
+        client: httpx.Client | None = None,
+    ) -> None:
+        self.url = url
+        self._max_batch = max_batch
+        self._client = client or httpx.Client(timeout=_TIMEOUT)
+        self._ids = itertools.count(1)
+        self._id_lock = threading.Lock()
 
-        tps_values = []
-        for s in samples:
-            num_txs = s.get("numTransactions", 0)
-            slot_time = s.get("samplePeriodSecs", 60)
-            if slot_time > 0:
-                tps_values.append(num_txs / slot_time)
+    def _next_id(self) -> int:
+        with self._id_lock:
+            return next(self._ids)
 
-        avg_tps = sum(tps_values) / len(tps_values) if tps_values else 0
+    def call(self, method: str, params: list | None = None) -> Any:
+        """Make a single JSON-RPC call and return its ``result``."""
+        result = self.batch([(method, params)])[0]
+        if isinstance(result, RpcError):
+            raise result
+        return result
 
-        return {
-            "source": "solana_rpc",
-            "timestamp": datetime.now(timezone.utc).isoformat(),
-            "avg_tps": round(avg_tps, 0),
-            "samples": len(samples),
-            "tps_range": {
-                "min": round(min(tps_values), 0) if tps_values else 0,
-                "max": round(max(tps_values), 0) if tps_values else 0,
-            },
-        }
+    def batch(self, calls: Sequence[tuple[str, list | None]]) -> list[Any]:
+        """Run ``(method, params)`` calls as JSON-RPC batches.
+
+        Returns one entry per call, in order: the call's ``result``, or an
+        ``RpcError`` instance for calls that failed individually. Transport
+        errors and rejected batches raise.
+        """
+        results: list[Any] = []
+        for start in range(0, len(calls), self._max_batch):
+            results.extend(self._send(calls[start : start + self._max_batch]))
+        return results
+
+    def _send(self, calls: Sequence[tuple[str, list | None]]) -> list[Any]:
+        ids = [self._next_id() for _ in calls]
+        payload = [
+            {"jsonrpc": "2.0", "id": call_id, "method": method, "params": params or []}
+            for call_id, (method, params) in zip(ids, calls)
+        ]
+        resp = self._client.post(self.url, json=payload)
+        resp.raise_for_status()
+        body = resp.json()
+        if not isinstance(body, list):
+            # Servers answer a rejected batch with a single error object
+            message = body.get("error", {}).get("message", "unexpected response")
+            raise RpcError(f"Batch rejected: {message}")
+
+        by_id = {item.get("id"): item for item in body if isinstance(item, dict)}
+        out: list[Any] = []
+        for call_id, (method, _) in zip(ids, calls):
+            item = by_id.get(call_id)
+            if item is None:
+                out.append(RpcError(f"{method}: no response"))
+            elif "error" in item:
+                out.append(RpcError(f"{method}: {item['error'].get('message', item['error'])}"))
+            else:
+                out.append(item.get("result"))
+        return out
+
+    def close(self) -> None:
+        self._client.close()
+
+
+_clients: dict[str, SolanaRpcClient] = {}
+_clients_lock = threading.Lock()
+
+
+def get_client(rpc_url: str) -> SolanaRpcClient:
+    """Return the shared client for an RPC URL (connections are reused across calls)."""
+    with _clients_lock:
+        client = _clients.get(rpc_url)
+        if client is None:
+            client = _clients[rpc_url] = SolanaRpcClient(rpc_url)
+        return client
+
+
+def _perf_samples_call() -> tuple[str, list]:
+    return ("getRecentPerformanceSamples", [5])
+
+
+def _signatures_call(address: str) -> tuple[str, list]:
+    return ("getSignaturesForAddress", [address, {"limit": 5}])
+
+
+def _summarize_tps(samples: Any) -> dict:
+    if isinstance(samples, RpcError):
+        raise samples
+    if not samples:
+        return {"source": "error", "message": "No performance samples returned"}
+
+    tps_values = []
+    for s in samples:
+        num_txs = s.get("numTransactions", 0)
+        slot_time = s.get("samplePeriodSecs", 60)
+        if slot_time > 0:
+            tps_values.append(num_txs / slot_time)
+
+    avg_tps = sum(tps_values) / len(tps_values) if tps_values else 0
+
+    return {
+        "source": "solana_rpc",
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "avg_tps": round(avg_tps, 0),
+        "samples": len(samples),
+        "tps_range": {
+            "min": round(min(tps_values), 0) if tps_values else 0,
+            "max": round(max(tps_values), 0) if tps_values else 0,
+        },
+    }
+
+
+def _summarize_whales(addresses: Sequence[str], results: Sequence[Any]) -> dict:
+    activity = []
+    failed = 0
+    for addr, sigs in zip(addresses, results):
+        if isinstance(sigs, RpcError):
+            failed += 1
+            continue
+        sigs = sigs or []
+        activity.append({
+            "address": addr[:8] + "...",
+            "recent_tx_count": len(sigs),
+            "latest_slot": sigs[0].get("slot", 0) if sigs else 0,
+        })
+
+    if failed and not activity:
+        raise RpcError(f"getSignaturesForAddress failed for all {failed} addresses")
+
+    total_recent = sum(a["recent_tx_count"] for a in activity)
+    whale_level = "high" if total_recent > 10 else "moderate" if total_recent > 3 else "low"
+    most_active = sorted(activity, key=lambda a: a["latest_slot"], reverse=True)
+
+    result = {
+        "source": "solana_rpc",
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "whale_activity_level": whale_level,
+        "total_recent_txs": total_recent,
+        "tracked_addresses": len(addresses),
+        "details": most_active[:_MAX_DETAILS],
+    }
+    if failed:
+        result["failed_addresses"] = failed
+    return result
+
+
+def get_network_tps(
+    rpc_url: str = "https://api.mainnet-beta.solana.com",
+    client: SolanaRpcClient | None = None,
+) -> dict:
+    """Fetch recent network TPS from performance samples.
+
+    Uses getRecentPerformanceSamples to compute average TPS.
+    """
+    try:
+        client = client or get_client(rpc_url)
+        return _summarize_tps(client.batch([_perf_samples_call()])[0])
     except Exception as e:
         logger.warning("Solana RPC TPS failed: %s", e)
         return {"source": "error", "message": str(e)}
@@ -70,55 +204,57 @@ def get_network_tps(rpc_url: str = "https://api.mainnet-beta.solana.com") -> dic
 def get_whale_activity(
     rpc_url: str = "https://api.mainnet-beta.solana.com",
     addresses: list[str] | None = None,
+    client: SolanaRpcClient | None = None,
 ) -> dict:
     """Check recent transaction activity for known whale addresses.
 
-    Uses getSignaturesForAddress to detect recent large-scale activity.
+    Uses getSignaturesForAddress, batched so every address costs one
+    round trip per ``_MAX_BATCH`` addresses.
     """
     addresses = addresses or _WHALE_ADDRESSES
-    activity = []
-
     try:
-        for addr in addresses[:3]:  # Limit to avoid rate limits
-            result = _rpc_call(
-                rpc_url,
-                "getSignaturesForAddress",
-                [addr, {"limit": 5}],
-            )
-            sigs = result.get("result", [])
-            recent_count = len(sigs)
-
-            if sigs:
-                latest_slot = sigs[0].get("slot", 0)
-            else:
-                latest_slot = 0
+        client = client or get_client(rpc_url)
+        results = client.batch([_signatures_call(addr) for addr in addresses])
+        return _summarize_whales(addresses, results)
+    except Exception as e:
+        logger.warning("Solana RPC whale activity failed: %s", e)
+        return {"source": "error", "message": str(e)}
 
-            activity.append({
-                "address": addr[:8] + "...",
-                "recent_tx_count": recent_count,
-                "latest_slot": latest_slot,
-            })
 
-        total_recent = sum(a["recent_tx_count"] for a in activity)
-        whale_level = "high" if total_recent > 10 else "moderate" if total_recent > 3 else "low"
+def get_solana_network_data(
+    rpc_url: str = "https://api.mainnet-beta.solana.com",
+    addresses: list[str] | None = None,
+    tracker: WhaleTracker | None = None,
+    windows_hours: Sequence[int] = (1, 24, 168),
+) -> dict:
+    """Aggregate all Solana RPC data.
 
+    Without a ``tracker``, TPS samples and every whale address go out in one
+    JSON-RPC batch. With one, whale activity comes from the tracker's stored
+    transactions after an incremental sync of new signatures.
+    """
+    addresses = addresses or _WHALE_ADDRESSES
+    if tracker is not None:
         return {
             "source": "solana_rpc",
             "timestamp": datetime.now(timezone.utc).isoformat(),
-            "whale_activity_level": whale_level,
-            "total_recent_txs": total_recent,
-            "tracked_addresses": len(addresses),
-            "details": activity,
+            "network_tps": get_network_tps(rpc_url),
+            "whale_activity": _guard(
+                lambda: _tracked_whales(tracker, addresses, windows_hours), "whale tracker"
+            ),
         }
-    except Exception as e:
-        logger.warning("Solana RPC whale activity failed: %s", e)
-        return {"source": "error", "message": str(e)}
 
+    calls = [_perf_samples_call(), *(_signatures_call(addr) for addr in addresses)]
 
-def get_solana_network_data(rpc_url: str = "https://api.mainnet-beta.solana.com") -> dict:
-    """Aggregate all Solana RPC data."""
-    tps = get_network_tps(rpc_url)
-    whales = get_whale_activity(rpc_url)
+    try:
+        results = get_client(rpc_url).batch(calls)
+    except Exception as e:
+        logger.warning("Solana RPC batch failed: %s", e)
+        error = {"source": "error", "message": str(e)}
+        tps, whales = error, error
+    else:
+        tps = _guard(lambda: _summarize_tps(results[0]), "TPS")
+        whales = _guard(lambda: _summarize_whales(addresses, results[1:]), "whale activity")
 
     return {
         "source": "solana_rpc",
@@ -126,3 +262,24 @@ def get_solana_network_data(rpc_url: str = "https://api.mainnet-beta.solana.com"
         "network_tps": tps,
         "whale_activity": whales,
     }
+
+
+def _tracked_whales(
+    tracker: WhaleTracker, addresses: Sequence[str], windows_hours: Sequence[int]
+) -> dict:
+    sync = tracker.sync(addresses)
+    return {
+        "source": "solana_rpc",
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "tracked_addresses": len(addresses),
+        **sync,
+        **tracker.activity(windows_hours, addresses=addresses),
+    }
+
+
+def _guard(summarize, label: str) -> dict:
+    try:
+        return summarize()
+    except Exception as e:
+        logger.warning("Solana RPC %s failed: %s", label, e)
+        return {"source": "error", "message": str(e)}
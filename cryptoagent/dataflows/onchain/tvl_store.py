@@ -0,0 +1,215 @@
+"""Local TVL time-series store — daily TVL per chain and per protocol slug."""
+
+from __future__ import annotations
+
+import bisect
+import logging
+import math
+import statistics
+import threading
+from datetime import date, datetime, timedelta, timezone
+
+from cryptoagent.persistence.database import Database
+
+logger = logging.getLogger(__name__)
+
+CHAIN = "chain"
+PROTOCOL = "protocol"
+
+WINDOWS = (1, 7, 30, 90)
+
+
+class TvlStore:
+    """Stores daily TVL points and serves window statistics from memory.
+
+    Each (kind, key) series is loaded from the database once and kept as
+    parallel sorted lists, so window lookups are a bisect away. Writes go to
+    both the database and the in-memory copy; the copy is replaced rather
+    than mutated, so readers can bisect the lists they were handed without
+    holding the lock.
+    """
+
+    def __init__(self, db: Database) -> None:
+        self._db = db
+        self._series: dict[tuple[str, str], tuple[list[str], list[float]]] = {}
+        self._lock = threading.Lock()
+
+    # --- sync bookkeeping ---
+
+    def latest_date(self, kind: str, key: str) -> str | None:
+        """Return the most recent stored date (YYYY-MM-DD) for a series."""
+        dates, _ = self._load(kind, key)
+        return dates[-1] if dates else None
+
+    def synced_today(self, kind: str, key: str) -> bool:
+        """True if the series was already synced from the network today (UTC).
+
+        Only the chain path uses sync markers; protocols are re-read each time
+        for their current TVL.
+        """
+        cursor = self._db.conn.execute(
+            "SELECT synced_on FROM tvl_sync WHERE kind = ? AND key = ?",
+            (kind, key),
+        )
+        row = cursor.fetchone()
+        return bool(row) and row["synced_on"] == _today()
+
+    def mark_synced(self, kind: str, key: str) -> None:
+        """Record that the series was synced today."""
+        with self._db.transaction() as conn:
+            conn.execute(
+                """INSERT INTO tvl_sync (kind, key, synced_on) VALUES (?, ?, ?)
+                   ON CONFLICT (kind, key) DO UPDATE SET synced_on = excluded.synced_on""",
+                (kind, key, _today()),
+            )
+
+    def missing_days(self, kind: str, key: str) -> int | None:
+        """Number of trailing daily points needed to catch up (None = full history).
+
+        Includes the latest stored day so an intraday value is refreshed.
+        """
+        latest = self.latest_date(kind, key)
+        if latest is None:
+            return None
+        gap = (date.fromisoformat(_today()) - date.fromisoformat(latest)).days
+        return max(gap, 0) + 1
+
+    # --- writes ---
+
+    def append(self, kind: str, key: str, points: list[tuple[str, float]]) -> int:
+        """Upsert (date, tvl) points on or after the latest stored date.
+
+        Older points are ignored, so feeding a full history only writes the
+        tail. Returns the number of rows written.
+        """
+        latest = self.latest_date(kind, key)
+        rows = [
+            (kind, key, day, float(tvl))
+            for day, tvl in points
+            if tvl is not None and (latest is None or day >= latest)
+        ]
+        if not rows:
+            return 0
+
+        with self._db.transaction() as conn:
+            conn.executemany(
+                """INSERT INTO tvl_history (kind, key, date, tvl)
+                   VALUES (?, ?, ?, ?)
+                   ON CONFLICT (kind, key, date) DO UPDATE SET tvl = excluded.tvl""",
+                rows,
+            )
+
+        with self._lock:
+            old_dates, old_values = self._series[(kind, key)]
+            dates, values = list(old_dates), list(old_values)
+            for _, _, day, tvl in sorted(rows, key=lambda r: r[2]):
+                idx = bisect.bisect_left(dates, day)
+                if idx < len(dates) and dates[idx] == day:
+                    values[idx] = tvl
+                else:
+                    dates.insert(idx, day)
+                    values.insert(idx, tvl)
+            self._series[(kind, key)] = (dates, values)
+
+        logger.info("TVL store: %d points written for %s/%s", len(rows), kind, key)
+        return len(rows)
+
+    # --- reads ---
+
+    def get_history(
+        self,
+        kind: str,
+        key: str,
+        start: str | None = None,
+        end: str | None = None,
+    ) -> list[tuple[str, float]]:
+        """Return (date, tvl) pairs oldest first — full history for backtests."""
+        dates, values = self._load(kind, key)
+        lo = bisect.bisect_left(dates, start) if start else 0
+        hi = bisect.bisect_right(dates, end) if end else len(dates)
+        return list(zip(dates[lo:hi], values[lo:hi]))
+
+    def value_at(self, kind: str, key: str, day: str) -> float | None:
+        """TVL on ``day``, or the last value before it."""
+        dates, values = self._load(kind, key)
+        idx = bisect.bisect_right(dates, day) - 1
+        return values[idx] if idx >= 0 else None
+
+    def change_pct(
+        self, kind: str, key: str, days: int, as_of: str | None = None
+    ) -> float | None:
+        """Percent TVL change over ``days`` ending at ``as_of`` (default latest)."""
+        end_idx, dates, values = self._end_index(kind, key, as_of)
+        if end_idx is None:
+            return None
+        start_day = _shift(dates[end_idx], -days)
+        start_idx = bisect.bisect_right(dates, start_day) - 1
+        if start_idx < 0 or start_idx == end_idx or not values[start_idx]:
+            return None
+        old, new = values[start_idx], values[end_idx]
+        return round((new - old) / old * 100, 2)
+
+    def volatility(
+        self, kind: str, key: str, days: int, as_of: str | None = None
+    ) -> float | None:
+        """Standard deviation of daily log changes (in %) over ``days``."""
+        end_idx, dates, values = self._end_index(kind, key, as_of)
+        if end_idx is None:
+            return None
+        start_idx = bisect.bisect_left(dates, _shift(dates[end_idx], -days))
+        window = [v for v in values[start_idx : end_idx + 1] if v > 0]
+        if len(window) < 3:
+            return None
+        returns = [math.log(b / a) for a, b in zip(window, window[1:])]
+        return round(statistics.stdev(returns) * 100, 3)
+
+    def window_stats(
+        self,
+        kind: str,
+        key: str,
+        windows: tuple[int, ...] = WINDOWS,
+        as_of: str | None = None,
+    ) -> dict:
+        """TVL change and volatility for each window, keyed like ``tvl_7d_change_pct``."""
+        stats: dict = {}
+        for days in windows:
+            stats[f"tvl_{days}d_change_pct"] = self.change_pct(kind, key, days, as_of)
+            if days > 1:
+                stats[f"tvl_{days}d_volatility_pct"] = self.volatility(kind, key, days, as_of)
+        return stats
+
+    # --- internals ---
+
+    def _end_index(
+        self, kind: str, key: str, as_of: str | None
+    ) -> tuple[int | None, list[str], list[float]]:
+        dates, values = self._load(kind, key)
+        idx = (bisect.bisect_right(dates, as_of) if as_of else len(dates)) - 1
+        return (idx if idx >= 0 else None), dates, values
+
+    def _load(self, kind: str, key: str) -> tuple[list[str], list[float]]:
+        with self._lock:
+            series = self._series.get((kind, key))
+            if series is None:
+                cursor = self._db.conn.execute(
+                    """SELECT date, tvl FROM tvl_history
+                       WHERE kind = ? AND key = ? ORDER BY date ASC""",
+                    (kind, key),
+                )
+                rows = cursor.fetchall()
+                series = ([row["date"] for row in rows], [row["tvl"] for row in rows])
+                self._series[(kind, key)] = series
+            return series
+
+
+def epoch_to_date(timestamp: int | float | str) -> str:
+    """Convert a DeFiLlama unix timestamp to a UTC YYYY-MM-DD string."""
+    return datetime.fromtimestamp(int(timestamp), tz=timezone.utc).date().isoformat()
+
+
+def _today() -> str:
+    return datetime.now(timezone.utc).date().isoformat()
+
+
+def _shift(day: str, days: int) -> str:
+    return (date.fromisoformat(day) + timedelta(days=days)).isoformat()
@@ -0,0 +1,200 @@
+"""Incremental whale-wallet tracker — per-address signature cursors and stored transactions."""
+
+from __future__ import annotations
+
+import logging
+import time
+from collections.abc import Sequence
+from datetime import datetime, timezone
+
+from cryptoagent.dataflows.onchain.solana_rpc import RpcError, SolanaRpcClient
+from cryptoagent.persistence.database import Database
+
+logger = logging.getLogger(__name__)
+
+_PAGE_LIMIT = 1000  # getSignaturesForAddress maximum
+_INITIAL_LIMIT = 25  # backfill for an address seen for the first time
+_MAX_PAGES = 5  # pagination rounds per sync before the cursor jumps ahead
+
+
+class WhaleTracker:
+    """Tracks watched Solana wallets, fetching only signatures newer than each cursor.
+
+    Each sync sends one JSON-RPC batch per pagination round covering every
+    address, using ``until`` (the last signature seen) so unchanged wallets
+    return empty pages. New transactions land in ``whale_transactions`` and
+    activity rates are computed from that table.
+    """
+
+    def __init__(
+        self,
+        db: Database,
+        client: SolanaRpcClient,
+        page_limit: int = _PAGE_LIMIT,
+        initial_limit: int = _INITIAL_LIMIT,
+        max_pages: int = _MAX_PAGES,
+    ) -> None:
+        self._db = db
+        self._client = client
+        self._page_limit = page_limit
+        self._initial_limit = initial_limit
+        self._max_pages = max_pages
+
+    def cursors(self) -> dict[str, str]:
+        """Return the last seen signature for every tracked address."""
+        cursor = self._db.conn.execute("SELECT address, last_signature FROM whale_cursors")
+        return {row["address"]: row["last_signature"] for row in cursor.fetchall()}
+
+    def sync(self, addresses: Sequence[str]) -> dict:
+        """Fetch and store transactions newer than each address cursor.
+
+        Returns counts of new transactions, addresses with activity and failures.
+        """
+        known = self.cursors()
+        # address -> (until, before); new addresses get a short backfill and no paging
+        pending: dict[str, tuple[str | None, str | None]] = {
+            addr: (known.get(addr), None) for addr in dict.fromkeys(addresses)
+        }
+        fetched: dict[str, list[dict]] = {}
+        failed = 0
+
+        for _ in range(self._max_pages):
+            if not pending:
+                break
+            calls = [
+                self._signatures_call(addr, until, before)
+                for addr, (until, before) in pending.items()
+            ]
+            results = self._client.batch(calls)
+
+            next_pending: dict[str, tuple[str | None, str | None]] = {}
+            for (addr, (until, _before)), sigs in zip(pending.items(), results):
+                if isinstance(sigs, RpcError):
+                    logger.warning("Whale tracker: %s failed: %s", addr[:8], sigs)
+                    failed += 1
+                    continue
+                sigs = sigs or []
+                fetched.setdefault(addr, []).extend(sigs)
+                if until and len(sigs) >= self._page_limit:
+                    next_pending[addr] = (until, sigs[-1]["signature"])
+            pending = next_pending
+
+        if pending:
+            logger.warning(
+                "Whale tracker: %d addresses exceeded %d pages; older activity skipped",
+                len(pending),
+                self._max_pages,
+            )
+
+        new_count = self._store(fetched)
+        return {
+            "new_transactions": new_count,
+            "active_addresses": sum(1 for sigs in fetched.values() if sigs),
+            "failed_addresses": failed,
+        }
+
+    def activity(
+        self,
+        windows_hours: Sequence[int] = (1, 24, 168),
+        now: float | None = None,
+        addresses: Sequence[str] | None = None,
+    ) -> dict:
+        """Transaction counts and hourly rates per window over the tracked wallets.
+
+        Only ``addresses`` are counted, so wallets dropped from the watch list
+        stop contributing; None counts every stored wallet. The activity level
+        compares the shortest window's rate to the longest window's (baseline)
+        rate.
+        """
+        now = now if now is not None else time.time()
+        sql = """SELECT COUNT(*) AS tx_count, COUNT(DISTINCT address) AS active
+                 FROM whale_transactions WHERE block_time >= ?"""
+        watched: tuple[str, ...] = ()
+        if addresses is not None:
+            watched = tuple(dict.fromkeys(addresses))
+            sql += f" AND address IN ({', '.join('?' * len(watched)) or 'NULL'})"
+        windows: dict[str, dict] = {}
+        for hours in sorted(windows_hours):
+            cursor = self._db.conn.execute(sql, (int(now - hours * 3600), *watched))
+            row = cursor.fetchone()
+            windows[f"{hours}h"] = {
+                "tx_count": row["tx_count"],
+                "active_addresses": row["active"],
+                "tx_per_hour": round(row["tx_count"] / hours, 3),
+            }
+
+        rates = [w["tx_count"] / hours for hours, w in zip(sorted(windows_hours), windows.values())]
+        recent, baseline = (rates[0], rates[-1]) if rates else (0.0, 0.0)
+        if recent == 0:
+            level, ratio = "low", 0.0
+        elif baseline == 0 or len(rates) == 1:
+            level, ratio = "high", None
+        else:
+            ratio = round(recent / baseline, 2)
+            level = "high" if ratio >= 2 else "moderate" if ratio >= 1 else "low"
+
+        return {
+            "whale_activity_level": level,
+            "recent_vs_baseline_rate": ratio,
+            "windows": windows,
+        }
+
+    def _signatures_call(
+        self, address: str, until: str | None, before: str | None
+    ) -> tuple[str, list]:
+        opts: dict = {"limit": self._page_limit if until else self._initial_limit}
+        if until:
+            opts["until"] = until
+        if before:
+            opts["before"] = before
+        return ("getSignaturesForAddress", [address, opts])
+
+    def _store(self, fetched: dict[str, list[dict]]) -> int:
+        rows = [
+            (
+                addr,
+                sig["signature"],
+                sig.get("slot", 0),
+                sig.get("blockTime"),
+                sig.get("err") is not None,
+            )
+            for addr, sigs in fetched.items()
+            for sig in sigs
+            if sig.get("signature")
+        ]
+        # The first signature of the first page is the newest one
+        now = datetime.now(timezone.utc).isoformat()
+        cursors = [
+            (addr, sigs[0]["signature"], sigs[0].get("slot", 0), now)
+            for addr, sigs in fetched.items()
+            if sigs and sigs[0].get("signature")
+        ]
+        if not rows:
+            return 0
+
+        with self._db.transaction() as conn:
+            # Row by row so signatures already stored (overlapping pages,
+            # re-fetches) aren't counted as new
+            inserted = sum(
+                conn.execute(
+                    """INSERT INTO whale_transactions
+                           (address, signature, slot, block_time, failed)
+                       VALUES (?, ?, ?, ?, ?)
+                       ON CONFLICT (address, signature) DO NOTHING""",
+                    row,
+                ).rowcount
+                for row in rows
+            )
+            conn.executemany(
+                """INSERT INTO whale_cursors (address, last_signature, last_slot, updated_at)
+                   VALUES (?, ?, ?, ?)
+                   ON CONFLICT (address) DO UPDATE SET
+                       last_signature = excluded.last_signature,
+                       last_slot = excluded.last_slot,
+                       updated_at = excluded.updated_at""",
+                cursors,
+            )
+        logger.info(
+            "Whale tracker: %d new transactions across %d addresses", inserted, len(cursors)
+        )
+        return inserted
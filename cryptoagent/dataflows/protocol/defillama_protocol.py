@@ -3,13 +3,28 @@
 from __future__ import annotations
 
 import logging
+from collections.abc import Callable, Iterable
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import nullcontext
 from datetime import datetime, timezone
 
 import httpx
 
+from cryptoagent.dataflows.cache import TTLCache
+from cryptoagent.dataflows.jsonstream import extract_fields
+from cryptoagent.dataflows.onchain.tvl_store import PROTOCOL, TvlStore, epoch_to_date
+
 logger = logging.getLogger(__name__)
 
 _TIMEOUT = 10
+_MAX_WORKERS = 8
+# Seconds. Loads are single-flight, so slugs shared between tokens (run one
+# after another or concurrently) are fetched once per window.
+_CACHE_TTL = 300
+
+# Fields read from /protocol/{slug}; everything else (per-chain and per-token
+# histories, often several MB) is skipped while streaming.
+_PROTOCOL_FIELDS = ("name", "category", "chains", "currentChainTvls")
 
 # Maps token symbols to their primary DeFiLlama protocol slugs.
 # Each token may have multiple key protocols; we track the most representative ones.
@@ -31,20 +46,63 @@ _TOKEN_PROTOCOL_SLUGS: dict[str, list[str]] = {
     "SNX": ["synthetix"],
 }
 
+# Per-slug TVL and fee results, shared across tokens. Error results are not cached.
+_cache = TTLCache(ttl_seconds=_CACHE_TTL)
+
+
+class _UncachedResult(Exception):
+    """Carries an error dict out of a cache loader so it is returned but not stored."""
+
+    def __init__(self, result: dict) -> None:
+        super().__init__(result.get("message", ""))
+        self.result = result
+
+
+def _cached(key: tuple, fetch: Callable[[], dict]) -> dict:
+    def load() -> dict:
+        result = fetch()
+        if result.get("source") == "error":
+            raise _UncachedResult(result)
+        return result
+
+    try:
+        return _cache.get_or_load(key, load)
+    except _UncachedResult as e:
+        return e.result
+
 
 def get_protocol_tvl(
     slug: str,
     base_url: str = "https://api.llama.fi",
+    store: TvlStore | None = None,
+    client: httpx.Client | None = None,
 ) -> dict:
     """Fetch protocol-level TVL and TVL history from DeFiLlama.
 
-    Returns current TVL, 7d change, and chain breakdown.
+    Returns current TVL, 7d change, and chain breakdown. With a ``store``,
+    only daily points newer than the stored history are kept and appended,
+    and window changes/volatility come from the local series. Results are
+    cached per slug; pass a shared ``client`` to reuse pooled connections.
     """
+    return _cached(
+        ("tvl", base_url, slug), lambda: _fetch_protocol_tvl(slug, base_url, store, client)
+    )
+
+
+def _fetch_protocol_tvl(
+    slug: str,
+    base_url: str,
+    store: TvlStore | None,
+    client: httpx.Client | None,
+) -> dict:
+    keep = store.missing_days(PROTOCOL, slug) if store is not None else 7
     try:
-        with httpx.Client(timeout=_TIMEOUT) as client:
-            resp = client.get(f"{base_url}/protocol/{slug}")
-            resp.raise_for_status()
-            data = resp.json()
+        with _client_scope(client) as http:
+            with http.stream("GET", f"{base_url}/protocol/{slug}") as resp:
+                resp.raise_for_status()
+                data = extract_fields(
+                    resp.iter_text(), fields=_PROTOCOL_FIELDS, tails={"tvl": keep}
+                )
 
             current_tvl = data.get("currentChainTvls", {})
             total_tvl = sum(
@@ -53,20 +111,33 @@ def get_protocol_tvl(
                 if not k.endswith("-staking") and not k.endswith("-borrowed")
             )
 
-            # 7d TVL change from history
             tvl_history = data.get("tvl", [])
-            tvl_7d_change_pct = 0.0
-            if len(tvl_history) >= 7:
-                old = tvl_history[-7].get("totalLiquidityUSD", 0)
-                new = tvl_history[-1].get("totalLiquidityUSD", 0)
-                if old > 0:
-                    tvl_7d_change_pct = round(((new - old) / old) * 100, 2)
+            if store is not None:
+                store.append(
+                    PROTOCOL,
+                    slug,
+                    [
+                        (epoch_to_date(p["date"]), p.get("totalLiquidityUSD"))
+                        for p in tvl_history
+                        if "date" in p
+                    ],
+                )
+                stats = store.window_stats(PROTOCOL, slug)
+            else:
+                # 7d TVL change from history
+                stats = {"tvl_7d_change_pct": 0.0}
+                if len(tvl_history) >= 7:
+                    old = tvl_history[-7].get("totalLiquidityUSD", 0)
+                    new = tvl_history[-1].get("totalLiquidityUSD", 0)
+                    if old > 0:
+                        stats["tvl_7d_change_pct"] = round(((new - old) / old) * 100, 2)
 
             return {
                 "slug": slug,
                 "name": data.get("name", slug),
                 "tvl": round(total_tvl, 2),
-                "tvl_7d_change_pct": tvl_7d_change_pct,
+                **stats,
+                "tvl_7d_change_pct": stats.get("tvl_7d_change_pct") or 0.0,
                 "category": data.get("category", "unknown"),
                 "chains": list(data.get("chains", [])),
             }
@@ -83,11 +154,16 @@ def get_protocol_tvl(
 def get_protocol_fees(
     slug: str,
     base_url: str = "https://api.llama.fi",
+    client: httpx.Client | None = None,
 ) -> dict:
-    """Fetch 24h and 30d fees/revenue for a protocol from DeFiLlama."""
+    """Fetch 24h and 30d fees/revenue for a protocol from DeFiLlama (cached per slug)."""
+    return _cached(("fees", base_url, slug), lambda: _fetch_protocol_fees(slug, base_url, client))
+
+
+def _fetch_protocol_fees(slug: str, base_url: str, client: httpx.Client | None) -> dict:
     try:
-        with httpx.Client(timeout=_TIMEOUT) as client:
-            resp = client.get(f"{base_url}/summary/fees/{slug}?dataType=dailyFees")
+        with _client_scope(client) as http:
+            resp = http.get(f"{base_url}/summary/fees/{slug}?dataType=dailyFees")
             resp.raise_for_status()
             data = resp.json()
 
@@ -107,28 +183,47 @@ def get_protocol_fees(
         return {"slug": slug, "source": "error", "message": str(e)}
 
 
-def get_protocol_fundamentals(
-    token: str,
+def _client_scope(client: httpx.Client | None):
+    """Use the shared client as-is, or open (and close) a one-off client."""
+    if client is not None:
+        return nullcontext(client)
+    return httpx.Client(timeout=_TIMEOUT)
+
+
+def fetch_slugs(
+    slugs: Iterable[str],
     base_url: str = "https://api.llama.fi",
-) -> dict:
-    """Aggregate TVL and fee data for all protocols mapped to a token.
+    store: TvlStore | None = None,
+) -> dict[str, tuple[dict, dict]]:
+    """Fetch TVL and fees for each unique slug concurrently.
 
-    Returns a combined report with per-protocol breakdown.
+    All requests go through one pooled client on a bounded thread pool.
+    Returns ``{slug: (tvl_data, fee_data)}``.
     """
-    slugs = _TOKEN_PROTOCOL_SLUGS.get(token.upper(), [])
-    if not slugs:
-        return {
-            "source": "defillama_protocol",
-            "token": token.upper(),
-            "timestamp": datetime.now(timezone.utc).isoformat(),
-            "note": f"No protocol mappings configured for {token.upper()}",
-            "protocols": [],
-        }
+    unique = list(dict.fromkeys(slugs))
+    if not unique:
+        return {}
 
+    workers = min(_MAX_WORKERS, 2 * len(unique))
+    limits = httpx.Limits(max_connections=workers, max_keepalive_connections=workers)
+    with httpx.Client(timeout=_TIMEOUT, limits=limits) as client:
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            tvl_futures = {
+                slug: pool.submit(get_protocol_tvl, slug, base_url, store, client)
+                for slug in unique
+            }
+            fee_futures = {
+                slug: pool.submit(get_protocol_fees, slug, base_url, client) for slug in unique
+            }
+            return {
+                slug: (tvl_futures[slug].result(), fee_futures[slug].result()) for slug in unique
+            }
+
+
+def _build_report(token: str, slugs: list[str], results: dict[str, tuple[dict, dict]]) -> dict:
     protocols = []
     for slug in slugs:
-        tvl_data = get_protocol_tvl(slug, base_url)
-        fee_data = get_protocol_fees(slug, base_url)
+        tvl_data, fee_data = results[slug]
 
         if tvl_data.get("source") == "error" and fee_data.get("source") == "error":
             continue
@@ -138,6 +233,12 @@ def get_protocol_fundamentals(
             entry["name"] = tvl_data.get("name", slug)
             entry["tvl"] = tvl_data.get("tvl")
             entry["tvl_7d_change_pct"] = tvl_data.get("tvl_7d_change_pct")
+            # Longer windows are present when a TVL store is in use
+            entry.update(
+                (k, v)
+                for k, v in tvl_data.items()
+                if k.startswith("tvl_") and k.endswith("_pct") and v is not None
+            )
             entry["category"] = tvl_data.get("category")
         if fee_data.get("source") != "error":
             entry["fees_24h"] = fee_data.get("fees_24h")
@@ -156,3 +257,31 @@ def get_protocol_fundamentals(
         "protocol_count": len(protocols),
         "protocols": protocols,
     }
+
+
+def _no_mapping(token: str) -> dict:
+    return {
+        "source": "defillama_protocol",
+        "token": token.upper(),
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "note": f"No protocol mappings configured for {token.upper()}",
+        "protocols": [],
+    }
+
+
+def get_protocol_fundamentals(
+    token: str,
+    base_url: str = "https://api.llama.fi",
+    store: TvlStore | None = None,
+) -> dict:
+    """Aggregate TVL and fee data for all protocols mapped to a token.
+
+    Returns a combined report with per-protocol breakdown. Slug requests run
+    concurrently and are cached, so slugs shared with other tokens are not
+    refetched. A ``store`` keeps each protocol's TVL history locally (see
+    ``get_protocol_tvl``).
+    """
+    slugs = _TOKEN_PROTOCOL_SLUGS.get(token.upper(), [])
+    if not slugs:
+        return _no_mapping(token)
+    return _build_report(token, slugs, fetch_slugs(slugs, base_url, store))
@@ -2,15 +2,24 @@
 
 from __future__ import annotations
 
+import json
 import logging
+import threading
+import time
 from datetime import datetime, timezone
 
 import httpx
 
+from cryptoagent.dataflows.protocol.github_store import GithubStore
+
 logger = logging.getLogger(__name__)
 
 _TIMEOUT = 10
 _GITHUB_API = "https://api.github.com"
+_META_MAX_AGE = 3600  # seconds before repo metadata is revalidated
+_STATS_MAX_AGE = 6 * 3600  # seconds before weekly commit stats are revalidated
+_POLL_BACKOFF = 2.0  # first retry delay for 202 stats answers; doubles each attempt
+_POLL_MAX_ATTEMPTS = 6
 
 # Maps token symbols to their primary GitHub repo (owner/repo).
 _TOKEN_REPOS: dict[str, str] = {
@@ -41,13 +50,170 @@ def _classify_health(commits_4w: int) -> str:
     return "stale"
 
 
-def get_dev_activity(token: str) -> dict:
+def _headers(github_token: str = "") -> dict[str, str]:
+    headers = {"Accept": "application/vnd.github.v3+json"}
+    if github_token:
+        headers["Authorization"] = f"Bearer {github_token}"
+    return headers
+
+
+def _stats_url(repo_path: str) -> str:
+    return f"{_GITHUB_API}/repos/{repo_path}/stats/commit_activity"
+
+
+def _refresh_stats(client: httpx.Client, repo_path: str, store: GithubStore) -> bool:
+    """One conditional stats request into the store.
+
+    Returns False while GitHub is still computing the stats (202).
+    """
+    url = _stats_url(repo_path)
+    resp = client.get(url, headers=store.http_cache.conditional_headers(url))
+    if resp.status_code == 202:
+        return False
+    if resp.status_code == 304:
+        store.http_cache.touch(url)
+        return True
+    resp.raise_for_status()
+    weeks = resp.json()
+    # Pollers run on their own threads; both writes go through the database
+    # write lock, in one transaction so a validator never outlives its weeks
+    with store.transaction():
+        if isinstance(weeks, list):
+            store.upsert_weeks(repo_path, weeks)
+        # Only the validators are cached; the weeks themselves live in the store
+        store.http_cache.store(url, resp)
+    return True
+
+
+class StatsPoller:
+    """Retries commit-stats requests on background threads with exponential backoff.
+
+    GitHub answers ``/stats/commit_activity`` with 202 while it computes the
+    stats. Rather than block a cycle, the repo is handed to the poller and
+    its store is filled in once the stats are ready. A repo is polled by at
+    most one thread at a time, process-wide.
+    """
+
+    _pending: set[str] = set()
+    _pending_lock = threading.Lock()
+
+    def __init__(
+        self,
+        store: GithubStore,
+        github_token: str = "",
+        backoff: float = _POLL_BACKOFF,
+        max_attempts: int = _POLL_MAX_ATTEMPTS,
+    ) -> None:
+        self._store = store
+        self._headers = _headers(github_token)
+        self._backoff = backoff
+        self._max_attempts = max_attempts
+        self._threads: list[threading.Thread] = []
+
+    def submit(self, repo_path: str) -> bool:
+        """Start polling ``repo_path`` unless it is already being polled."""
+        with self._pending_lock:
+            if repo_path in self._pending:
+                return False
+            self._pending.add(repo_path)
+        # Keep only live threads so a long-lived poller doesn't accumulate them
+        self._threads = [t for t in self._threads if t.is_alive()]
+        thread = threading.Thread(
+            target=self._poll,
+            args=(repo_path,),
+            name=f"github-stats-{repo_path}",
+            daemon=True,
+        )
+        self._threads.append(thread)
+        thread.start()
+        return True
+
+    def join(self, timeout: float | None = None) -> None:
+        """Wait for this poller's threads to finish."""
+        for thread in self._threads:
+            thread.join(timeout)
+
+    def _poll(self, repo_path: str) -> None:
+        delay = self._backoff
+        try:
+            with httpx.Client(timeout=_TIMEOUT, headers=self._headers) as client:
+                for _ in range(self._max_attempts):
+                    time.sleep(delay)
+                    if _refresh_stats(client, repo_path, self._store):
+                        logger.info("GitHub stats ready for %s", repo_path)
+                        return
+                    delay *= 2
+            logger.warning("GitHub stats still computing for %s, giving up for now", repo_path)
+        except Exception as e:
+            logger.warning("GitHub stats polling failed for %s: %s", repo_path, e)
+        finally:
+            with self._pending_lock:
+                self._pending.discard(repo_path)
+
+    @classmethod
+    def is_pending(cls, repo_path: str) -> bool:
+        with cls._pending_lock:
+            return repo_path in cls._pending
+
+
+def _fetch_repo(client: httpx.Client, repo_path: str, store: GithubStore | None) -> dict:
+    url = f"{_GITHUB_API}/repos/{repo_path}"
+    if store is None:
+        resp = client.get(url)
+        resp.raise_for_status()
+        return resp.json()
+    body, _ = store.http_cache.get(client, url, max_age=_META_MAX_AGE)
+    return json.loads(body)
+
+
+def _fetch_weeks_uncached(client: httpx.Client, repo_path: str) -> list[int]:
+    commit_resp = client.get(_stats_url(repo_path))
+    if commit_resp.status_code == 200:
+        weeks = commit_resp.json()
+        if isinstance(weeks, list) and len(weeks) >= 4:
+            return [w.get("total", 0) for w in weeks[-4:]]
+    elif commit_resp.status_code == 202:
+        # GitHub returns 202 when stats are being computed
+        logger.info("GitHub stats being computed for %s, using repo metadata", repo_path)
+    return []
+
+
+def _stored_weeks(
+    client: httpx.Client,
+    repo_path: str,
+    store: GithubStore,
+    poller: StatsPoller,
+) -> list[int]:
+    """Weekly commits from the store, refreshing stale stats without blocking.
+
+    The first time a repo is seen, one conditional request is made inline;
+    afterwards, and whenever GitHub answers 202, refreshes run in the poller.
+    """
+    if not store.http_cache.is_fresh(_stats_url(repo_path), _STATS_MAX_AGE):
+        if store.weekly_commits(repo_path, 1):
+            poller.submit(repo_path)
+        elif not _refresh_stats(client, repo_path, store):
+            logger.info("GitHub stats being computed for %s, polling in background", repo_path)
+            poller.submit(repo_path)
+    weeks = store.weekly_commits(repo_path, 4)
+    return weeks if len(weeks) >= 4 else []
+
+
+def get_dev_activity(
+    token: str,
+    store: GithubStore | None = None,
+    github_token: str = "",
+    poller: StatsPoller | None = None,
+) -> dict:
     """Fetch GitHub development metrics for a token's primary repository.
 
     Returns commit activity (last 4 weeks), contributor count,
     stars, forks, and a health classification.
 
-    Uses unauthenticated GitHub API (60 requests/hour limit).
+    Uses the unauthenticated GitHub API (60 requests/hour) unless
+    ``github_token`` is set. With a ``store``, requests are conditional
+    (ETag), repo metadata is reused for an hour, and weekly commits are read
+    from the store while 202 "computing" answers are polled in the background.
     """
     token_upper = token.upper()
     repo_path = _TOKEN_REPOS.get(token_upper)
@@ -62,36 +228,21 @@ def get_dev_activity(token: str) -> dict:
         }
 
     try:
-        headers = {"Accept": "application/vnd.github.v3+json"}
-
-        with httpx.Client(timeout=_TIMEOUT, headers=headers) as client:
+        with httpx.Client(timeout=_TIMEOUT, headers=_headers(github_token)) as client:
             # Repo metadata (stars, forks, last push)
-            repo_resp = client.get(f"{_GITHUB_API}/repos/{repo_path}")
-            repo_resp.raise_for_status()
-            repo_data = repo_resp.json()
-
-            # Weekly commit activity (last 52 weeks)
-            commit_resp = client.get(
-                f"{_GITHUB_API}/repos/{repo_path}/stats/commit_activity"
-            )
-
-            commits_4w = 0
-            weekly_breakdown: list[int] = []
-            if commit_resp.status_code == 200:
-                weeks = commit_resp.json()
-                if isinstance(weeks, list) and len(weeks) >= 4:
-                    recent_4 = weeks[-4:]
-                    weekly_breakdown = [w.get("total", 0) for w in recent_4]
-                    commits_4w = sum(weekly_breakdown)
-            elif commit_resp.status_code == 202:
-                # GitHub returns 202 when stats are being computed
-                logger.info(
-                    "GitHub stats being computed for %s, using repo metadata", repo_path
-                )
+            repo_data = _fetch_repo(client, repo_path, store)
+
+            # Weekly commit activity (last 4 weeks)
+            if store is None:
+                weekly_breakdown = _fetch_weeks_uncached(client, repo_path)
+            else:
+                poller = poller or StatsPoller(store, github_token)
+                weekly_breakdown = _stored_weeks(client, repo_path, store, poller)
 
+        commits_4w = sum(weekly_breakdown)
         health = _classify_health(commits_4w)
 
-        return {
+        result = {
             "source": "github",
             "token": token_upper,
             "timestamp": datetime.now(timezone.utc).isoformat(),
@@ -104,6 +255,9 @@ def get_dev_activity(token: str) -> dict:
             "weekly_commits": weekly_breakdown,
             "health": health,
         }
+        if store is not None:
+            result["stats_pending"] = StatsPoller.is_pending(repo_path)
+        return result
     except httpx.HTTPStatusError as e:
         logger.warning("GitHub API error for %s: %s", repo_path, e.response.status_code)
         return {
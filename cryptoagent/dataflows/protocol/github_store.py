@@ -0,0 +1,48 @@
+"""Local GitHub commit-activity store — weekly commit totals per repository."""
+
+from __future__ import annotations
+
+from cryptoagent.dataflows.http_cache import HttpCache
+from cryptoagent.persistence.database import Database
+
+
+class GithubStore:
+    """Persists GitHub's weekly commit totals so cycles read them locally.
+
+    Also carries the ``HttpCache`` used for conditional requests to the
+    GitHub API, since both live in the same database.
+    """
+
+    def __init__(self, db: Database) -> None:
+        self._db = db
+        self.http_cache = HttpCache(db)
+
+    def transaction(self):
+        """Commit weekly totals and their HTTP validators together (see ``Database``)."""
+        return self._db.transaction()
+
+    def upsert_weeks(self, repo: str, weeks: list[dict]) -> int:
+        """Store ``/stats/commit_activity`` entries (``week`` epoch, ``total``)."""
+        rows = [
+            (repo, int(w["week"]), int(w.get("total", 0)))
+            for w in weeks
+            if isinstance(w, dict) and "week" in w
+        ]
+        if not rows:
+            return 0
+        with self._db.transaction() as conn:
+            conn.executemany(
+                """INSERT INTO github_commit_activity (repo, week, total) VALUES (?, ?, ?)
+                   ON CONFLICT (repo, week) DO UPDATE SET total = excluded.total""",
+                rows,
+            )
+        return len(rows)
+
+    def weekly_commits(self, repo: str, weeks: int = 4) -> list[int]:
+        """Commit totals for the last ``weeks`` weeks on record, oldest first."""
+        cursor = self._db.conn.execute(
+            """SELECT total FROM github_commit_activity
+               WHERE repo = ? ORDER BY week DESC LIMIT ?""",
+            (repo, weeks),
+        )
+        return [row["total"] for row in cursor.fetchall()][::-1]
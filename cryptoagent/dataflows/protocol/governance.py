@@ -3,6 +3,10 @@
 from __future__ import annotations
 
 import logging
+import threading
+import time
+from collections.abc import Iterable
+from contextlib import nullcontext
 from datetime import datetime, timezone
 
 import httpx
@@ -29,133 +33,265 @@ _TOKEN_SPACES: dict[str, list[str]] = {
     "ENS": ["ens.eth"],
 }
 
-_PROPOSALS_QUERY = """\
-query ($spaces: [String!]!) {
-  proposals(
-    first: 10
-    where: { space_in: $spaces, state: "active" }
-    orderBy: "created"
-    orderDirection: desc
-  ) {
-    id
-    title
-    state
-    choices
-    scores_total
-    votes
-    start
-    end
-    space { id name }
-  }
-}
-"""
+_LISTING_TTL = 900  # seconds before a space's proposal listing is re-queried
+_MAX_SPACES_PER_QUERY = 20  # aliased spaces per GraphQL request
+_ACTIVE_LIMIT = 10
+_RECENT_LIMIT = 5
 
-_RECENT_PROPOSALS_QUERY = """\
-query ($spaces: [String!]!) {
-  proposals(
-    first: 5
-    where: { space_in: $spaces }
-    orderBy: "created"
-    orderDirection: desc
-  ) {
-    id
-    title
-    state
-    votes
-    scores_total
-    space { id name }
-  }
+_PROPOSAL_FIELDS = """\
+fragment P on Proposal {
+  id
+  title
+  state
+  choices
+  scores_total
+  votes
+  start
+  end
+  space { id name }
 }
 """
 
 
-def get_governance_activity(token: str) -> dict:
-    """Fetch active and recent governance proposals for a token's Snapshot spaces.
+def _build_query(spaces: list[str], refresh_ids: list[str]) -> tuple[str, dict]:
+    """One aliased GraphQL document listing every space and refreshing ``refresh_ids``.
 
-    Solana tokens return a stub since Solana governance uses Realms, not Snapshot.
-    Tokens without configured spaces return an informational note.
+    Each space gets an active and a recent listing (``a{i}`` / ``r{i}``);
+    ``changed`` re-reads proposals whose state may have moved on.
     """
-    token_upper = token.upper()
+    params = [f"$s{i}: String!" for i in range(len(spaces))]
+    fields = []
+    for i in range(len(spaces)):
+        fields.append(
+            f"  a{i}: proposals(first: {_ACTIVE_LIMIT}, "
+            f'where: {{ space: $s{i}, state: "active" }}, '
+            f'orderBy: "created", orderDirection: desc) {{ ...P }}'
+        )
+        fields.append(
+            f"  r{i}: proposals(first: {_RECENT_LIMIT}, where: {{ space: $s{i} }}, "
+            f'orderBy: "created", orderDirection: desc) {{ ...P }}'
+        )
+    if refresh_ids:
+        params.append("$ids: [String!]!")
+        fields.append(
+            f"  changed: proposals(first: {len(refresh_ids)}, "
+            f"where: {{ id_in: $ids }}) {{ ...P }}"
+        )
 
-    if token_upper == "SOL":
-        return {
-            "source": "snapshot",
-            "token": token_upper,
-            "timestamp": datetime.now(timezone.utc).isoformat(),
-            "note": "SOL governance uses Realms (realms.today), not Snapshot.",
-            "active_proposals": 0,
-            "proposals": [],
-        }
+    query = f"query ({', '.join(params)}) {{\n" + "\n".join(fields) + "\n}\n" + _PROPOSAL_FIELDS
+    variables: dict = {f"s{i}": space for i, space in enumerate(spaces)}
+    if refresh_ids:
+        variables["ids"] = refresh_ids
+    return query, variables
 
-    spaces = _TOKEN_SPACES.get(token_upper, [])
-    if not spaces:
-        return {
-            "source": "snapshot",
-            "token": token_upper,
-            "timestamp": datetime.now(timezone.utc).isoformat(),
-            "note": f"No Snapshot spaces configured for {token_upper}",
-            "active_proposals": 0,
-            "proposals": [],
-        }
 
-    try:
-        with httpx.Client(timeout=_TIMEOUT) as client:
-            # Fetch active proposals
-            active_resp = client.post(
-                _SNAPSHOT_URL,
-                json={"query": _PROPOSALS_QUERY, "variables": {"spaces": spaces}},
-            )
-            active_resp.raise_for_status()
-            active_data = active_resp.json()
-            active_proposals = active_data.get("data", {}).get("proposals", [])
-
-            # Fetch recent proposals (any state) for context
-            recent_resp = client.post(
-                _SNAPSHOT_URL,
-                json={
-                    "query": _RECENT_PROPOSALS_QUERY,
-                    "variables": {"spaces": spaces},
-                },
+def _needs_refresh(proposal: dict, now: float) -> bool:
+    """Whether a cached proposal's state may have changed since it was fetched."""
+    state = proposal.get("state")
+    if state == "active":
+        return (proposal.get("end") or 0) <= now
+    if state == "pending":
+        return (proposal.get("start") or 0) <= now
+    return False
+
+
+class ProposalCache:
+    """Snapshot proposals cached by id, with per-space listings.
+
+    A space's listing is re-queried once per ``listing_ttl``. In between,
+    only proposals whose state may have changed (active past their end,
+    pending past their start) are re-read. All stale spaces and changed
+    proposals go out together in one aliased request (or a few).
+    """
+
+    def __init__(self, listing_ttl: float = _LISTING_TTL) -> None:
+        self._listing_ttl = listing_ttl
+        self._proposals: dict[str, dict] = {}
+        # space -> (fetched_at, active ids, recent ids)
+        self._listings: dict[str, tuple[float, list[str], list[str]]] = {}
+        self._lock = threading.Lock()
+
+    def refresh(self, spaces: Iterable[str], client: httpx.Client | None = None) -> int:
+        """Bring ``spaces`` up to date. Returns the number of requests made."""
+        with self._lock:
+            now = time.time()
+            stale = [
+                space
+                for space in dict.fromkeys(spaces)
+                if now - self._listings.get(space, (0.0, [], []))[0] >= self._listing_ttl
+            ]
+            refresh_ids = [pid for pid, p in self._proposals.items() if _needs_refresh(p, now)]
+            if not stale and not refresh_ids:
+                return 0
+
+            chunks = [
+                stale[i : i + _MAX_SPACES_PER_QUERY]
+                for i in range(0, len(stale), _MAX_SPACES_PER_QUERY)
+            ] or [[]]
+            with _client_scope(client) as http:
+                for n, chunk in enumerate(chunks):
+                    # Changed proposals ride along with the first request
+                    ids = refresh_ids if n == 0 else []
+                    self._absorb(chunk, ids, _post(http, *_build_query(chunk, ids)), now)
+            return len(chunks)
+
+    def _absorb(self, spaces: list[str], refresh_ids: list[str], data: dict, now: float) -> None:
+        changed = {p["id"]: p for p in data.get("changed") or []}
+        for pid in refresh_ids:
+            # Proposals deleted upstream disappear from the cache
+            if pid in changed:
+                self._proposals[pid] = changed[pid]
+            else:
+                self._proposals.pop(pid, None)
+        for i, space in enumerate(spaces):
+            active = data.get(f"a{i}") or []
+            recent = data.get(f"r{i}") or []
+            for proposal in (*active, *recent):
+                self._proposals[proposal["id"]] = proposal
+            self._listings[space] = (
+                now,
+                [p["id"] for p in active],
+                [p["id"] for p in recent],
             )
-            recent_resp.raise_for_status()
-            recent_data = recent_resp.json()
-            recent_proposals = recent_data.get("data", {}).get("proposals", [])
-
-        active_list = [
-            {
-                "title": p.get("title", ""),
-                "state": p.get("state", ""),
-                "votes": p.get("votes", 0),
-                "space": p.get("space", {}).get("name", ""),
-            }
-            for p in active_proposals
-        ]
-
-        recent_list = [
-            {
-                "title": p.get("title", ""),
-                "state": p.get("state", ""),
-                "votes": p.get("votes", 0),
-                "space": p.get("space", {}).get("name", ""),
-            }
-            for p in recent_proposals
-        ]
+        self._prune()
 
-        return {
-            "source": "snapshot",
-            "token": token_upper,
-            "timestamp": datetime.now(timezone.utc).isoformat(),
-            "active_proposals": len(active_list),
-            "proposals": active_list,
-            "recent_proposals": recent_list,
+    def _prune(self) -> None:
+        """Drop proposals that no space lists as active or recent any more."""
+        listed = {
+            pid for _, active, recent in self._listings.values() for pid in (*active, *recent)
         }
+        for pid in self._proposals.keys() - listed:
+            del self._proposals[pid]
+
+    def has_listing(self, space: str) -> bool:
+        with self._lock:
+            return space in self._listings
+
+    def proposals(self, spaces: Iterable[str]) -> tuple[list[dict], list[dict]]:
+        """Cached ``(active, recent)`` proposals for ``spaces``, newest first per space."""
+        with self._lock:
+            active: list[dict] = []
+            recent: list[dict] = []
+            for space in spaces:
+                _, active_ids, recent_ids = self._listings.get(space, (0.0, [], []))
+                active.extend(
+                    p
+                    for p in map(self._proposals.get, active_ids)
+                    if p is not None and p.get("state") == "active"
+                )
+                recent.extend(p for p in map(self._proposals.get, recent_ids) if p is not None)
+            return active[:_ACTIVE_LIMIT], recent[:_RECENT_LIMIT]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._proposals.clear()
+            self._listings.clear()
+
+
+def _client_scope(client: httpx.Client | None):
+    return nullcontext(client) if client is not None else httpx.Client(timeout=_TIMEOUT)
+
+
+def _post(client: httpx.Client, query: str, variables: dict) -> dict:
+    resp = client.post(_SNAPSHOT_URL, json={"query": query, "variables": variables})
+    resp.raise_for_status()
+    body = resp.json()
+    if body.get("errors"):
+        raise RuntimeError(f"Snapshot query failed: {body['errors'][0].get('message')}")
+    return body.get("data") or {}
+
+
+# Shared across tokens and agents within the process
+_cache = ProposalCache()
+
+
+def _summarize(proposal: dict) -> dict:
+    return {
+        "title": proposal.get("title", ""),
+        "state": proposal.get("state", ""),
+        "votes": proposal.get("votes", 0),
+        "space": (proposal.get("space") or {}).get("name", ""),
+    }
+
+
+def _note(token: str, note: str) -> dict:
+    return {
+        "source": "snapshot",
+        "token": token,
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "note": note,
+        "active_proposals": 0,
+        "proposals": [],
+    }
+
+
+def _error(token: str, message: str) -> dict:
+    return {
+        "source": "error",
+        "token": token,
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "message": message,
+        "active_proposals": 0,
+        "proposals": [],
+    }
+
+
+def _report(token: str, cache: ProposalCache) -> dict:
+    if token == "SOL":
+        return _note(token, "SOL governance uses Realms (realms.today), not Snapshot.")
+
+    spaces = _TOKEN_SPACES.get(token, [])
+    if not spaces:
+        return _note(token, f"No Snapshot spaces configured for {token}")
+
+    active, recent = cache.proposals(spaces)
+    return {
+        "source": "snapshot",
+        "token": token,
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "active_proposals": len(active),
+        "proposals": [_summarize(p) for p in active],
+        "recent_proposals": [_summarize(p) for p in recent],
+    }
+
+
+def get_governance_activity_batch(
+    tokens: Iterable[str] | None = None,
+    cache: ProposalCache | None = None,
+) -> dict[str, dict]:
+    """Governance activity for several tokens from one batched Snapshot request.
+
+    Every space of every token is listed in a single aliased GraphQL query
+    (a few for very large universes) and the results are split per token.
+    Defaults to all tokens with configured spaces. Returns ``{TOKEN: report}``
+    in the same shape as ``get_governance_activity``.
+    """
+    cache = cache or _cache
+    tokens = [t.upper() for t in (tokens if tokens is not None else _TOKEN_SPACES)]
+    spaces = [space for token in tokens for space in _TOKEN_SPACES.get(token, [])]
+
+    try:
+        cache.refresh(spaces)
     except Exception as e:
-        logger.warning("Snapshot governance fetch failed for %s: %s", token_upper, e)
+        logger.warning("Snapshot governance fetch failed: %s", e)
         return {
-            "source": "error",
-            "token": token_upper,
-            "timestamp": datetime.now(timezone.utc).isoformat(),
-            "message": str(e),
-            "active_proposals": 0,
-            "proposals": [],
+            token: _report(token, cache)
+            if all(cache.has_listing(s) for s in _TOKEN_SPACES.get(token, []))
+            else _error(token, str(e))
+            for token in tokens
         }
+    return {token: _report(token, cache) for token in tokens}
+
+
+def get_governance_activity(token: str) -> dict:
+    """Fetch active and recent governance proposals for a token's Snapshot spaces.
+
+    Solana tokens return a stub since Solana governance uses Realms, not Snapshot.
+    Tokens without configured spaces return an informational note. The first
+    call refreshes every configured space in one request, so later tokens in
+    the same cycle are served from the proposal cache.
+    """
+    token_upper = token.upper()
+    if not _TOKEN_SPACES.get(token_upper):
+        return _report(token_upper, _cache)
+    return get_governance_activity_batch([token_upper, *_TOKEN_SPACES])[token_upper]
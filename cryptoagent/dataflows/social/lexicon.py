@@ -0,0 +1,258 @@
+"""Compiled lexicon sentiment classifier for tweets, Reddit titles, and headlines.
+
+All terms are compiled into one word-bounded, case-insensitive regex, so a
+text is scanned once regardless of lexicon size. A negator up to two words
+before a term ("not bullish", "no longer pumping") flips its weight. Batches
+are joined and scanned in a single pass, and labels are cached by item ID.
+"""
+
+from __future__ import annotations
+
+import bisect
+import re
+import threading
+from collections import OrderedDict
+from collections.abc import Hashable, Sequence
+
+# Positive weights are bullish, negative bearish. Multi-word phrases are allowed.
+LEXICON: dict[str, float] = {
+    # bullish
+    "moon": 1.0,
+    "mooning": 1.0,
+    "to the moon": 1.5,
+    "bullish": 1.5,
+    "pump": 1.0,
+    "pumping": 1.0,
+    "buy": 0.5,
+    "buying": 0.5,
+    "accumulate": 0.75,
+    "accumulating": 0.75,
+    "long": 0.5,
+    "breakout": 1.0,
+    "breaks out": 1.0,
+    "ath": 1.0,
+    "all time high": 1.0,
+    "all-time high": 1.0,
+    "rally": 1.0,
+    "rallies": 1.0,
+    "gains": 0.75,
+    "surge": 1.0,
+    "surges": 1.0,
+    "soar": 1.0,
+    "soars": 1.0,
+    "upgrade": 0.5,
+    "approval": 0.75,
+    "approved": 0.75,
+    "inflows": 0.75,
+    "adoption": 0.5,
+    "partnership": 0.5,
+    # bearish
+    "dump": -1.0,
+    "dumping": -1.0,
+    "bearish": -1.5,
+    "crash": -1.5,
+    "crashes": -1.5,
+    "sell": -0.5,
+    "selling": -0.5,
+    "short": -0.5,
+    "rug": -1.5,
+    "rugged": -1.5,
+    "rug pull": -2.0,
+    "scam": -1.5,
+    "dead": -1.0,
+    "rekt": -1.0,
+    "plunge": -1.0,
+    "plunges": -1.0,
+    "hack": -1.5,
+    "hacked": -1.5,
+    "exploit": -1.5,
+    "exploited": -1.5,
+    "outflows": -0.75,
+    "lawsuit": -0.75,
+    "liquidated": -1.0,
+    "liquidations": -0.75,
+    "outage": -1.0,
+    "delisted": -1.0,
+    "delisting": -1.0,
+}
+
+NEGATORS = (
+    "not",
+    "no",
+    "never",
+    "isn't",
+    "isnt",
+    "aren't",
+    "wasn't",
+    "don't",
+    "dont",
+    "doesn't",
+    "won't",
+    "wont",
+    "without",
+    "hardly",
+    "no longer",
+)
+
+_SEP = "\x00"  # joins batch texts; negation windows never cross it
+_CACHE_SIZE = 50_000
+_NEGATION_WINDOW = 2  # words allowed between a negator and the term it flips
+_WORD = re.compile(r"\w+")
+
+
+def _trie_pattern(terms) -> str:
+    """Regex alternation factored by shared prefixes.
+
+    Python's regex engine tries alternatives one by one; a prefix trie means
+    each position is rejected after a character or two instead of after
+    trying every term.
+    """
+    trie: dict = {}
+    for term in terms:
+        node = trie
+        for char in _normalize(term):
+            node = node.setdefault(char, {})
+        node[""] = {}
+
+    def build(node: dict) -> str:
+        branches = [
+            (r"\s+" if char == " " else re.escape(char)) + build(child)
+            for char, child in sorted(node.items())
+            if char
+        ]
+        if not branches:
+            return ""
+        body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+        if "" in node:
+            return (body if len(branches) > 1 else f"(?:{body})") + "?"
+        return body
+
+    return build(trie)
+
+
+class LexiconClassifier:
+    """Weighted keyword classifier backed by a single compiled pattern."""
+
+    def __init__(
+        self,
+        lexicon: dict[str, float] | None = None,
+        negators: Sequence[str] = NEGATORS,
+        threshold: float = 0.25,
+        cache_size: int = _CACHE_SIZE,
+    ) -> None:
+        lexicon = lexicon if lexicon is not None else LEXICON
+        self._weights = {_normalize(term): weight for term, weight in lexicon.items()}
+        # Texts are lowercased before matching, which is cheaper than IGNORECASE
+        self._pattern = re.compile(
+            rf"\b(?:(?P<neg>{_trie_pattern(negators)})|(?P<term>{_trie_pattern(lexicon)}))\b"
+        )
+        self._threshold = threshold
+        self._cache: OrderedDict[Hashable, str] = OrderedDict()
+        self._cache_size = cache_size
+        self._lock = threading.Lock()
+
+    def score(self, text: str) -> float:
+        """Net sentiment weight of a text (positive = bullish)."""
+        return self.score_batch([text])[0]
+
+    def score_batch(self, texts: Sequence[str]) -> list[float]:
+        """Net sentiment weight for each text, scanning all texts in one pass."""
+        if not texts:
+            return []
+        lowered = [t.lower().replace(_SEP, " ") for t in texts]
+        joined = _SEP.join(lowered)
+        # Start offset of each text within the joined string
+        starts: list[int] = []
+        offset = 0
+        for text in lowered:
+            starts.append(offset)
+            offset += len(text) + 1
+
+        scores = [0.0] * len(texts)
+        neg_end = -1
+        for match in self._pattern.finditer(joined):
+            if match.group("neg"):
+                neg_end = match.end()
+                continue
+            weight = self._weights.get(_normalize(match.group("term")), 0.0)
+            if neg_end >= 0:
+                gap = joined[neg_end : match.start()]
+                if _SEP not in gap and len(_WORD.findall(gap)) <= _NEGATION_WINDOW:
+                    weight = -weight
+                neg_end = -1
+            scores[bisect.bisect_right(starts, match.start()) - 1] += weight
+        return scores
+
+    def label(self, score: float) -> str:
+        if score > self._threshold:
+            return "bullish"
+        if score < -self._threshold:
+            return "bearish"
+        return "neutral"
+
+    def classify(self, text: str) -> str:
+        """Classify a text as bullish, bearish, or neutral."""
+        return self.label(self.score(text))
+
+    def classify_batch(
+        self,
+        texts: Sequence[str],
+        ids: Sequence[Hashable | None] | None = None,
+    ) -> list[str]:
+        """Classify many texts at once.
+
+        When ``ids`` are given (tweet or post IDs), labels are cached per ID
+        and only unseen items are scanned.
+        """
+        if ids is None:
+            return [self.label(s) for s in self.score_batch(texts)]
+
+        labels: list[str | None] = [None] * len(texts)
+        pending: list[int] = []
+        with self._lock:
+            for i, item_id in enumerate(ids):
+                cached = self._cache.get(item_id) if item_id is not None else None
+                if cached is None:
+                    pending.append(i)
+                else:
+                    self._cache.move_to_end(item_id)
+                    labels[i] = cached
+
+        scores = self.score_batch([texts[i] for i in pending])
+        with self._lock:
+            for i, score in zip(pending, scores):
+                labels[i] = self.label(score)
+                if ids[i] is not None:
+                    self._cache[ids[i]] = labels[i]
+            while len(self._cache) > self._cache_size:
+                self._cache.popitem(last=False)
+        return labels  # type: ignore[return-value]
+
+
+def sentiment_ratio(labels: Sequence[str]) -> dict[str, float]:
+    """Share of bullish / bearish / neutral labels."""
+    total = len(labels) or 1
+    return {
+        name: round(sum(1 for label in labels if label == name) / total, 3)
+        for name in ("bullish", "bearish", "neutral")
+    }
+
+
+def _normalize(term: str) -> str:
+    return " ".join(term.lower().split())
+
+
+_default = LexiconClassifier()
+
+
+def classify_sentiment(text: str) -> str:
+    """Classify one text with the default lexicon."""
+    return _default.classify(text)
+
+
+def classify_batch(
+    texts: Sequence[str],
+    ids: Sequence[Hashable | None] | None = None,
+) -> list[str]:
+    """Classify many texts with the default lexicon (cached by ID when given)."""
+    return _default.classify_batch(texts, ids)
@@ -3,77 +3,166 @@
 from __future__ import annotations
 
 import logging
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
 
 import httpx
 
+from cryptoagent.dataflows.social.lexicon import classify_batch, sentiment_ratio
+from cryptoagent.dataflows.social.reddit_store import RedditStore
+
 logger = logging.getLogger(__name__)
 
 _TIMEOUT = 10
 _USER_AGENT = "CryptoAgent/0.2.0 (research bot)"
+_MAX_WORKERS = 4
+_BODY_CHARS = 500  # selftext kept for token matching
+
+
+def _new_client() -> httpx.Client:
+    return httpx.Client(
+        timeout=_TIMEOUT,
+        follow_redirects=True,
+        headers={"User-Agent": _USER_AGENT},
+    )
+
+
+def _normalize(post: dict, subreddit: str) -> dict:
+    """Reduce a Reddit listing entry to the fields we keep, keyed by canonical ID.
+
+    Crossposts take their parent's ID so the same story collapses across subreddits.
+    """
+    parent = post.get("crosspost_parent") or ""
+    return {
+        "id": parent.removeprefix("t3_") or post.get("id", ""),
+        "title": post.get("title", ""),
+        "body": (post.get("selftext") or "")[:_BODY_CHARS],
+        "score": post.get("score", 0),
+        "num_comments": post.get("num_comments", 0),
+        "created_utc": post.get("created_utc", 0),
+        "subreddit": subreddit,
+        "upvote_ratio": post.get("upvote_ratio", 0),
+        "crosspost": bool(parent),
+    }
+
+
+def _token_matcher(token: str):
+    token_lower = token.lower()
+    sol_keywords = [token_lower, "solana"] if token_lower == "sol" else [token_lower]
+
+    def matches(post: dict) -> bool:
+        # For r/solana, include all posts; for others, filter by token mention
+        if post["subreddit"].lower() == "solana":
+            return True
+        combined = f"{post['title']} {post.get('body', '')}".lower()
+        return any(kw in combined for kw in sol_keywords)
+
+    return matches
+
+
+def _fetch_hot(client: httpx.Client, subreddit: str, limit: int) -> list[dict]:
+    resp = client.get(
+        f"https://www.reddit.com/r/{subreddit}/hot.json",
+        params={"limit": limit, "raw_json": 1},
+    )
+    resp.raise_for_status()
+    children = resp.json().get("data", {}).get("children", [])
+    return [_normalize(child.get("data", {}), subreddit) for child in children]
 
 
 def fetch_subreddit_hot(
     subreddit: str,
     token_filter: str = "SOL",
     limit: int = 25,
+    client: httpx.Client | None = None,
 ) -> list[dict]:
     """Fetch hot posts from a subreddit via the public JSON API.
 
     Filters posts that mention the target token (case-insensitive).
     """
-    url = f"https://www.reddit.com/r/{subreddit}/hot.json"
-    headers = {"User-Agent": _USER_AGENT}
-    params = {"limit": limit, "raw_json": 1}
-
     try:
-        with httpx.Client(timeout=_TIMEOUT, follow_redirects=True) as client:
-            resp = client.get(url, headers=headers, params=params)
-            resp.raise_for_status()
-            data = resp.json()
-
-        posts = []
-        token_lower = token_filter.lower()
-        sol_keywords = [token_lower, "solana"] if token_lower == "sol" else [token_lower]
-
-        for child in data.get("data", {}).get("children", []):
-            post = child.get("data", {})
-            title = post.get("title", "")
-            selftext = post.get("selftext", "")
-            combined = f"{title} {selftext}".lower()
-
-            # For r/solana, include all posts; for others, filter by token mention
-            if subreddit.lower() == "solana" or any(kw in combined for kw in sol_keywords):
-                posts.append({
-                    "title": title,
-                    "score": post.get("score", 0),
-                    "num_comments": post.get("num_comments", 0),
-                    "created_utc": post.get("created_utc", 0),
-                    "subreddit": subreddit,
-                    "upvote_ratio": post.get("upvote_ratio", 0),
-                })
-
-        return posts
-
+        if client is not None:
+            posts = _fetch_hot(client, subreddit, limit)
+        else:
+            with _new_client() as own_client:
+                posts = _fetch_hot(own_client, subreddit, limit)
     except Exception as e:
         logger.warning("Reddit fetch for r/%s failed: %s", subreddit, e)
         return []
 
+    matches = _token_matcher(token_filter)
+    return [p for p in posts if matches(p)]
+
+
+def fetch_subreddits(subreddits: list[str], limit: int = 25) -> list[dict]:
+    """Fetch hot posts from several subreddits concurrently, deduplicated.
+
+    One pooled client serves all subreddits. Posts sharing a canonical ID
+    (crossposts, or the same post listed twice) collapse to the copy with
+    the highest engagement, attributed to the original post's subreddit.
+    """
+    if not subreddits:
+        return []
+
+    def fetch(sub: str) -> list[dict]:
+        try:
+            return _fetch_hot(client, sub, limit)
+        except Exception as e:
+            logger.warning("Reddit fetch for r/%s failed: %s", sub, e)
+            return []
+
+    with _new_client() as client:
+        with ThreadPoolExecutor(max_workers=min(_MAX_WORKERS, len(subreddits))) as pool:
+            results = list(pool.map(fetch, subreddits))
+
+    unique: dict[str, dict] = {}
+    for post in (p for posts in results for p in posts):
+        seen = unique.get(post["id"])
+        if seen is None:
+            unique[post["id"]] = post
+            continue
+        original, other = (seen, post) if post["crosspost"] else (post, seen)
+        best = max(seen, post, key=_engagement)
+        unique[post["id"]] = {
+            **original,
+            "score": best["score"],
+            "num_comments": best["num_comments"],
+            "upvote_ratio": best["upvote_ratio"],
+            "crosspost": original["crosspost"] and other["crosspost"],
+        }
+    return list(unique.values())
+
+
+def _engagement(post: dict) -> int:
+    return post["score"] + post["num_comments"]
+
 
 def get_reddit_sentiment(
     subreddits: list[str] | None = None,
     token: str = "SOL",
+    store: RedditStore | None = None,
 ) -> dict:
     """Aggregate Reddit sentiment data from multiple subreddits.
 
     Returns structured dict with posts, volume, and overall tone assessment.
+    With a ``store``, posts are persisted across cycles: the result also
+    reports how many relevant posts are new or updated since the last cycle
+    and a rolling engagement-weighted time series.
     """
     subreddits = subreddits or ["solana", "cryptocurrency"]
-    all_posts: list[dict] = []
-
-    for sub in subreddits:
-        posts = fetch_subreddit_hot(sub, token_filter=token)
-        all_posts.extend(posts)
+    fetched = fetch_subreddits(subreddits)
+
+    matches = _token_matcher(token)
+    all_posts = [p for p in fetched if matches(p)]
+
+    history: dict = {}
+    if store is not None:
+        new_posts, updated_posts = store.upsert(fetched)
+        history = {
+            "new_posts": sum(1 for p in new_posts if matches(p)),
+            "updated_posts": sum(1 for p in updated_posts if matches(p)),
+            "engagement_series": store.engagement_series(matches),
+        }
 
     if not all_posts:
         return {
@@ -84,11 +173,23 @@ def get_reddit_sentiment(
             "overall_tone": "no_data",
             "top_topics": [],
             "note": "No relevant posts found on Reddit",
+            **history,
         }
 
     # Sort by engagement (score + comments)
-    all_posts.sort(key=lambda p: p["score"] + p["num_comments"], reverse=True)
-    top_posts = all_posts[:10]
+    all_posts.sort(key=_engagement, reverse=True)
+    top_posts = [
+        {k: v for k, v in p.items() if k not in ("id", "body", "crosspost")}
+        for p in all_posts[:10]
+    ]
+
+    # Title sentiment; labels are cached per post, so only new posts are scanned
+    title_labels = classify_batch(
+        [p["title"] for p in all_posts],
+        ids=[f"reddit:{p['id']}" for p in all_posts],
+    )
+    for post, label in zip(top_posts, title_labels):
+        post["title_sentiment"] = label
 
     # Simple tone assessment based on upvote ratios and engagement
     avg_upvote_ratio = sum(p["upvote_ratio"] for p in all_posts) / len(all_posts)
@@ -115,4 +216,6 @@ def get_reddit_sentiment(
         "avg_upvote_ratio": round(avg_upvote_ratio, 3),
         "total_engagement": total_score,
         "top_topics": [p["title"][:80] for p in top_posts[:5]],
+        "title_sentiment_ratio": sentiment_ratio(title_labels),
+        **history,
     }
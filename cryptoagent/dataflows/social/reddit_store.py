@@ -0,0 +1,138 @@
+"""Local Reddit post store — dedups posts across cycles and serves engagement time series."""
+
+from __future__ import annotations
+
+import logging
+import time
+from collections.abc import Callable
+from datetime import datetime, timezone
+
+from cryptoagent.persistence.database import Database
+
+logger = logging.getLogger(__name__)
+
+
+class RedditStore:
+    """Persists the latest state of each Reddit post, keyed by canonical post ID.
+
+    Crossposts are stored under their parent's ID, so the same story seen in
+    several subreddits is one row. ``upsert`` reports which posts are new or
+    changed since the last cycle so downstream work runs only on those.
+    """
+
+    def __init__(self, db: Database) -> None:
+        self._db = db
+
+    def upsert(self, posts: list[dict]) -> tuple[list[dict], list[dict]]:
+        """Store posts and return ``(new_posts, updated_posts)``.
+
+        A post counts as updated when its score or comment count changed.
+        Posts must carry ``id``, ``subreddit``, ``title``, ``body``, ``score``,
+        ``num_comments``, ``upvote_ratio`` and ``created_utc``.
+        """
+        if not posts:
+            return [], []
+
+        ids = [p["id"] for p in posts]
+        placeholders = ",".join("?" * len(ids))
+        cursor = self._db.conn.execute(
+            f"SELECT id, score, num_comments FROM reddit_posts WHERE id IN ({placeholders})",
+            tuple(ids),
+        )
+        known = {row["id"]: (row["score"], row["num_comments"]) for row in cursor.fetchall()}
+
+        new_posts = [p for p in posts if p["id"] not in known]
+        updated_posts = [
+            p
+            for p in posts
+            if p["id"] in known and known[p["id"]] != (p["score"], p["num_comments"])
+        ]
+        changed = new_posts + updated_posts
+        if not changed:
+            return [], []
+
+        now = datetime.now(timezone.utc).isoformat()
+        with self._db.transaction() as conn:
+            conn.executemany(
+                """INSERT INTO reddit_posts
+                   (id, subreddit, title, body, score, num_comments, upvote_ratio,
+                    created_utc, first_seen, updated_at)
+                   VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                   ON CONFLICT (id) DO UPDATE SET
+                       score = excluded.score,
+                       num_comments = excluded.num_comments,
+                       upvote_ratio = excluded.upvote_ratio,
+                       updated_at = excluded.updated_at""",
+                [
+                    (
+                        p["id"],
+                        p["subreddit"],
+                        p["title"],
+                        p["body"],
+                        p["score"],
+                        p["num_comments"],
+                        p["upvote_ratio"],
+                        p["created_utc"],
+                        now,
+                        now,
+                    )
+                    for p in changed
+                ],
+            )
+        logger.info("Reddit store: %d new, %d updated posts", len(new_posts), len(updated_posts))
+        return new_posts, updated_posts
+
+    def get_posts(self, since_utc: float) -> list[dict]:
+        """Return stored posts created at or after ``since_utc`` (oldest first)."""
+        cursor = self._db.conn.execute(
+            """SELECT id, subreddit, title, body, score, num_comments, upvote_ratio, created_utc
+               FROM reddit_posts WHERE created_utc >= ? ORDER BY created_utc ASC""",
+            (since_utc,),
+        )
+        return [dict(row) for row in cursor.fetchall()]
+
+    def engagement_series(
+        self,
+        matches: Callable[[dict], bool] | None = None,
+        hours: int = 24,
+        bucket_hours: int = 4,
+        now: float | None = None,
+    ) -> list[dict]:
+        """Rolling engagement-weighted series over the last ``hours``.
+
+        Each bucket reports post count, total engagement (score + comments)
+        and the engagement-weighted upvote ratio of posts created in it.
+        ``matches`` filters posts (e.g. by token mention).
+        """
+        now = now if now is not None else time.time()
+        bucket_secs = bucket_hours * 3600
+        n_buckets = max(1, hours // bucket_hours)
+        start = now - n_buckets * bucket_secs
+
+        buckets = [
+            {"posts": 0, "engagement": 0, "_weighted": 0.0, "_weight": 0}
+            for _ in range(n_buckets)
+        ]
+        for post in self.get_posts(start):
+            if matches is not None and not matches(post):
+                continue
+            idx = min(int((post["created_utc"] - start) // bucket_secs), n_buckets - 1)
+            engagement = max(post["score"], 0) + post["num_comments"]
+            bucket = buckets[idx]
+            bucket["posts"] += 1
+            bucket["engagement"] += engagement
+            # +1 so zero-engagement posts still count toward the ratio
+            bucket["_weighted"] += (engagement + 1) * post["upvote_ratio"]
+            bucket["_weight"] += engagement + 1
+
+        series = []
+        for i, bucket in enumerate(buckets):
+            weight = bucket.pop("_weight")
+            weighted = bucket.pop("_weighted")
+            bucket_start = datetime.fromtimestamp(start + i * bucket_secs, tz=timezone.utc)
+            series.append({
+                "start": bucket_start.isoformat(),
+                **bucket,
+                "weighted_upvote_ratio": round(weighted / weight, 3) if weight else None,
+            })
+        return series
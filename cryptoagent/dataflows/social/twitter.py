@@ -7,6 +7,8 @@ from datetime import datetime, timezone
 
 import httpx
 
+from cryptoagent.dataflows.social.lexicon import classify_batch, sentiment_ratio
+
 logger = logging.getLogger(__name__)
 
 _TIMEOUT = 15
@@ -31,6 +33,7 @@ class ScrapingBackend:
             tweets = data if isinstance(data, list) else data.get("tweets", [])
             return [
                 {
+                    "id": t.get("id") or t.get("id_str"),
                     "text": t.get("text", t.get("content", "")),
                     "likes": t.get("likes", t.get("favorite_count", 0)),
                     "retweets": t.get("retweets", t.get("retweet_count", 0)),
@@ -68,6 +71,7 @@ class OfficialBackend:
             for t in data.get("data", []):
                 metrics = t.get("public_metrics", {})
                 tweets.append({
+                    "id": t.get("id"),
                     "text": t.get("text", ""),
                     "likes": metrics.get("like_count", 0),
                     "retweets": metrics.get("retweet_count", 0),
@@ -79,22 +83,6 @@ class OfficialBackend:
             return []
 
 
-def _classify_sentiment(text: str) -> str:
-    """Simple keyword-based sentiment classification."""
-    text_lower = text.lower()
-    bullish_words = ["moon", "bullish", "pump", "buy", "long", "breakout", "ath", "rally", "gains"]
-    bearish_words = ["dump", "bearish", "crash", "sell", "short", "rug", "scam", "dead", "rekt"]
-
-    bull_score = sum(1 for w in bullish_words if w in text_lower)
-    bear_score = sum(1 for w in bearish_words if w in text_lower)
-
-    if bull_score > bear_score:
-        return "bullish"
-    elif bear_score > bull_score:
-        return "bearish"
-    return "neutral"
-
-
 def get_twitter_sentiment(
     token: str = "SOL",
     bearer_token: str = "",
@@ -142,13 +130,12 @@ def get_twitter_sentiment(
         }
 
     # Classify sentiment
-    sentiments = [_classify_sentiment(t["text"]) for t in tweets]
+    sentiments = classify_batch(
+        [t["text"] for t in tweets],
+        ids=[f"tweet:{t['id']}" if t.get("id") else None for t in tweets],
+    )
     total = len(sentiments)
-    ratio = {
-        "bullish": round(sentiments.count("bullish") / total, 3),
-        "bearish": round(sentiments.count("bearish") / total, 3),
-        "neutral": round(sentiments.count("neutral") / total, 3),
-    }
+    ratio = sentiment_ratio(sentiments)
 
     # Top tweets by engagement
     tweets.sort(key=lambda t: t.get("likes", 0) + t.get("retweets", 0), reverse=True)
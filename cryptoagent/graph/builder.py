@@ -2,21 +2,32 @@
 
 from __future__ import annotations
 
+import asyncio
+import copy
 import json
 import logging
+import uuid
+from collections.abc import Iterable
 from datetime import datetime, timezone
+from functools import partial
+from typing import TYPE_CHECKING
 
-from langgraph.graph import END, START, StateGraph
-
-from cryptoagent.agents.brain import brain_node
-from cryptoagent.agents.macro import macro_node
-from cryptoagent.agents.research import research_node
-from cryptoagent.agents.sentiment import sentiment_node
+from cryptoagent.agents.brain import abrain_node, brain_node
+from cryptoagent.agents.macro import amacro_node, macro_node
+from cryptoagent.agents.research import aresearch_node, research_node
+from cryptoagent.agents.sentiment import asentiment_node, sentiment_node
 from cryptoagent.agents.trader import trader_node
 from cryptoagent.config import AgentConfig
 from cryptoagent.dataflows.aggregator import DataAggregator
 from cryptoagent.graph.state import AgentState
+from cryptoagent.llm.accounting import cycle_scope, set_call_sink
+from cryptoagent.llm.cache import LLMCache
+from cryptoagent.llm.client import configure_cache, configure_concurrency, preload_litellm
+from cryptoagent.llm.fake import configure_fake
+from cryptoagent.llm.router import configure_fallbacks
+from cryptoagent.llm.scheduler import configure_scheduler
 from cryptoagent.persistence.database import Database
+from cryptoagent.persistence.llm_call_log import LLMCallLog
 from cryptoagent.persistence.trade_logger import TradeLogger
 from cryptoagent.reflection.manager import ReflectionManager
 from cryptoagent.risk.sentinel import RiskSentinel
@@ -25,10 +36,14 @@ from cryptoagent.signals.extractor import extract_signals
 from cryptoagent.signals.logger import SignalLogger
 from cryptoagent.signals.report import generate_signal_report
 
+if TYPE_CHECKING:
+    from langgraph.graph import StateGraph
+    from langgraph.graph.state import CompiledStateGraph
+
 logger = logging.getLogger(__name__)
 
 
-def build_graph() -> StateGraph:
+def build_graph(use_async: bool = False, aggregator: DataAggregator | None = None) -> StateGraph:
     """Build the 5-agent trading pipeline.
 
     Flow:
@@ -36,13 +51,26 @@ def build_graph() -> StateGraph:
         START ──┬─┼── sentiment ─┼── brain ── trader ── END
                   └── macro ─────┘
     Research, Sentiment, and Macro run in parallel. All three must complete before Brain.
+
+    With ``use_async``, the analyst and Brain nodes are coroutines awaiting
+    ``acall_llm``; compile and run the graph with ``ainvoke``. The Trader
+    node stays synchronous and runs in LangGraph's executor.
+
+    ``aggregator`` is shared by the three data-collecting nodes; without one
+    each node call opens (and closes) its own.
     """
+    # LangGraph takes about a second to import; only pay for it when a graph is built
+    from langgraph.graph import END, START, StateGraph
+
     graph = StateGraph(AgentState)
 
-    graph.add_node("research", research_node)
-    graph.add_node("sentiment", sentiment_node)
-    graph.add_node("macro", macro_node)
-    graph.add_node("brain", brain_node)
+    def collector(node):
+        return node if aggregator is None else partial(node, aggregator=aggregator)
+
+    graph.add_node("research", collector(aresearch_node if use_async else research_node))
+    graph.add_node("sentiment", collector(asentiment_node if use_async else sentiment_node))
+    graph.add_node("macro", collector(amacro_node if use_async else macro_node))
+    graph.add_node("brain", abrain_node if use_async else brain_node)
     graph.add_node("trader", trader_node)
 
     # Fan-out: START → Research + Sentiment + Macro in parallel
@@ -67,17 +95,46 @@ class TradingGraph:
 
     def __init__(self, config: AgentConfig | None = None) -> None:
         self.config = config or AgentConfig()
-        self._graph = build_graph().compile()
+        self._graphs: dict[bool, CompiledStateGraph] = {}
+        configure_concurrency(
+            self.config.llm_max_concurrency,
+            self.config.llm_provider_concurrency,
+        )
+        cache_modes = {self.config.llm_cache_mode, *self.config.llm_cache_agent_modes.values()}
+        cache = None
+        if cache_modes != {"off"}:
+            cache = LLMCache(
+                self.config.llm_cache_path,
+                max_entries=self.config.llm_cache_max_entries,
+                max_bytes=self.config.llm_cache_max_mb * 1_000_000,
+            )
+        configure_cache(cache, self.config.llm_cache_mode, self.config.llm_cache_agent_modes)
+        configure_fallbacks(
+            self.config.llm_fallback_models,
+            self.config.llm_hedge_min_s,
+            self.config.llm_hedge_default_s,
+        )
+        configure_scheduler(
+            self.config.llm_rate_limits,
+            self.config.llm_agent_priorities,
+            self.config.llm_max_retries,
+            self.config.llm_backoff_base_s,
+        )
+        configure_fake(self.config.llm_fake_seed)
 
         # Phase 2: persistence + risk + reflection
         db_target = self.config.database_url or self.config.db_path
         self._db = Database(db_target)
         self._trade_logger = TradeLogger(self._db)
+        self._llm_calls = LLMCallLog(self._db)
+        set_call_sink(self._llm_calls.record)
         self._reflection_mgr = ReflectionManager(
             db=self._db,
             model=self.config.reflection_model,
             cycle_length=self.config.reflection_cycle_length,
         )
+        if self.config.reflection_mode == "deferred":
+            self._reflection_mgr.start_worker()
         self._signal_logger = SignalLogger(self._db)
         self._risk_sentinel = RiskSentinel(
             max_daily_loss_pct=self.config.max_daily_loss_pct,
@@ -88,8 +145,27 @@ class TradingGraph:
         self._aggregator = DataAggregator(
             exchange=self.config.exchange,
             config=self.config,
+            db=self._db,
         )
 
+    def _compiled(self, use_async: bool) -> CompiledStateGraph:
+        """The compiled sync or async pipeline, built on first use."""
+        if use_async not in self._graphs:
+            graph = build_graph(use_async=use_async, aggregator=self._aggregator)
+            self._graphs[use_async] = graph.compile()
+        return self._graphs[use_async]
+
+    def warm_up(self) -> None:
+        """Compile both pipelines and import LiteLLM ahead of the first cycle.
+
+        All of it otherwise happens lazily, inside the first ``run``/``arun``;
+        long-running callers that care about first-cycle latency call this
+        once after construction.
+        """
+        self._compiled(use_async=False)
+        self._compiled(use_async=True)
+        preload_litellm()
+
     def run(
         self,
         token: str | None = None,
@@ -100,8 +176,68 @@ class TradingGraph:
 
         Pre-pipeline: load reflections, risk pre-check, compute regime.
         Pipeline: 5-agent graph.
-        Post-pipeline: risk post-check, log trade, generate reflections.
+        Post-pipeline: risk post-check, log trade, generate (or, with
+        ``reflection_mode="deferred"``, queue) reflections.
         """
+        initial_state, halted = self._pre_pipeline(token, portfolio_state, reflection_memory)
+        if halted:
+            return initial_state
+
+        # --- RUN PIPELINE ---
+        with cycle_scope(initial_state["cycle_id"], initial_state["token"]):
+            logger.info("Starting trading pipeline for %s", initial_state["token"])
+            result = self._compiled(use_async=False).invoke(initial_state)
+            logger.info("Pipeline complete for %s", initial_state["token"])
+
+            return self._post_pipeline(initial_state, result)
+
+    async def arun(
+        self,
+        token: str | None = None,
+        portfolio_state: dict | None = None,
+        reflection_memory: list[str] | None = None,
+    ) -> AgentState:
+        """Async ``run``: LLM calls await on the event loop.
+
+        Pre- and post-pipeline steps (database, regime fetch, reflections)
+        run in worker threads, so many tokens can share one loop.
+        """
+        initial_state, halted = await asyncio.to_thread(
+            self._pre_pipeline, token, portfolio_state, reflection_memory
+        )
+        if halted:
+            return initial_state
+
+        with cycle_scope(initial_state["cycle_id"], initial_state["token"]):
+            logger.info("Starting async trading pipeline for %s", initial_state["token"])
+            result = await self._compiled(use_async=True).ainvoke(initial_state)
+            logger.info("Pipeline complete for %s", initial_state["token"])
+
+            return await asyncio.to_thread(self._post_pipeline, initial_state, result)
+
+    async def arun_many(
+        self,
+        tokens: Iterable[str],
+        portfolio_state: dict | None = None,
+    ) -> dict[str, AgentState]:
+        """Run the pipeline for several tokens concurrently from one event loop.
+
+        Each token gets its own copy of ``portfolio_state``. LLM concurrency
+        is bounded per provider (``llm_max_concurrency``).
+        """
+        tokens = [t.upper() for t in tokens]
+        results = await asyncio.gather(
+            *(self.arun(token, copy.deepcopy(portfolio_state)) for token in tokens)
+        )
+        return dict(zip(tokens, results))
+
+    def _pre_pipeline(
+        self,
+        token: str | None,
+        portfolio_state: dict | None,
+        reflection_memory: list[str] | None,
+    ) -> tuple[AgentState, bool]:
+        """Build the initial state. Returns ``(state, halted)``; a halted state is final."""
         token = token or self.config.target_token
 
         if portfolio_state is None:
@@ -155,6 +291,7 @@ class TradingGraph:
             "token": token.upper(),
             "asset_type": self.config.asset_type,
             "timestamp": datetime.now(timezone.utc).isoformat(),
+            "cycle_id": uuid.uuid4().hex,
             "research_report": "",
             "sentiment_report": "",
             "brain_decision": "",
@@ -196,14 +333,15 @@ class TradingGraph:
                     "brain_decision": json.loads(hold_decision),
                 }
             )
-            return initial_state
+            return initial_state, True
 
-        # --- RUN PIPELINE ---
-        logger.info("Starting trading pipeline for %s", token.upper())
-        result = self._graph.invoke(initial_state)
-        logger.info("Pipeline complete for %s", token.upper())
+        return initial_state, False
 
-        # --- POST-PIPELINE ---
+    def _post_pipeline(self, initial_state: AgentState, result: AgentState) -> AgentState:
+        """Log the trade and signals, and generate reflections."""
+        token = initial_state["token"]
+        market_regime = initial_state["market_regime"]
+        regime_confidence = initial_state["regime_confidence"]
 
         # 5. Parse brain decision for post-checks
         try:
@@ -237,29 +375,44 @@ class TradingGraph:
         except Exception as e:
             logger.warning("Signal extraction/logging failed: %s", e)
 
-        # 7. Generate Level 1 reflection
+        # 7. Generate Level 1 reflection (deferred: queue it, carry the template summary)
         regime = brain_decision.get("regime", market_regime)
-        l1_reflection = self._reflection_mgr.generate_level1(
-            brain_decision=brain_decision,
-            trade_result=trade_result,
-            regime=regime,
-        )
+        if self.config.reflection_mode == "deferred":
+            l1_reflection = self._reflection_mgr.defer(
+                brain_decision=brain_decision,
+                trade_result=trade_result,
+                regime=regime,
+            )
+        else:
+            l1_reflection = self._reflection_mgr.generate_level1(
+                brain_decision=brain_decision,
+                trade_result=trade_result,
+                regime=regime,
+            )
 
         # Append to in-memory reflection list for carry-forward
         memory = list(result.get("reflection_memory", []))
         memory.append(l1_reflection)
         result["reflection_memory"] = memory
 
-        # 8. Maybe generate Level 2 reflection
-        self._reflection_mgr.maybe_generate_level2(regime=regime)
+        # 8. Maybe generate Level 2 reflection (deferred: the worker does it)
+        if self.config.reflection_mode != "deferred":
+            self._reflection_mgr.maybe_generate_level2(regime=regime)
 
         # Store pipeline metadata
         result["market_regime"] = market_regime
         result["regime_confidence"] = regime_confidence
-        result["risk_verdict"] = risk_verdict
+        result["risk_verdict"] = initial_state["risk_verdict"]
 
         return result
 
+    def llm_usage(self, cycle_id: str) -> list[dict]:
+        """Per-agent LLM tokens, cost, and latency for one cycle (see ``AgentState.cycle_id``)."""
+        return self._llm_calls.cycle_breakdown(cycle_id)
+
     def close(self) -> None:
-        """Close the database connection."""
+        """Finish queued reflections and close the database connection."""
+        self._reflection_mgr.stop_worker()
+        set_call_sink(None)
+        self._aggregator.close()
         self._db.close()
@@ -26,6 +26,7 @@ class AgentState(TypedDict, total=False):
     token: str
     asset_type: str  # "crypto" | "equity"
     timestamp: str
+    cycle_id: str  # Tags this cycle's LLM calls in the llm_calls table
 
     # Agent outputs
     research_report: str
@@ -0,0 +1,112 @@
+"""Per-call LLM accounting: tokens, cost, and latency tagged with agent and cycle.
+
+The client reports every call through ``record_call``; the current cycle
+id and token come from a context variable set by ``cycle_scope``, so agents
+do not have to thread them through. Context variables follow LangGraph's
+worker threads and ``asyncio`` tasks, so concurrent cycles stay separate.
+"""
+
+from __future__ import annotations
+
+import logging
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import datetime, timezone
+
+logger = logging.getLogger(__name__)
+
+_cycle: ContextVar[tuple[str, str] | None] = ContextVar("llm_cycle", default=None)
+_sink: Callable[[dict], None] | None = None
+
+
+def set_call_sink(sink: Callable[[dict], None] | None) -> None:
+    """Install the callable that receives one dict per LLM call (None disables)."""
+    global _sink
+    _sink = sink
+
+
+@contextmanager
+def cycle_scope(cycle_id: str, token: str) -> Iterator[None]:
+    """Tag every LLM call made inside the block with ``cycle_id`` and ``token``."""
+    reset = _cycle.set((cycle_id, token))
+    try:
+        yield
+    finally:
+        _cycle.reset(reset)
+
+
+def _usage_field(usage, name: str) -> int:
+    if usage is None:
+        return 0
+    value = usage.get(name) if isinstance(usage, dict) else getattr(usage, name, None)
+    return int(value or 0)
+
+
+def _cached_prompt_tokens(usage) -> int:
+    """Prompt tokens served from the provider's prefix cache.
+
+    OpenAI-style usage reports them under ``prompt_tokens_details``;
+    Anthropic reports ``cache_read_input_tokens``.
+    """
+    if usage is None:
+        return 0
+    details = (
+        usage.get("prompt_tokens_details")
+        if isinstance(usage, dict)
+        else getattr(usage, "prompt_tokens_details", None)
+    )
+    if details is not None:
+        cached = _usage_field(details, "cached_tokens")
+        if cached:
+            return cached
+    return _usage_field(usage, "cache_read_input_tokens")
+
+
+def _cost(response) -> float:
+    import litellm
+
+    try:
+        return float(litellm.completion_cost(completion_response=response) or 0.0)
+    except Exception:
+        # Unknown or local models have no price entry
+        return 0.0
+
+
+def record_call(
+    agent: str | None,
+    model: str,
+    response,
+    latency_s: float,
+    cached: bool = False,
+    decision_latency_s: float | None = None,
+) -> None:
+    """Report one call to the installed sink. Never raises.
+
+    ``response`` is the LiteLLM response, or None for a cache hit (which
+    costs nothing and uses no provider tokens). ``decision_latency_s`` is
+    the time until a streamed call's decision fields were usable.
+    """
+    if _sink is None:
+        return
+    cycle_id, token = _cycle.get() or (None, None)
+    usage = getattr(response, "usage", None)
+    try:
+        _sink({
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "cycle_id": cycle_id,
+            "token": token,
+            "agent": agent or "unknown",
+            "model": model,
+            "prompt_tokens": _usage_field(usage, "prompt_tokens"),
+            "cached_prompt_tokens": _cached_prompt_tokens(usage),
+            "completion_tokens": _usage_field(usage, "completion_tokens"),
+            "cost_usd": 0.0 if response is None else _cost(response),
+            "latency_ms": round(latency_s * 1000, 1),
+            "decision_ms": (
+                None if decision_latency_s is None else round(decision_latency_s * 1000, 1)
+            ),
+            "cached": cached,
+        })
+    except Exception as e:
+        logger.warning("LLM call accounting failed: %s", e)
@@ -0,0 +1,155 @@
+"""Content-addressed LLM response cache persisted in SQLite.
+
+Responses are keyed by a SHA-256 of every input that affects the output,
+so identical prompts (reflections on HOLD cycles, backtest replays, re-runs
+after a crash) are answered from disk instead of the provider.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Literal
+
+logger = logging.getLogger(__name__)
+
+CacheMode = Literal["off", "read", "readwrite"]
+MODES: tuple[str, ...] = ("off", "read", "readwrite")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS llm_cache (
+    key TEXT PRIMARY KEY,
+    model TEXT NOT NULL,
+    response TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    created_at REAL NOT NULL,
+    last_used REAL NOT NULL,
+    hits INTEGER NOT NULL DEFAULT 0
+);
+
+CREATE INDEX IF NOT EXISTS idx_llm_cache_last_used ON llm_cache (last_used);
+"""
+
+
+def cache_key(
+    model: str,
+    system: str,
+    user: str,
+    temperature: float,
+    response_format: dict | None,
+    max_tokens: int,
+) -> str:
+    """SHA-256 over the canonical JSON encoding of the request inputs."""
+    payload = json.dumps(
+        [model, system, user, temperature, response_format, max_tokens],
+        sort_keys=True,
+        separators=(",", ":"),
+    )
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+class LLMCache:
+    """SQLite-backed response cache with LRU eviction by entry count and total size.
+
+    Entry count and total bytes are tracked in memory, so eviction checks
+    cost nothing on the hot path. When either limit is exceeded, the least
+    recently used entries are removed until the cache is back under 90%.
+    """
+
+    def __init__(
+        self,
+        path: str = "data/llm_cache.db",
+        max_entries: int = 10_000,
+        max_bytes: int = 100_000_000,
+    ) -> None:
+        self._max_entries = max_entries
+        self._max_bytes = max_bytes
+        self._lock = threading.Lock()
+        if path != ":memory:":
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(_SCHEMA)
+        self._conn.commit()
+        count, size = self._conn.execute(
+            "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM llm_cache"
+        ).fetchone()
+        self._count = count
+        self._bytes = size
+
+    def get(self, key: str) -> str | None:
+        """Return the cached response for ``key`` and mark it recently used."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT response FROM llm_cache WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            self._conn.execute(
+                "UPDATE llm_cache SET last_used = ?, hits = hits + 1 WHERE key = ?",
+                (time.time(), key),
+            )
+            self._conn.commit()
+            return row[0]
+
+    def put(self, key: str, model: str, response: str) -> None:
+        """Store a response, evicting least recently used entries if over a limit."""
+        size = len(response.encode())
+        now = time.time()
+        with self._lock:
+            old = self._conn.execute(
+                "SELECT size FROM llm_cache WHERE key = ?", (key,)
+            ).fetchone()
+            self._conn.execute(
+                """INSERT INTO llm_cache (key, model, response, size, created_at, last_used)
+                   VALUES (?, ?, ?, ?, ?, ?)
+                   ON CONFLICT (key) DO UPDATE SET
+                       response = excluded.response,
+                       size = excluded.size,
+                       last_used = excluded.last_used""",
+                (key, model, response, size, now, now),
+            )
+            if old is None:
+                self._count += 1
+                self._bytes += size
+            else:
+                self._bytes += size - old[0]
+            if self._count > self._max_entries or self._bytes > self._max_bytes:
+                self._evict_locked()
+            self._conn.commit()
+
+    def _evict_locked(self) -> None:
+        target_count = int(self._max_entries * 0.9)
+        target_bytes = int(self._max_bytes * 0.9)
+        cursor = self._conn.execute("SELECT key, size FROM llm_cache ORDER BY last_used ASC")
+        doomed: list[tuple[str]] = []
+        for key, size in cursor:
+            if self._count <= target_count and self._bytes <= target_bytes:
+                break
+            doomed.append((key,))
+            self._count -= 1
+            self._bytes -= size
+        self._conn.executemany("DELETE FROM llm_cache WHERE key = ?", doomed)
+        logger.info("LLM cache: evicted %d entries", len(doomed))
+
+    def stats(self) -> dict:
+        """Entry count, total size, and lifetime hits."""
+        with self._lock:
+            hits = self._conn.execute("SELECT COALESCE(SUM(hits), 0) FROM llm_cache").fetchone()
+            return {"entries": self._count, "bytes": self._bytes, "hits": hits[0]}
+
+    def clear(self) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM llm_cache")
+            self._conn.commit()
+            self._count = 0
+            self._bytes = 0
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
@@ -2,15 +2,212 @@
 
 from __future__ import annotations
 
+import asyncio
 import json
 import logging
+import threading
+import time
+import weakref
+from collections.abc import Awaitable, Callable, Iterable
+from functools import lru_cache
+from typing import TYPE_CHECKING
 
-import litellm
+from cryptoagent.dataflows.jsonstream import ObjectFeed
+from cryptoagent.llm import fake, scheduler
+from cryptoagent.llm.accounting import record_call
+from cryptoagent.llm.cache import MODES, LLMCache, cache_key
+from cryptoagent.llm.prompt import estimate_tokens
+from cryptoagent.llm.router import arun_chain, chain_for, run_chain
+
+if TYPE_CHECKING:
+    from pydantic import BaseModel
 
 logger = logging.getLogger(__name__)
 
-# Suppress noisy LiteLLM logs
-litellm.suppress_debug_info = True
+
+_JSON_INSTRUCTION = "\n\nYou MUST respond with valid JSON only. No markdown, no explanation."
+_SCHEMA_INSTRUCTION = "\nThe JSON object must match this JSON Schema:\n"
+
+_DEFAULT_CONCURRENCY = 8
+_concurrency: dict[str, int] = {}  # per-provider overrides
+_default_concurrency = _DEFAULT_CONCURRENCY
+# One semaphore per (event loop, provider); asyncio primitives are loop-bound
+_semaphores: weakref.WeakKeyDictionary[
+    asyncio.AbstractEventLoop, dict[str, asyncio.Semaphore]
+] = weakref.WeakKeyDictionary()
+
+
+def _litellm():
+    """LiteLLM, imported on first use: importing it takes seconds."""
+    import litellm
+
+    # Suppress noisy LiteLLM logs
+    litellm.suppress_debug_info = True
+    return litellm
+
+
+def preload_litellm() -> None:
+    """Import LiteLLM now rather than in the first call (which may be on an event loop)."""
+    _litellm()
+
+
+def configure_concurrency(default: int, per_provider: dict[str, int] | None = None) -> None:
+    """Set the maximum number of in-flight async LLM calls per provider.
+
+    Args:
+        default: Limit for providers without an explicit entry.
+        per_provider: Overrides keyed by LiteLLM provider prefix (e.g. {"openai": 16}).
+
+    Applies to semaphores created afterwards, i.e. to new event loops.
+    """
+    global _default_concurrency
+    _default_concurrency = max(1, default)
+    _concurrency.clear()
+    _concurrency.update({k.lower(): max(1, v) for k, v in (per_provider or {}).items()})
+
+
+# Response cache: off unless configured; modes are "off", "read", or "readwrite" per agent
+_cache: LLMCache | None = None
+_cache_default_mode = "off"
+_cache_modes: dict[str, str] = {}
+
+
+def configure_cache(
+    cache: LLMCache | None,
+    default_mode: str = "off",
+    per_agent: dict[str, str] | None = None,
+) -> None:
+    """Install the response cache and its per-agent modes.
+
+    Args:
+        cache: The cache to use, or None to disable caching.
+        default_mode: Mode for agents without an explicit entry.
+        per_agent: Overrides keyed by agent name (e.g. {"reflection": "readwrite"}).
+            "read" serves cached responses but never writes new ones.
+    """
+    global _cache, _cache_default_mode
+    modes = {k.lower(): v for k, v in (per_agent or {}).items()}
+    for mode in (default_mode, *modes.values()):
+        if mode not in MODES:
+            raise ValueError(f"Unknown LLM cache mode {mode!r}; expected one of {MODES}")
+    _cache = cache
+    _cache_default_mode = default_mode
+    _cache_modes.clear()
+    _cache_modes.update(modes)
+
+
+def _cache_mode(agent: str | None) -> str:
+    if _cache is None:
+        return "off"
+    return _cache_modes.get((agent or "").lower(), _cache_default_mode)
+
+
+def _cached(agent: str | None, kwargs: dict) -> tuple[str | None, str | None]:
+    """Return ``(key, cached_response)``; key is None when caching is off for ``agent``."""
+    if _cache_mode(agent) == "off":
+        return None, None
+    key = cache_key(
+        kwargs["model"],
+        _text(kwargs["messages"][0]["content"]),
+        _text(kwargs["messages"][1]["content"]),
+        kwargs["temperature"],
+        kwargs.get("response_format"),
+        kwargs["max_tokens"],
+    )
+    cached = _cache.get(key)
+    if cached is not None:
+        logger.info("LLM cache hit: model=%s agent=%s", kwargs["model"], agent)
+    return key, cached
+
+
+def _remember(agent: str | None, key: str | None, model: str, content: str) -> None:
+    if key is not None and content and _cache_mode(agent) == "readwrite":
+        _cache.put(key, model, content)
+
+
+def _provider(model: str) -> str:
+    """LiteLLM provider prefix of a model string ("openai/gpt-4o" -> "openai")."""
+    return model.split("/", 1)[0].lower() if "/" in model else "default"
+
+
+def _semaphore(model: str) -> asyncio.Semaphore:
+    loop = asyncio.get_running_loop()
+    per_loop = _semaphores.setdefault(loop, {})
+    provider = _provider(model)
+    if provider not in per_loop:
+        limit = _concurrency.get(provider, _default_concurrency)
+        per_loop[provider] = asyncio.Semaphore(limit)
+    return per_loop[provider]
+
+
+def _explicit_cache_hints(model: str) -> bool:
+    """Whether ``model`` only caches prompt prefixes marked with ``cache_control``.
+
+    OpenAI and DeepSeek cache long prefixes automatically; Anthropic models
+    (direct, or through Bedrock/Vertex/OpenRouter) need explicit breakpoints.
+    """
+    return model.startswith("anthropic/") or "claude" in model.lower()
+
+
+def _text(content: str | list) -> str:
+    """Plain text of a message's content, whether a string or content blocks."""
+    if isinstance(content, str):
+        return content
+    return "\n\n".join(block["text"] for block in content)
+
+
+def _estimate(kwargs: dict) -> int:
+    """Tokens a request counts against TPM limits: prompt estimate plus max_tokens."""
+    prompt = sum(estimate_tokens(_text(m["content"])) for m in kwargs["messages"])
+    return prompt + kwargs["max_tokens"]
+
+
+def _completion_kwargs(
+    model: str,
+    system: str,
+    prefix: str,
+    user: str,
+    temperature: float,
+    response_format: dict | None,
+    max_tokens: int,
+) -> dict:
+    if _provider(model) == fake.PROVIDER:
+        fake.register()
+    if _explicit_cache_hints(model):
+        # Mark the end of each stable block so the provider caches up to it
+        cached = {"cache_control": {"type": "ephemeral"}}
+        user_content: str | list = [{"type": "text", "text": user}]
+        if prefix:
+            user_content.insert(0, {"type": "text", "text": prefix, **cached})
+        messages = [
+            {"role": "system", "content": [{"type": "text", "text": system, **cached}]},
+            {"role": "user", "content": user_content},
+        ]
+    else:
+        messages = [
+            {"role": "system", "content": system},
+            {"role": "user", "content": f"{prefix}\n\n{user}" if prefix else user},
+        ]
+
+    kwargs: dict = {
+        "model": model,
+        "messages": messages,
+        "temperature": temperature,
+        "max_tokens": max_tokens,
+    }
+    if response_format is not None:
+        kwargs["response_format"] = response_format
+    return kwargs
+
+
+def _content(response, model: str) -> str:
+    content = response.choices[0].message.content or ""
+    logger.info(
+        "LLM response: model=%s usage=%s",
+        model,
+        response.usage,
+    )
+    return content
 
 
 def call_llm(
@@ -18,72 +215,540 @@ def call_llm(
     system: str,
     user: str,
     *,
+    prefix: str = "",
     temperature: float = 0.3,
     response_format: dict | None = None,
     max_tokens: int = 4096,
+    agent: str | None = None,
 ) -> str:
     """Universal LLM call via LiteLLM. Works with any provider.
 
     Args:
         model: LiteLLM model string (e.g. "openai/gpt-4o-mini", "anthropic/claude-sonnet-4-20250514")
         system: System prompt
-        user: User prompt
+        user: User prompt; the part that changes on every call
+        prefix: Slowly changing context (reflections, macro data) sent after
+            the system prompt and ahead of ``user``, so providers that cache
+            prompt prefixes can reuse it across calls
         temperature: Sampling temperature
         response_format: Optional JSON mode ({"type": "json_object"})
         max_tokens: Maximum response tokens
+        agent: Calling agent's name; selects its response-cache mode and
+            fallback chain (see ``router.configure_fallbacks``)
 
     Returns:
         The model's response text.
     """
-    messages = [
-        {"role": "system", "content": system},
-        {"role": "user", "content": user},
-    ]
+    return run_chain(
+        chain_for(agent, model),
+        lambda m: _complete(
+            m, system, prefix, user, temperature, response_format, max_tokens, agent
+        ),
+    )
 
-    kwargs: dict = {
-        "model": model,
-        "messages": messages,
-        "temperature": temperature,
-        "max_tokens": max_tokens,
-    }
-    if response_format is not None:
-        kwargs["response_format"] = response_format
+
+def _complete(
+    model: str,
+    system: str,
+    prefix: str,
+    user: str,
+    temperature: float,
+    response_format: dict | None,
+    max_tokens: int,
+    agent: str | None,
+) -> str:
+    kwargs = _completion_kwargs(
+        model, system, prefix, user, temperature, response_format, max_tokens
+    )
+    start = time.perf_counter()
+    key, cached = _cached(agent, kwargs)
+    if cached is not None:
+        record_call(agent, model, None, time.perf_counter() - start, cached=True)
+        return cached
 
     logger.info("Calling LLM: model=%s tokens=%d", model, max_tokens)
 
-    response = litellm.completion(**kwargs)
-    content = response.choices[0].message.content or ""
+    response, start = scheduler.run(
+        agent, model, _estimate(kwargs), lambda: _litellm().completion(**kwargs)
+    )
+    record_call(agent, model, response, time.perf_counter() - start)
+    content = _content(response, model)
+    _remember(agent, key, model, content)
+    return content
 
-    logger.info(
-        "LLM response: model=%s usage=%s",
-        model,
-        response.usage,
+
+async def acall_llm(
+    model: str,
+    system: str,
+    user: str,
+    *,
+    prefix: str = "",
+    temperature: float = 0.3,
+    response_format: dict | None = None,
+    max_tokens: int = 4096,
+    agent: str | None = None,
+) -> str:
+    """Async ``call_llm`` via ``litellm.acompletion``.
+
+    In-flight calls are bounded per provider (see ``configure_concurrency``),
+    so many tokens' agents can share one event loop without overrunning a
+    provider.
+    """
+    return await arun_chain(
+        chain_for(agent, model),
+        lambda m: _acomplete(
+            m, system, prefix, user, temperature, response_format, max_tokens, agent
+        ),
     )
+
+
+async def _acomplete(
+    model: str,
+    system: str,
+    prefix: str,
+    user: str,
+    temperature: float,
+    response_format: dict | None,
+    max_tokens: int,
+    agent: str | None,
+) -> str:
+    kwargs = _completion_kwargs(
+        model, system, prefix, user, temperature, response_format, max_tokens
+    )
+    start = time.perf_counter()
+    key, cached = _cached(agent, kwargs)
+    if cached is not None:
+        record_call(agent, model, None, time.perf_counter() - start, cached=True)
+        return cached
+
+    async with _semaphore(model):
+        logger.info("Calling LLM (async): model=%s tokens=%d", model, max_tokens)
+        # Latency excludes time spent waiting for the semaphore and rate limits
+        response, start = await scheduler.arun(
+            agent, model, _estimate(kwargs), lambda: _litellm().acompletion(**kwargs)
+        )
+    record_call(agent, model, response, time.perf_counter() - start)
+    content = _content(response, model)
+    _remember(agent, key, model, content)
     return content
 
 
+@lru_cache(maxsize=64)
+def _supports_schema(model: str) -> bool:
+    """Whether ``model`` accepts a JSON Schema as its response format."""
+    try:
+        return _litellm().supports_response_schema(model=model)
+    except Exception:
+        return False
+
+
+def _json_request(
+    model: str, system: str, schema: type[BaseModel] | None
+) -> tuple[str, dict]:
+    """System prompt and ``response_format`` for a JSON call to ``model``.
+
+    Models that support it get ``schema`` as a native structured-output
+    format; the rest get plain JSON mode with the schema spelled out in the
+    system prompt.
+    """
+    system = system + _JSON_INSTRUCTION
+    if schema is None:
+        return system, {"type": "json_object"}
+    json_schema = schema.model_json_schema()
+    if _supports_schema(model):
+        return system, {
+            "type": "json_schema",
+            "json_schema": {"name": schema.__name__, "schema": json_schema},
+        }
+    return system + _SCHEMA_INSTRUCTION + json.dumps(json_schema), {"type": "json_object"}
+
+
+def _validated(raw: str, schema: type[BaseModel] | None) -> dict:
+    """Parse ``raw`` and, with a schema, validate and normalise it.
+
+    Raises ValueError (pydantic's ValidationError is one) if either fails.
+    """
+    data = _parse_json(raw)
+    if schema is None:
+        return data
+    return schema.model_validate(data).model_dump()
+
+
+def _repair_prompt(user: str, raw: str, error: ValueError) -> str:
+    return (
+        f"{user}\n\n## Your previous response\n{raw[:4000]}\n\n"
+        f"## It was rejected\n{str(error)[:2000]}\n\n"
+        "Respond again with the corrected JSON object only."
+    )
+
+
+def _checked(
+    model: str, raw: str, schema: type[BaseModel] | None, repair: Callable[[ValueError], str]
+) -> dict:
+    """Validate ``raw``; if it fails, ask once more with the error attached.
+
+    ``repair`` re-asks the same model given the validation error. A second
+    invalid answer raises, so the agent's fallback chain moves on.
+    """
+    try:
+        return _validated(raw, schema)
+    except ValueError as e:
+        logger.warning("Invalid JSON from %s, asking for a repair: %s", model, str(e)[:300])
+        return _validated(repair(e), schema)
+
+
+async def _achecked(
+    model: str,
+    raw: str,
+    schema: type[BaseModel] | None,
+    repair: Callable[[ValueError], Awaitable[str]],
+) -> dict:
+    """Async ``_checked``."""
+    try:
+        return _validated(raw, schema)
+    except ValueError as e:
+        logger.warning("Invalid JSON from %s, asking for a repair: %s", model, str(e)[:300])
+        return _validated(await repair(e), schema)
+
+
 def call_llm_json(
     model: str,
     system: str,
     user: str,
     *,
+    prefix: str = "",
+    schema: type[BaseModel] | None = None,
     temperature: float = 0.2,
     max_tokens: int = 4096,
+    agent: str | None = None,
 ) -> dict:
     """Call LLM and parse response as JSON.
 
     Falls back to extracting JSON from markdown code blocks if JSON mode
-    isn't supported by the provider.
+    isn't supported by the provider. With ``schema`` (a pydantic model),
+    the answer is validated against it and returned normalised; models that
+    support structured outputs get the schema as their response format.
+    An unparseable or invalid answer gets one repair attempt with the error
+    attached; if that fails too, the agent's next fallback model is tried.
+    """
+
+    def attempt(m: str) -> dict:
+        system_m, response_format = _json_request(m, system, schema)
+
+        def send(text: str) -> str:
+            return _complete(
+                m, system_m, prefix, text, temperature, response_format, max_tokens, agent
+            )
+
+        raw = send(user)
+        return _checked(m, raw, schema, lambda error: send(_repair_prompt(user, raw, error)))
+
+    return run_chain(chain_for(agent, model), attempt)
+
+
+async def acall_llm_json(
+    model: str,
+    system: str,
+    user: str,
+    *,
+    prefix: str = "",
+    schema: type[BaseModel] | None = None,
+    temperature: float = 0.2,
+    max_tokens: int = 4096,
+    agent: str | None = None,
+) -> dict:
+    """Async ``call_llm_json``."""
+
+    async def attempt(m: str) -> dict:
+        system_m, response_format = _json_request(m, system, schema)
+
+        def send(text: str) -> Awaitable[str]:
+            return _acomplete(
+                m, system_m, prefix, text, temperature, response_format, max_tokens, agent
+            )
+
+        raw = await send(user)
+        return await _achecked(
+            m, raw, schema, lambda error: send(_repair_prompt(user, raw, error))
+        )
+
+    return await arun_chain(chain_for(agent, model), attempt)
+
+
+class _DecisionStream:
+    """Accumulates a streamed JSON completion and fires ``on_fields`` early.
+
+    ``on_fields`` is called once, with the members decoded so far, as soon
+    as every name in ``required`` has arrived; the rest of the object (e.g.
+    a long rationale) keeps streaming meanwhile. If the stream ends without
+    them, it is called with the full result instead.
     """
-    raw = call_llm(
-        model=model,
-        system=system + "\n\nYou MUST respond with valid JSON only. No markdown, no explanation.",
-        user=user,
-        temperature=temperature,
-        response_format={"type": "json_object"},
-        max_tokens=max_tokens,
+
+    def __init__(
+        self,
+        required: Iterable[str],
+        on_fields: Callable[[dict], None] | None,
+        start: float,
+    ) -> None:
+        self._required = frozenset(required)
+        self._on_fields = on_fields
+        self._start = start
+        self._feed: ObjectFeed | None = ObjectFeed()
+        self._parts: list[str] = []
+        self.chunks: list = []
+        self.decision_latency: float | None = None
+
+    def add(self, chunk) -> None:
+        self.chunks.append(chunk)
+        choices = getattr(chunk, "choices", None)
+        delta = choices[0].delta.content if choices else None
+        if not delta:
+            return
+        self._parts.append(delta)
+        if self._feed is None:
+            return
+        try:
+            self._feed.feed(delta)
+        except ValueError:
+            # Not a plain JSON object; parse the full text at the end instead
+            self._feed = None
+            return
+        if self.decision_latency is None and self._required <= self._feed.fields.keys():
+            self._fire(dict(self._feed.fields))
+
+    def _fire(self, fields: dict) -> None:
+        self.decision_latency = time.perf_counter() - self._start
+        if self._on_fields is not None:
+            self._on_fields(fields)
+
+    def finish(self) -> str:
+        """Return the raw text once the stream has ended."""
+        if self.decision_latency is None:
+            # The required fields never arrived early; the decision is the whole answer
+            self.decision_latency = time.perf_counter() - self._start
+        return "".join(self._parts)
+
+
+def _once(callback: Callable[[dict], None] | None) -> Callable[[dict], None] | None:
+    """Wrap ``callback`` so hedged attempts trigger it at most once."""
+    if callback is None:
+        return None
+    lock = threading.Lock()
+    fired = False
+
+    def wrapper(fields: dict) -> None:
+        nonlocal fired
+        with lock:
+            if fired:
+                return
+            fired = True
+        callback(fields)
+
+    return wrapper
+
+
+def _stream_response(chunks: list, messages: list[dict]):
+    """Rebuild a full response (usage, cost) from streamed chunks for accounting."""
+    try:
+        return _litellm().stream_chunk_builder(chunks, messages=messages)
+    except Exception:
+        return None
+
+
+def _stream_kwargs(
+    model: str,
+    system: str,
+    prefix: str,
+    user: str,
+    temperature: float,
+    response_format: dict,
+    max_tokens: int,
+) -> dict:
+    kwargs = _completion_kwargs(
+        model, system, prefix, user, temperature, response_format, max_tokens
+    )
+    kwargs["stream"] = True
+    kwargs["stream_options"] = {"include_usage": True}
+    return kwargs
+
+
+def _cached_stream(
+    agent: str | None, kwargs: dict, start: float
+) -> tuple[str | None, str | None]:
+    key, cached = _cached(agent, kwargs)
+    if cached is not None:
+        elapsed = time.perf_counter() - start
+        record_call(
+            agent, kwargs["model"], None, elapsed, cached=True, decision_latency_s=elapsed
+        )
+    return key, cached
+
+
+def _deliver(result: dict, on_fields: Callable[[dict], None] | None) -> dict:
+    """Hand the final object to ``on_fields`` unless early fields already went."""
+    if on_fields is not None:
+        on_fields(dict(result))
+    return result
+
+
+def stream_llm_json(
+    model: str,
+    system: str,
+    user: str,
+    *,
+    prefix: str = "",
+    schema: type[BaseModel] | None = None,
+    required: Iterable[str] = (),
+    on_fields: Callable[[dict], None] | None = None,
+    temperature: float = 0.2,
+    max_tokens: int = 4096,
+    agent: str | None = None,
+) -> dict:
+    """``call_llm_json`` over a streamed completion.
+
+    Top-level members are decoded as they arrive; once all ``required``
+    fields are in, ``on_fields`` is called with them so downstream work can
+    start while the rest of the object is still being generated. Time to
+    that point is recorded as the call's decision latency, separately from
+    total latency. Early fields are not yet validated against ``schema``;
+    the returned object is. Malformed or invalid answers get the same
+    single repair attempt as ``call_llm_json``, as a non-streamed call.
+    With fallback models, ``on_fields`` still fires only once, for
+    whichever attempt gets there first.
+    """
+    on_fields = _once(on_fields)
+    return run_chain(
+        chain_for(agent, model),
+        lambda m: _stream_once(
+            m, system, prefix, user, schema, required, on_fields, temperature, max_tokens, agent
+        ),
+    )
+
+
+def _stream_once(
+    model: str,
+    system: str,
+    prefix: str,
+    user: str,
+    schema: type[BaseModel] | None,
+    required: Iterable[str],
+    on_fields: Callable[[dict], None] | None,
+    temperature: float,
+    max_tokens: int,
+    agent: str | None,
+) -> dict:
+    system, response_format = _json_request(model, system, schema)
+    kwargs = _stream_kwargs(
+        model, system, prefix, user, temperature, response_format, max_tokens
     )
+    start = time.perf_counter()
+    key, raw = _cached_stream(agent, kwargs, start)
+    if raw is None:
+        logger.info("Calling LLM (stream): model=%s tokens=%d", model, max_tokens)
+        chunks, start = scheduler.run(
+            agent, model, _estimate(kwargs), lambda: _litellm().completion(**kwargs)
+        )
+        stream = _DecisionStream(required, on_fields, start)
+        for chunk in chunks:
+            stream.add(chunk)
+        raw = _finish_stream(agent, key, model, kwargs, stream, start)
+
+    def repair(error: ValueError) -> str:
+        return _complete(
+            model, system, prefix, _repair_prompt(user, raw, error),
+            temperature, response_format, max_tokens, agent,
+        )
+
+    return _deliver(_checked(model, raw, schema, repair), on_fields)
+
 
+async def astream_llm_json(
+    model: str,
+    system: str,
+    user: str,
+    *,
+    prefix: str = "",
+    schema: type[BaseModel] | None = None,
+    required: Iterable[str] = (),
+    on_fields: Callable[[dict], None] | None = None,
+    temperature: float = 0.2,
+    max_tokens: int = 4096,
+    agent: str | None = None,
+) -> dict:
+    """Async ``stream_llm_json``; ``on_fields`` runs on the event loop."""
+    on_fields = _once(on_fields)
+    return await arun_chain(
+        chain_for(agent, model),
+        lambda m: _astream_once(
+            m, system, prefix, user, schema, required, on_fields, temperature, max_tokens, agent
+        ),
+    )
+
+
+async def _astream_once(
+    model: str,
+    system: str,
+    prefix: str,
+    user: str,
+    schema: type[BaseModel] | None,
+    required: Iterable[str],
+    on_fields: Callable[[dict], None] | None,
+    temperature: float,
+    max_tokens: int,
+    agent: str | None,
+) -> dict:
+    system, response_format = _json_request(model, system, schema)
+    kwargs = _stream_kwargs(
+        model, system, prefix, user, temperature, response_format, max_tokens
+    )
+    start = time.perf_counter()
+    key, raw = _cached_stream(agent, kwargs, start)
+    if raw is None:
+        async with _semaphore(model):
+            logger.info("Calling LLM (async stream): model=%s tokens=%d", model, max_tokens)
+            chunks, start = await scheduler.arun(
+                agent, model, _estimate(kwargs), lambda: _litellm().acompletion(**kwargs)
+            )
+            stream = _DecisionStream(required, on_fields, start)
+            async for chunk in chunks:
+                stream.add(chunk)
+        raw = _finish_stream(agent, key, model, kwargs, stream, start)
+
+    def repair(error: ValueError) -> Awaitable[str]:
+        return _acomplete(
+            model, system, prefix, _repair_prompt(user, raw, error),
+            temperature, response_format, max_tokens, agent,
+        )
+
+    return _deliver(await _achecked(model, raw, schema, repair), on_fields)
+
+
+def _finish_stream(
+    agent: str | None,
+    key: str | None,
+    model: str,
+    kwargs: dict,
+    stream: _DecisionStream,
+    start: float,
+) -> str:
+    raw = stream.finish()
+    total = time.perf_counter() - start
+    logger.info(
+        "LLM stream complete: model=%s decision=%.2fs total=%.2fs",
+        model, stream.decision_latency, total,
+    )
+    response = _stream_response(stream.chunks, kwargs["messages"])
+    record_call(agent, model, response, total, decision_latency_s=stream.decision_latency)
+    _remember(agent, key, model, raw)
+    return raw
+
+
+def _parse_json(raw: str) -> dict:
+    """Parse a JSON object from an LLM response.
+
+    Tries the raw text, then a markdown code block, then the outermost
+    ``{ ... }`` span.
+    """
     # Try direct parse first
     try:
         return json.loads(raw)
@@ -0,0 +1,231 @@
+"""Deterministic fake LLM backend for offline runs and pipeline benchmarks.
+
+Registered with LiteLLM as the ``fake`` provider, so any agent can be
+pointed at it through its usual model string::
+
+    CA_BRAIN_MODEL=fake/realistic
+    CA_RESEARCH_MODEL=fake/instant
+
+The part after ``fake/`` names a latency profile (``PROFILES``). Answers
+are generated from a generator seeded with the configured seed and the
+prompt, so the same prompt always gets the same answer regardless of
+thread scheduling. The agent is recognised from its system prompt: the
+Brain and Trader get schema-valid JSON, the analysts and reflections get
+short labelled reports. Usage is reported (chars/4 estimates), so the
+accounting and call log work as with a real provider.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import random
+import re
+import threading
+from collections.abc import Iterator
+
+from cryptoagent.llm.prompt import estimate_tokens
+
+PROVIDER = "fake"
+
+# Profile name -> (time to first token in seconds, completion tokens per second)
+PROFILES: dict[str, tuple[float, float]] = {
+    "instant": (0.0, 0.0),  # no delay at all
+    "fast": (0.05, 2000.0),
+    "realistic": (0.6, 80.0),
+    "slow": (2.0, 25.0),
+}
+_JITTER = 0.2  # +/- fraction applied to each call's delays
+_STREAM_CHUNK = 16  # characters per streamed chunk
+
+_seed = 0
+_registered = False
+_register_lock = threading.Lock()
+
+
+def configure_fake(seed: int = 0, profiles: dict[str, tuple[float, float]] | None = None) -> None:
+    """Set the answer seed and add or override latency profiles."""
+    global _seed
+    _seed = seed
+    PROFILES.update(profiles or {})
+
+
+def register() -> None:
+    """Add the ``fake`` provider to LiteLLM (idempotent)."""
+    global _registered
+    with _register_lock:
+        if _registered:
+            return
+        # The handler subclasses LiteLLM's, so it is only imported once needed
+        import litellm
+
+        from cryptoagent.llm.fake_handler import FakeLLM
+
+        litellm.custom_provider_map = [
+            *[p for p in litellm.custom_provider_map if p["provider"] != PROVIDER],
+            {"provider": PROVIDER, "custom_handler": FakeLLM()},
+        ]
+        _registered = True
+
+
+def _profile(model: str) -> tuple[float, float]:
+    name = model.split("/", 1)[-1]
+    if name not in PROFILES:
+        raise ValueError(f"Unknown fake LLM profile {name!r}; expected one of {sorted(PROFILES)}")
+    return PROFILES[name]
+
+
+def _text(content) -> str:
+    if isinstance(content, str):
+        return content
+    return "\n\n".join(block.get("text", "") for block in content or [])
+
+
+def _rng(model: str, messages: list[dict]) -> random.Random:
+    digest = hashlib.sha256(
+        json.dumps([model, [_text(m.get("content")) for m in messages]]).encode()
+    ).hexdigest()
+    return random.Random(f"{_seed}:{digest}")
+
+
+def _asset(user: str) -> str:
+    match = re.search(r"(?:Target Asset:|data for|\"asset\":\s*\")\s*([A-Z0-9]{2,10})", user)
+    return match.group(1) if match else "SOL"
+
+
+def _brain(rng: random.Random, user: str) -> str:
+    action = rng.choice(["BUY", "SELL", "HOLD", "HOLD"])
+    regime = rng.choice(["bull", "bear", "sideways"])
+    decision = {
+        "action": action,
+        "asset": _asset(user),
+        "size_pct": 0 if action == "HOLD" else rng.choice([5, 10, 15, 20]),
+        "stop_loss_pct": rng.choice([3, 5, 8]),
+        "take_profit_pct": rng.choice([6, 10, 15]),
+        "confidence": rng.randint(3, 8),
+        "regime": regime,
+        "rationale": (
+            f"The {regime} regime and the balance of on-chain and sentiment evidence "
+            f"favour {action}. Position size reflects the current volatility."
+        ),
+    }
+    return json.dumps(decision)
+
+
+def _trader(rng: random.Random, user: str) -> str:
+    match = re.search(r"\"action\":\s*\"(\w+)\"", user)
+    action = match.group(1) if match else "HOLD"
+    size = re.search(r"\"size_pct\":\s*([\d.]+)", user)
+    size_pct = float(size.group(1)) if size else 0.0
+    if action == "HOLD":
+        return json.dumps({
+            "execute": False,
+            "modified_size_pct": 0,
+            "order_type": "market",
+            "reason": "HOLD — no trade needed",
+        })
+    execute = rng.random() < 0.85
+    return json.dumps({
+        "execute": execute,
+        "modified_size_pct": size_pct if rng.random() < 0.7 else round(size_pct / 2, 2),
+        "order_type": rng.choice(["market", "limit"]),
+        "reason": "Within limits." if execute else "Position would exceed exposure limits.",
+    })
+
+
+_REPORT_LINES = {
+    "research": [
+        "[FACT] Price moved {pct:+.1f}% over 24h on {vol:.1f}B volume.",
+        "[FACT] RSI is {rsi} and the MACD histogram is {macd:+.2f}.",
+        "[FACT] TVL changed {tvl:+.1f}% week over week.",
+        "[INFERENCE] On-chain activity {trend} the price trend.",
+        "Key Signals: momentum, TVL trend, macro liquidity.",
+    ],
+    "sentiment": [
+        "[FACT] Fear & Greed Index is {fng}.",
+        "[SUBJECTIVE] Social tone reads {tone} with {intensity}/10 intensity.",
+        "[FACT] Headline volume is {news} items in the last day.",
+        "Direction: {tone}. Intensity: {intensity}/10.",
+    ],
+    "macro": [
+        "[FACT] Fed funds rate is {rate:.2f}%.",
+        "[INFERENCE] Liquidity conditions are {liquidity}.",
+        "[FACT] The 10y-2y spread is {spread:+.2f}.",
+        "Regime recommendation: {macro}.",
+    ],
+    "reflection": [
+        "The {tone} call at {intensity}/10 confidence {trend} the following price action.",
+        "Lesson: weight on-chain flows more heavily when sentiment is {tone}.",
+    ],
+}
+
+
+def _report(rng: random.Random, kind: str) -> str:
+    values = {
+        "pct": rng.uniform(-8, 8),
+        "vol": rng.uniform(0.5, 5),
+        "rsi": rng.randint(20, 80),
+        "macd": rng.uniform(-2, 2),
+        "tvl": rng.uniform(-10, 10),
+        "trend": rng.choice(["confirms", "diverges from"]),
+        "fng": rng.randint(5, 95),
+        "tone": rng.choice(["bearish", "neutral", "bullish"]),
+        "intensity": rng.randint(1, 10),
+        "news": rng.randint(0, 40),
+        "rate": rng.uniform(3, 5.5),
+        "liquidity": rng.choice(["tightening", "stable", "easing"]),
+        "spread": rng.uniform(-1, 1),
+        "macro": rng.choice(["risk-on", "risk-off", "neutral"]),
+    }
+    return "\n".join(line.format(**values) for line in _REPORT_LINES[kind])
+
+
+def answer(model: str, messages: list[dict]) -> str:
+    """The deterministic answer for ``messages`` (exposed for tests)."""
+    system = _text(messages[0].get("content")) if messages else ""
+    user = _text(messages[-1].get("content")) if messages else ""
+    rng = _rng(model, messages)
+    if '"execute"' in system:
+        return _trader(rng, user)
+    if '"action"' in system:
+        return _brain(rng, user)
+    lowered = system.lower()
+    # Checked in order: the research prompt also mentions macro indicators
+    for kind in ("research", "sentiment", "macro"):
+        if kind in lowered:
+            return _report(rng, kind)
+    return _report(rng, "reflection")
+
+
+def _usage(messages: list[dict], content: str) -> dict:
+    prompt = sum(estimate_tokens(_text(m.get("content"))) for m in messages)
+    completion = estimate_tokens(content)
+    return {
+        "prompt_tokens": prompt,
+        "completion_tokens": completion,
+        "total_tokens": prompt + completion,
+    }
+
+
+def _delays(model: str, messages: list[dict], completion_tokens: int) -> tuple[float, float]:
+    """(time to first token, generation time) for one call, with seeded jitter."""
+    ttft, tokens_per_s = _profile(model)
+    if not ttft and not tokens_per_s:
+        return 0.0, 0.0
+    jitter = 1 + _rng(model, messages).uniform(-_JITTER, _JITTER)
+    generation = completion_tokens / tokens_per_s if tokens_per_s else 0.0
+    return ttft * jitter, generation * jitter
+
+
+def _chunks(content: str, usage: dict) -> Iterator[dict]:
+    pieces = [content[i : i + _STREAM_CHUNK] for i in range(0, len(content), _STREAM_CHUNK)]
+    for i, piece in enumerate(pieces):
+        last = i == len(pieces) - 1
+        yield {
+            "text": piece,
+            "is_finished": last,
+            "finish_reason": "stop" if last else "",
+            "usage": usage if last else None,
+            "index": 0,
+            "tool_use": None,
+        }
@@ -0,0 +1,67 @@
+"""LiteLLM handler for the fake provider (see ``cryptoagent.llm.fake``).
+
+Kept apart from the answer generation so that configuring the fake backend
+does not import LiteLLM; ``fake.register`` imports this module on first use.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from collections.abc import AsyncIterator, Iterator
+
+import litellm
+from litellm import CustomLLM
+from litellm.types.utils import ModelResponse
+
+from cryptoagent.llm.fake import _chunks, _delays, _usage, answer
+
+
+class FakeLLM(CustomLLM):
+    """LiteLLM handler for ``fake/<profile>`` models."""
+
+    def _respond(self, model: str, messages: list, model_response: ModelResponse):
+        content = answer(model, messages)
+        usage = _usage(messages, content)
+        model_response.choices[0].message.content = content
+        model_response.model = model
+        model_response.usage = litellm.Usage(**usage)
+        return content, usage
+
+    def completion(self, model, messages, *args, model_response: ModelResponse, **kwargs):
+        content, usage = self._respond(model, messages, model_response)
+        ttft, generation = _delays(model, messages, usage["completion_tokens"])
+        if ttft + generation:
+            time.sleep(ttft + generation)
+        return model_response
+
+    async def acompletion(self, model, messages, *args, model_response: ModelResponse, **kwargs):
+        content, usage = self._respond(model, messages, model_response)
+        ttft, generation = _delays(model, messages, usage["completion_tokens"])
+        if ttft + generation:
+            await asyncio.sleep(ttft + generation)
+        return model_response
+
+    def streaming(self, model, messages, *args, **kwargs) -> Iterator[dict]:
+        content = answer(model, messages)
+        usage = _usage(messages, content)
+        ttft, generation = _delays(model, messages, usage["completion_tokens"])
+        chunks = list(_chunks(content, usage))
+        if ttft:
+            time.sleep(ttft)
+        for chunk in chunks:
+            if generation:
+                time.sleep(generation / len(chunks))
+            yield chunk
+
+    async def astreaming(self, model, messages, *args, **kwargs) -> AsyncIterator[dict]:
+        content = answer(model, messages)
+        usage = _usage(messages, content)
+        ttft, generation = _delays(model, messages, usage["completion_tokens"])
+        chunks = list(_chunks(content, usage))
+        if ttft:
+            await asyncio.sleep(ttft)
+        for chunk in chunks:
+            if generation:
+                await asyncio.sleep(generation / len(chunks))
+            yield chunk
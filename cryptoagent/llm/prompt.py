@@ -0,0 +1,247 @@
+"""Token-budgeted prompt builder with compact rendering of data dicts.
+
+``json.dumps(indent=2)`` spends most of a prompt's tokens on whitespace,
+quotes, and braces, and grows with every list it is handed (trade history,
+OHLCV rows). ``PromptBuilder`` renders each section compactly instead:
+
+- dicts as ``key: value`` lines, nested dicts indented beneath their key;
+- lists of scalars inline, lists of uniform dicts as a ``|``-separated table;
+- floats kept to at least 2 decimals (4 significant digits below 1), and
+  large aggregates (volume, TVL) of a million and up abbreviated with
+  M/B/T suffixes; prices and portfolio figures are never abbreviated;
+- ``None``, empty values, and noise keys (``timestamp``) dropped.
+
+Each section has a token budget; over-budget sections are truncated by
+lines, keeping the head (key figures lead) or the tail (latest entries).
+Token counts are estimated at ~4 characters per token, which is close
+enough for budgeting and costs nothing.
+"""
+
+from __future__ import annotations
+
+import json
+import math
+from typing import Literal
+
+_CHARS_PER_TOKEN = 4
+_DROP_KEYS = frozenset({"timestamp"})
+# Keys (and everything beneath them) rendered without M/B/T abbreviation
+_EXACT_TAGS = ("price", "cash", "net_worth", "holdings", "pnl", "balance", "equity", "capital")
+
+Truncate = Literal["head", "tail"]
+
+
+def estimate_tokens(text: str) -> int:
+    """Approximate token count (~4 characters per token)."""
+    return math.ceil(len(text) / _CHARS_PER_TOKEN)
+
+
+def format_number(value: float, exact: bool = False) -> str:
+    """Round for display: at least 2 decimals and 4 significant digits, with
+    M/B/T suffixes from a million up unless ``exact`` (prices, balances)."""
+    if isinstance(value, bool):
+        return str(value).lower()
+    if not math.isfinite(value):
+        return str(value)
+    magnitude = abs(value)
+    if not exact:
+        for threshold, suffix in ((1e12, "T"), (1e9, "B"), (1e6, "M")):
+            if magnitude >= threshold:
+                return f"{value / threshold:.4g}{suffix}"
+    if value == int(value):
+        return str(int(value))
+    if magnitude < 1:
+        return f"{value:.4g}"
+    decimals = max(2, 4 - len(str(int(magnitude))))
+    return f"{value:.{decimals}f}".rstrip("0").rstrip(".")
+
+
+def _is_exact(key) -> bool:
+    return isinstance(key, str) and any(tag in key.lower() for tag in _EXACT_TAGS)
+
+
+def _scalar(value, exact: bool = False) -> str:
+    if isinstance(value, (int, float)):
+        return format_number(value, exact)
+    return str(value)
+
+
+def _empty(value) -> bool:
+    return value is None or value == "" or value == [] or value == {}
+
+
+def _is_table(items: list) -> bool:
+    return (
+        len(items) > 1
+        and all(isinstance(i, dict) for i in items)
+        and all(not isinstance(v, (dict, list)) for i in items for v in i.values())
+    )
+
+
+def _table(items: list[dict], indent: str, exact: bool) -> list[str]:
+    columns: list[str] = []
+    for item in items:
+        columns.extend(k for k in item if k not in columns and k not in _DROP_KEYS)
+    exact_columns = {c: exact or _is_exact(c) for c in columns}
+    lines = [indent + " | ".join(columns)]
+    for item in items:
+        cells = (_scalar(item.get(c, ""), exact_columns[c]) for c in columns)
+        lines.append(indent + " | ".join(cells))
+    return lines
+
+
+def render(
+    data, max_rows: int | None = None, _indent: str = "", _exact: bool = False
+) -> list[str]:
+    """Render ``data`` as compact lines.
+
+    Lists longer than ``max_rows`` keep their last ``max_rows`` items
+    (the repo's lists — trade history, candles, weekly stats — are
+    chronological), with a note of how many were omitted.
+    """
+    if isinstance(data, dict):
+        lines: list[str] = []
+        for key, value in data.items():
+            if key in _DROP_KEYS or _empty(value):
+                continue
+            exact = _exact or _is_exact(key)
+            if isinstance(value, (dict, list)) and not _inline(value):
+                lines.append(f"{_indent}{key}:")
+                lines.extend(render(value, max_rows, _indent + "  ", exact))
+            else:
+                lines.append(f"{_indent}{key}: {_inline_text(value, exact)}")
+        return lines
+    if isinstance(data, list):
+        items = data
+        lines = []
+        if max_rows is not None and len(items) > max_rows:
+            lines.append(f"{_indent}({len(items) - max_rows} earlier items omitted)")
+            items = items[-max_rows:]
+        if _inline(items):
+            return lines + [_indent + _inline_text(items, _exact)]
+        if _is_table(items):
+            return lines + _table(items, _indent, _exact)
+        for item in items:
+            sub = render(item, max_rows, _indent + "  ", _exact)
+            if sub:
+                lines.append(f"{_indent}- {sub[0].lstrip()}")
+                lines.extend(sub[1:])
+        return lines
+    return [_indent + _scalar(data, _exact)]
+
+
+def _inline(value) -> bool:
+    if isinstance(value, list):
+        return all(not isinstance(v, (dict, list)) for v in value)
+    return not isinstance(value, dict)
+
+
+def _inline_text(value, exact: bool = False) -> str:
+    if isinstance(value, list):
+        return ", ".join(_scalar(v, exact) for v in value)
+    return _scalar(value, exact)
+
+
+def _truncate(lines: list[str], budget: int, keep: Truncate) -> tuple[list[str], int]:
+    """Drop lines until the section fits ``budget`` tokens.
+
+    The first line that does not fit is cut to the remaining budget rather
+    than dropped, so a single long paragraph still contributes its start
+    (or end, for ``keep="tail"``). Returns ``(kept, lines_cut)``.
+    """
+    kept: list[str] = []
+    used = 0
+    partial = 0
+    ordered = lines if keep == "head" else lines[::-1]
+    for line in ordered:
+        cost = estimate_tokens(line + "\n")
+        if used + cost > budget:
+            chars = (budget - used) * _CHARS_PER_TOKEN - 1
+            if chars > 0:
+                kept.append(line[:chars] if keep == "head" else line[-chars:])
+                partial = 1
+            break
+        kept.append(line)
+        used += cost
+    if keep == "tail":
+        kept.reverse()
+    return kept, len(lines) - len(kept) + partial
+
+
+class PromptBuilder:
+    """Assembles a prompt from titled, individually budgeted sections.
+
+    Usage:
+        builder = PromptBuilder()
+        builder.text("Analyze SOL.")
+        builder.section("Market Data", market_data, budget=400)
+        prompt = builder.build()
+        builder.report()  # per-section token usage
+    """
+
+    def __init__(self) -> None:
+        self._parts: list[str] = []
+        self._report: list[dict] = []
+
+    def text(self, text: str) -> PromptBuilder:
+        """Append unbudgeted free text (instructions, headers)."""
+        self._parts.append(text)
+        return self
+
+    def section(
+        self,
+        title: str,
+        data,
+        budget: int,
+        truncate: Truncate = "head",
+        max_rows: int | None = None,
+        empty: str = "Not available for this cycle.",
+    ) -> PromptBuilder:
+        """Append ``## title`` followed by ``data`` rendered within ``budget`` tokens.
+
+        ``data`` may be a string (kept verbatim, split by lines), a dict, or
+        a list. ``empty`` is shown when there is nothing to render.
+        """
+        if isinstance(data, str):
+            lines = data.strip().splitlines()
+            raw = data
+        else:
+            lines = render(data, max_rows)
+            raw = json.dumps(data, indent=2, default=str)
+        if not lines:
+            lines = [empty]
+
+        kept, dropped = _truncate(lines, budget, truncate)
+        if dropped:
+            note = f"[{dropped} lines truncated]"
+            kept = [note, *kept] if truncate == "tail" else [*kept, note]
+        body = "\n".join(kept)
+
+        self._parts.append(f"## {title}\n{body}")
+        self._report.append({
+            "section": title,
+            "tokens": estimate_tokens(body),
+            "budget": budget,
+            "raw_tokens": estimate_tokens(raw),
+            "truncated_lines": dropped,
+        })
+        return self
+
+    def build(self) -> str:
+        return "\n\n".join(self._parts) + "\n"
+
+    def report(self) -> list[dict]:
+        """Per-section rendered tokens, budget, tokens of the indented-JSON
+        equivalent (``raw_tokens``), and lines dropped by truncation."""
+        return list(self._report)
+
+    def summary(self) -> str:
+        """One-line size report for logging."""
+        total = sum(r["tokens"] for r in self._report)
+        raw = sum(r["raw_tokens"] for r in self._report)
+        parts = ", ".join(
+            f"{r['section']}={r['tokens']}/{r['budget']}"
+            + ("*" if r["truncated_lines"] else "")
+            for r in self._report
+        )
+        return f"~{total} tokens (raw JSON ~{raw}; * = truncated): {parts}"
@@ -0,0 +1,228 @@
+"""Per-agent model fallback chains with hedged requests.
+
+Each agent can list fallback models after its primary (``llm_fallback_models``).
+A call starts on the first model in the chain; if it has not answered
+within that model's hedge delay (its observed p95 latency), the next model
+is started too and the first valid answer wins. An error moves on to the
+next model immediately. Every attempt's latency and outcome feed
+``ModelStats``, which sets the hedge delays and moves unreliable models to
+the back of the chain.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextvars
+import logging
+import threading
+import time
+from collections import deque
+from collections.abc import Awaitable, Callable
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+_WINDOW = 100  # recent attempts kept per model
+_MIN_SAMPLES = 20  # below this, a model's p95 is not trusted
+_DEMOTE_FAILURE_RATE = 0.5
+
+_pool = ThreadPoolExecutor(max_workers=16, thread_name_prefix="llm-hedge")
+
+
+class ModelStats:
+    """Rolling latency and outcome window per model. Thread-safe."""
+
+    def __init__(self, window: int = _WINDOW) -> None:
+        self._window = window
+        self._latencies: dict[str, deque[float]] = {}
+        self._outcomes: dict[str, deque[bool]] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, model: str, latency_s: float, ok: bool) -> None:
+        with self._lock:
+            self._outcomes.setdefault(model, deque(maxlen=self._window)).append(ok)
+            # Failures often return fast; only successes describe latency
+            if ok:
+                self._latencies.setdefault(model, deque(maxlen=self._window)).append(latency_s)
+
+    def p95(self, model: str) -> float | None:
+        """95th percentile success latency, or None with too few samples."""
+        with self._lock:
+            samples = sorted(self._latencies.get(model, ()))
+        if len(samples) < _MIN_SAMPLES:
+            return None
+        return samples[min(len(samples) - 1, int(len(samples) * 0.95))]
+
+    def failure_rate(self, model: str) -> float:
+        with self._lock:
+            outcomes = self._outcomes.get(model)
+            if not outcomes:
+                return 0.0
+            return outcomes.count(False) / len(outcomes)
+
+    def snapshot(self) -> dict[str, dict]:
+        """Per-model attempts, failure rate, and p95 latency (seconds)."""
+        with self._lock:
+            models = list(self._outcomes)
+        return {
+            m: {
+                "attempts": len(self._outcomes[m]),
+                "failure_rate": round(self.failure_rate(m), 3),
+                "p95_s": self.p95(m),
+            }
+            for m in models
+        }
+
+    def clear(self) -> None:
+        with self._lock:
+            self._latencies.clear()
+            self._outcomes.clear()
+
+
+stats = ModelStats()
+_fallbacks: dict[str, list[str]] = {}
+_hedge_min_s = 2.0
+_hedge_default_s = 30.0
+
+
+def configure_fallbacks(
+    fallbacks: dict[str, list[str]] | None = None,
+    hedge_min_s: float = 2.0,
+    hedge_default_s: float = 30.0,
+) -> None:
+    """Set fallback models per agent and the hedge delay bounds.
+
+    Args:
+        fallbacks: Agent name -> models to try after the agent's primary.
+        hedge_min_s: Lower bound on any hedge delay.
+        hedge_default_s: Hedge delay for models without enough latency samples.
+    """
+    global _hedge_min_s, _hedge_default_s
+    _fallbacks.clear()
+    _fallbacks.update({k.lower(): list(v) for k, v in (fallbacks or {}).items()})
+    _hedge_min_s = hedge_min_s
+    _hedge_default_s = hedge_default_s
+
+
+def chain_for(agent: str | None, primary: str) -> list[str]:
+    """The agent's model chain, with frequently failing models moved last.
+
+    Configured order is otherwise kept; a model is demoted once at least
+    half of its recent attempts failed.
+    """
+    chain = [primary] + [m for m in _fallbacks.get((agent or "").lower(), []) if m != primary]
+    if len(chain) == 1:
+        return chain
+    return sorted(chain, key=lambda m: stats.failure_rate(m) >= _DEMOTE_FAILURE_RATE)
+
+
+def hedge_delay(model: str) -> float:
+    """Seconds to wait on ``model`` before starting the next one in the chain."""
+    p95 = stats.p95(model)
+    return max(_hedge_min_s, p95 if p95 is not None else _hedge_default_s)
+
+
+def _timed(model: str, call: Callable[[str], T]) -> T:
+    start = time.perf_counter()
+    try:
+        result = call(model)
+    except Exception:
+        stats.observe(model, time.perf_counter() - start, ok=False)
+        raise
+    stats.observe(model, time.perf_counter() - start, ok=True)
+    return result
+
+
+def run_chain(chain: list[str], call: Callable[[str], T]) -> T:
+    """Run ``call(model)`` over ``chain`` with hedging; return the first success.
+
+    ``call`` must raise on an invalid answer so the next model is tried.
+    With a single model the call runs inline. Otherwise attempts run on a
+    shared pool; losing attempts finish in the background (their outcomes
+    still update the stats) since threads cannot be cancelled.
+    """
+    if len(chain) == 1:
+        return _timed(chain[0], call)
+
+    remaining = list(chain)
+    pending: dict[Future, str] = {}
+    last_error: Exception | None = None
+
+    def launch() -> float:
+        model = remaining.pop(0)
+        ctx = contextvars.copy_context()
+        pending[_pool.submit(ctx.run, _timed, model, call)] = model
+        return hedge_delay(model)
+
+    delay = launch()
+    while pending:
+        done, _ = wait(pending, timeout=delay if remaining else None, return_when=FIRST_COMPLETED)
+        if not done:
+            logger.info("LLM hedge: no answer in %.1fs, also trying %s", delay, remaining[0])
+            delay = launch()
+            continue
+        for future in done:
+            model = pending.pop(future)
+            try:
+                return future.result()
+            except Exception as e:
+                last_error = e
+                logger.warning("LLM call failed on %s: %s", model, e)
+        if remaining:
+            delay = launch()
+    raise last_error
+
+
+async def arun_chain(chain: list[str], call: Callable[[str], Awaitable[T]]) -> T:
+    """Async ``run_chain``; losing attempts are cancelled."""
+
+    async def timed(model: str) -> T:
+        start = time.perf_counter()
+        try:
+            result = await call(model)
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            stats.observe(model, time.perf_counter() - start, ok=False)
+            raise
+        stats.observe(model, time.perf_counter() - start, ok=True)
+        return result
+
+    if len(chain) == 1:
+        return await timed(chain[0])
+
+    remaining = list(chain)
+    pending: dict[asyncio.Task, str] = {}
+    last_error: Exception | None = None
+
+    def launch() -> float:
+        model = remaining.pop(0)
+        pending[asyncio.ensure_future(timed(model))] = model
+        return hedge_delay(model)
+
+    delay = launch()
+    try:
+        while pending:
+            done, _ = await asyncio.wait(
+                pending, timeout=delay if remaining else None, return_when=FIRST_COMPLETED
+            )
+            if not done:
+                logger.info("LLM hedge: no answer in %.1fs, also trying %s", delay, remaining[0])
+                delay = launch()
+                continue
+            for task in done:
+                model = pending.pop(task)
+                try:
+                    return task.result()
+                except Exception as e:
+                    last_error = e
+                    logger.warning("LLM call failed on %s: %s", model, e)
+            if remaining:
+                delay = launch()
+        raise last_error
+    finally:
+        for task in pending:
+            task.cancel()
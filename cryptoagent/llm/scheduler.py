@@ -0,0 +1,274 @@
+"""Rate-limit-aware LLM scheduling: RPM/TPM budgets, priorities, 429 backoff.
+
+Budgets are configured per provider ("openai") and/or per model
+("openai/gpt-4o") as requests and tokens per rolling minute. Each call
+reserves one request and its estimated tokens (prompt estimate plus
+``max_tokens``, as providers count it) from every budget that applies,
+and the reservation is corrected to the actual usage once the response
+arrives. Calls that do not fit wait in a queue ordered by agent priority —
+Brain and Trader first, the analysts next, reflections last — then by
+arrival. A 429 that gets through anyway is retried with exponential
+backoff, honouring the provider's Retry-After when it sends one.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import itertools
+import logging
+import random
+import threading
+import time
+from collections import deque
+from collections.abc import Awaitable, Callable
+from typing import TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+_WINDOW_S = 60.0
+_POLL_S = 0.05  # recheck interval while a higher-priority call is ahead
+_MAX_BACKOFF_S = 60.0
+
+# Lower runs first; agents not listed get _DEFAULT_PRIORITY
+PRIORITIES = {"brain": 0, "trader": 0, "research": 1, "sentiment": 1, "macro": 1, "reflection": 2}
+_DEFAULT_PRIORITY = 1
+
+
+class _Budget:
+    """Requests and tokens sent in the last minute for one provider or model."""
+
+    def __init__(self, rpm: int | None, tpm: int | None) -> None:
+        self.rpm = rpm
+        self.tpm = tpm
+        self.entries: deque[list[float]] = deque()  # [sent_at, tokens]
+
+    def _prune(self, now: float) -> None:
+        while self.entries and self.entries[0][0] <= now - _WINDOW_S:
+            self.entries.popleft()
+
+    def wait(self, tokens: int, now: float) -> float:
+        """Seconds until ``tokens`` more fit (0 if they fit now)."""
+        self._prune(now)
+        if self.rpm is not None and len(self.entries) >= self.rpm:
+            return self.entries[0][0] + _WINDOW_S - now
+        if self.tpm is not None and self.entries:
+            # A request larger than the whole budget goes alone rather than never
+            excess = sum(e[1] for e in self.entries) + tokens - self.tpm
+            if excess > 0:
+                for sent_at, used in self.entries:
+                    excess -= used
+                    if excess <= 0:
+                        return sent_at + _WINDOW_S - now
+                # Still over with the window emptied: wait until it is empty
+                return self.entries[-1][0] + _WINDOW_S - now
+        return 0.0
+
+
+class Grant:
+    """A reservation in each applicable budget; see ``Scheduler.settle``."""
+
+    def __init__(self, entries: list[list[float]]) -> None:
+        self.entries = entries
+
+
+class Scheduler:
+    """Admits LLM calls within RPM/TPM budgets, highest priority first. Thread-safe."""
+
+    def __init__(self) -> None:
+        self._budgets: dict[str, _Budget] = {}
+        self._priorities = dict(PRIORITIES)
+        self._waiting: dict[int, tuple[int, int, tuple[str, ...]]] = {}
+        self._seq = itertools.count()
+        self._cond = threading.Condition()
+
+    def configure(
+        self,
+        limits: dict[str, dict[str, int]] | None = None,
+        priorities: dict[str, int] | None = None,
+    ) -> None:
+        """Set budgets (key -> {"rpm": ..., "tpm": ...}) and agent priority overrides."""
+        with self._cond:
+            self._budgets = {
+                key: _Budget(limit.get("rpm"), limit.get("tpm"))
+                for key, limit in (limits or {}).items()
+            }
+            overrides = {k.lower(): v for k, v in (priorities or {}).items()}
+            self._priorities = {**PRIORITIES, **overrides}
+            self._cond.notify_all()
+
+    def _keys(self, model: str) -> tuple[str, ...]:
+        provider = model.split("/", 1)[0]
+        return tuple(k for k in (provider, model) if k in self._budgets)
+
+    def _enqueue(self, agent: str | None, model: str) -> int:
+        ticket = next(self._seq)
+        priority = self._priorities.get((agent or "").lower(), _DEFAULT_PRIORITY)
+        with self._cond:
+            self._waiting[ticket] = (priority, ticket, self._keys(model))
+        return ticket
+
+    def _dequeue(self, ticket: int) -> None:
+        with self._cond:
+            self._waiting.pop(ticket, None)
+            self._cond.notify_all()
+
+    def _try_grant(self, ticket: int, tokens: int) -> tuple[Grant | None, float]:
+        """With the lock held: reserve for ``ticket`` or return how long to wait."""
+        rank = self._waiting[ticket]
+        keys = rank[2]
+        if any(
+            other[:2] < rank[:2] and set(other[2]) & set(keys)
+            for other in self._waiting.values()
+        ):
+            return None, _POLL_S
+        now = time.monotonic()
+        wait = max((self._budgets[k].wait(tokens, now) for k in keys), default=0.0)
+        if wait > 0:
+            return None, wait
+        entries = [[now, tokens] for _ in keys]
+        for key, entry in zip(keys, entries):
+            self._budgets[key].entries.append(entry)
+        del self._waiting[ticket]
+        self._cond.notify_all()
+        return Grant(entries), 0.0
+
+    def acquire(self, agent: str | None, model: str, tokens: int) -> Grant:
+        """Block until the call fits its budgets and no higher-priority call is waiting."""
+        ticket = self._enqueue(agent, model)
+        try:
+            with self._cond:
+                while True:
+                    grant, wait = self._try_grant(ticket, tokens)
+                    if grant is not None:
+                        return grant
+                    self._cond.wait(timeout=wait)
+        finally:
+            self._dequeue(ticket)
+
+    async def aacquire(self, agent: str | None, model: str, tokens: int) -> Grant:
+        """Async ``acquire``; waits without blocking the event loop."""
+        ticket = self._enqueue(agent, model)
+        try:
+            while True:
+                with self._cond:
+                    grant, wait = self._try_grant(ticket, tokens)
+                if grant is not None:
+                    return grant
+                # Nothing wakes a coroutine early, so recheck at least every poll interval
+                await asyncio.sleep(min(wait, _POLL_S))
+        finally:
+            self._dequeue(ticket)
+
+    def settle(self, grant: Grant, tokens: int) -> None:
+        """Replace a grant's estimated tokens with the actual usage."""
+        with self._cond:
+            for entry in grant.entries:
+                entry[1] = tokens
+            self._cond.notify_all()
+
+    def waiting(self) -> int:
+        with self._cond:
+            return len(self._waiting)
+
+
+scheduler = Scheduler()
+_max_retries = 4
+_backoff_base_s = 1.0
+
+
+def configure_scheduler(
+    limits: dict[str, dict[str, int]] | None = None,
+    priorities: dict[str, int] | None = None,
+    max_retries: int = 4,
+    backoff_base_s: float = 1.0,
+) -> None:
+    """Set rate-limit budgets, agent priorities, and 429 retry behaviour.
+
+    Args:
+        limits: Provider or model -> {"rpm": requests/min, "tpm": tokens/min};
+            either may be omitted.
+        priorities: Agent name -> priority overrides (lower runs first).
+        max_retries: Retries after a 429 before the error is raised (and the
+            agent's fallback chain moves on).
+        backoff_base_s: First backoff delay; doubles per retry, with jitter.
+    """
+    global _max_retries, _backoff_base_s
+    scheduler.configure(limits, priorities)
+    _max_retries = max_retries
+    _backoff_base_s = backoff_base_s
+
+
+def _backoff(attempt: int, error: Exception) -> float:
+    headers = getattr(error, "litellm_response_headers", None) or getattr(
+        getattr(error, "response", None), "headers", None
+    )
+    try:
+        retry_after = float(headers.get("retry-after")) if headers else None
+    except (TypeError, ValueError):
+        retry_after = None
+    if retry_after is not None:
+        return min(retry_after, _MAX_BACKOFF_S)
+    delay = _backoff_base_s * 2**attempt
+    return min(delay * random.uniform(0.5, 1.5), _MAX_BACKOFF_S)
+
+
+def _settle(grant: Grant, result) -> None:
+    usage = getattr(result, "usage", None)
+    total = usage.get("total_tokens") if isinstance(usage, dict) else getattr(
+        usage, "total_tokens", None
+    )
+    if total:
+        scheduler.settle(grant, int(total))
+
+
+def run(
+    agent: str | None, model: str, tokens: int, send: Callable[[], T]
+) -> tuple[T, float]:
+    """Send a call within its budgets, retrying 429s with backoff.
+
+    ``tokens`` is the reservation estimate; it is replaced by the
+    response's ``usage.total_tokens`` when there is one (streams keep the
+    estimate). Returns ``(result, sent_at)``, where ``sent_at`` is the
+    ``time.perf_counter()`` at which the successful attempt was sent, so
+    callers can time the call without the queueing and backoff.
+    """
+    import litellm
+
+    for attempt in itertools.count():
+        grant = scheduler.acquire(agent, model, tokens)
+        sent_at = time.perf_counter()
+        try:
+            result = send()
+        except litellm.RateLimitError as e:
+            if attempt >= _max_retries:
+                raise
+            delay = _backoff(attempt, e)
+            logger.warning("LLM 429 from %s; retry %d in %.1fs", model, attempt + 1, delay)
+            time.sleep(delay)
+            continue
+        _settle(grant, result)
+        return result, sent_at
+
+
+async def arun(
+    agent: str | None, model: str, tokens: int, send: Callable[[], Awaitable[T]]
+) -> tuple[T, float]:
+    """Async ``run``."""
+    import litellm
+
+    for attempt in itertools.count():
+        grant = await scheduler.aacquire(agent, model, tokens)
+        sent_at = time.perf_counter()
+        try:
+            result = await send()
+        except litellm.RateLimitError as e:
+            if attempt >= _max_retries:
+                raise
+            delay = _backoff(attempt, e)
+            logger.warning("LLM 429 from %s; retry %d in %.1fs", model, attempt + 1, delay)
+            await asyncio.sleep(delay)
+            continue
+        _settle(grant, result)
+        return result, sent_at
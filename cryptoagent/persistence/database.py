@@ -4,6 +4,9 @@ from __future__ import annotations
 
 import logging
 import sqlite3
+import threading
+from collections.abc import Iterator
+from contextlib import contextmanager
 from pathlib import Path
 
 logger = logging.getLogger(__name__)
@@ -32,6 +35,14 @@ CREATE TABLE IF NOT EXISTS reflections (
     performance_summary TEXT
 );
 
+CREATE TABLE IF NOT EXISTS reflection_queue (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    timestamp TEXT NOT NULL,
+    brain_decision TEXT NOT NULL,
+    trade_result TEXT NOT NULL,
+    regime TEXT
+);
+
 CREATE TABLE IF NOT EXISTS signals (
     id INTEGER PRIMARY KEY AUTOINCREMENT,
     timestamp TEXT NOT NULL,
@@ -61,6 +72,125 @@ CREATE TABLE IF NOT EXISTS signal_outcomes (
     direction_correct INTEGER NOT NULL,
     evaluated_at TEXT NOT NULL
 );
+
+CREATE TABLE IF NOT EXISTS fred_observations (
+    series_id TEXT NOT NULL,
+    date TEXT NOT NULL,
+    value REAL,
+    PRIMARY KEY (series_id, date)
+);
+
+CREATE TABLE IF NOT EXISTS fred_sync (
+    series_id TEXT PRIMARY KEY,
+    synced_at REAL NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS tvl_history (
+    kind TEXT NOT NULL,
+    key TEXT NOT NULL,
+    date TEXT NOT NULL,
+    tvl REAL NOT NULL,
+    PRIMARY KEY (kind, key, date)
+);
+
+CREATE TABLE IF NOT EXISTS tvl_sync (
+    kind TEXT NOT NULL,
+    key TEXT NOT NULL,
+    synced_on TEXT NOT NULL,
+    PRIMARY KEY (kind, key)
+);
+
+CREATE TABLE IF NOT EXISTS whale_cursors (
+    address TEXT PRIMARY KEY,
+    last_signature TEXT NOT NULL,
+    last_slot INTEGER NOT NULL,
+    updated_at TEXT NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS whale_transactions (
+    address TEXT NOT NULL,
+    signature TEXT NOT NULL,
+    slot INTEGER NOT NULL,
+    block_time INTEGER,
+    failed INTEGER NOT NULL,
+    PRIMARY KEY (address, signature)
+);
+
+CREATE INDEX IF NOT EXISTS idx_whale_tx_time ON whale_transactions (block_time);
+
+CREATE TABLE IF NOT EXISTS reddit_posts (
+    id TEXT PRIMARY KEY,
+    subreddit TEXT NOT NULL,
+    title TEXT NOT NULL,
+    body TEXT NOT NULL,
+    score INTEGER NOT NULL,
+    num_comments INTEGER NOT NULL,
+    upvote_ratio REAL NOT NULL,
+    created_utc REAL NOT NULL,
+    first_seen TEXT NOT NULL,
+    updated_at TEXT NOT NULL
+);
+
+CREATE INDEX IF NOT EXISTS idx_reddit_posts_created ON reddit_posts (created_utc);
+
+CREATE TABLE IF NOT EXISTS http_cache (
+    url TEXT PRIMARY KEY,
+    etag TEXT,
+    last_modified TEXT,
+    body TEXT,
+    fetched_at REAL NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS news_items (
+    id TEXT PRIMARY KEY,
+    title TEXT NOT NULL,
+    link TEXT NOT NULL,
+    pub_date TEXT NOT NULL,
+    published_utc REAL NOT NULL,
+    first_seen TEXT NOT NULL
+);
+
+CREATE INDEX IF NOT EXISTS idx_news_items_published ON news_items (published_utc);
+
+CREATE TABLE IF NOT EXISTS news_tokens (
+    token TEXT NOT NULL,
+    item_id TEXT NOT NULL REFERENCES news_items(id),
+    published_utc REAL NOT NULL,
+    PRIMARY KEY (token, item_id)
+);
+
+CREATE INDEX IF NOT EXISTS idx_news_tokens_recent ON news_tokens (token, published_utc);
+
+CREATE TABLE IF NOT EXISTS fear_greed (
+    date TEXT PRIMARY KEY,
+    value INTEGER NOT NULL,
+    classification TEXT NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS github_commit_activity (
+    repo TEXT NOT NULL,
+    week INTEGER NOT NULL,
+    total INTEGER NOT NULL,
+    PRIMARY KEY (repo, week)
+);
+
+CREATE TABLE IF NOT EXISTS llm_calls (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    timestamp TEXT NOT NULL,
+    cycle_id TEXT,
+    token TEXT,
+    agent TEXT NOT NULL,
+    model TEXT NOT NULL,
+    prompt_tokens INTEGER NOT NULL,
+    cached_prompt_tokens INTEGER NOT NULL DEFAULT 0,
+    completion_tokens INTEGER NOT NULL,
+    cost_usd REAL NOT NULL,
+    latency_ms REAL NOT NULL,
+    decision_ms REAL,
+    cached INTEGER NOT NULL DEFAULT 0
+);
+
+CREATE INDEX IF NOT EXISTS idx_llm_calls_cycle ON llm_calls (cycle_id);
 """
 
 _SCHEMA_PG = """
@@ -87,6 +217,14 @@ CREATE TABLE IF NOT EXISTS reflections (
     performance_summary TEXT
 );
 
+CREATE TABLE IF NOT EXISTS reflection_queue (
+    id SERIAL PRIMARY KEY,
+    timestamp TEXT NOT NULL,
+    brain_decision TEXT NOT NULL,
+    trade_result TEXT NOT NULL,
+    regime TEXT
+);
+
 CREATE TABLE IF NOT EXISTS signals (
     id SERIAL PRIMARY KEY,
     timestamp TEXT NOT NULL,
@@ -116,6 +254,125 @@ CREATE TABLE IF NOT EXISTS signal_outcomes (
     direction_correct BOOLEAN NOT NULL,
     evaluated_at TEXT NOT NULL
 );
+
+CREATE TABLE IF NOT EXISTS fred_observations (
+    series_id TEXT NOT NULL,
+    date TEXT NOT NULL,
+    value REAL,
+    PRIMARY KEY (series_id, date)
+);
+
+CREATE TABLE IF NOT EXISTS fred_sync (
+    series_id TEXT PRIMARY KEY,
+    synced_at DOUBLE PRECISION NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS tvl_history (
+    kind TEXT NOT NULL,
+    key TEXT NOT NULL,
+    date TEXT NOT NULL,
+    tvl REAL NOT NULL,
+    PRIMARY KEY (kind, key, date)
+);
+
+CREATE TABLE IF NOT EXISTS tvl_sync (
+    kind TEXT NOT NULL,
+    key TEXT NOT NULL,
+    synced_on TEXT NOT NULL,
+    PRIMARY KEY (kind, key)
+);
+
+CREATE TABLE IF NOT EXISTS whale_cursors (
+    address TEXT PRIMARY KEY,
+    last_signature TEXT NOT NULL,
+    last_slot BIGINT NOT NULL,
+    updated_at TEXT NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS whale_transactions (
+    address TEXT NOT NULL,
+    signature TEXT NOT NULL,
+    slot BIGINT NOT NULL,
+    block_time BIGINT,
+    failed BOOLEAN NOT NULL,
+    PRIMARY KEY (address, signature)
+);
+
+CREATE INDEX IF NOT EXISTS idx_whale_tx_time ON whale_transactions (block_time);
+
+CREATE TABLE IF NOT EXISTS reddit_posts (
+    id TEXT PRIMARY KEY,
+    subreddit TEXT NOT NULL,
+    title TEXT NOT NULL,
+    body TEXT NOT NULL,
+    score INTEGER NOT NULL,
+    num_comments INTEGER NOT NULL,
+    upvote_ratio REAL NOT NULL,
+    created_utc DOUBLE PRECISION NOT NULL,
+    first_seen TEXT NOT NULL,
+    updated_at TEXT NOT NULL
+);
+
+CREATE INDEX IF NOT EXISTS idx_reddit_posts_created ON reddit_posts (created_utc);
+
+CREATE TABLE IF NOT EXISTS http_cache (
+    url TEXT PRIMARY KEY,
+    etag TEXT,
+    last_modified TEXT,
+    body TEXT,
+    fetched_at DOUBLE PRECISION NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS news_items (
+    id TEXT PRIMARY KEY,
+    title TEXT NOT NULL,
+    link TEXT NOT NULL,
+    pub_date TEXT NOT NULL,
+    published_utc DOUBLE PRECISION NOT NULL,
+    first_seen TEXT NOT NULL
+);
+
+CREATE INDEX IF NOT EXISTS idx_news_items_published ON news_items (published_utc);
+
+CREATE TABLE IF NOT EXISTS news_tokens (
+    token TEXT NOT NULL,
+    item_id TEXT NOT NULL REFERENCES news_items(id),
+    published_utc DOUBLE PRECISION NOT NULL,
+    PRIMARY KEY (token, item_id)
+);
+
+CREATE INDEX IF NOT EXISTS idx_news_tokens_recent ON news_tokens (token, published_utc);
+
+CREATE TABLE IF NOT EXISTS fear_greed (
+    date TEXT PRIMARY KEY,
+    value INTEGER NOT NULL,
+    classification TEXT NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS github_commit_activity (
+    repo TEXT NOT NULL,
+    week BIGINT NOT NULL,
+    total INTEGER NOT NULL,
+    PRIMARY KEY (repo, week)
+);
+
+CREATE TABLE IF NOT EXISTS llm_calls (
+    id SERIAL PRIMARY KEY,
+    timestamp TEXT NOT NULL,
+    cycle_id TEXT,
+    token TEXT,
+    agent TEXT NOT NULL,
+    model TEXT NOT NULL,
+    prompt_tokens INTEGER NOT NULL,
+    cached_prompt_tokens INTEGER NOT NULL DEFAULT 0,
+    completion_tokens INTEGER NOT NULL,
+    cost_usd DOUBLE PRECISION NOT NULL,
+    latency_ms DOUBLE PRECISION NOT NULL,
+    decision_ms DOUBLE PRECISION,
+    cached INTEGER NOT NULL DEFAULT 0
+);
+
+CREATE INDEX IF NOT EXISTS idx_llm_calls_cycle ON llm_calls (cycle_id);
 """
 
 
@@ -125,6 +382,10 @@ class _PgCursorAdapter:
     def __init__(self, cursor):
         self._cursor = cursor
 
+    @property
+    def rowcount(self) -> int:
+        return self._cursor.rowcount
+
     def fetchone(self):
         row = self._cursor.fetchone()
         if row is None:
@@ -161,6 +422,12 @@ class _PgConnAdapter:
         cursor.execute(translated, params)
         return _PgCursorAdapter(cursor)
 
+    def executemany(self, sql: str, seq_of_params):
+        translated = sql.replace("?", "%s")
+        cursor = self._conn.cursor()
+        cursor.executemany(translated, seq_of_params)
+        return _PgCursorAdapter(cursor)
+
     def executescript(self, sql: str):
         cursor = self._conn.cursor()
         cursor.execute(sql)
@@ -168,33 +435,72 @@ class _PgConnAdapter:
     def commit(self):
         self._conn.commit()
 
+    def rollback(self):
+        self._conn.rollback()
+
     def close(self):
         self._conn.close()
 
 
 class Database:
-    """Manages a database connection (SQLite or PostgreSQL)."""
+    """Manages a database connection (SQLite or PostgreSQL).
+
+    One connection is shared by the graph's worker threads and background
+    pollers. Reads may use ``conn`` directly; writes go through
+    ``transaction()`` so that one thread's commit never commits (or
+    interleaves with) another thread's half-finished batch.
+    """
 
     def __init__(self, db_path: str = "data/cryptoagent.db") -> None:
         self._db_path = db_path
         self._is_pg = db_path.startswith("postgresql://")
         self._conn = None
+        self._open_lock = threading.Lock()
+        self._write_lock = threading.RLock()
+        self._depth = 0  # transaction nesting; only touched with the write lock held
 
     @property
     def conn(self):
         if self._conn is None:
-            if self._is_pg:
-                self._conn = self._connect_pg()
-            else:
-                self._conn = self._connect_sqlite()
-            self._init_schema()
-            logger.info("Database opened: %s", "PostgreSQL" if self._is_pg else self._db_path)
+            # Concurrent cycles may open the database at once; publish the
+            # connection only after its schema exists
+            with self._open_lock:
+                if self._conn is None:
+                    conn = self._connect_pg() if self._is_pg else self._connect_sqlite()
+                    self._init_schema(conn)
+                    self._conn = conn
+                    logger.info(
+                        "Database opened: %s", "PostgreSQL" if self._is_pg else self._db_path
+                    )
         return self._conn
 
+    @contextmanager
+    def transaction(self) -> Iterator:
+        """Hold the write lock for a block of writes; commit on success, roll back on error.
+
+        Re-entrant: a nested block joins the outer one, which commits.
+        """
+        with self._write_lock:
+            conn = self.conn
+            outermost = self._depth == 0
+            self._depth += 1
+            try:
+                yield conn
+            except BaseException:
+                if outermost:
+                    conn.rollback()
+                raise
+            else:
+                if outermost:
+                    conn.commit()
+            finally:
+                self._depth -= 1
+
     def _connect_sqlite(self) -> sqlite3.Connection:
         path = Path(self._db_path)
         path.parent.mkdir(parents=True, exist_ok=True)
-        conn = sqlite3.connect(str(path))
+        # Graph nodes run in worker threads and share this connection
+        conn = sqlite3.connect(str(path), check_same_thread=False)
         conn.row_factory = sqlite3.Row
         conn.execute("PRAGMA journal_mode=WAL")
         return conn
@@ -206,12 +512,13 @@ class Database:
         pg_conn.autocommit = False
         return _PgConnAdapter(pg_conn)
 
-    def _init_schema(self) -> None:
+    def _init_schema(self, conn) -> None:
         schema = _SCHEMA_PG if self._is_pg else _SCHEMA_SQLITE
-        self.conn.executescript(schema)
-        self.conn.commit()
+        conn.executescript(schema)
+        conn.commit()
 
     def close(self) -> None:
-        if self._conn is not None:
-            self._conn.close()
-            self._conn = None
+        with self._write_lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
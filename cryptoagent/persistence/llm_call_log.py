@@ -0,0 +1,67 @@
+"""LLM call log — per-call token, cost, and latency records."""
+
+from __future__ import annotations
+
+from cryptoagent.persistence.database import Database
+
+
+class LLMCallLog:
+    """Persists one row per LLM call and summarises them per cycle.
+
+    ``record`` is installed as the client's accounting sink and may be
+    called from several graph worker threads at once; writes go through
+    the database's write lock.
+    """
+
+    def __init__(self, db: Database) -> None:
+        self._db = db
+
+    def record(self, call: dict) -> None:
+        """Insert a call dict as produced by ``llm.accounting.record_call``."""
+        with self._db.transaction() as conn:
+            conn.execute(
+                """INSERT INTO llm_calls
+                   (timestamp, cycle_id, token, agent, model, prompt_tokens,
+                    cached_prompt_tokens, completion_tokens, cost_usd, latency_ms,
+                    decision_ms, cached)
+                   VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""",
+                (
+                    call["timestamp"],
+                    call["cycle_id"],
+                    call["token"],
+                    call["agent"],
+                    call["model"],
+                    call["prompt_tokens"],
+                    call.get("cached_prompt_tokens", 0),
+                    call["completion_tokens"],
+                    call["cost_usd"],
+                    call["latency_ms"],
+                    call.get("decision_ms"),
+                    int(call["cached"]),
+                ),
+            )
+
+    def cycle_breakdown(self, cycle_id: str) -> list[dict]:
+        """Per-agent, per-model totals for one cycle, most expensive first.
+
+        An agent whose calls went to several models (fallbacks, hedged
+        requests) gets one row per model. Each row has agent, model, calls,
+        cached, prompt_tokens, cached_prompt_tokens (served from the
+        provider's prefix cache), completion_tokens, cost_usd, and latency_ms
+        (summed over calls), and decision_ms (summed over streamed calls;
+        None if none streamed).
+        """
+        cursor = self._db.conn.execute(
+            """SELECT agent, model, COUNT(*) AS calls,
+                      SUM(cached) AS cached,
+                      SUM(prompt_tokens) AS prompt_tokens,
+                      SUM(cached_prompt_tokens) AS cached_prompt_tokens,
+                      SUM(completion_tokens) AS completion_tokens,
+                      SUM(cost_usd) AS cost_usd,
+                      SUM(latency_ms) AS latency_ms,
+                      SUM(decision_ms) AS decision_ms
+               FROM llm_calls WHERE cycle_id = ?
+               GROUP BY agent, model ORDER BY cost_usd DESC, latency_ms DESC""",
+            (cycle_id,),
+        )
+        return [dict(row) for row in cursor.fetchall()]
@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import json
 import logging
 from datetime import datetime, timezone
 
@@ -24,18 +25,18 @@ class ReflectionStore:
         performance_summary: str = "",
     ) -> None:
         """Insert a reflection entry (level 1 = per-cycle, level 2 = cross-trial)."""
-        self._db.conn.execute(
-            """INSERT INTO reflections (timestamp, level, text, regime, performance_summary)
-               VALUES (?, ?, ?, ?, ?)""",
-            (
-                datetime.now(timezone.utc).isoformat(),
-                level,
-                text,
-                regime,
-                performance_summary,
-            ),
-        )
-        self._db.conn.commit()
+        with self._db.transaction() as conn:
+            conn.execute(
+                """INSERT INTO reflections (timestamp, level, text, regime, performance_summary)
+                   VALUES (?, ?, ?, ?, ?)""",
+                (
+                    datetime.now(timezone.utc).isoformat(),
+                    level,
+                    text,
+                    regime,
+                    performance_summary,
+                ),
+            )
         logger.info("Reflection stored: level=%d, regime=%s", level, regime)
 
     def get_latest_cross_trial(self, limit: int = 3) -> list[str]:
@@ -67,3 +68,50 @@ class ReflectionStore:
             (last_l2_id,),
         )
         return cursor.fetchone()["cnt"]
+
+    def enqueue(self, brain_decision: dict, trade_result: dict, regime: str = "unknown") -> None:
+        """Queue a cycle's outcome for a deferred Level 1 reflection."""
+        with self._db.transaction() as conn:
+            conn.execute(
+                """INSERT INTO reflection_queue (timestamp, brain_decision, trade_result, regime)
+                   VALUES (?, ?, ?, ?)""",
+                (
+                    datetime.now(timezone.utc).isoformat(),
+                    json.dumps(brain_decision),
+                    json.dumps(trade_result),
+                    regime,
+                ),
+            )
+
+    def get_queued(self, limit: int = 10) -> list[dict]:
+        """Return the oldest queued cycles (id, brain_decision, trade_result, regime)."""
+        cursor = self._db.conn.execute(
+            """SELECT id, brain_decision, trade_result, regime
+               FROM reflection_queue ORDER BY id LIMIT ?""",
+            (limit,),
+        )
+        return [
+            {
+                "id": row["id"],
+                "brain_decision": json.loads(row["brain_decision"]),
+                "trade_result": json.loads(row["trade_result"]),
+                "regime": row["regime"],
+            }
+            for row in cursor.fetchall()
+        ]
+
+    def dequeue(self, queue_id: int) -> None:
+        """Remove a queued cycle once its reflection is stored."""
+        with self._db.transaction() as conn:
+            conn.execute("DELETE FROM reflection_queue WHERE id = ?", (queue_id,))
+
+    def resolve(self, queue_id: int, text: str, regime: str = "unknown") -> None:
+        """Store a queued cycle's Level 1 reflection and dequeue it in one transaction.
+
+        A crash can't leave the reflection stored with its cycle still queued
+        (which would store it twice), or the cycle dequeued without it.
+        """
+        with self._db.transaction():
+            self.insert(level=1, text=text, regime=regime)
+            self.dequeue(queue_id)
+
@@ -27,25 +27,25 @@ class TradeLogger:
         trade = execution.get("trade", {})
         portfolio = execution.get("updated_portfolio", {})
 
-        self._db.conn.execute(
-            """INSERT INTO trades
-               (timestamp, token, action, price, quantity, fee,
-                portfolio_snapshot, brain_decision, regime, confidence)
-               VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""",
-            (
-                datetime.now(timezone.utc).isoformat(),
-                brain.get("asset", trade.get("token", "")),
-                brain.get("action", "HOLD"),
-                trade.get("price", 0),
-                trade.get("quantity", 0),
-                trade.get("fee", 0),
-                json.dumps(portfolio, default=str),
-                json.dumps(brain, default=str),
-                brain.get("regime", "unknown"),
-                brain.get("confidence", 0),
-            ),
-        )
-        self._db.conn.commit()
+        with self._db.transaction() as conn:
+            conn.execute(
+                """INSERT INTO trades
+                   (timestamp, token, action, price, quantity, fee,
+                    portfolio_snapshot, brain_decision, regime, confidence)
+                   VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""",
+                (
+                    datetime.now(timezone.utc).isoformat(),
+                    brain.get("asset", trade.get("token", "")),
+                    brain.get("action", "HOLD"),
+                    trade.get("price", 0),
+                    trade.get("quantity", 0),
+                    trade.get("fee", 0),
+                    json.dumps(portfolio, default=str),
+                    json.dumps(brain, default=str),
+                    brain.get("regime", "unknown"),
+                    brain.get("confidence", 0),
+                ),
+            )
         logger.info("Trade logged: %s %s", brain.get("action"), brain.get("asset"))
 
     def get_recent(self, limit: int = 10) -> list[dict]:
@@ -1,8 +1,16 @@
-"""Reflection Manager — Level 1 (per-cycle) and Level 2 (cross-trial) reflections."""
+"""Reflection Manager — Level 1 (per-cycle) and Level 2 (cross-trial) reflections.
+
+Reflections are only read by the next cycle, so they can be taken off the
+critical path: ``defer`` queues a cycle's outcome in the ``reflection_queue``
+table and a background worker (``start_worker``) generates and stores the
+reflections once the trade is committed. The queue is durable; cycles still
+queued when the process exits are picked up by the next worker.
+"""
 
 from __future__ import annotations
 
 import logging
+import threading
 
 from cryptoagent.llm.client import call_llm
 from cryptoagent.persistence.database import Database
@@ -34,6 +42,10 @@ class ReflectionManager:
         self._store = ReflectionStore(db)
         self._model = model
         self._cycle_length = cycle_length
+        self._drain_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._worker: threading.Thread | None = None
 
     def generate_level1(
         self,
@@ -51,6 +63,32 @@ class ReflectionManager:
         Returns:
             The reflection text.
         """
+        reflection = self._level1_text(brain_decision, trade_result, regime)
+        self._store.insert(level=1, text=reflection, regime=regime)
+        logger.info("[Reflection] Level 1 stored")
+        return reflection
+
+    def _level1_text(self, brain_decision: dict, trade_result: dict, regime: str) -> str:
+        """The LLM's per-cycle reflection, or the template summary if the call fails."""
+        user_prompt, fallback = self._level1_prompt(brain_decision, trade_result, regime)
+        try:
+            return call_llm(
+                model=self._model,
+                system=_LEVEL1_SYSTEM,
+                user=user_prompt,
+                temperature=0.3,
+                max_tokens=256,
+                agent="reflection",
+            )
+        except Exception as e:
+            logger.warning("Level 1 reflection LLM call failed: %s", e)
+            return fallback
+
+    @staticmethod
+    def _level1_prompt(
+        brain_decision: dict, trade_result: dict, regime: str
+    ) -> tuple[str, str]:
+        """Return ``(user_prompt, fallback)``; the fallback is a template summary."""
         action = brain_decision.get("action", "HOLD")
         confidence = brain_decision.get("confidence", "?")
         rationale = brain_decision.get("rationale", "")
@@ -73,22 +111,8 @@ class ReflectionManager:
             f"Outcome: {execution_info}\n\n"
             f"Summarize the lesson from this cycle."
         )
-
-        try:
-            reflection = call_llm(
-                model=self._model,
-                system=_LEVEL1_SYSTEM,
-                user=user_prompt,
-                temperature=0.3,
-                max_tokens=256,
-            )
-        except Exception as e:
-            logger.warning("Level 1 reflection LLM call failed: %s", e)
-            reflection = f"[Auto] {action} decision with confidence {confidence}. {execution_info}"
-
-        self._store.insert(level=1, text=reflection, regime=regime)
-        logger.info("[Reflection] Level 1 stored")
-        return reflection
+        fallback = f"[Auto] {action} decision with confidence {confidence}. {execution_info}"
+        return user_prompt, fallback
 
     def maybe_generate_level2(self, regime: str = "unknown") -> str | None:
         """Generate a Level 2 cross-trial reflection if enough cycles have passed.
@@ -124,6 +148,7 @@ class ReflectionManager:
                 user=user_prompt,
                 temperature=0.4,
                 max_tokens=512,
+                agent="reflection",
             )
         except Exception as e:
             logger.warning("Level 2 reflection LLM call failed: %s", e)
@@ -133,6 +158,84 @@ class ReflectionManager:
         logger.info("[Reflection] Level 2 cross-trial review stored")
         return review
 
+    def defer(
+        self,
+        brain_decision: dict,
+        trade_result: dict,
+        regime: str = "unknown",
+    ) -> str:
+        """Queue this cycle's reflections for the background worker.
+
+        Returns the template summary (the Level 1 fallback text) so the
+        caller can carry something forward without waiting on the LLM.
+        """
+        self._store.enqueue(brain_decision, trade_result, regime)
+        self._wake.set()
+        logger.info("[Reflection] Level 1 queued")
+        return self._level1_prompt(brain_decision, trade_result, regime)[1]
+
+    def drain(self, limit: int | None = None) -> int:
+        """Generate reflections for queued cycles, oldest first.
+
+        Each cycle gets its Level 1 reflection, then a Level 2 review if one
+        is due, exactly as in synchronous mode. The Level 1 reflection is
+        stored and the cycle dequeued atomically, so none is stored twice.
+        Returns the cycles processed.
+        """
+        done = 0
+        with self._drain_lock:
+            while limit is None or done < limit:
+                queued = self._store.get_queued(limit=1)
+                if not queued:
+                    break
+                job = queued[0]
+                reflection = self._level1_text(
+                    job["brain_decision"], job["trade_result"], job["regime"]
+                )
+                self._store.resolve(job["id"], reflection, job["regime"])
+                logger.info("[Reflection] Level 1 stored")
+                self.maybe_generate_level2(regime=job["regime"])
+                done += 1
+        return done
+
+    def start_worker(self) -> None:
+        """Start the background thread that drains the queue as cycles are deferred."""
+        if self._worker is not None:
+            return
+        self._stop.clear()
+        self._worker = threading.Thread(
+            target=self._run_worker, name="reflection-drain", daemon=True
+        )
+        self._worker.start()
+        # Pick up cycles left queued by an earlier run
+        self._wake.set()
+
+    def stop_worker(self, drain: bool = True) -> None:
+        """Stop the worker after its current cycle; with ``drain``, then
+        process whatever is still queued before returning."""
+        if self._worker is not None:
+            self._stop.set()
+            self._wake.set()
+            self._worker.join()
+            self._worker = None
+        if drain:
+            self.drain()
+
+    def _run_worker(self) -> None:
+        while True:
+            self._wake.wait()
+            self._wake.clear()
+            while not self._stop.is_set():
+                try:
+                    if not self.drain(limit=1):
+                        break
+                except Exception as e:
+                    # The cycle stays queued and is retried on the next wake-up
+                    logger.warning("Deferred reflection failed: %s", e)
+                    break
+            if self._stop.is_set():
+                return
+
     def get_cross_trial_reflections(self, limit: int = 3) -> list[str]:
         """Load the latest cross-trial reflections for Brain prompt injection."""
         return self._store.get_latest_cross_trial(limit=limit)
@@ -39,42 +39,42 @@ def evaluate_pending_signals(
     signal_logger = SignalLogger(db)
     total_evaluated = 0
 
-    for timeframe, min_hours in TIMEFRAMES.items():
-        unevaluated = signal_logger.get_unevaluated_signals(
-            token=token,
-            timeframe=timeframe,
-            min_age_hours=min_hours,
-        )
-
-        for sig in unevaluated:
-            price_at_signal = signal_logger.get_signal_price(sig["id"])
-            if price_at_signal is None or price_at_signal <= 0:
-                continue
-
-            price_change_pct = (
-                (current_price - price_at_signal) / price_at_signal
-            ) * 100
-            direction_correct = _check_direction(sig["direction"], price_change_pct)
-
-            db.conn.execute(
-                """INSERT INTO signal_outcomes
-                   (signal_id, timeframe, price_at_signal, price_at_eval,
-                    price_change_pct, direction_correct, evaluated_at)
-                   VALUES (?, ?, ?, ?, ?, ?, ?)""",
-                (
-                    sig["id"],
-                    timeframe,
-                    price_at_signal,
-                    current_price,
-                    round(price_change_pct, 4),
-                    1 if direction_correct else 0,
-                    datetime.now(timezone.utc).isoformat(),
-                ),
+    with db.transaction() as conn:
+        for timeframe, min_hours in TIMEFRAMES.items():
+            unevaluated = signal_logger.get_unevaluated_signals(
+                token=token,
+                timeframe=timeframe,
+                min_age_hours=min_hours,
             )
-            total_evaluated += 1
+
+            for sig in unevaluated:
+                price_at_signal = signal_logger.get_signal_price(sig["id"])
+                if price_at_signal is None or price_at_signal <= 0:
+                    continue
+
+                price_change_pct = (
+                    (current_price - price_at_signal) / price_at_signal
+                ) * 100
+                direction_correct = _check_direction(sig["direction"], price_change_pct)
+
+                conn.execute(
+                    """INSERT INTO signal_outcomes
+                       (signal_id, timeframe, price_at_signal, price_at_eval,
+                        price_change_pct, direction_correct, evaluated_at)
+                       VALUES (?, ?, ?, ?, ?, ?, ?)""",
+                    (
+                        sig["id"],
+                        timeframe,
+                        price_at_signal,
+                        current_price,
+                        round(price_change_pct, 4),
+                        1 if direction_correct else 0,
+                        datetime.now(timezone.utc).isoformat(),
+                    ),
+                )
+                total_evaluated += 1
 
     if total_evaluated > 0:
-        db.conn.commit()
         logger.info("Evaluated %d signal outcomes for %s", total_evaluated, token)
 
     return total_evaluated
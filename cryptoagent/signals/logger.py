@@ -32,31 +32,31 @@ class SignalLogger:
             volume_24h: Optional 24h volume.
         """
         now = datetime.now(timezone.utc).isoformat()
-        conn = self._db.conn
-
-        # Insert price snapshot
-        conn.execute(
-            "INSERT INTO price_snapshots (timestamp, token, price, volume_24h) VALUES (?, ?, ?, ?)",
-            (now, token.upper(), price, volume_24h),
-        )
-
-        # Batch insert signals
-        for sig in signals:
+        with self._db.transaction() as conn:
+            # Insert price snapshot
             conn.execute(
-                """INSERT INTO signals (timestamp, token, name, source, direction, confidence, raw_value)
-                   VALUES (?, ?, ?, ?, ?, ?, ?)""",
-                (
-                    now,
-                    token.upper(),
-                    sig["name"],
-                    sig["source"],
-                    sig["direction"],
-                    sig["confidence"],
-                    sig.get("raw_value"),
-                ),
+                """INSERT INTO price_snapshots (timestamp, token, price, volume_24h)
+                   VALUES (?, ?, ?, ?)""",
+                (now, token.upper(), price, volume_24h),
             )
 
-        conn.commit()
+            # Batch insert signals
+            for sig in signals:
+                conn.execute(
+                    """INSERT INTO signals
+                       (timestamp, token, name, source, direction, confidence, raw_value)
+                       VALUES (?, ?, ?, ?, ?, ?, ?)""",
+                    (
+                        now,
+                        token.upper(),
+                        sig["name"],
+                        sig["source"],
+                        sig["direction"],
+                        sig["confidence"],
+                        sig.get("raw_value"),
+                    ),
+                )
+
         logger.info(
             "Logged %d signals + price snapshot for %s @ $%.2f",
             len(signals),
@@ -0,0 +1,87 @@
+"""Unit tests for the shared provider TTL cache."""
+
+from __future__ import annotations
+
+import threading
+import time
+
+import pytest
+
+from cryptoagent.dataflows.cache import TTLCache
+
+
+class TestTTLCache:
+    """Expiry, eviction and single-flight loading."""
+
+    def test_get_or_load_caches_value(self) -> None:
+        cache = TTLCache(ttl_seconds=60)
+        calls = []
+
+        def loader() -> int:
+            calls.append(1)
+            return 42
+
+        assert cache.get_or_load("k", loader) == 42
+        assert cache.get_or_load("k", loader) == 42
+        assert len(calls) == 1
+
+    def test_entries_expire(self) -> None:
+        cache = TTLCache(ttl_seconds=0.01)
+        cache.set("k", "v")
+        time.sleep(0.02)
+        assert cache.get("k") is None
+
+    def test_loader_errors_not_cached(self) -> None:
+        cache = TTLCache(ttl_seconds=60)
+
+        def failing() -> int:
+            raise RuntimeError("boom")
+
+        with pytest.raises(RuntimeError):
+            cache.get_or_load("k", failing)
+        assert cache.get_or_load("k", lambda: 7) == 7
+
+    def test_concurrent_callers_share_one_load(self) -> None:
+        cache = TTLCache(ttl_seconds=60)
+        calls = []
+        gate = threading.Event()
+
+        def slow_loader() -> str:
+            calls.append(1)
+            gate.wait(1)
+            return "value"
+
+        results: list[str] = []
+        threads = [
+            threading.Thread(target=lambda: results.append(cache.get_or_load("k", slow_loader)))
+            for _ in range(8)
+        ]
+        for t in threads:
+            t.start()
+        time.sleep(0.05)
+        gate.set()
+        for t in threads:
+            t.join()
+
+        assert results == ["value"] * 8
+        assert len(calls) == 1
+        assert cache._key_locks == {}
+
+    def test_key_locks_released(self) -> None:
+        cache = TTLCache(ttl_seconds=60)
+        for i in range(100):
+            cache.get_or_load(i, lambda: "v")
+
+        def failing() -> str:
+            raise RuntimeError("boom")
+
+        with pytest.raises(RuntimeError):
+            cache.get_or_load("bad", failing)
+        assert cache._key_locks == {}
+
+    def test_eviction_bounds_size(self) -> None:
+        cache = TTLCache(ttl_seconds=60, max_entries=4)
+        for i in range(10):
+            cache.set(i, i)
+        assert len(cache._entries) <= 4
+        assert cache.get(9) == 9
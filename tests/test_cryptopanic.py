@@ -0,0 +1,147 @@
+"""Unit tests for CryptoPanic feed ingestion, the news store, and token matching."""
+
+from __future__ import annotations
+
+import time
+from email.utils import formatdate
+from unittest.mock import patch
+
+import httpx
+import pytest
+
+from cryptoagent.dataflows.http_cache import HttpCache
+from cryptoagent.dataflows.news import cryptopanic
+from cryptoagent.dataflows.news.cryptopanic import NewsIngestor, TokenMatcher, get_crypto_news
+from cryptoagent.dataflows.news.news_store import NewsStore
+
+
+def _rss(items: list[tuple[str, str]], ampersand: bool = False) -> bytes:
+    """RSS document from ``(guid, title)`` pairs, newest first."""
+    now = time.time()
+    body = "".join(
+        f"<item><title>{title}</title><link>https://n.example/{guid}</link>"
+        f"<guid>{guid}</guid><pubDate>{formatdate(now - i * 60)}</pubDate></item>"
+        for i, (guid, title) in enumerate(items)
+    )
+    if ampersand:
+        body = body.replace("</title>", " & more</title>", 1)
+    return f'<?xml version="1.0"?><rss><channel><title>news</title>{body}</channel></rss>'.encode()
+
+
+@pytest.fixture(autouse=True)
+def _clear_cache():
+    cryptopanic._cache.clear()
+    yield
+    cryptopanic._cache.clear()
+
+
+@pytest.fixture
+def feed():
+    """Mock CryptoPanic feed honoring ETag, with request tracking."""
+    state = {
+        "items": [("g1", "Solana ETF approved"), ("g2", "Bitcoin and ETH rally")],
+        "requests": [],
+    }
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        state["requests"].append(request)
+        etag = f'"{len(state["items"])}"'
+        if request.headers.get("If-None-Match") == etag:
+            return httpx.Response(304)
+        return httpx.Response(200, content=_rss(state["items"]), headers={"ETag": etag})
+
+    real_client = httpx.Client
+
+    def client_factory(**kwargs):
+        return real_client(transport=httpx.MockTransport(handler), **kwargs)
+
+    with patch.object(cryptopanic.httpx, "Client", side_effect=client_factory):
+        yield state
+
+
+class TestFeedParsing:
+    """Incremental parsing and the malformed-feed fallback."""
+
+    def test_items_parsed_across_chunk_boundaries(self) -> None:
+        doc = _rss([("g1", "SOL up"), ("g2", "BTC down")])
+        chunks = [doc[i : i + 7] for i in range(0, len(doc), 7)]
+        items = list(cryptopanic._iter_feed(chunks))
+        assert [(i["id"], i["title"]) for i in items] == [("g1", "SOL up"), ("g2", "BTC down")]
+        assert items[0]["published_utc"] > items[1]["published_utc"]
+
+    def test_malformed_feed_falls_back_to_sanitized_parse(self) -> None:
+        doc = _rss([("g1", "SOL up")], ampersand=True)
+        items = list(cryptopanic._iter_feed([doc]))
+        assert [i["title"] for i in items] == ["SOL up & more"]
+
+    def test_missing_guid_falls_back_to_link(self) -> None:
+        doc = b"<rss><channel><item><title>T</title><link>https://x/1</link></item></channel></rss>"
+        assert next(cryptopanic._iter_feed([doc]))["id"] == "https://x/1"
+
+
+class TestTokenMatcher:
+    """One pass finds every watched token."""
+
+    def test_symbols_and_names(self) -> None:
+        match = TokenMatcher(["JUP"])
+        assert match("Bitcoin and ETH rally while JUP lags") == {"BTC", "ETH", "JUP"}
+        assert match("Solana's validators upgrade") == {"SOL"}
+
+    def test_word_bounded(self) -> None:
+        match = TokenMatcher()
+        assert match("Consolidation phase, soldiers of the dotcom era") == set()
+
+
+class TestNewsIngestor:
+    """Poll interval, conditional GET, dedup, and per-token index reads."""
+
+    def test_poll_interval_and_conditional_get(self, feed, in_memory_db) -> None:
+        ingestor = NewsIngestor(NewsStore(in_memory_db), HttpCache(in_memory_db), tokens=["SOL"])
+        assert ingestor.refresh() == 2
+        # Within the interval: no request at all
+        assert ingestor.refresh() == 0
+        assert len(feed["requests"]) == 1
+
+        # Interval elapsed, feed unchanged: conditional GET answered with 304
+        ingestor._poll_interval = 0
+        assert ingestor.refresh() == 0
+        assert feed["requests"][-1].headers["If-None-Match"] == '"2"'
+
+        # Feed changed: only the unseen GUID is stored
+        feed["items"] = [("g3", "Ethereum upgrade"), *feed["items"]]
+        assert ingestor.refresh() == 1
+        assert ingestor.store.count() == 3
+
+    def test_token_index_and_reindex(self, feed, in_memory_db) -> None:
+        store = NewsStore(in_memory_db)
+        feed["items"].append(("g3", "JUP airdrop lands"))
+        ingestor = NewsIngestor(store, HttpCache(in_memory_db))
+        ingestor.refresh()
+        assert [h["title"] for h in store.headlines("ETH")] == ["Bitcoin and ETH rally"]
+        assert store.headlines("JUP") == []
+
+        ingestor.watch(["JUP"])
+        assert [h["title"] for h in store.headlines("JUP")] == ["JUP airdrop lands"]
+
+    def test_get_crypto_news_from_store(self, feed, in_memory_db) -> None:
+        ingestor = NewsIngestor(NewsStore(in_memory_db), HttpCache(in_memory_db))
+        result = get_crypto_news("SOL", ingestor=ingestor)
+        assert result["token_specific"] is True
+        assert [h["title"] for h in result["headlines"]] == ["Solana ETF approved"]
+        assert result["headlines"][0]["sentiment"] == "bullish"
+        assert result["total_count"] == 1
+
+        other = get_crypto_news("DOGE", ingestor=ingestor)
+        assert other["token_specific"] is False
+        assert other["total_count"] == 2
+
+
+class TestGetCryptoNewsWithoutStore:
+    """In-memory path shares one parsed feed across tokens."""
+
+    def test_feed_fetched_once(self, feed) -> None:
+        sol = get_crypto_news("SOL")
+        btc = get_crypto_news("BTC")
+        assert sol["headlines"][0]["title"] == "Solana ETF approved"
+        assert btc["headlines"][0]["title"] == "Bitcoin and ETH rally"
+        assert len(feed["requests"]) == 1
@@ -0,0 +1,140 @@
+"""Unit tests for the chain-aware DeFiLlama on-chain provider."""
+
+from __future__ import annotations
+
+import json
+from unittest.mock import patch
+
+import httpx
+import pytest
+
+from cryptoagent.config import AgentConfig
+from cryptoagent.dataflows.aggregator import DataAggregator, borrow
+from cryptoagent.dataflows.onchain import defillama
+from cryptoagent.dataflows.onchain.tvl_store import TvlStore
+
+_DAY0 = 1_700_000_000
+
+_CHAINS = [
+    {"name": "Ethereum", "tvl": 60e9, "tokenSymbol": "ETH", "chainId": 1},
+    {"name": "Solana", "tvl": 9e9, "tokenSymbol": "SOL", "chainId": None},
+    {"name": "Arbitrum", "tvl": 3e9, "tokenSymbol": "ARB", "chainId": 42161},
+]
+
+
+@pytest.fixture(autouse=True)
+def _clear_cache():
+    defillama._cache.clear()
+    yield
+    defillama._cache.clear()
+
+
+@pytest.fixture
+def requests_seen():
+    """Route DeFiLlama calls to a mock transport and record request paths."""
+    seen: list[str] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        path = request.url.path
+        seen.append(path)
+        if path == "/v2/chains":
+            return httpx.Response(200, text=json.dumps(_CHAINS))
+        if path.startswith("/v2/historicalChainTvl/"):
+            history = [{"date": _DAY0 + i * 86_400, "tvl": 100.0 + i} for i in range(30)]
+            return httpx.Response(200, text=json.dumps(history))
+        if path.startswith("/overview/"):
+            return httpx.Response(200, json={"total24h": 5e8, "change_1d": 2.5, "protocols": []})
+        return httpx.Response(404)
+
+    real_client = httpx.Client
+
+    def client_factory(**kwargs):
+        return real_client(transport=httpx.MockTransport(handler), **kwargs)
+
+    with patch.object(defillama.httpx, "Client", side_effect=client_factory):
+        yield seen
+
+
+class TestChainMapping:
+    """Token → chain resolution."""
+
+    def test_known_tokens(self) -> None:
+        assert defillama.chain_for_token("sol") == "Solana"
+        assert defillama.chain_for_token("ETH") == "Ethereum"
+        assert defillama.chain_for_token("GMX") == "Arbitrum"
+
+    def test_unknown_token(self) -> None:
+        assert defillama.chain_for_token("DOGE2") is None
+
+
+class TestChainData:
+    """Per-chain extraction and shared caching."""
+
+    def test_chain_tvl_for_each_chain(self, requests_seen) -> None:
+        eth = defillama.get_chain_tvl("https://llama.test", "Ethereum")
+        arb = defillama.get_chain_tvl("https://llama.test", "arbitrum")
+        assert eth["tvl"] == 60e9 and eth["token_symbol"] == "ETH"
+        assert arb["chain"] == "Arbitrum"
+        assert requests_seen.count("/v2/chains") == 1
+
+    def test_unknown_chain_returns_error(self, requests_seen) -> None:
+        result = defillama.get_chain_tvl("https://llama.test", "Nowhere")
+        assert result["source"] == "error"
+
+    def test_endpoints_use_chain(self, requests_seen) -> None:
+        data = defillama.get_all_onchain_data("https://llama.test", "Ethereum")
+        assert data["chain"] == "Ethereum"
+        assert data["tvl_history"]["tvl_7d_history"][-1] == 129.0
+        assert "/v2/historicalChainTvl/Ethereum" in requests_seen
+        assert "/overview/dexs/ethereum" in requests_seen
+        assert "/overview/fees/ethereum" in requests_seen
+
+    def test_many_tokens_share_requests(self, requests_seen, in_memory_db) -> None:
+        aggregator = DataAggregator(db=in_memory_db)
+        aggregator._config.defillama_base_url = "https://llama.test"
+        tokens = ["ETH", "AAVE", "UNI", "LINK", "MKR", "ARB", "GMX"]
+        for token in tokens:
+            result = aggregator.get_onchain_data(token)
+            assert result["source"] == "real"
+            assert "solana_network" not in result
+
+        # One chains list, plus history/dex/fees once per distinct chain
+        assert requests_seen.count("/v2/chains") == 1
+        assert len(requests_seen) == 1 + 3 * 2
+
+    def test_unmapped_token_gets_stub(self, requests_seen, in_memory_db) -> None:
+        result = DataAggregator(db=in_memory_db).get_onchain_data("DOGE2")
+        assert result["source"] == "stub"
+        assert requests_seen == []
+
+    def test_history_synced_into_store_once(self, requests_seen, in_memory_db) -> None:
+        store = TvlStore(in_memory_db)
+        first = defillama.get_chain_tvl_history("https://llama.test", "Ethereum", store)
+        defillama._cache.clear()
+        second = defillama.get_chain_tvl_history("https://llama.test", "Ethereum", store)
+
+        assert first == second
+        assert first["tvl_7d_history"][-1] == 129.0
+        assert first["tvl_1d_change_pct"] == round(1 / 128 * 100, 2)
+        assert len(store.get_history("chain", "Ethereum")) == 30
+        # Synced today already, so the second call stays local
+        assert requests_seen.count("/v2/historicalChainTvl/Ethereum") == 1
+
+
+class TestAggregatorLifecycle:
+    """Database ownership for shared and temporary aggregators."""
+
+    def test_injected_db_left_open(self, in_memory_db) -> None:
+        aggregator = DataAggregator(db=in_memory_db)
+        aggregator.close()
+        assert aggregator.db is in_memory_db
+        assert in_memory_db.conn.execute("SELECT 1").fetchone()[0] == 1
+
+    def test_borrow_closes_temporary(self, tmp_path) -> None:
+        config = AgentConfig(db_path=str(tmp_path / "agent.db"), database_url="")
+        with borrow(None, config) as aggregator:
+            db = aggregator.db
+        assert db._conn is None
+        shared = DataAggregator(config=config)
+        with borrow(shared, config) as aggregator:
+            assert aggregator is shared
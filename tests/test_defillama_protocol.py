@@ -0,0 +1,118 @@
+"""Unit tests for concurrent, cached protocol fundamentals."""
+
+from __future__ import annotations
+
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import patch
+
+import httpx
+import pytest
+
+from cryptoagent.dataflows.onchain.tvl_store import PROTOCOL, TvlStore
+from cryptoagent.dataflows.protocol import defillama_protocol as dp
+
+
+@pytest.fixture(autouse=True)
+def _clear_cache():
+    dp._cache.clear()
+    yield
+    dp._cache.clear()
+
+
+@pytest.fixture
+def llama():
+    """Mock DeFiLlama: records request paths and peak concurrency."""
+    state = {"paths": [], "in_flight": 0, "peak": 0, "fail": set()}
+    lock = threading.Lock()
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        path = request.url.path
+        with lock:
+            state["paths"].append(path)
+            state["in_flight"] += 1
+            state["peak"] = max(state["peak"], state["in_flight"])
+        time.sleep(0.02)
+        with lock:
+            state["in_flight"] -= 1
+
+        slug = path.rsplit("/", 1)[-1]
+        if slug in state["fail"]:
+            return httpx.Response(500)
+        if path.startswith("/protocol/"):
+            body = {
+                "name": slug.title(),
+                "category": "Dexes",
+                "chains": ["Ethereum"],
+                "currentChainTvls": {"Ethereum": 100.0, "Ethereum-borrowed": 50.0},
+                "tvl": [
+                    {"date": 1_700_000_000 + i * 86_400, "totalLiquidityUSD": 90.0 + i}
+                    for i in range(11)
+                ],
+            }
+            return httpx.Response(200, text=json.dumps(body))
+        if path.startswith("/summary/fees/"):
+            return httpx.Response(200, json={"total24h": 1.0, "total30d": 30.0})
+        return httpx.Response(404)
+
+    real_client = httpx.Client
+
+    def client_factory(**kwargs):
+        return real_client(transport=httpx.MockTransport(handler), **kwargs)
+
+    with patch.object(dp.httpx, "Client", side_effect=client_factory):
+        yield state
+
+
+class TestProtocolFundamentals:
+    """Concurrency and per-slug caching."""
+
+    def test_report_shape(self, llama) -> None:
+        report = dp.get_protocol_fundamentals("SOL", "https://llama.test")
+        assert report["protocol_count"] == 4
+        assert [p["slug"] for p in report["protocols"]] == dp._TOKEN_PROTOCOL_SLUGS["SOL"]
+        assert report["protocols"][0]["tvl"] == 100.0
+        assert report["protocols"][0]["fees_30d"] == 30.0
+        assert report["total_ecosystem_tvl"] == 400.0
+
+    def test_requests_run_concurrently(self, llama) -> None:
+        dp.get_protocol_fundamentals("ETH", "https://llama.test")
+        assert len(llama["paths"]) == 8
+        assert llama["peak"] > 1
+
+    def test_shared_slugs_fetched_once_across_tokens(self, llama) -> None:
+        for token in ("ETH", "ARB", "OP"):
+            dp.get_protocol_fundamentals(token, "https://llama.test")
+        # Distinct slugs: lido aave uniswap eigenlayer gmx velodrome-v2 synthetix
+        assert llama["paths"].count("/protocol/aave") == 1
+        assert llama["paths"].count("/protocol/uniswap") == 1
+        assert len(llama["paths"]) == 2 * 7
+
+    def test_concurrent_tokens_share_slugs(self, llama) -> None:
+        with ThreadPoolExecutor(max_workers=3) as pool:
+            reports = list(pool.map(
+                lambda t: dp.get_protocol_fundamentals(t, "https://llama.test"),
+                ("ETH", "ARB", "DOGE2"),
+            ))
+        assert reports[1]["protocol_count"] == 3
+        assert reports[2]["protocols"] == []
+        # lido aave uniswap eigenlayer gmx, each once
+        assert len(llama["paths"]) == 2 * 5
+
+    def test_errors_not_cached(self, llama) -> None:
+        llama["fail"].add("aave")
+        first = dp.get_protocol_tvl("aave", "https://llama.test")
+        assert first["source"] == "error"
+        llama["fail"].clear()
+        assert dp.get_protocol_tvl("aave", "https://llama.test")["name"] == "Aave"
+        assert llama["paths"].count("/protocol/aave") == 2
+
+    def test_store_adds_window_stats(self, llama, in_memory_db) -> None:
+        report = dp.get_protocol_fundamentals("UNI", "https://llama.test", TvlStore(in_memory_db))
+        entry = report["protocols"][0]
+        assert entry["tvl_7d_change_pct"] == round(7 / 93 * 100, 2)
+        assert "tvl_7d_volatility_pct" in entry
+        # Protocols always need /protocol/{slug} for current TVL; no sync marker
+        assert not TvlStore(in_memory_db).synced_today(PROTOCOL, "uniswap")
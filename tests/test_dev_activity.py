@@ -0,0 +1,108 @@
+"""Unit tests for the GitHub dev-activity provider, its store, and stats polling."""
+
+from __future__ import annotations
+
+import threading
+from unittest.mock import patch
+
+import httpx
+import pytest
+
+from cryptoagent.dataflows.protocol import dev_activity
+from cryptoagent.dataflows.protocol.dev_activity import StatsPoller, get_dev_activity
+from cryptoagent.dataflows.protocol.github_store import GithubStore
+
+_WEEKS = [{"week": 1_700_000_000 + i * 604800, "total": i, "days": []} for i in range(10)]
+
+
+@pytest.fixture
+def github():
+    """Mock GitHub API honoring ETags, with scriptable stats status codes."""
+    state = {"stats_status": [200], "requests": []}
+    lock = threading.Lock()
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        with lock:
+            state["requests"].append(request)
+        path = request.url.path
+        if path.endswith("/stats/commit_activity"):
+            etag = '"stats"'
+            if request.headers.get("If-None-Match") == etag:
+                return httpx.Response(304)
+            with lock:
+                status = state["stats_status"].pop(0) if state["stats_status"] else 200
+            if status == 202:
+                return httpx.Response(202, json={})
+            return httpx.Response(200, json=_WEEKS, headers={"ETag": etag})
+        etag = '"repo"'
+        if request.headers.get("If-None-Match") == etag:
+            return httpx.Response(304)
+        return httpx.Response(
+            200,
+            json={"stargazers_count": 10, "forks_count": 2, "pushed_at": "2024-01-01"},
+            headers={"ETag": etag},
+        )
+
+    real_client = httpx.Client
+
+    def client_factory(**kwargs):
+        return real_client(transport=httpx.MockTransport(handler), **kwargs)
+
+    with patch.object(dev_activity.httpx, "Client", side_effect=client_factory):
+        yield state
+
+
+class TestDevActivity:
+    """Conditional requests and the local weekly-commit store."""
+
+    def test_store_serves_repeat_cycles(self, github, in_memory_db) -> None:
+        store = GithubStore(in_memory_db)
+        first = get_dev_activity("SOL", store=store)
+        assert first["weekly_commits"] == [6, 7, 8, 9]
+        assert first["commits_last_4_weeks"] == 30
+        assert first["health"] == "active"
+        assert first["stats_pending"] is False
+        assert len(github["requests"]) == 2
+
+        # Within the max ages nothing goes to GitHub
+        assert get_dev_activity("SOL", store=store)["weekly_commits"] == [6, 7, 8, 9]
+        assert len(github["requests"]) == 2
+
+    def test_metadata_revalidated_with_etag(self, github, in_memory_db) -> None:
+        store = GithubStore(in_memory_db)
+        get_dev_activity("SOL", store=store)
+        with patch.object(dev_activity, "_META_MAX_AGE", 0):
+            result = get_dev_activity("SOL", store=store)
+        assert result["stars"] == 10
+        assert github["requests"][-1].headers["If-None-Match"] == '"repo"'
+
+    def test_202_polled_in_background(self, github, in_memory_db) -> None:
+        github["stats_status"] = [202, 202, 200]
+        store = GithubStore(in_memory_db)
+        poller = StatsPoller(store, backoff=0.01)
+
+        first = get_dev_activity("ETH", store=store, poller=poller)
+        assert first["weekly_commits"] == []
+        assert first["stats_pending"] is True
+
+        poller.join(timeout=5)
+        assert store.weekly_commits("ethereum/go-ethereum") == [6, 7, 8, 9]
+        assert get_dev_activity("ETH", store=store)["commits_last_4_weeks"] == 30
+
+    def test_finished_threads_dropped(self, github, in_memory_db) -> None:
+        poller = StatsPoller(GithubStore(in_memory_db), backoff=0.01)
+        for repo in ("org/one", "org/two", "org/three"):
+            assert poller.submit(repo)
+            poller.join(timeout=5)
+        assert len(poller._threads) == 1
+
+    def test_token_sent_when_configured(self, github, in_memory_db) -> None:
+        get_dev_activity("BTC", store=GithubStore(in_memory_db), github_token="ghp_x")
+        assert github["requests"][0].headers["Authorization"] == "Bearer ghp_x"
+
+    def test_without_store(self, github) -> None:
+        github["stats_status"] = [202]
+        result = get_dev_activity("SOL")
+        assert result["weekly_commits"] == []
+        assert "stats_pending" not in result
+        assert get_dev_activity("DOGE")["note"] == "No GitHub repo configured for DOGE"
@@ -0,0 +1,84 @@
+"""Tests for the local Fear & Greed store, bulk load, and daily append."""
+
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone
+from unittest.mock import patch
+
+from cryptoagent.dataflows.onchain import fear_greed
+from cryptoagent.dataflows.onchain.fear_greed import get_fear_greed_index, sync_fear_greed
+from cryptoagent.dataflows.onchain.fear_greed_store import FearGreedStore
+from cryptoagent.persistence.database import Database
+
+_TODAY = datetime.now(timezone.utc).replace(hour=0, minute=0, second=0, microsecond=0)
+
+
+def _entries(days: int, offset: int = 0) -> list[dict]:
+    """API entries for the last ``days`` days ending ``offset`` days ago, newest first."""
+    return [
+        {
+            "value": str(20 + i),
+            "value_classification": "Fear",
+            "timestamp": str(int((_TODAY - timedelta(days=offset + i)).timestamp())),
+        }
+        for i in range(days)
+    ]
+
+
+class TestFearGreedStore:
+    """FearGreedStore reads and writes."""
+
+    def test_value_at_and_history(self, in_memory_db: Database) -> None:
+        store = FearGreedStore(in_memory_db)
+        assert store.value_at() is None
+        store.upsert(_entries(5))
+
+        latest = store.value_at()
+        assert latest["value"] == 20
+        assert latest["date"] == _TODAY.strftime("%Y-%m-%d")
+
+        three_ago = (_TODAY - timedelta(days=3)).strftime("%Y-%m-%d")
+        assert store.value_at(three_ago)["value"] == 23
+        history = store.get_history(end=three_ago)
+        assert [v for _, v in history] == [24, 23]
+
+    def test_malformed_entries_skipped(self, in_memory_db: Database) -> None:
+        store = FearGreedStore(in_memory_db)
+        assert store.upsert([{"value": "x", "timestamp": "1"}, {"value": "5"}]) == 0
+
+
+class TestSync:
+    """Bulk load once, then append only missing days."""
+
+    def test_bulk_then_incremental(self, in_memory_db: Database) -> None:
+        store = FearGreedStore(in_memory_db)
+        with patch.object(fear_greed, "_fetch", return_value=_entries(30, offset=2)) as fetch:
+            assert sync_fear_greed(store) == 30
+        fetch.assert_called_once_with(0)
+
+        with patch.object(fear_greed, "_fetch", return_value=_entries(3)) as fetch:
+            assert sync_fear_greed(store) == 3
+        fetch.assert_called_once_with(3)
+
+        # Today's value is stored: no request
+        with patch.object(fear_greed, "_fetch") as fetch:
+            assert sync_fear_greed(store) == 0
+        fetch.assert_not_called()
+
+    def test_cycle_and_replay_lookups(self, in_memory_db: Database) -> None:
+        store = FearGreedStore(in_memory_db)
+        with patch.object(fear_greed, "_fetch", return_value=_entries(10)):
+            current = get_fear_greed_index(store=store)
+        assert (current["source"], current["value"]) == ("alternative.me", 20)
+
+        with patch.object(fear_greed, "_fetch", side_effect=AssertionError("network")):
+            assert get_fear_greed_index(store=store)["value"] == 20
+            past = (_TODAY - timedelta(days=4)).strftime("%Y-%m-%d")
+            assert get_fear_greed_index(store=store, as_of=past)["value"] == 24
+
+    def test_api_down_serves_stored_value(self, in_memory_db: Database) -> None:
+        store = FearGreedStore(in_memory_db)
+        store.upsert(_entries(3, offset=1))
+        with patch.object(fear_greed, "_fetch", side_effect=RuntimeError("down")):
+            assert get_fear_greed_index(store=store)["value"] == 20
+            assert get_fear_greed_index()["source"] == "error"
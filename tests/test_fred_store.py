@@ -0,0 +1,154 @@
+"""Tests for the local FRED observation store and incremental sync."""
+
+from __future__ import annotations
+
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import patch
+
+import pytest
+
+from cryptoagent.dataflows.macro import fred
+from cryptoagent.dataflows.macro.fred_store import FredStore
+from cryptoagent.persistence.database import Database
+
+
+def _obs(*pairs: tuple[str, str]) -> list[dict]:
+    return [{"date": d, "value": v} for d, v in pairs]
+
+
+class TestFredStore:
+    """FredStore CRUD tests."""
+
+    def test_upsert_and_latest_date(self, in_memory_db: Database) -> None:
+        store = FredStore(in_memory_db)
+        assert store.latest_date("M2SL") is None
+
+        store.upsert("M2SL", _obs(("2025-01-01", "21000.0"), ("2025-02-01", "21100.0")))
+        assert store.latest_date("M2SL") == "2025-02-01"
+
+    def test_upsert_overwrites_revised_value(self, in_memory_db: Database) -> None:
+        store = FredStore(in_memory_db)
+        store.upsert("M2SL", _obs(("2025-01-01", "21000.0")))
+        store.upsert("M2SL", _obs(("2025-01-01", "21050.0")))
+        obs = store.get_observations("M2SL")
+        assert len(obs) == 1
+        assert obs[0]["value"] == pytest.approx(21050.0)
+
+    def test_missing_value_stored_as_null(self, in_memory_db: Database) -> None:
+        store = FredStore(in_memory_db)
+        store.upsert("T10Y2Y", _obs(("2025-01-01", ".")))
+        assert store.get_observations("T10Y2Y")[0]["value"] is None
+
+    def test_get_observations_newest_first_with_as_of(self, in_memory_db: Database) -> None:
+        store = FredStore(in_memory_db)
+        store.upsert(
+            "GS10",
+            _obs(("2025-01-01", "4.0"), ("2025-02-01", "4.1"), ("2025-03-01", "4.2")),
+        )
+        obs = store.get_observations("GS10", limit=2)
+        assert [o["date"] for o in obs] == ["2025-03-01", "2025-02-01"]
+
+        historical = store.get_observations("GS10", as_of="2025-02-15")
+        assert historical[0]["date"] == "2025-02-01"
+
+    def test_get_history_oldest_first(self, in_memory_db: Database) -> None:
+        store = FredStore(in_memory_db)
+        store.upsert("GS2", _obs(("2025-02-01", "3.9"), ("2025-01-01", "3.8")))
+        history = store.get_history("GS2", start="2025-01-01")
+        assert history == [("2025-01-01", 3.8), ("2025-02-01", 3.9)]
+
+
+class TestSyncSeries:
+    """Incremental sync behaviour with a mocked FRED API."""
+
+    def test_empty_store_fetches_full_history(self, in_memory_db: Database) -> None:
+        store = FredStore(in_memory_db)
+        with patch.object(fred, "_fetch_series", return_value=_obs(("2025-01-01", "1.0"))) as m:
+            written = fred.sync_series("key", store, series_ids=["FEDFUNDS"])
+
+        assert written == {"FEDFUNDS": 1}
+        kwargs = m.call_args.kwargs
+        assert kwargs["limit"] is None
+        assert "observation_start" not in kwargs
+
+    def test_requests_only_after_last_stored_date(self, in_memory_db: Database) -> None:
+        store = FredStore(in_memory_db)
+        store.upsert("FEDFUNDS", _obs(("2025-01-01", "4.3")))
+
+        with patch.object(fred, "_fetch_series", return_value=_obs(("2025-02-01", "4.2"))) as m:
+            written = fred.sync_series("key", store, series_ids=["FEDFUNDS"])
+
+        assert m.call_args.kwargs["observation_start"] == "2025-01-02"
+        assert written == {"FEDFUNDS": 1}
+        assert store.latest_date("FEDFUNDS") == "2025-02-01"
+
+    def test_failed_series_does_not_block_others(self, in_memory_db: Database) -> None:
+        store = FredStore(in_memory_db)
+
+        def fake_fetch(api_key, series_id, **kwargs):
+            if series_id == "GS2":
+                raise RuntimeError("boom")
+            return _obs(("2025-01-01", "1.0"))
+
+        with patch.object(fred, "_fetch_series", side_effect=fake_fetch):
+            written = fred.sync_series("key", store, series_ids=["GS10", "GS2"])
+
+        assert written == {"GS10": 1, "GS2": -1}
+
+    def test_recent_sync_skipped(self, in_memory_db: Database) -> None:
+        store = FredStore(in_memory_db)
+        with patch.object(fred, "_fetch_series", return_value=_obs(("2025-01-01", "1.0"))) as m:
+            fred.sync_series("key", store, series_ids=["GS10"])
+            assert fred.sync_series("key", store, series_ids=["GS10"]) == {}
+            assert m.call_count == 1
+            # Stale again once the max age has passed
+            assert fred.sync_series("key", store, series_ids=["GS10"], max_age=0) == {"GS10": 0}
+        assert m.call_count == 2
+
+    def test_failed_series_retried(self, in_memory_db: Database) -> None:
+        store = FredStore(in_memory_db)
+        with patch.object(fred, "_fetch_series", side_effect=RuntimeError("boom")):
+            fred.sync_series("key", store, series_ids=["GS2"])
+        assert store.last_synced("GS2") is None
+
+    def test_concurrent_callers_share_one_sync(self, in_memory_db: Database) -> None:
+        store = FredStore(in_memory_db)
+        with patch.object(fred, "_fetch_series", return_value=_obs(("2025-01-01", "1.0"))) as m:
+            with ThreadPoolExecutor(max_workers=2) as pool:
+                for _ in range(2):
+                    pool.submit(fred.get_all_macro_data, "key", store)
+        assert m.call_count == len(fred.FRED_SERIES)
+
+
+class TestGettersFromStore:
+    """Getters answer from local data without touching the network."""
+
+    def test_macro_snapshot_from_local_data(self, in_memory_db: Database) -> None:
+        store = FredStore(in_memory_db)
+        store.upsert(
+            "M2SL",
+            _obs(
+                ("2025-01-01", "20000"),
+                ("2025-02-01", "20100"),
+                ("2025-03-01", "20200"),
+                ("2025-04-01", "20400"),
+            ),
+        )
+        store.upsert("T10Y2Y", _obs(("2025-04-01", "-0.3")))
+
+        with patch.object(fred, "_fetch_series", side_effect=AssertionError("network")):
+            snapshot = fred.get_macro_snapshot(store)
+
+        assert snapshot["m2_money_supply"]["latest_value"] == pytest.approx(20400.0)
+        assert snapshot["m2_money_supply"]["trend_3m"] == "expanding"
+        assert snapshot["yield_spread"]["yield_curve"] == "inverted"
+
+    def test_as_of_replays_history(self, in_memory_db: Database) -> None:
+        store = FredStore(in_memory_db)
+        store.upsert("T10Y2Y", _obs(("2024-01-01", "-0.5"), ("2025-01-01", "0.4")))
+
+        past = fred.get_yield_spread("", store, as_of="2024-06-01")
+        now = fred.get_yield_spread("", store)
+
+        assert past["yield_curve"] == "inverted"
+        assert now["yield_curve"] == "normal"
@@ -0,0 +1,147 @@
+"""Unit tests for batched Snapshot governance queries and the proposal cache."""
+
+from __future__ import annotations
+
+import json
+import time
+from unittest.mock import patch
+
+import httpx
+import pytest
+
+from cryptoagent.dataflows.protocol import governance
+from cryptoagent.dataflows.protocol.governance import (
+    get_governance_activity,
+    get_governance_activity_batch,
+)
+
+_NOW = time.time()
+
+
+def _proposal(pid: str, space: str, state: str = "closed", end: float = _NOW - 86400) -> dict:
+    return {
+        "id": pid,
+        "title": f"Proposal {pid}",
+        "state": state,
+        "choices": ["For", "Against"],
+        "scores_total": 100.0,
+        "votes": 42,
+        "start": _NOW - 7 * 86400,
+        "end": end,
+        "space": {"id": space, "name": space.split(".")[0].upper()},
+    }
+
+
+@pytest.fixture(autouse=True)
+def _clear_cache():
+    governance._cache.clear()
+    yield
+    governance._cache.clear()
+
+
+@pytest.fixture
+def snapshot():
+    """Mock Snapshot hub answering aliased listing and id_in queries."""
+    state = {
+        "proposals": {
+            "ens-1": _proposal("ens-1", "ens.eth", "active", end=_NOW + 86400),
+            "ens-0": _proposal("ens-0", "ens.eth"),
+            "aave-1": _proposal("aave-1", "aave.eth"),
+        },
+        "requests": [],
+        "fail": False,
+    }
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        if state["fail"]:
+            return httpx.Response(502)
+        body = json.loads(request.content)
+        state["requests"].append(body)
+        variables = body["variables"]
+        data: dict = {}
+        for name, space in variables.items():
+            if not name.startswith("s"):
+                continue
+            in_space = [p for p in state["proposals"].values() if p["space"]["id"] == space]
+            data[f"a{name[1:]}"] = [p for p in in_space if p["state"] == "active"]
+            data[f"r{name[1:]}"] = in_space
+        if "ids" in variables:
+            data["changed"] = [
+                state["proposals"][pid] for pid in variables["ids"] if pid in state["proposals"]
+            ]
+        return httpx.Response(200, json={"data": data})
+
+    real_client = httpx.Client
+
+    def client_factory(**kwargs):
+        return real_client(transport=httpx.MockTransport(handler), **kwargs)
+
+    with patch.object(governance.httpx, "Client", side_effect=client_factory):
+        yield state
+
+
+class TestGovernanceBatch:
+    """One aliased request for the whole token universe, split per token."""
+
+    def test_single_request_for_all_tokens(self, snapshot) -> None:
+        reports = get_governance_activity_batch()
+        assert len(snapshot["requests"]) == 1
+        # ETH and ENS share ens.eth; it is listed once
+        spaces = list(snapshot["requests"][0]["variables"].values())
+        assert spaces.count("ens.eth") == 1
+
+        assert reports["ENS"]["active_proposals"] == 1
+        assert reports["ETH"]["proposals"] == reports["ENS"]["proposals"]
+        assert [p["title"] for p in reports["AAVE"]["recent_proposals"]] == ["Proposal aave-1"]
+        assert reports["LINK"]["note"] == "No Snapshot spaces configured for LINK"
+
+    def test_per_token_calls_share_one_request(self, snapshot) -> None:
+        for token in ("ETH", "AAVE", "UNI", "SOL", "ENS"):
+            get_governance_activity(token)
+        assert len(snapshot["requests"]) == 1
+        assert get_governance_activity("sol")["note"].startswith("SOL governance")
+
+    def test_large_universe_split_into_few_requests(self, snapshot) -> None:
+        with patch.object(governance, "_MAX_SPACES_PER_QUERY", 4):
+            get_governance_activity_batch()
+        spaces = {s for spaces in governance._TOKEN_SPACES.values() for s in spaces}
+        assert len(snapshot["requests"]) == -(-len(spaces) // 4)
+
+
+class TestProposalCache:
+    """Listings are reused within the TTL; only changed states are re-read."""
+
+    def test_only_ended_proposals_refreshed(self, snapshot) -> None:
+        get_governance_activity_batch(["ENS"])
+        get_governance_activity_batch(["ENS"])
+        assert len(snapshot["requests"]) == 1
+
+        # The active proposal ends: the next call re-reads just that id
+        cached = governance._cache._proposals["ens-1"]
+        cached["end"] = _NOW - 1
+        snapshot["proposals"]["ens-1"] = {**cached, "state": "closed"}
+
+        report = get_governance_activity_batch(["ENS"])["ENS"]
+        request = snapshot["requests"][-1]
+        assert len(snapshot["requests"]) == 2
+        assert request["variables"] == {"ids": ["ens-1"]}
+        assert report["active_proposals"] == 0
+        assert report["recent_proposals"][0]["state"] == "closed"
+
+    def test_error_falls_back_to_cached_listing(self, snapshot) -> None:
+        get_governance_activity_batch(["ENS"])
+        snapshot["fail"] = True
+        with patch.object(governance._cache, "_listing_ttl", 0):
+            reports = get_governance_activity_batch(["ENS", "AAVE"])
+        assert reports["ENS"]["source"] == "snapshot"
+        assert reports["AAVE"]["source"] == "error"
+
+    def test_unlisted_proposals_evicted(self, snapshot) -> None:
+        get_governance_activity_batch(["ENS"])
+        assert "ens-0" in governance._cache._proposals
+
+        # ens-0 drops out of the space's listing on the next re-query
+        del snapshot["proposals"]["ens-0"]
+        with patch.object(governance._cache, "_listing_ttl", 0):
+            get_governance_activity_batch(["ENS"])
+        assert set(governance._cache._proposals) == {"ens-1"}
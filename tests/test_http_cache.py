@@ -0,0 +1,45 @@
+"""Unit tests for the persistent HTTP validator cache."""
+
+from __future__ import annotations
+
+import httpx
+
+from cryptoagent.dataflows.http_cache import HttpCache, cache_key
+
+
+def _client(state: dict) -> httpx.Client:
+    def handler(request: httpx.Request) -> httpx.Response:
+        state["requests"].append(request)
+        if request.headers.get("If-None-Match") == state["etag"]:
+            return httpx.Response(304)
+        return httpx.Response(200, text=state["body"], headers={"ETag": state["etag"]})
+
+    return httpx.Client(transport=httpx.MockTransport(handler))
+
+
+class TestHttpCache:
+    """Conditional GET, max-age short-circuit, and revalidation."""
+
+    def test_conditional_get(self, in_memory_db) -> None:
+        state = {"etag": '"v1"', "body": "one", "requests": []}
+        cache = HttpCache(in_memory_db)
+        client = _client(state)
+
+        assert cache.get(client, "https://api.example/x", params={"a": 1}) == ("one", True)
+        assert cache.get(client, "https://api.example/x", params={"a": 1}) == ("one", False)
+        assert state["requests"][-1].headers["If-None-Match"] == '"v1"'
+
+        state.update(etag='"v2"', body="two")
+        assert cache.get(client, "https://api.example/x", params={"a": 1}) == ("two", True)
+        assert cache.lookup(cache_key("https://api.example/x", {"a": 1}))["etag"] == '"v2"'
+
+    def test_max_age_skips_request(self, in_memory_db) -> None:
+        state = {"etag": '"v1"', "body": "one", "requests": []}
+        cache = HttpCache(in_memory_db)
+        client = _client(state)
+
+        cache.get(client, "https://api.example/y")
+        assert cache.get(client, "https://api.example/y", max_age=60) == ("one", False)
+        assert len(state["requests"]) == 1
+        assert cache.is_fresh("https://api.example/y", 60)
+        assert not cache.is_fresh("https://api.example/y", 0)
@@ -0,0 +1,56 @@
+"""Cold-start checks: entry points must not import heavy dependencies eagerly."""
+
+from __future__ import annotations
+
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+# Loaded on first use only (see benchmarks/bench_import.py for timings)
+_HEAVY = {"litellm", "langgraph", "ccxt", "pandas", "numpy", "ta", "httpx", "psycopg2"}
+
+
+def _loaded(code: str, **env: str) -> set[str]:
+    """Top-level modules imported after running ``code`` in a fresh interpreter."""
+    modules = "sorted({m.split('.')[0] for m in sys.modules})"
+    probe = f"{code}\nimport json, sys\nprint(json.dumps({modules}))"
+    out = subprocess.run(
+        [sys.executable, "-c", probe],
+        capture_output=True, text=True, check=True,
+        env={**os.environ, "LITELLM_LOCAL_MODEL_COST_MAP": "True", **env},
+    )
+    return set(json.loads(out.stdout.strip().splitlines()[-1]))
+
+
+class TestLazyImports:
+    """Heavy modules stay out of ``sys.modules`` until they are needed."""
+
+    @pytest.mark.parametrize(
+        "module",
+        [
+            "cryptoagent.cli.main",
+            "cryptoagent.graph.builder",
+            "cryptoagent.dataflows.aggregator",
+            "cryptoagent.llm.client",
+            "cryptoagent.reflection.manager",
+        ],
+    )
+    def test_entry_point(self, module: str) -> None:
+        assert _loaded(f"import {module}") & _HEAVY == set()
+
+    def test_trading_graph_construction(self, tmp_path) -> None:
+        code = "from cryptoagent.graph.builder import TradingGraph\nTradingGraph().close()"
+        loaded = _loaded(code, CA_DB_PATH=str(tmp_path / "agent.db"), CA_LLM_CACHE_MODE="off")
+        assert loaded & _HEAVY == set()
+
+    def test_loaded_on_use(self) -> None:
+        code = (
+            "from cryptoagent.llm.client import call_llm\n"
+            "call_llm('fake/instant', 's', 'u')\n"
+            "from cryptoagent.graph.builder import build_graph\n"
+            "build_graph()"
+        )
+        assert {"litellm", "langgraph"} <= _loaded(code)
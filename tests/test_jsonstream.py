@@ -0,0 +1,153 @@
+"""Unit tests for incremental JSON extraction."""
+
+from __future__ import annotations
+
+import json
+
+import pytest
+
+from cryptoagent.dataflows.jsonstream import (
+    JSONStream,
+    ObjectFeed,
+    extract_fields,
+    iter_array_items,
+    tail_array,
+)
+
+
+def _chunks(text: str, size: int):
+    for i in range(0, len(text), size):
+        yield text[i : i + size]
+
+
+_PROTOCOL = {
+    "id": "1",
+    "name": "Aave",
+    "description": 'Lending with "quotes" and brackets ]} in text',
+    "chainTvls": {
+        "Ethereum": {
+            "tvl": [{"date": d, "totalLiquidityUSD": d * 1.5} for d in range(50)],
+            "tokens": [{"date": d, "tokens": {"USDC": 1.0, "WETH": 2e-5}} for d in range(50)],
+        },
+    },
+    "tvl": [{"date": d, "totalLiquidityUSD": float(d)} for d in range(30)],
+    "currentChainTvls": {"Ethereum": 100.0, "Ethereum-borrowed": 40.0},
+    "category": "Lending",
+    "tokens": [[1, 2, [3, {"nested": [4]}]]],
+}
+
+
+class TestJSONStream:
+    """Chunk-boundary handling for reads and skips."""
+
+    @pytest.mark.parametrize("size", [1, 2, 3, 7, 64, 10_000])
+    def test_extract_fields_any_chunk_size(self, size: int) -> None:
+        text = json.dumps(_PROTOCOL)
+        result = extract_fields(
+            _chunks(text, size),
+            fields=("name", "category", "currentChainTvls"),
+            tails={"tvl": 3},
+        )
+        assert result["name"] == "Aave"
+        assert result["category"] == "Lending"
+        assert result["currentChainTvls"] == _PROTOCOL["currentChainTvls"]
+        assert result["tvl"] == _PROTOCOL["tvl"][-3:]
+
+    def test_stops_reading_once_fields_found(self) -> None:
+        consumed: list[str] = []
+
+        payload = {"name": "Aave", "tvl": [{"date": d, "tvl": 1.0} for d in range(20_000)]}
+        text = json.dumps(payload)
+
+        def tracked():
+            for chunk in _chunks(text, 4096):
+                consumed.append(chunk)
+                yield chunk
+
+        assert extract_fields(tracked(), fields=("name",)) == {"name": "Aave"}
+        assert len("".join(consumed)) < len(text) // 2
+
+    def test_numbers_split_across_chunks(self) -> None:
+        text = '{"a": -25000000000.125e-3, "b": 12345678901234}'
+        stream = JSONStream(_chunks(text, 1), min_buffer=1)
+        values = {key: stream.read_value() for key in stream.iter_object()}
+        assert values == json.loads(text)
+
+    def test_skip_value_handles_escaped_strings(self) -> None:
+        text = '{"skip": ["a\\"]", {"b": "}\\\\"}], "keep": 1}'
+        stream = JSONStream(_chunks(text, 2), min_buffer=1)
+        out = {}
+        for key in stream.iter_object():
+            if key == "keep":
+                out[key] = stream.read_value()
+            else:
+                stream.skip_value()
+        assert out == {"keep": 1}
+
+    def test_truncated_stream_raises(self) -> None:
+        with pytest.raises(ValueError):
+            extract_fields(_chunks('{"a": [1, 2', 4), fields=("b",))
+
+
+class TestArrayHelpers:
+    """Top-level array helpers."""
+
+    def test_iter_array_items(self) -> None:
+        data = [{"name": "Ethereum"}, {"name": "Solana"}, 3, "x", None]
+        assert list(iter_array_items(_chunks(json.dumps(data), 5))) == data
+
+    def test_empty_array(self) -> None:
+        assert list(iter_array_items(["[ ]"])) == []
+
+    def test_tail_array(self) -> None:
+        data = [{"date": i, "tvl": i * 10.0} for i in range(100)]
+        assert tail_array(_chunks(json.dumps(data), 9), 7) == data[-7:]
+
+
+class TestObjectFeed:
+    """Push-mode decoding of top-level object members."""
+
+    _DECISION = {
+        "action": "BUY",
+        "size_pct": 12.5,
+        "confidence": 7,
+        "flags": {"nested": [1, {"x": None}]},
+        "ok": True,
+        "rationale": 'Long text with "quotes", braces } and commas, too.',
+    }
+
+    @pytest.mark.parametrize("size", [1, 2, 3, 7, 1000])
+    def test_any_chunking(self, size: int) -> None:
+        feed = ObjectFeed()
+        order: list[str] = []
+        for chunk in _chunks(json.dumps(self._DECISION), size):
+            order.extend(feed.feed(chunk))
+        order.extend(feed.close())
+        assert feed.done
+        assert feed.fields == self._DECISION
+        assert order == list(self._DECISION)
+
+    def test_members_available_before_end(self) -> None:
+        feed = ObjectFeed()
+        text = json.dumps(self._DECISION)
+        cut = text.index('"rationale"') + len('"rationale": "Long te')
+        feed.feed(text[:cut])
+        assert feed.fields["confidence"] == 7
+        assert "rationale" not in feed.fields
+        assert not feed.done
+
+    def test_number_at_chunk_edge_waits(self) -> None:
+        feed = ObjectFeed()
+        assert feed.feed('{"size_pct": 1') == {}
+        assert feed.feed("2.5") == {}
+        assert feed.feed(", ") == {"size_pct": 12.5}
+
+    def test_leading_fence_ignored(self) -> None:
+        feed = ObjectFeed()
+        feed.feed('```json\n{"action": "HOLD"}\n```')
+        assert feed.done
+        assert feed.fields == {"action": "HOLD"}
+
+    def test_missing_colon_raises(self) -> None:
+        with pytest.raises(ValueError):
+            ObjectFeed().feed('{"a" 1}')
@@ -0,0 +1,69 @@
+"""Unit tests for the compiled lexicon sentiment classifier."""
+
+from __future__ import annotations
+
+import pytest
+
+from cryptoagent.dataflows.social.lexicon import (
+    LexiconClassifier,
+    classify_sentiment,
+    sentiment_ratio,
+)
+
+
+class TestLexiconClassifier:
+    """Word boundaries, phrases, negation, and batching."""
+
+    @pytest.mark.parametrize(
+        "text, expected",
+        [
+            ("SOL to the moon!", "bullish"),
+            ("New ATH for ETH", "bullish"),
+            ("Bitcoin hits an all-time  high", "bullish"),
+            ("Rug pull on a Solana DEX", "bearish"),
+            ("Market crash, everyone rekt", "bearish"),
+            # Substrings inside other words must not match
+            ("Find the path where you belong", "neutral"),
+            ("Shortcut to the dumpster", "neutral"),
+        ],
+    )
+    def test_classify(self, text: str, expected: str) -> None:
+        assert classify_sentiment(text) == expected
+
+    def test_negation_flips_weight(self) -> None:
+        assert classify_sentiment("This is not bullish") == "bearish"
+        assert classify_sentiment("No longer pumping") == "bearish"
+        assert classify_sentiment("Definitely isn't a scam") == "bullish"
+        # Negator too far from the term is ignored
+        assert classify_sentiment("Not sure what to make of it, bullish") == "bullish"
+
+    def test_negation_does_not_cross_texts(self) -> None:
+        classifier = LexiconClassifier()
+        assert classifier.score_batch(["I will not", "bullish"]) == [0.0, 1.5]
+
+    def test_batch_matches_single(self) -> None:
+        classifier = LexiconClassifier()
+        texts = ["pump it", "", "nothing here", "dump and crash", "not bearish", "buy the dip"]
+        assert classifier.classify_batch(texts) == [classifier.classify(t) for t in texts]
+
+    def test_custom_lexicon_and_threshold(self) -> None:
+        classifier = LexiconClassifier({"upgrade": 0.5, "delay": -1.0}, threshold=0.6)
+        assert classifier.classify("Network upgrade") == "neutral"
+        assert classifier.classify("Upgrade delay") == "neutral"
+        assert classifier.classify("Another delay") == "bearish"
+
+    def test_cache_by_id(self) -> None:
+        classifier = LexiconClassifier(cache_size=2)
+        assert classifier.classify_batch(["pump"], ids=["t1"]) == ["bullish"]
+        # Cached label wins for a known ID, even if the text differs
+        assert classifier.classify_batch(["dump", "dump"], ids=["t1", None]) == [
+            "bullish",
+            "bearish",
+        ]
+        classifier.classify_batch(["x", "y"], ids=["t2", "t3"])
+        assert "t1" not in classifier._cache
+
+    def test_sentiment_ratio(self) -> None:
+        ratio = sentiment_ratio(["bullish", "bullish", "bearish", "neutral"])
+        assert ratio == {"bullish": 0.5, "bearish": 0.25, "neutral": 0.25}
+        assert sentiment_ratio([]) == {"bullish": 0.0, "bearish": 0.0, "neutral": 0.0}
@@ -0,0 +1,172 @@
+"""Unit tests for per-call LLM accounting and the llm_calls table."""
+
+from __future__ import annotations
+
+import asyncio
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import pytest
+
+from cryptoagent.llm import accounting
+from cryptoagent.llm.accounting import cycle_scope, record_call, set_call_sink
+from cryptoagent.llm.cache import LLMCache
+from cryptoagent.llm.client import acall_llm, call_llm, configure_cache
+from cryptoagent.persistence.database import Database
+from cryptoagent.persistence.llm_call_log import LLMCallLog
+
+
+def _response(content: str, prompt: int = 100, completion: int = 20) -> SimpleNamespace:
+    return SimpleNamespace(
+        choices=[SimpleNamespace(message=SimpleNamespace(content=content))],
+        usage={"prompt_tokens": prompt, "completion_tokens": completion},
+    )
+
+
+@pytest.fixture
+def calls():
+    recorded: list[dict] = []
+    set_call_sink(recorded.append)
+    with patch.object(accounting, "_cost", return_value=0.002):
+        yield recorded
+    set_call_sink(None)
+
+
+class TestRecordCall:
+    """record_call tagging and robustness."""
+
+    def test_no_sink_is_noop(self) -> None:
+        record_call("brain", "m", _response("x"), 0.1)
+
+    def test_tags_cycle_and_usage(self, calls: list) -> None:
+        with cycle_scope("c1", "SOL"):
+            record_call("brain", "openai/gpt-4o", _response("x", 300, 40), 1.25)
+        record_call("brain", "openai/gpt-4o", _response("x"), 0.1)
+
+        assert calls[0] == {
+            "timestamp": calls[0]["timestamp"],
+            "cycle_id": "c1",
+            "token": "SOL",
+            "agent": "brain",
+            "model": "openai/gpt-4o",
+            "prompt_tokens": 300,
+            "cached_prompt_tokens": 0,
+            "completion_tokens": 40,
+            "cost_usd": 0.002,
+            "latency_ms": 1250.0,
+            "decision_ms": None,
+            "cached": False,
+        }
+        assert calls[1]["cycle_id"] is None
+
+    def test_cache_hit_is_free(self, calls: list) -> None:
+        record_call("brain", "m", None, 0.001, cached=True)
+        assert calls[0]["cached"] is True
+        assert calls[0]["cost_usd"] == 0.0
+        assert calls[0]["prompt_tokens"] == 0
+
+    def test_unpriced_model_costs_zero(self) -> None:
+        assert accounting._cost(_response("x")) == 0.0
+
+    def test_sink_errors_swallowed(self) -> None:
+        def broken(_: dict) -> None:
+            raise RuntimeError("db gone")
+
+        set_call_sink(broken)
+        try:
+            record_call("brain", "m", _response("x"), 0.1)
+        finally:
+            set_call_sink(None)
+
+
+class TestClientRecording:
+    """call_llm / acall_llm report each call."""
+
+    def test_sync_call_recorded(self, calls: list) -> None:
+        with patch("litellm.completion", return_value=_response("ok", 50, 5)):
+            with cycle_scope("c1", "ETH"):
+                call_llm("openai/gpt-4o", "s", "u", agent="research")
+        assert len(calls) == 1
+        assert calls[0]["agent"] == "research"
+        assert calls[0]["token"] == "ETH"
+        assert calls[0]["prompt_tokens"] == 50
+        assert calls[0]["latency_ms"] >= 0
+
+    def test_cache_hit_recorded(self, calls: list, tmp_path) -> None:
+        cache = LLMCache(str(tmp_path / "c.db"))
+        configure_cache(cache, "readwrite")
+        try:
+            with patch("litellm.completion", return_value=_response("ok")):
+                call_llm("openai/gpt-4o", "s", "u", agent="brain")
+                call_llm("openai/gpt-4o", "s", "u", agent="brain")
+        finally:
+            configure_cache(None)
+            cache.close()
+        assert [c["cached"] for c in calls] == [False, True]
+
+    async def test_concurrent_cycles_tagged_separately(self, calls: list) -> None:
+        async def acompletion(**kwargs):
+            await asyncio.sleep(0.01)
+            return _response("ok")
+
+        async def cycle(token: str) -> None:
+            with cycle_scope(f"cycle-{token}", token):
+                await acall_llm("openai/gpt-4o", "s", token, agent="research")
+                await acall_llm("openai/gpt-4o", "s", token, agent="brain")
+
+        with patch("litellm.acompletion", side_effect=acompletion):
+            await asyncio.gather(cycle("SOL"), cycle("ETH"))
+
+        assert len(calls) == 4
+        assert all(c["cycle_id"] == f"cycle-{c['token']}" for c in calls)
+
+
+class TestLLMCallLog:
+    """Persistence and per-cycle breakdown."""
+
+    def _call(self, agent: str, cycle_id: str = "c1", **overrides) -> dict:
+        call = {
+            "timestamp": "2026-01-01T00:00:00+00:00",
+            "cycle_id": cycle_id,
+            "token": "SOL",
+            "agent": agent,
+            "model": "openai/gpt-4o",
+            "prompt_tokens": 1000,
+            "completion_tokens": 100,
+            "cost_usd": 0.01,
+            "latency_ms": 800.0,
+            "cached": False,
+        }
+        call.update(overrides)
+        return call
+
+    def test_breakdown_per_agent(self, in_memory_db: Database) -> None:
+        log = LLMCallLog(in_memory_db)
+        log.record(self._call("research"))
+        log.record(self._call("brain", cost_usd=0.05, prompt_tokens=4000))
+        log.record(self._call("brain", cached=True, cost_usd=0.0, prompt_tokens=0))
+        log.record(self._call("brain", cycle_id="other"))
+
+        rows = log.cycle_breakdown("c1")
+        assert [r["agent"] for r in rows] == ["brain", "research"]
+        brain = rows[0]
+        assert brain["calls"] == 2
+        assert brain["cached"] == 1
+        assert brain["prompt_tokens"] == 4000
+        assert brain["cost_usd"] == pytest.approx(0.05)
+        assert brain["latency_ms"] == pytest.approx(1600.0)
+
+    def test_fallback_models_credited_separately(self, in_memory_db: Database) -> None:
+        log = LLMCallLog(in_memory_db)
+        log.record(self._call("brain", cost_usd=0.02))
+        log.record(self._call("brain", model="anthropic/claude-3-5-haiku", cost_usd=0.01))
+
+        rows = log.cycle_breakdown("c1")
+        assert [(r["agent"], r["model"], r["calls"]) for r in rows] == [
+            ("brain", "openai/gpt-4o", 1),
+            ("brain", "anthropic/claude-3-5-haiku", 1),
+        ]
+        assert rows[1]["cost_usd"] == pytest.approx(0.01)
+
+    def test_unknown_cycle_empty(self, in_memory_db: Database) -> None:
+        assert LLMCallLog(in_memory_db).cycle_breakdown("missing") == []
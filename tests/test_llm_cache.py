@@ -0,0 +1,161 @@
+"""Unit tests for the content-addressed LLM response cache."""
+
+from __future__ import annotations
+
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import pytest
+
+from cryptoagent.llm.cache import LLMCache, cache_key
+from cryptoagent.llm.client import acall_llm, call_llm, call_llm_json, configure_cache
+
+
+def _response(content: str) -> SimpleNamespace:
+    return SimpleNamespace(
+        choices=[SimpleNamespace(message=SimpleNamespace(content=content))],
+        usage={"total_tokens": 10},
+    )
+
+
+@pytest.fixture
+def cache(tmp_path):
+    cache = LLMCache(str(tmp_path / "llm_cache.db"))
+    yield cache
+    configure_cache(None)
+    cache.close()
+
+
+@pytest.fixture
+def fake_completion():
+    calls: list[dict] = []
+
+    def completion(**kwargs):
+        calls.append(kwargs)
+        return _response(f"answer {len(calls)}")
+
+    async def acompletion(**kwargs):
+        return completion(**kwargs)
+
+    with (
+        patch("litellm.completion", side_effect=completion),
+        patch("litellm.acompletion", side_effect=acompletion),
+    ):
+        yield calls
+
+
+class TestCacheKey:
+    """Keys cover every input that changes the response."""
+
+    def test_stable(self) -> None:
+        args = ("openai/gpt-4o", "sys", "user", 0.3, {"type": "json_object"}, 512)
+        assert cache_key(*args) == cache_key(*args)
+
+    @pytest.mark.parametrize("index, value", [
+        (0, "openai/gpt-4o-mini"), (1, "sys2"), (2, "user2"),
+        (3, 0.4), (4, None), (5, 1024),
+    ])
+    def test_each_input_changes_key(self, index: int, value) -> None:
+        args = ["openai/gpt-4o", "sys", "user", 0.3, {"type": "json_object"}, 512]
+        changed = list(args)
+        changed[index] = value
+        assert cache_key(*args) != cache_key(*changed)
+
+
+class TestLLMCache:
+    """Storage, LRU eviction, and persistence."""
+
+    def test_roundtrip_and_hits(self, cache: LLMCache) -> None:
+        assert cache.get("k") is None
+        cache.put("k", "m", "hello")
+        assert cache.get("k") == "hello"
+        assert cache.stats() == {"entries": 1, "bytes": 5, "hits": 1}
+
+    def test_overwrite_adjusts_size(self, cache: LLMCache) -> None:
+        cache.put("k", "m", "hello")
+        cache.put("k", "m", "hi")
+        assert cache.stats()["entries"] == 1
+        assert cache.stats()["bytes"] == 2
+
+    def test_evicts_least_recently_used_by_count(self, tmp_path) -> None:
+        cache = LLMCache(str(tmp_path / "c.db"), max_entries=3)
+        with patch("cryptoagent.llm.cache.time.time", side_effect=range(100)):
+            for key in "abc":
+                cache.put(key, "m", key)
+            cache.get("a")  # "b" is now the oldest
+            cache.put("d", "m", "d")
+        assert cache.get("b") is None
+        assert cache.get("a") == "a"
+        assert cache.get("d") == "d"
+        assert cache.stats()["entries"] <= 3
+
+    def test_evicts_by_size(self, tmp_path) -> None:
+        cache = LLMCache(str(tmp_path / "c.db"), max_bytes=100)
+        with patch("cryptoagent.llm.cache.time.time", side_effect=range(100)):
+            for i in range(5):
+                cache.put(str(i), "m", "x" * 30)
+        assert cache.stats()["bytes"] <= 90
+        assert cache.get("4") is not None
+        assert cache.get("0") is None
+
+    def test_persists_across_reopen(self, tmp_path) -> None:
+        path = str(tmp_path / "c.db")
+        cache = LLMCache(path)
+        cache.put("k", "m", "stored")
+        cache.close()
+
+        reopened = LLMCache(path)
+        assert reopened.get("k") == "stored"
+        assert reopened.stats()["entries"] == 1
+        reopened.close()
+
+
+class TestClientModes:
+    """Per-agent off / read / readwrite behaviour in call_llm."""
+
+    def test_off_by_default(self, fake_completion: list) -> None:
+        assert call_llm("openai/gpt-4o", "s", "u", agent="brain") == "answer 1"
+        assert call_llm("openai/gpt-4o", "s", "u", agent="brain") == "answer 2"
+
+    def test_readwrite_serves_repeat_calls(self, cache: LLMCache, fake_completion: list) -> None:
+        configure_cache(cache, "readwrite")
+        assert call_llm("openai/gpt-4o", "s", "u", agent="brain") == "answer 1"
+        assert call_llm("openai/gpt-4o", "s", "u", agent="brain") == "answer 1"
+        assert call_llm("openai/gpt-4o", "s", "other", agent="brain") == "answer 2"
+        assert len(fake_completion) == 2
+
+    def test_read_mode_never_writes(self, cache: LLMCache, fake_completion: list) -> None:
+        configure_cache(cache, "read")
+        call_llm("openai/gpt-4o", "s", "u", agent="brain")
+        call_llm("openai/gpt-4o", "s", "u", agent="brain")
+        assert len(fake_completion) == 2
+        assert cache.stats()["entries"] == 0
+
+    def test_read_mode_serves_existing_entries(
+        self, cache: LLMCache, fake_completion: list
+    ) -> None:
+        configure_cache(cache, "off", {"reflection": "readwrite", "brain": "read"})
+        call_llm("openai/gpt-4o", "s", "u", agent="reflection")
+        # Same request from an agent in read mode hits the shared entry
+        assert call_llm("openai/gpt-4o", "s", "u", agent="brain") == "answer 1"
+        # Agents left "off" always call the provider
+        assert call_llm("openai/gpt-4o", "s", "u", agent="trader") == "answer 2"
+
+    def test_json_calls_cached(self, cache: LLMCache) -> None:
+        configure_cache(cache, "readwrite")
+        with patch(
+            "litellm.completion", return_value=_response('{"action": "HOLD"}')
+        ) as completion:
+            assert call_llm_json("openai/gpt-4o", "s", "u")["action"] == "HOLD"
+            assert call_llm_json("openai/gpt-4o", "s", "u")["action"] == "HOLD"
+        assert completion.call_count == 1
+
+    async def test_async_shares_cache(self, cache: LLMCache, fake_completion: list) -> None:
+        configure_cache(cache, "readwrite")
+        first = call_llm("openai/gpt-4o", "s", "u")
+        assert await acall_llm("openai/gpt-4o", "s", "u") == first
+        assert len(fake_completion) == 1
+
+    def test_unknown_mode_rejected(self, cache: LLMCache) -> None:
+        with pytest.raises(ValueError):
+            configure_cache(cache, "sometimes")
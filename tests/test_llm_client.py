@@ -0,0 +1,124 @@
+"""Unit tests for the LLM client: async calls, per-provider concurrency, JSON parsing."""
+
+from __future__ import annotations
+
+import asyncio
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import pytest
+
+from cryptoagent.agents import research
+from cryptoagent.config import AgentConfig
+from cryptoagent.llm import client
+from cryptoagent.llm.client import acall_llm, acall_llm_json, configure_concurrency
+
+
+def _response(content: str) -> SimpleNamespace:
+    return SimpleNamespace(
+        choices=[SimpleNamespace(message=SimpleNamespace(content=content))],
+        usage={"total_tokens": 10},
+    )
+
+
+@pytest.fixture
+def fake_acompletion():
+    """Async litellm.acompletion stand-in that tracks in-flight calls per provider."""
+    state = {"in_flight": {}, "peak": {}, "calls": []}
+
+    async def acompletion(**kwargs):
+        provider = kwargs["model"].split("/", 1)[0]
+        state["calls"].append(kwargs)
+        state["in_flight"][provider] = state["in_flight"].get(provider, 0) + 1
+        state["peak"][provider] = max(state["peak"].get(provider, 0), state["in_flight"][provider])
+        await asyncio.sleep(0.01)
+        state["in_flight"][provider] -= 1
+        return _response('{"ok": true}')
+
+    with patch("litellm.acompletion", side_effect=acompletion):
+        yield state
+    configure_concurrency(client._DEFAULT_CONCURRENCY)
+
+
+class TestAsyncClient:
+    """acall_llm / acall_llm_json with bounded concurrency."""
+
+    async def test_per_provider_limits(self, fake_acompletion) -> None:
+        configure_concurrency(4, {"anthropic": 2})
+        calls = [acall_llm("openai/gpt-4o-mini", "s", "u") for _ in range(50)]
+        calls += [acall_llm("anthropic/claude", "s", "u") for _ in range(10)]
+        results = await asyncio.gather(*calls)
+
+        assert len(results) == 60
+        assert fake_acompletion["peak"] == {"openai": 4, "anthropic": 2}
+
+    async def test_json_mode(self, fake_acompletion) -> None:
+        assert await acall_llm_json("openai/gpt-4o", "sys", "user") == {"ok": True}
+        sent = fake_acompletion["calls"][0]
+        assert sent["response_format"] == {"type": "json_object"}
+        assert "valid JSON only" in sent["messages"][0]["content"]
+
+    def test_semaphores_are_per_event_loop(self, fake_acompletion) -> None:
+        configure_concurrency(1)
+        # Separate asyncio.run calls must not share a loop-bound semaphore
+        for _ in range(2):
+            assert asyncio.run(acall_llm("openai/gpt-4o", "s", "u")) == '{"ok": true}'
+
+    async def test_async_node(self, fake_acompletion) -> None:
+        collected = (AgentConfig(), "", "prompt", {"market_data": {"price": 1}})
+        with patch.object(research, "_collect", return_value=collected):
+            result = await research.aresearch_node({"token": "SOL"})
+        assert result["research_report"] == '{"ok": true}'
+        assert result["market_data"] == {"price": 1}
+
+
+class TestParseJson:
+    """Fallbacks for providers that ignore JSON mode."""
+
+    @pytest.mark.parametrize(
+        "raw",
+        [
+            '{"action": "BUY"}',
+            'Sure:\n```json\n{"action": "BUY"}\n```',
+            'Decision follows {"action": "BUY"} as requested',
+        ],
+    )
+    def test_extracts_object(self, raw: str) -> None:
+        assert client._parse_json(raw) == {"action": "BUY"}
+
+    def test_unparseable_raises(self) -> None:
+        with pytest.raises(ValueError, match="Could not parse JSON"):
+            client._parse_json("no json here")
+
+
+class TestAsyncGraph:
+    """The async pipeline runs coroutine analyst nodes concurrently."""
+
+    async def test_analysts_overlap(self) -> None:
+        from cryptoagent.graph import builder
+
+        state = {"in_flight": 0, "peak": 0}
+
+        def analyst(key: str):
+            async def node(_: dict) -> dict:
+                state["in_flight"] += 1
+                state["peak"] = max(state["peak"], state["in_flight"])
+                await asyncio.sleep(0.01)
+                state["in_flight"] -= 1
+                return {key: "done"}
+
+            return node
+
+        with (
+            patch.object(builder, "aresearch_node", analyst("research_report")),
+            patch.object(builder, "asentiment_node", analyst("sentiment_report")),
+            patch.object(builder, "amacro_node", analyst("macro_report")),
+            patch.object(builder, "abrain_node", analyst("brain_decision")),
+            patch.object(builder, "trader_node", lambda _: {"trade_result": "{}"}),
+        ):
+            graph = builder.build_graph(use_async=True).compile()
+            result = await graph.ainvoke({"token": "SOL"})
+
+        assert result["macro_report"] == "done"
+        assert result["trade_result"] == "{}"
+        assert state["peak"] == 3
@@ -0,0 +1,176 @@
+"""Unit tests for model fallback chains and hedged requests."""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import pytest
+
+from cryptoagent.llm import router
+from cryptoagent.llm.client import call_llm_json
+from cryptoagent.llm.router import (
+    ModelStats,
+    arun_chain,
+    chain_for,
+    configure_fallbacks,
+    hedge_delay,
+    run_chain,
+)
+
+
+@pytest.fixture(autouse=True)
+def _reset():
+    router.stats.clear()
+    configure_fallbacks(hedge_min_s=0.05, hedge_default_s=0.05)
+    yield
+    router.stats.clear()
+    configure_fallbacks()
+
+
+class TestModelStats:
+    """Rolling latency and failure windows."""
+
+    def test_p95_needs_samples(self) -> None:
+        stats = ModelStats()
+        for _ in range(5):
+            stats.observe("m", 1.0, ok=True)
+        assert stats.p95("m") is None
+
+    def test_p95(self) -> None:
+        stats = ModelStats()
+        for i in range(1, 101):
+            stats.observe("m", i / 10, ok=True)
+        assert stats.p95("m") == pytest.approx(9.6)
+
+    def test_failures_count_but_not_latency(self) -> None:
+        stats = ModelStats()
+        stats.observe("m", 0.01, ok=False)
+        stats.observe("m", 2.0, ok=True)
+        assert stats.failure_rate("m") == 0.5
+        assert stats.snapshot()["m"]["attempts"] == 2
+
+    def test_window_rolls(self) -> None:
+        stats = ModelStats(window=10)
+        for _ in range(10):
+            stats.observe("m", 1.0, ok=False)
+        for _ in range(10):
+            stats.observe("m", 1.0, ok=True)
+        assert stats.failure_rate("m") == 0.0
+
+
+class TestChain:
+    """Chain order and hedge delays."""
+
+    def test_no_fallbacks(self) -> None:
+        assert chain_for("brain", "a/1") == ["a/1"]
+
+    def test_configured_order(self) -> None:
+        configure_fallbacks({"Brain": ["b/1", "a/1", "c/1"]})
+        assert chain_for("brain", "a/1") == ["a/1", "b/1", "c/1"]
+        assert chain_for("research", "a/1") == ["a/1"]
+
+    def test_failing_model_demoted(self) -> None:
+        configure_fallbacks({"brain": ["b/1", "c/1"]})
+        for _ in range(3):
+            router.stats.observe("a/1", 0.1, ok=False)
+        router.stats.observe("b/1", 0.1, ok=True)
+        assert chain_for("brain", "a/1") == ["b/1", "c/1", "a/1"]
+
+    def test_hedge_delay_from_p95(self) -> None:
+        configure_fallbacks(hedge_min_s=1.0, hedge_default_s=30.0)
+        assert hedge_delay("m") == 30.0
+        for _ in range(50):
+            router.stats.observe("m", 4.0, ok=True)
+        assert hedge_delay("m") == 4.0
+        for _ in range(100):
+            router.stats.observe("fast", 0.2, ok=True)
+        assert hedge_delay("fast") == 1.0
+
+
+class TestRunChain:
+    """Sync fallback and hedging."""
+
+    def test_single_model_inline(self) -> None:
+        thread = []
+        assert run_chain(["a"], lambda m: thread.append(threading.current_thread()) or m) == "a"
+        assert thread == [threading.current_thread()]
+
+    def test_falls_back_on_error(self) -> None:
+        def call(model: str) -> str:
+            if model == "a":
+                raise RuntimeError("overloaded")
+            return model
+
+        assert run_chain(["a", "b"], call) == "b"
+        assert router.stats.failure_rate("a") == 1.0
+
+    def test_hedges_slow_primary(self) -> None:
+        def call(model: str) -> str:
+            if model == "slow":
+                time.sleep(0.5)
+            return model
+
+        start = time.perf_counter()
+        assert run_chain(["slow", "fast"], call) == "fast"
+        assert time.perf_counter() - start < 0.4
+
+    def test_all_fail_raises_last(self) -> None:
+        def call(model: str) -> str:
+            raise RuntimeError(model)
+
+        with pytest.raises(RuntimeError, match="b"):
+            run_chain(["a", "b"], call)
+
+
+class TestArunChain:
+    """Async hedging cancels the loser."""
+
+    async def test_hedge_cancels_loser(self) -> None:
+        cancelled = []
+
+        async def call(model: str) -> str:
+            if model == "slow":
+                try:
+                    await asyncio.sleep(1)
+                except asyncio.CancelledError:
+                    cancelled.append(model)
+                    raise
+            return model
+
+        assert await arun_chain(["slow", "fast"], call) == "fast"
+        await asyncio.sleep(0)
+        assert cancelled == ["slow"]
+
+    async def test_falls_back_on_error(self) -> None:
+        async def call(model: str) -> str:
+            if model == "a":
+                raise RuntimeError("down")
+            return model
+
+        assert await arun_chain(["a", "b"], call) == "b"
+
+
+class TestClientIntegration:
+    """Agents' calls run over their chain."""
+
+    def test_invalid_json_tries_fallback(self) -> None:
+        configure_fallbacks({"brain": ["b/model"]}, hedge_min_s=5.0, hedge_default_s=5.0)
+
+        def completion(**kwargs):
+            content = "not json" if kwargs["model"] == "a/model" else '{"action": "HOLD"}'
+            return SimpleNamespace(
+                choices=[SimpleNamespace(message=SimpleNamespace(content=content))],
+                usage={},
+            )
+
+        with patch("litellm.completion", side_effect=completion) as mock:
+            result = call_llm_json("a/model", "s", "u", agent="brain")
+
+        assert result == {"action": "HOLD"}
+        # One repair attempt on the same model before moving on
+        models = [c.kwargs["model"] for c in mock.call_args_list]
+        assert models == ["a/model", "a/model", "b/model"]
@@ -0,0 +1,153 @@
+"""Unit tests for the RPM/TPM scheduler and 429 backoff."""
+
+from __future__ import annotations
+
+import threading
+import time
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import litellm
+import pytest
+
+from cryptoagent.llm import scheduler
+from cryptoagent.llm.client import acall_llm, call_llm
+from cryptoagent.llm.scheduler import Scheduler, _Budget, configure_scheduler
+
+
+def _response(total: int = 50) -> SimpleNamespace:
+    return SimpleNamespace(
+        choices=[SimpleNamespace(message=SimpleNamespace(content="ok"))],
+        usage={"prompt_tokens": total - 10, "completion_tokens": 10, "total_tokens": total},
+    )
+
+
+def _rate_limited() -> litellm.RateLimitError:
+    return litellm.RateLimitError("slow down", llm_provider="openai", model="gpt-4o")
+
+
+@pytest.fixture(autouse=True)
+def _reset():
+    configure_scheduler(backoff_base_s=0.01)
+    yield
+    configure_scheduler()
+
+
+class TestBudget:
+    """Rolling one-minute request and token windows."""
+
+    def test_rpm(self) -> None:
+        budget = _Budget(rpm=2, tpm=None)
+        budget.entries.extend([[0.0, 1], [10.0, 1]])
+        assert budget.wait(1, now=30.0) == pytest.approx(30.0)
+        assert budget.wait(1, now=61.0) == 0.0
+
+    def test_tpm_waits_for_enough_to_expire(self) -> None:
+        budget = _Budget(rpm=None, tpm=1000)
+        budget.entries.extend([[0.0, 400], [5.0, 400], [10.0, 100]])
+        assert budget.wait(100, now=20.0) == 0.0
+        assert budget.wait(500, now=20.0) == pytest.approx(40.0)
+        assert budget.wait(900, now=20.0) == pytest.approx(45.0)
+
+    def test_oversized_request_goes_alone(self) -> None:
+        budget = _Budget(rpm=None, tpm=1000)
+        assert budget.wait(5000, now=0.0) == 0.0
+
+    def test_oversized_request_waits_for_empty_window(self) -> None:
+        budget = _Budget(rpm=None, tpm=100)
+        budget.entries.append([0.0, 10])
+        assert budget.wait(150, now=1.0) == 59.0
+        assert budget.wait(150, now=60.0) == 0.0
+
+
+class TestScheduler:
+    """Admission order and settlement."""
+
+    def test_unlimited_model_not_queued(self) -> None:
+        sched = Scheduler()
+        sched.configure({"anthropic": {"rpm": 1}})
+        for _ in range(5):
+            sched.acquire("research", "openai/gpt-4o", 100)
+        assert sched.waiting() == 0
+
+    def test_priority_order(self) -> None:
+        sched = Scheduler()
+        sched.configure({"openai": {"rpm": 1}})
+        order: list[str] = []
+        with patch.object(scheduler, "_WINDOW_S", 0.3):
+            sched.acquire("brain", "openai/gpt-4o", 10)
+
+            def call(agent: str) -> None:
+                sched.acquire(agent, "openai/gpt-4o", 10)
+                order.append(agent)
+
+            threads = []
+            for agent in ("reflection", "research", "trader"):
+                threads.append(threading.Thread(target=call, args=(agent,)))
+                threads[-1].start()
+                time.sleep(0.02)
+            for t in threads:
+                t.join(timeout=5)
+        assert order == ["trader", "research", "reflection"]
+
+    def test_settle_frees_tokens(self) -> None:
+        sched = Scheduler()
+        sched.configure({"openai/gpt-4o": {"tpm": 1000}})
+        grant = sched.acquire("brain", "openai/gpt-4o", 900)
+        sched.settle(grant, 100)
+        start = time.perf_counter()
+        sched.acquire("brain", "openai/gpt-4o", 800)
+        assert time.perf_counter() - start < 0.1
+
+    async def test_async_waits_for_window(self) -> None:
+        sched = Scheduler()
+        sched.configure({"openai": {"rpm": 1}})
+        with patch.object(scheduler, "_WINDOW_S", 0.2):
+            await sched.aacquire("brain", "openai/gpt-4o", 10)
+            start = time.perf_counter()
+            await sched.aacquire("brain", "openai/gpt-4o", 10)
+        assert time.perf_counter() - start >= 0.1
+
+
+class TestBackoff:
+    """429 retries."""
+
+    def test_retry_after_header(self) -> None:
+        error = _rate_limited()
+        error.litellm_response_headers = {"retry-after": "3"}
+        assert scheduler._backoff(0, error) == 3.0
+
+    def test_exponential(self) -> None:
+        assert 0.005 <= scheduler._backoff(0, _rate_limited()) <= 0.015
+        assert 0.02 <= scheduler._backoff(2, _rate_limited()) <= 0.06
+
+    def test_call_retried(self) -> None:
+        with patch("litellm.completion", side_effect=[_rate_limited(), _response()]) as completion:
+            assert call_llm("openai/gpt-4o", "s", "u", agent="research") == "ok"
+        assert completion.call_count == 2
+
+    def test_gives_up(self) -> None:
+        configure_scheduler(max_retries=1, backoff_base_s=0.01)
+        with patch("litellm.completion", side_effect=_rate_limited()) as completion:
+            with pytest.raises(litellm.RateLimitError):
+                call_llm("openai/gpt-4o", "s", "u")
+        assert completion.call_count == 2
+
+    async def test_async_retried(self) -> None:
+        responses = iter([_rate_limited(), _response()])
+
+        async def acompletion(**kwargs):
+            result = next(responses)
+            if isinstance(result, Exception):
+                raise result
+            return result
+
+        with patch("litellm.acompletion", side_effect=acompletion):
+            assert await acall_llm("openai/gpt-4o", "s", "u") == "ok"
+
+    def test_usage_settles_reservation(self) -> None:
+        configure_scheduler({"openai": {"tpm": 100_000}})
+        with patch("litellm.completion", return_value=_response(total=77)):
+            call_llm("openai/gpt-4o", "s", "u", max_tokens=4096)
+        entries = scheduler.scheduler._budgets["openai"].entries
+        assert [e[1] for e in entries] == [77]
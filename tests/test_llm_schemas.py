@@ -0,0 +1,154 @@
+"""Unit tests for schema-validated JSON calls and the repair retry."""
+
+from __future__ import annotations
+
+import json
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import pytest
+
+from cryptoagent.agents import brain, trader
+from cryptoagent.agents.schemas import BrainDecision, TraderValidation
+from cryptoagent.llm import client
+from cryptoagent.llm.client import acall_llm_json, call_llm_json, stream_llm_json
+
+_DECISION = {
+    "action": "buy",
+    "asset": "sol",
+    "size_pct": 10,
+    "stop_loss_pct": 5,
+    "take_profit_pct": 12,
+    "confidence": 7,
+    "regime": "Bull",
+    "rationale": "Momentum.",
+}
+
+
+def _response(content: str) -> SimpleNamespace:
+    return SimpleNamespace(
+        choices=[SimpleNamespace(message=SimpleNamespace(content=content))],
+        usage={},
+    )
+
+
+def _chunks(content: str) -> list[SimpleNamespace]:
+    return [SimpleNamespace(choices=[SimpleNamespace(delta=SimpleNamespace(content=content))])]
+
+
+class TestSchemas:
+    """Normalisation and bounds."""
+
+    def test_normalises_case(self) -> None:
+        decision = BrainDecision.model_validate(_DECISION).model_dump()
+        assert (decision["action"], decision["asset"], decision["regime"]) == ("BUY", "SOL", "bull")
+
+    @pytest.mark.parametrize("field,value", [("size_pct", 150), ("confidence", 0), ("action", "X")])
+    def test_rejects_out_of_range(self, field: str, value: object) -> None:
+        with pytest.raises(ValueError):
+            BrainDecision.model_validate({**_DECISION, field: value})
+
+    def test_trader_defaults_to_market(self) -> None:
+        verdict = TraderValidation(execute=True, modified_size_pct=5, reason="ok")
+        assert verdict.order_type == "market"
+
+
+class TestResponseFormat:
+    """Native structured outputs where the model supports them."""
+
+    def test_native_schema(self) -> None:
+        system, fmt = client._json_request("openai/gpt-4o", "s", BrainDecision)
+        assert fmt["type"] == "json_schema"
+        assert fmt["json_schema"]["name"] == "BrainDecision"
+        assert "JSON Schema" not in system
+
+    def test_prompted_schema(self) -> None:
+        system, fmt = client._json_request("fake/instant", "s", BrainDecision)
+        assert fmt == {"type": "json_object"}
+        assert '"rationale"' in system
+
+    def test_no_schema(self) -> None:
+        _, fmt = client._json_request("openai/gpt-4o", "s", None)
+        assert fmt == {"type": "json_object"}
+
+
+class TestRepair:
+    """One repair round trip, with the validation error, before failing over."""
+
+    def test_valid_answer_normalised(self) -> None:
+        with patch(
+            "litellm.completion", return_value=_response(json.dumps(_DECISION))
+        ) as completion:
+            result = call_llm_json("openai/gpt-4o", "s", "u", schema=BrainDecision)
+        assert result["action"] == "BUY"
+        assert completion.call_count == 1
+
+    def test_repaired(self) -> None:
+        bad = json.dumps({**_DECISION, "confidence": 42})
+        responses = [_response(bad), _response(json.dumps(_DECISION))]
+        with patch("litellm.completion", side_effect=responses) as completion:
+            result = call_llm_json("openai/gpt-4o", "s", "u", schema=BrainDecision)
+        assert result["confidence"] == 7
+        repair = completion.call_args_list[1].kwargs["messages"][-1]["content"]
+        assert bad in repair and "confidence" in repair
+
+    def test_fails_after_one_repair(self) -> None:
+        with patch("litellm.completion", return_value=_response("not json")) as completion:
+            with pytest.raises(ValueError):
+                call_llm_json("openai/gpt-4o", "s", "u", schema=BrainDecision)
+        assert completion.call_count == 2
+
+    async def test_async_repaired(self) -> None:
+        responses = iter([_response("{}"), _response(json.dumps(_DECISION))])
+
+        async def acompletion(**kwargs):
+            return next(responses)
+
+        with patch("litellm.acompletion", side_effect=acompletion):
+            result = await acall_llm_json("openai/gpt-4o", "s", "u", schema=BrainDecision)
+        assert result["asset"] == "SOL"
+
+    def test_stream_repaired_without_streaming(self) -> None:
+        seen: list[dict] = []
+
+        def completion(**kwargs):
+            if kwargs.get("stream"):
+                return iter(_chunks('{"action": "BUY"}'))
+            return _response(json.dumps(_DECISION))
+
+        with patch("litellm.completion", side_effect=completion) as mock:
+            result = stream_llm_json(
+                "openai/gpt-4o", "s", "u", schema=BrainDecision,
+                required=("action", "size_pct"), on_fields=seen.append,
+            )
+        assert result["size_pct"] == 10
+        assert seen == [result]
+        assert [bool(c.kwargs.get("stream")) for c in mock.call_args_list] == [True, False]
+
+
+class TestAgents:
+    """Agents degrade safely when no model produces a valid answer."""
+
+    def test_brain_holds(self, sample_agent_state: dict) -> None:
+        error = ValueError("confidence: Input should be less than or equal to 10")
+        with (
+            patch.object(brain, "call_llm_json", side_effect=error),
+            patch.object(brain, "stream_llm_json", side_effect=error),
+        ):
+            result = brain.brain_node(sample_agent_state)
+        decision = json.loads(result["brain_decision"])
+        assert decision["action"] == "HOLD"
+        assert decision["size_pct"] == 0
+        assert "confidence" in decision["rationale"]
+        # The fallback is itself a complete, valid decision
+        assert BrainDecision.model_validate(decision).asset == "SOL"
+
+    def test_trader_rejects(self, sample_portfolio: dict, sample_market_data: dict) -> None:
+        with patch.object(trader, "call_llm_json", side_effect=ValueError("bad")):
+            verdict = trader._validate(
+                {"action": "BUY", "asset": "SOL", "size_pct": 10},
+                sample_portfolio,
+                sample_market_data,
+            )
+        assert verdict["execute"] is False
+        assert verdict["modified_size_pct"] == 0
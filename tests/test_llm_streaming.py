@@ -0,0 +1,158 @@
+"""Unit tests for streamed JSON decisions and the Trader prefetch."""
+
+from __future__ import annotations
+
+import json
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import pytest
+
+from cryptoagent.agents import brain, trader
+from cryptoagent.llm.accounting import set_call_sink
+from cryptoagent.llm.client import astream_llm_json, stream_llm_json
+
+_DECISION = {
+    "action": "BUY",
+    "asset": "SOL",
+    "size_pct": 10,
+    "confidence": 7,
+    "regime": "bull",
+    "rationale": "Trend and on-chain flows agree. " * 5,
+}
+
+
+def _chunk(text: str) -> SimpleNamespace:
+    return SimpleNamespace(choices=[SimpleNamespace(delta=SimpleNamespace(content=text))])
+
+
+def _stream(text: str, size: int = 8, log: list | None = None):
+    """Yield streamed chunks, appending each one's text to ``log`` as it is sent."""
+    for i in range(0, len(text), size):
+        if log is not None:
+            log.append(text[i : i + size])
+        yield _chunk(text[i : i + size])
+    # Final usage-only chunk, as sent with include_usage
+    yield SimpleNamespace(choices=[])
+
+
+@pytest.fixture
+def calls():
+    recorded: list[dict] = []
+    set_call_sink(recorded.append)
+    yield recorded
+    set_call_sink(None)
+
+
+class TestStreamLLMJson:
+    """Early fields, fallbacks, and timing."""
+
+    def test_fields_fire_before_rationale(self, calls: list) -> None:
+        sent: list[str] = []
+        seen: list[tuple[dict, str]] = []
+        text = json.dumps(_DECISION)
+
+        with patch("litellm.completion", return_value=_stream(text, log=sent)):
+            result = stream_llm_json(
+                "openai/gpt-4o", "s", "u",
+                required=("action", "size_pct", "confidence"),
+                on_fields=lambda f: seen.append((f, "".join(sent))),
+                agent="brain",
+            )
+
+        assert result == _DECISION
+        assert len(seen) == 1
+        fields, sent_so_far = seen[0]
+        assert fields["action"] == "BUY"
+        assert fields["confidence"] == 7
+        assert "rationale" not in fields
+        assert len(sent_so_far) < len(text)
+
+        assert calls[0]["decision_ms"] is not None
+        assert calls[0]["decision_ms"] <= calls[0]["latency_ms"]
+
+    def test_fenced_response_falls_back(self) -> None:
+        text = "Sure! ```json\n" + json.dumps(_DECISION) + "\n```"
+        with patch("litellm.completion", return_value=_stream(text)):
+            assert stream_llm_json("openai/gpt-4o", "s", "u") == _DECISION
+
+    def test_missing_fields_fire_at_end(self) -> None:
+        seen: list[dict] = []
+        with patch("litellm.completion", return_value=_stream('{"action": "HOLD"}')):
+            stream_llm_json(
+                "openai/gpt-4o", "s", "u", required=("size_pct",), on_fields=seen.append
+            )
+        assert seen == [{"action": "HOLD"}]
+
+    def test_stream_requested(self) -> None:
+        with patch("litellm.completion", return_value=_stream("{}")) as completion:
+            stream_llm_json("openai/gpt-4o", "s", "u")
+        kwargs = completion.call_args.kwargs
+        assert kwargs["stream"] is True
+        assert kwargs["response_format"] == {"type": "json_object"}
+
+    async def test_async_stream(self) -> None:
+        async def agen():
+            for chunk in _stream(json.dumps(_DECISION), size=5):
+                yield chunk
+
+        async def acompletion(**kwargs):
+            return agen()
+
+        seen: list[dict] = []
+        with patch("litellm.acompletion", side_effect=acompletion):
+            result = await astream_llm_json(
+                "openai/gpt-4o", "s", "u", required=("action",), on_fields=seen.append
+            )
+        assert result == _DECISION
+        assert seen == [{"action": "BUY"}]
+
+
+class TestTraderPrefetch:
+    """Trader validation overlapping the Brain's rationale."""
+
+    @pytest.fixture
+    def state(self, sample_portfolio: dict, sample_market_data: dict) -> dict:
+        return {
+            "token": "SOL",
+            "cycle_id": "cycle-1",
+            "portfolio_state": sample_portfolio,
+            "market_data": sample_market_data,
+        }
+
+    def _run_brain(self, state: dict, decision: dict) -> dict:
+        with (
+            patch(
+                "litellm.completion", return_value=_stream(json.dumps(decision))
+            ),
+            patch.object(brain, "_prompt", return_value=("", "prompt")),
+        ):
+            return brain.brain_node(state)
+
+    def test_prefetched_validation_used(self, state: dict) -> None:
+        validation = {"execute": False, "modified_size_pct": 10, "reason": "prefetched"}
+        with patch.object(trader, "call_llm_json", return_value=validation) as validate:
+            update = self._run_brain(state, _DECISION)
+            result = trader.trader_node({**state, **update})
+
+        assert validate.call_count == 1
+        prompt = validate.call_args.kwargs["user"]
+        assert "rationale" not in prompt
+        assert json.loads(result["trade_result"])["reason"] == "prefetched"
+
+    def test_hold_not_prefetched(self, state: dict) -> None:
+        hold = {**_DECISION, "action": "HOLD", "size_pct": 0}
+        with patch.object(trader, "call_llm_json") as validate:
+            update = self._run_brain(state, hold)
+            trader.trader_node({**state, **update})
+        validate.assert_not_called()
+
+    def test_changed_decision_revalidated(self, state: dict) -> None:
+        with patch.object(trader, "call_llm_json", return_value={"execute": False}) as validate:
+            trader.prefetch_validation(state, {**_DECISION, "size_pct": 50.0})
+            trader._prefetched[state["cycle_id"]][1].result()
+            brain_decision = json.dumps({**_DECISION, "size_pct": 10.0})
+            trader.trader_node({**state, "brain_decision": brain_decision})
+        assert validate.call_count == 2
+        assert '"size_pct": 10.0' in validate.call_args.kwargs["user"]
+        assert state["cycle_id"] not in trader._prefetched
@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import threading
 
 import pytest
 
@@ -10,6 +11,8 @@ from cryptoagent.persistence.reflection_store import ReflectionStore
 from cryptoagent.persistence.trade_logger import TradeLogger
 from cryptoagent.signals.logger import SignalLogger
 
+_SNAPSHOT = "INSERT INTO price_snapshots (timestamp, token, price) VALUES (?, ?, ?)"
+
 
 class TestDatabase:
     """Database creation and schema tests."""
@@ -33,6 +36,35 @@ class TestDatabase:
         ).fetchall()
         assert len(tables) >= 5
 
+    def test_transaction_rolls_back_on_error(self, in_memory_db: Database) -> None:
+        with pytest.raises(RuntimeError):
+            with in_memory_db.transaction() as conn:
+                conn.execute(_SNAPSHOT, ("2026-01-01T00:00:00", "BTC", 1.0))
+                raise RuntimeError("boom")
+        assert in_memory_db.conn.execute("SELECT COUNT(*) FROM price_snapshots").fetchone()[0] == 0
+
+    def test_nested_transaction_joins_outer(self, in_memory_db: Database) -> None:
+        with pytest.raises(RuntimeError):
+            with in_memory_db.transaction() as conn:
+                with in_memory_db.transaction():
+                    conn.execute(_SNAPSHOT, ("2026-01-01T00:00:00", "BTC", 1.0))
+                raise RuntimeError("outer fails after inner block")
+        assert in_memory_db.conn.execute("SELECT COUNT(*) FROM price_snapshots").fetchone()[0] == 0
+
+    def test_concurrent_writers(self, in_memory_db: Database) -> None:
+        store = ReflectionStore(in_memory_db)
+
+        def write(regime: str) -> None:
+            for i in range(20):
+                store.insert(level=1, text=f"{regime} {i}", regime=regime)
+
+        threads = [threading.Thread(target=write, args=(r,)) for r in ("bull", "bear", "chop")]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        assert store.count_since_last_level2() == 60
+
 
 class TestTradeLogger:
     """TradeLogger CRUD tests."""
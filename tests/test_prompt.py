@@ -0,0 +1,164 @@
+"""Unit tests for the token-budgeted prompt builder and agent prompts."""
+
+from __future__ import annotations
+
+import pytest
+
+from cryptoagent.agents import brain, research
+from cryptoagent.llm.prompt import PromptBuilder, estimate_tokens, format_number, render
+
+
+class TestFormatNumber:
+    """Numeric rounding policy."""
+
+    @pytest.mark.parametrize("value, expected", [
+        (150.123456, "150.12"),
+        (1.23456, "1.235"),
+        (0.00123456, "0.001235"),
+        (5.0, "5"),
+        (42, "42"),
+        (67234.56, "67234.56"),
+        (1_234_567.0, "1.235M"),
+        (8.5e9, "8.5B"),
+        (-2.5e12, "-2.5T"),
+        (True, "true"),
+        (float("nan"), "nan"),
+    ])
+    def test_format(self, value: float, expected: str) -> None:
+        assert format_number(value) == expected
+
+    def test_exact_not_abbreviated(self) -> None:
+        assert format_number(1_234_567.891, exact=True) == "1234567.89"
+
+
+class TestRender:
+    """Compact rendering of dicts and lists."""
+
+    def test_nested_dict(self) -> None:
+        data = {
+            "price": 150.0,
+            "timestamp": "2026-01-01",
+            "empty": None,
+            "indicators": {"rsi_14": 55.123, "bands": [130.0, 160.0]},
+        }
+        assert render(data) == [
+            "price: 150",
+            "indicators:",
+            "  rsi_14: 55.12",
+            "  bands: 130, 160",
+        ]
+
+    def test_price_and_portfolio_fields_exact(self) -> None:
+        data = {
+            "net_worth": 2_500_000.5,
+            "volume_24h": 1_200_000_000.0,
+            "trade_history": [{"price": 1_050_000.25, "size": 2.0}, {"price": 1.5, "size": 1.0}],
+        }
+        assert render(data) == [
+            "net_worth: 2500000.5",
+            "volume_24h: 1.2B",
+            "trade_history:",
+            "  price | size",
+            "  1050000.25 | 2",
+            "  1.5 | 1",
+        ]
+
+    def test_uniform_dicts_render_as_table(self) -> None:
+        rows = [{"a": 1, "b": 2.5}, {"a": 3, "b": 4.25}]
+        assert render({"rows": rows}) == ["rows:", "  a | b", "  1 | 2.5", "  3 | 4.25"]
+
+    def test_max_rows_keeps_latest(self) -> None:
+        lines = render({"history": [{"n": i, "x": 0} for i in range(20)]}, max_rows=3)
+        assert lines[1] == "  (17 earlier items omitted)"
+        assert [line.split(" | ")[0].strip() for line in lines[3:]] == ["17", "18", "19"]
+
+    def test_mixed_list(self) -> None:
+        assert render([{"a": {"b": 1}}, {"c": 2}]) == ["- a:", "    b: 1", "- c: 2"]
+
+
+class TestPromptBuilder:
+    """Budgets, truncation, and the size report."""
+
+    def test_head_truncation(self) -> None:
+        text = "\n".join(f"line {i:02d}" for i in range(50))
+        builder = PromptBuilder().section("Report", text, budget=10)
+        prompt = builder.build()
+        assert "line 00" in prompt
+        assert "line 49" not in prompt
+        report = builder.report()[0]
+        assert report["tokens"] <= 10 + estimate_tokens("[99 lines truncated]")
+        assert report["truncated_lines"] > 0
+        assert f"[{report['truncated_lines']} lines truncated]" in prompt
+
+    def test_tail_truncation(self) -> None:
+        text = "\n".join(f"line {i:02d}" for i in range(50))
+        prompt = PromptBuilder().section("History", text, budget=10, truncate="tail").build()
+        assert "line 49" in prompt
+        assert "line 00" not in prompt
+        assert prompt.index("lines truncated]") < prompt.index("line 49")
+
+    def test_long_single_line_cut_not_dropped(self) -> None:
+        prompt = PromptBuilder().section("Report", "word " * 1000, budget=20).build()
+        assert "word word" in prompt
+        assert "[1 lines truncated]" in prompt
+
+    def test_empty_section(self) -> None:
+        prompt = PromptBuilder().section("Protocol", {}, budget=100).build()
+        assert prompt == "## Protocol\nNot available for this cycle.\n"
+
+    def test_report_compares_with_raw_json(self) -> None:
+        data = {"market": {f"field_{i}": i * 1.123456 for i in range(30)}}
+        builder = PromptBuilder().text("Intro").section("Market", data, budget=1000)
+        row = builder.report()[0]
+        assert row["section"] == "Market"
+        assert row["tokens"] < row["raw_tokens"]
+        assert "Market=" in builder.summary()
+
+
+class TestAgentPrompts:
+    """Research and Brain prompts stay bounded."""
+
+    def _brain_prompt(self, trades: int, reflections: int) -> str:
+        portfolio = {
+            "cash": 5000.0,
+            "holdings": {"SOL": 10.0},
+            "net_worth": 6500.0,
+            "trade_history": [
+                {"action": "BUY", "token": "SOL", "price": 150.0 + i, "quantity": 1.5}
+                for i in range(trades)
+            ],
+        }
+        return brain._build_user_prompt(
+            token="SOL",
+            research_report="Research findings.",
+            sentiment_report="Sentiment findings.",
+            portfolio_state=portfolio,
+            market_data={"current_price": 150.0, "price_change_24h_pct": 2.0},
+            reflection_memory=[f"Reflection {i}: " + "x" * 400 for i in range(reflections)],
+            onchain_data={"source": "real", "defillama": {"tvl": 8.5e9}},
+        )
+
+    def test_brain_prompt_does_not_grow_with_history(self) -> None:
+        short = self._brain_prompt(trades=5, reflections=5)
+        long = self._brain_prompt(trades=500, reflections=500)
+        assert abs(len(long) - len(short)) < 100
+        assert "(495 earlier items omitted)" in long
+        assert "Reflection 499" in long
+        assert "Reflection 0:" not in long
+
+    def test_brain_prompt_sections(self) -> None:
+        prompt = self._brain_prompt(trades=1, reflections=0)
+        assert prompt.startswith("## Target Asset: SOL\nCurrent price: $150.0")
+        assert "tvl: 8.5B" in prompt
+        assert "## Recent Decision History\nNo prior decisions." in prompt
+        assert prompt.rstrip().endswith("No prior decisions.")
+
+    def test_research_prompt_stub_protocol(self) -> None:
+        prompt = research._build_user_prompt(
+            "SOL",
+            {"current_price": 150.0, "volume_24h": 1.2e9},
+            {"source": "real"},
+            {"source": "stub"},
+        )
+        assert "volume_24h: 1.2B" in prompt
+        assert "## Protocol Fundamentals\nNot available for this cycle." in prompt
@@ -0,0 +1,164 @@
+"""Unit tests for the prefix-cache-friendly prompt layout."""
+
+from __future__ import annotations
+
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import pytest
+
+from cryptoagent.agents import brain, macro, research
+from cryptoagent.llm import client
+from cryptoagent.llm.accounting import record_call, set_call_sink
+from cryptoagent.llm.cache import LLMCache
+from cryptoagent.llm.client import call_llm, configure_cache
+from cryptoagent.persistence.database import Database
+from cryptoagent.persistence.llm_call_log import LLMCallLog
+
+
+def _response(usage: dict) -> SimpleNamespace:
+    return SimpleNamespace(
+        choices=[SimpleNamespace(message=SimpleNamespace(content="ok"))],
+        usage=usage,
+    )
+
+
+def _messages(model: str, prefix: str = "context") -> list[dict]:
+    return client._completion_kwargs(model, "system", prefix, "volatile", 0.2, None, 100)[
+        "messages"
+    ]
+
+
+@pytest.fixture
+def calls():
+    recorded: list[dict] = []
+    set_call_sink(recorded.append)
+    yield recorded
+    set_call_sink(None)
+
+
+class TestMessageLayout:
+    """Stable content first, cache breakpoints only where needed."""
+
+    def test_anthropic_gets_cache_breakpoints(self) -> None:
+        system, user = _messages("anthropic/claude-sonnet-4-20250514")
+        assert system["content"] == [
+            {"type": "text", "text": "system", "cache_control": {"type": "ephemeral"}}
+        ]
+        assert user["content"] == [
+            {"type": "text", "text": "context", "cache_control": {"type": "ephemeral"}},
+            {"type": "text", "text": "volatile"},
+        ]
+
+    def test_claude_via_other_provider(self) -> None:
+        system, _ = _messages("openrouter/anthropic/claude-3.5-sonnet")
+        assert system["content"][0]["cache_control"] == {"type": "ephemeral"}
+
+    def test_openai_plain_prefix(self) -> None:
+        system, user = _messages("openai/gpt-4o")
+        assert system["content"] == "system"
+        assert user["content"] == "context\n\nvolatile"
+
+    def test_no_prefix(self) -> None:
+        _, user = _messages("openai/gpt-4o", prefix="")
+        assert user["content"] == "volatile"
+        _, user = _messages("anthropic/claude-sonnet-4-20250514", prefix="")
+        assert user["content"] == [{"type": "text", "text": "volatile"}]
+
+    def test_prefix_sent(self) -> None:
+        with patch("litellm.completion", return_value=_response({})) as mock:
+            call_llm("openai/gpt-4o", "s", "u", prefix="p")
+        assert mock.call_args.kwargs["messages"][1]["content"] == "p\n\nu"
+
+    def test_response_cache_hits_across_layouts(self, tmp_path) -> None:
+        cache = LLMCache(str(tmp_path / "c.db"))
+        configure_cache(cache, "readwrite")
+        model = "anthropic/claude-sonnet-4-20250514"
+        try:
+            with patch("litellm.completion", return_value=_response({})) as mock:
+                call_llm(model, "s", "u", prefix="p", agent="brain")
+                call_llm(model, "s", "u", prefix="p", agent="brain")
+        finally:
+            configure_cache(None)
+            cache.close()
+        assert mock.call_count == 1
+
+
+class TestCachedTokens:
+    """Provider cache reads are accounted."""
+
+    def test_openai_usage(self, calls: list) -> None:
+        usage = {"prompt_tokens": 2000, "prompt_tokens_details": {"cached_tokens": 1536}}
+        record_call("brain", "openai/gpt-4o", _response(usage), 0.5)
+        assert calls[0]["cached_prompt_tokens"] == 1536
+
+    def test_anthropic_usage(self, calls: list) -> None:
+        usage = {"prompt_tokens": 2000, "cache_read_input_tokens": 1800}
+        record_call("brain", "anthropic/claude", _response(usage), 0.5)
+        assert calls[0]["cached_prompt_tokens"] == 1800
+
+    def test_breakdown_sums(self, in_memory_db: Database, calls: list) -> None:
+        usage = {"prompt_tokens": 1000, "prompt_tokens_details": {"cached_tokens": 800}}
+        record_call("brain", "openai/gpt-4o", _response(usage), 0.5)
+        record_call("brain", "openai/gpt-4o", _response(usage), 0.5)
+        log = LLMCallLog(in_memory_db)
+        for call in calls:
+            log.record({**call, "cycle_id": "c1"})
+        row = log.cycle_breakdown("c1")[0]
+        assert row["prompt_tokens"] == 2000
+        assert row["cached_prompt_tokens"] == 1600
+
+
+class TestBrainLayout:
+    """Session-level context goes in the Brain's prefix."""
+
+    def test_prefix_holds_reflections_and_signals(self) -> None:
+        prefix, user = brain._prompt({
+            "token": "SOL",
+            "cross_trial_reflections": ["Cut losers faster"],
+            "signal_report": "RSI hit rate 62%",
+            "research_report": "Research findings.",
+        })
+        assert "Cut losers faster" in prefix
+        assert "RSI hit rate 62%" in prefix
+        assert "Cut losers faster" not in user
+        assert "Research findings." in user
+        assert "Research findings." not in prefix
+
+    def test_empty_prefix(self) -> None:
+        prefix, _ = brain._prompt({"token": "SOL"})
+        assert prefix == ""
+
+
+class TestMacroLayout:
+    """The macro prefix is byte-identical across fetches of unchanged data."""
+
+    @staticmethod
+    def _fetch(stamp: str) -> dict:
+        return {
+            "source": "real",
+            "timestamp": stamp,
+            "fred": {
+                "source": "fred",
+                "timestamp": stamp,
+                "fed_funds_rate": {"latest_value": 4.33, "latest_date": "2026-09-01"},
+            },
+            "macro_regime": {"macro_regime": "neutral", "confidence": 5, "signals": {}},
+        }
+
+    def test_prefix_stable_across_builds(self) -> None:
+        aggregator = SimpleNamespace()
+        prefixes = []
+        for stamp in ("2026-10-19T00:00:00+00:00", "2026-10-19T00:05:00+00:00"):
+            aggregator.get_macro_data = lambda stamp=stamp: self._fetch(stamp)
+            _, prefix, _ = macro._collect(aggregator)
+            prefixes.append(prefix)
+        assert prefixes[0] == prefixes[1]
+        assert "4.33" in prefixes[0]
+        assert "timestamp" not in prefixes[0]
+
+    def test_research_prefix_stable(self) -> None:
+        first = research._build_context(self._fetch("2026-10-19T00:00:00+00:00"))
+        second = research._build_context(self._fetch("2026-10-19T00:05:00+00:00"))
+        assert first == second
+
@@ -0,0 +1,148 @@
+"""Unit tests for Reddit ingestion, dedup, and the local post store."""
+
+from __future__ import annotations
+
+import threading
+import time
+from unittest.mock import patch
+
+import httpx
+import pytest
+
+from cryptoagent.agents.sentiment import _build_user_prompt
+from cryptoagent.dataflows.social import reddit
+from cryptoagent.dataflows.social.reddit_store import RedditStore
+
+_NOW = time.time()
+
+
+def _post(pid: str, title: str, score: int = 10, comments: int = 2, **extra) -> dict:
+    return {
+        "id": pid,
+        "title": title,
+        "selftext": "",
+        "score": score,
+        "num_comments": comments,
+        "created_utc": _NOW - 3600,
+        "upvote_ratio": 0.8,
+        **extra,
+    }
+
+
+@pytest.fixture
+def listings():
+    """Mock Reddit: per-subreddit listings, with request and concurrency tracking."""
+    state = {
+        "subs": {
+            "solana": [_post("a1", "Validators upgrade"), _post("a2", "Firedancer news")],
+            "cryptocurrency": [
+                _post("b1", "SOL breaks out", score=100),
+                _post("x9", "Firedancer news", score=500, crosspost_parent="t3_a2"),
+                _post("b2", "ETH gas fees"),
+            ],
+        },
+        "calls": 0,
+        "in_flight": 0,
+        "peak": 0,
+    }
+    lock = threading.Lock()
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        sub = request.url.path.split("/")[2]
+        with lock:
+            state["calls"] += 1
+            state["in_flight"] += 1
+            state["peak"] = max(state["peak"], state["in_flight"])
+        time.sleep(0.02)
+        with lock:
+            state["in_flight"] -= 1
+        children = [{"kind": "t3", "data": p} for p in state["subs"].get(sub, [])]
+        return httpx.Response(200, json={"data": {"children": children}})
+
+    real_client = httpx.Client
+
+    def client_factory(**kwargs):
+        return real_client(transport=httpx.MockTransport(handler), **kwargs)
+
+    with patch.object(reddit.httpx, "Client", side_effect=client_factory):
+        yield state
+
+
+class TestRedditIngestion:
+    """Concurrent fetches and cross-subreddit dedup."""
+
+    def test_concurrent_fetch_and_crosspost_dedup(self, listings) -> None:
+        posts = reddit.fetch_subreddits(["solana", "cryptocurrency"])
+        ids = sorted(p["id"] for p in posts)
+        assert ids == ["a1", "a2", "b1", "b2"]
+        # Collapsed copy keeps the original's subreddit and the higher engagement
+        collapsed = next(p for p in posts if p["id"] == "a2")
+        assert (collapsed["subreddit"], collapsed["score"]) == ("solana", 500)
+        assert listings["peak"] == 2
+
+    def test_token_filter(self, listings) -> None:
+        result = reddit.get_reddit_sentiment(["solana", "cryptocurrency"], token="SOL")
+        titles = {p["title"] for p in result["posts"]}
+        assert titles == {"Validators upgrade", "Firedancer news", "SOL breaks out"}
+        assert result["volume"] == 3
+
+    def test_store_reports_only_new_or_updated(self, listings, in_memory_db) -> None:
+        store = RedditStore(in_memory_db)
+        first = reddit.get_reddit_sentiment(["solana", "cryptocurrency"], "SOL", store)
+        assert first["new_posts"] == 3
+
+        second = reddit.get_reddit_sentiment(["solana", "cryptocurrency"], "SOL", store)
+        assert (second["new_posts"], second["updated_posts"]) == (0, 0)
+
+        listings["subs"]["solana"][0]["score"] = 50
+        third = reddit.get_reddit_sentiment(["solana", "cryptocurrency"], "SOL", store)
+        assert (third["new_posts"], third["updated_posts"]) == (0, 1)
+
+
+class TestRedditStore:
+    """Engagement-weighted series."""
+
+    def _row(self, pid: str, hours_ago: float, score: int, ratio: float) -> dict:
+        return {
+            "id": pid,
+            "subreddit": "solana",
+            "title": pid,
+            "body": "",
+            "score": score,
+            "num_comments": 0,
+            "upvote_ratio": ratio,
+            "created_utc": _NOW - hours_ago * 3600,
+        }
+
+    def test_engagement_series_buckets(self, in_memory_db) -> None:
+        store = RedditStore(in_memory_db)
+        store.upsert([
+            self._row("old", 30, 100, 0.9),  # outside the window
+            self._row("p1", 10, 9, 0.5),
+            self._row("p2", 10.5, 29, 0.9),
+            self._row("p3", 1, 0, 0.6),
+        ])
+        series = store.engagement_series(hours=24, bucket_hours=4, now=_NOW)
+        assert len(series) == 6
+        assert sum(b["posts"] for b in series) == 3
+        busy = next(b for b in series if b["posts"] == 2)
+        assert busy["engagement"] == 38
+        assert busy["weighted_upvote_ratio"] == round((10 * 0.5 + 30 * 0.9) / 40, 3)
+        assert series[-1]["posts"] == 1
+        assert series[0]["weighted_upvote_ratio"] is None
+
+    def test_prompt_includes_series(self, in_memory_db) -> None:
+        store = RedditStore(in_memory_db)
+        store.upsert([self._row("p1", 1, 10, 0.7)])
+        sentiment = {
+            "reddit": {
+                "source": "reddit",
+                "posts": [],
+                "new_posts": 1,
+                "updated_posts": 0,
+                "engagement_series": store.engagement_series(now=_NOW),
+            }
+        }
+        prompt = _build_user_prompt("SOL", sentiment)
+        assert "Since last cycle: 1 new posts" in prompt
+        assert "Engagement over time" in prompt
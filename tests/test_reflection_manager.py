@@ -2,10 +2,13 @@
 
 from __future__ import annotations
 
+import time
 from unittest.mock import patch
 
+import pytest
 
 from cryptoagent.persistence.database import Database
+from cryptoagent.persistence.reflection_store import ReflectionStore
 from cryptoagent.reflection.manager import ReflectionManager
 
 
@@ -114,3 +117,70 @@ class TestCrossTrialRetrieval:
         mgr = ReflectionManager(in_memory_db, model="test-model")
         results = mgr.get_cross_trial_reflections()
         assert results == []
+
+
+class TestDeferred:
+    """Queued reflections generated off the critical path."""
+
+    _DECISION = {"action": "BUY", "confidence": 7, "rationale": "Strong signal."}
+    _RESULT = {"executed": False, "reason": "size too small"}
+
+    def _count(self, db: Database, table: str) -> int:
+        return db.conn.execute(f"SELECT COUNT(*) AS n FROM {table}").fetchone()["n"]
+
+    def test_defer_queues_without_llm(self, in_memory_db: Database, mock_llm) -> None:
+        mgr = ReflectionManager(in_memory_db, model="test-model")
+        summary = mgr.defer(self._DECISION, self._RESULT, regime="bull")
+        assert summary.startswith("[Auto] BUY")
+        mock_llm.assert_not_called()
+        assert self._count(in_memory_db, "reflections") == 0
+        assert self._count(in_memory_db, "reflection_queue") == 1
+
+    def test_drain_stores_and_dequeues(self, in_memory_db: Database, mock_llm) -> None:
+        mgr = ReflectionManager(in_memory_db, model="test-model", cycle_length=2)
+        for _ in range(2):
+            mgr.defer(self._DECISION, self._RESULT, regime="bull")
+
+        assert mgr.drain() == 2
+        rows = in_memory_db.conn.execute(
+            "SELECT level, text FROM reflections ORDER BY id"
+        ).fetchall()
+        assert [r["level"] for r in rows] == [1, 1, 2]
+        assert rows[0]["text"] == "Mocked LLM reflection output."
+        assert self._count(in_memory_db, "reflection_queue") == 0
+
+    def test_drain_store_and_dequeue_atomic(self, in_memory_db: Database, mock_llm) -> None:
+        mgr = ReflectionManager(in_memory_db, model="test-model")
+        mgr.defer(self._DECISION, self._RESULT)
+        with patch.object(ReflectionStore, "dequeue", side_effect=RuntimeError("crash")):
+            with pytest.raises(RuntimeError):
+                mgr.drain()
+        # Nothing stored without the dequeue; the cycle is retried later
+        assert self._count(in_memory_db, "reflections") == 0
+        assert mgr.drain() == 1
+        assert self._count(in_memory_db, "reflections") == 1
+
+    def test_queue_survives_restart(self, in_memory_db: Database, mock_llm) -> None:
+        ReflectionManager(in_memory_db, model="test-model").defer(self._DECISION, self._RESULT)
+        assert ReflectionManager(in_memory_db, model="test-model").drain() == 1
+
+    def test_worker_drains_in_background(self, in_memory_db: Database, mock_llm) -> None:
+        mgr = ReflectionManager(in_memory_db, model="test-model")
+        mgr.start_worker()
+        try:
+            mgr.defer(self._DECISION, self._RESULT)
+            for _ in range(200):
+                if self._count(in_memory_db, "reflection_queue") == 0:
+                    break
+                time.sleep(0.01)
+        finally:
+            mgr.stop_worker()
+        assert self._count(in_memory_db, "reflections") == 1
+
+    def test_stop_worker_flushes_queue(self, in_memory_db: Database, mock_llm) -> None:
+        mgr = ReflectionManager(in_memory_db, model="test-model")
+        for _ in range(3):
+            mgr.defer(self._DECISION, self._RESULT)
+        mgr.stop_worker()
+        assert self._count(in_memory_db, "reflections") == 3
+        assert self._count(in_memory_db, "reflection_queue") == 0
@@ -0,0 +1,100 @@
+"""Unit tests for the batched Solana JSON-RPC client."""
+
+from __future__ import annotations
+
+import json
+from unittest.mock import patch
+
+import httpx
+import pytest
+
+from cryptoagent.dataflows.onchain import solana_rpc
+from cryptoagent.dataflows.onchain.solana_rpc import RpcError, SolanaRpcClient
+
+
+def _make_client(requests: list, max_batch: int = 100, reject: bool = False) -> SolanaRpcClient:
+    """Client backed by a mock RPC that answers batches in reverse order."""
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        batch = json.loads(request.content)
+        requests.append(batch)
+        if reject:
+            return httpx.Response(200, json={"jsonrpc": "2.0", "error": {"message": "too large"}})
+        out = []
+        for call in reversed(batch):
+            method, params = call["method"], call["params"]
+            if method == "getRecentPerformanceSamples":
+                result = [{"numTransactions": 6000, "samplePeriodSecs": 60}] * 5
+                out.append({"jsonrpc": "2.0", "id": call["id"], "result": result})
+            elif params and params[0] == "bad":
+                out.append({"jsonrpc": "2.0", "id": call["id"], "error": {"message": "invalid"}})
+            else:
+                n = int(params[0][-1]) if params[0][-1].isdigit() else 1
+                sigs = [{"slot": 1000 + n}] * n
+                out.append({"jsonrpc": "2.0", "id": call["id"], "result": sigs})
+        return httpx.Response(200, json=out)
+
+    http = httpx.Client(transport=httpx.MockTransport(handler))
+    return SolanaRpcClient("https://rpc.test", max_batch=max_batch, client=http)
+
+
+class TestSolanaRpcClient:
+    """Batching and response demultiplexing."""
+
+    def test_batch_demuxes_by_id(self) -> None:
+        requests: list = []
+        client = _make_client(requests)
+        results = client.batch([("getSignaturesForAddress", [f"addr{n}"]) for n in (1, 2, 3)])
+        assert [len(r) for r in results] == [1, 2, 3]
+        assert len(requests) == 1
+
+    def test_batch_chunks_large_requests(self) -> None:
+        requests: list = []
+        client = _make_client(requests, max_batch=40)
+        results = client.batch([("getSignaturesForAddress", [f"a{i}"]) for i in range(100)])
+        assert len(results) == 100
+        assert [len(b) for b in requests] == [40, 40, 20]
+
+    def test_per_call_errors(self) -> None:
+        client = _make_client([])
+        ok, bad = client.batch(
+            [("getSignaturesForAddress", ["addr2"]), ("getSignaturesForAddress", ["bad"])]
+        )
+        assert len(ok) == 2
+        assert isinstance(bad, RpcError)
+        with pytest.raises(RpcError):
+            client.call("getSignaturesForAddress", ["bad"])
+
+    def test_rejected_batch_raises(self) -> None:
+        with pytest.raises(RpcError, match="too large"):
+            _make_client([], reject=True).batch([("getRecentPerformanceSamples", [5])])
+
+
+class TestNetworkData:
+    """Aggregated network data in one round trip."""
+
+    def test_single_round_trip_for_all_addresses(self) -> None:
+        requests: list = []
+        client = _make_client(requests)
+        addresses = [f"whale{i % 10}" for i in range(250)]
+        with patch.object(solana_rpc, "get_client", return_value=client):
+            data = solana_rpc.get_solana_network_data("https://rpc.test", addresses)
+
+        assert len(requests) == 3  # 251 calls in batches of 100
+        assert data["network_tps"]["avg_tps"] == 100
+        whales = data["whale_activity"]
+        assert whales["tracked_addresses"] == 250
+        assert whales["whale_activity_level"] == "high"
+        assert len(whales["details"]) == solana_rpc._MAX_DETAILS
+
+    def test_partial_failures_reported(self) -> None:
+        client = _make_client([])
+        result = solana_rpc.get_whale_activity("https://rpc.test", ["addr1", "bad"], client=client)
+        assert result["total_recent_txs"] == 1
+        assert result["failed_addresses"] == 1
+
+    def test_transport_failure_returns_error_dicts(self) -> None:
+        with patch.object(solana_rpc, "get_client", side_effect=httpx.ConnectError("down")):
+            data = solana_rpc.get_solana_network_data("https://rpc.test")
+        assert data["network_tps"]["source"] == "error"
+        assert data["whale_activity"]["source"] == "error"
@@ -0,0 +1,98 @@
+"""Unit tests for the local TVL time-series store."""
+
+from __future__ import annotations
+
+import math
+import statistics
+from datetime import date, timedelta
+from unittest.mock import patch
+
+import pytest
+
+from cryptoagent.dataflows.onchain.tvl_store import CHAIN, PROTOCOL, TvlStore, epoch_to_date
+
+
+def _days(start: str, values: list[float]) -> list[tuple[str, float]]:
+    day0 = date.fromisoformat(start)
+    return [((day0 + timedelta(days=i)).isoformat(), v) for i, v in enumerate(values)]
+
+
+@pytest.fixture
+def store(in_memory_db) -> TvlStore:
+    return TvlStore(in_memory_db)
+
+
+class TestTvlStoreWrites:
+    """Append-only ingestion."""
+
+    def test_append_and_history(self, store: TvlStore) -> None:
+        assert store.append(CHAIN, "Solana", _days("2026-01-01", [1.0, 2.0, 3.0])) == 3
+        assert store.get_history(CHAIN, "Solana") == _days("2026-01-01", [1.0, 2.0, 3.0])
+        assert store.latest_date(CHAIN, "Solana") == "2026-01-03"
+
+    def test_only_new_points_written(self, store: TvlStore) -> None:
+        store.append(CHAIN, "Solana", _days("2026-01-01", [1.0, 2.0, 3.0]))
+        # Full history again plus one new day: latest day refreshed, one appended
+        written = store.append(CHAIN, "Solana", _days("2026-01-01", [9.0, 9.0, 3.5, 4.0]))
+        assert written == 2
+        assert store.get_history(CHAIN, "Solana") == _days("2026-01-01", [1.0, 2.0, 3.5, 4.0])
+
+    def test_series_isolated_by_kind_and_key(self, store: TvlStore) -> None:
+        store.append(CHAIN, "aave", [("2026-01-01", 1.0)])
+        store.append(PROTOCOL, "aave", [("2026-01-01", 2.0)])
+        assert store.value_at(CHAIN, "aave", "2026-01-01") == 1.0
+        assert store.value_at(PROTOCOL, "aave", "2026-01-01") == 2.0
+
+    def test_persists_across_instances(self, in_memory_db) -> None:
+        TvlStore(in_memory_db).append(PROTOCOL, "jito", _days("2026-02-01", [5.0, 6.0]))
+        assert TvlStore(in_memory_db).get_history(PROTOCOL, "jito", start="2026-02-02") == [
+            ("2026-02-02", 6.0)
+        ]
+
+    def test_append_does_not_mutate_read_series(self, store: TvlStore) -> None:
+        store.append(CHAIN, "Solana", _days("2026-01-01", [1.0, 2.0]))
+        dates, values = store._series[(CHAIN, "Solana")]
+        store.append(CHAIN, "Solana", _days("2026-01-03", [3.0]))
+        assert (len(dates), len(values)) == (2, 2)
+        assert store.latest_date(CHAIN, "Solana") == "2026-01-03"
+
+    def test_sync_markers(self, store: TvlStore) -> None:
+        assert store.missing_days(CHAIN, "Solana") is None
+        assert not store.synced_today(CHAIN, "Solana")
+        with patch("cryptoagent.dataflows.onchain.tvl_store._today", return_value="2026-01-05"):
+            store.append(CHAIN, "Solana", _days("2026-01-01", [1.0, 2.0]))
+            store.mark_synced(CHAIN, "Solana")
+            assert store.synced_today(CHAIN, "Solana")
+            assert store.missing_days(CHAIN, "Solana") == 4
+
+
+class TestTvlStoreWindows:
+    """Window statistics served from memory."""
+
+    def test_change_pct_windows(self, store: TvlStore) -> None:
+        store.append(CHAIN, "Ethereum", _days("2026-01-01", [100.0 + i for i in range(100)]))
+        assert store.change_pct(CHAIN, "Ethereum", 1) == round(1 / 198 * 100, 2)
+        assert store.change_pct(CHAIN, "Ethereum", 7) == round(7 / 192 * 100, 2)
+        assert store.change_pct(CHAIN, "Ethereum", 90) == round(90 / 109 * 100, 2)
+        # As-of cutoff for backtests
+        assert store.change_pct(CHAIN, "Ethereum", 1, as_of="2026-01-02") == 1.0
+
+    def test_change_pct_uses_last_value_before_gap(self, store: TvlStore) -> None:
+        store.append(CHAIN, "Sui", [("2026-01-01", 100.0), ("2026-01-10", 110.0)])
+        assert store.change_pct(CHAIN, "Sui", 7) == 10.0
+        assert store.change_pct(CHAIN, "Sui", 30) is None
+
+    def test_volatility(self, store: TvlStore) -> None:
+        values = [100.0, 102.0, 99.0, 105.0, 104.0, 108.0, 107.0, 110.0]
+        store.append(CHAIN, "Base", _days("2026-03-01", values))
+        returns = [math.log(b / a) for a, b in zip(values, values[1:])]
+        assert store.volatility(CHAIN, "Base", 7) == round(statistics.stdev(returns) * 100, 3)
+
+    def test_window_stats_empty_series(self, store: TvlStore) -> None:
+        stats = store.window_stats(CHAIN, "Nowhere")
+        assert stats["tvl_7d_change_pct"] is None
+        assert stats["tvl_30d_volatility_pct"] is None
+        assert "tvl_1d_volatility_pct" not in stats
+
+    def test_epoch_to_date(self) -> None:
+        assert epoch_to_date(1_700_000_000) == "2023-11-14"
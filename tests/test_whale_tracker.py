@@ -0,0 +1,143 @@
+"""Unit tests for the incremental whale-wallet tracker."""
+
+from __future__ import annotations
+
+import time
+
+import pytest
+
+from cryptoagent.dataflows.onchain.solana_rpc import RpcError
+from cryptoagent.dataflows.onchain.whale_tracker import WhaleTracker
+
+
+class FakeRpc:
+    """Serves getSignaturesForAddress from per-address histories (newest first)."""
+
+    def __init__(self) -> None:
+        self.history: dict[str, list[dict]] = {}
+        self.batches: list[list] = []
+
+    def add(self, address: str, n: int, block_time: int | None = None) -> None:
+        existing = self.history.setdefault(address, [])
+        start = len(existing)
+        new = [
+            {"signature": f"{address}-{start + i}", "slot": start + i, "blockTime": block_time}
+            for i in range(n)
+        ]
+        self.history[address] = list(reversed(new)) + existing
+
+    def batch(self, calls):
+        self.batches.append(calls)
+        out = []
+        for _method, (address, opts) in calls:
+            if address == "bad":
+                out.append(RpcError("boom"))
+                continue
+            sigs = self.history.get(address, [])
+            names = [s["signature"] for s in sigs]
+            if "until" in opts and opts["until"] in names:
+                sigs = sigs[: names.index(opts["until"])]
+            if "before" in opts:
+                sigs = sigs[[s["signature"] for s in sigs].index(opts["before"]) + 1 :]
+            out.append(sigs[: opts["limit"]])
+        return out
+
+
+@pytest.fixture
+def rpc() -> FakeRpc:
+    return FakeRpc()
+
+
+class TestWhaleTrackerSync:
+    """Cursor handling and delta fetches."""
+
+    def test_first_sync_backfills_and_sets_cursor(self, in_memory_db, rpc) -> None:
+        rpc.add("w1", 40)
+        tracker = WhaleTracker(in_memory_db, rpc, initial_limit=25)
+        result = tracker.sync(["w1"])
+        assert result["new_transactions"] == 25
+        assert tracker.cursors() == {"w1": "w1-39"}
+
+    def test_second_sync_fetches_only_deltas(self, in_memory_db, rpc) -> None:
+        rpc.add("w1", 5)
+        rpc.add("w2", 5)
+        tracker = WhaleTracker(in_memory_db, rpc)
+        tracker.sync(["w1", "w2"])
+
+        rpc.add("w1", 3)
+        result = tracker.sync(["w1", "w2"])
+        assert result == {"new_transactions": 3, "active_addresses": 1, "failed_addresses": 0}
+        assert rpc.batches[-1][0][1][1]["until"] == "w1-4"
+        assert tracker.cursors()["w1"] == "w1-7"
+
+    def test_paginates_large_deltas(self, in_memory_db, rpc) -> None:
+        rpc.add("w1", 1)
+        tracker = WhaleTracker(in_memory_db, rpc, page_limit=10)
+        tracker.sync(["w1"])
+
+        rpc.add("w1", 35)
+        result = tracker.sync(["w1"])
+        assert result["new_transactions"] == 35
+        assert len(rpc.batches) == 1 + 4
+        assert tracker.cursors()["w1"] == "w1-35"
+
+    def test_one_batch_per_round_for_many_addresses(self, in_memory_db, rpc) -> None:
+        addresses = [f"w{i}" for i in range(2000)]
+        for addr in addresses[::100]:
+            rpc.add(addr, 2)
+        tracker = WhaleTracker(in_memory_db, rpc)
+        tracker.sync(addresses)
+        tracker.sync(addresses)
+        assert len(rpc.batches) == 2
+        assert len(rpc.batches[0]) == 2000
+
+    def test_refetched_signatures_not_counted(self, in_memory_db, rpc) -> None:
+        rpc.add("w1", 5)
+        tracker = WhaleTracker(in_memory_db, rpc)
+        tracker.sync(["w1"])
+        # Cursor lost (e.g. reset): the same signatures come back
+        in_memory_db.conn.execute("DELETE FROM whale_cursors")
+        assert tracker.sync(["w1"])["new_transactions"] == 0
+
+    def test_failed_address_keeps_cursor(self, in_memory_db, rpc) -> None:
+        rpc.add("w1", 2)
+        tracker = WhaleTracker(in_memory_db, rpc)
+        result = tracker.sync(["w1", "bad"])
+        assert result["failed_addresses"] == 1
+        assert "bad" not in tracker.cursors()
+
+
+class TestWhaleTrackerActivity:
+    """Windowed activity rates."""
+
+    def test_rates_and_level(self, in_memory_db, rpc) -> None:
+        now = time.time()
+        rpc.add("w1", 14, block_time=int(now - 3 * 86_400))
+        rpc.add("w1", 6, block_time=int(now - 600))
+        tracker = WhaleTracker(in_memory_db, rpc, initial_limit=100)
+        tracker.sync(["w1"])
+
+        activity = tracker.activity(windows_hours=(1, 24, 168), now=now)
+        assert activity["windows"]["1h"]["tx_count"] == 6
+        assert activity["windows"]["168h"]["tx_count"] == 20
+        assert activity["windows"]["1h"]["active_addresses"] == 1
+        assert activity["recent_vs_baseline_rate"] == round(6 / (20 / 168), 2)
+        assert activity["whale_activity_level"] == "high"
+
+    def test_only_watched_addresses_counted(self, in_memory_db, rpc) -> None:
+        now = time.time()
+        rpc.add("w1", 3, block_time=int(now - 600))
+        rpc.add("old", 9, block_time=int(now - 600))
+        tracker = WhaleTracker(in_memory_db, rpc)
+        tracker.sync(["w1", "old"])
+
+        activity = tracker.activity(windows_hours=(1,), now=now, addresses=["w1"])
+        assert activity["windows"]["1h"]["tx_count"] == 3
+        assert activity["windows"]["1h"]["active_addresses"] == 1
+        idle = tracker.activity(windows_hours=(1,), now=now, addresses=[])
+        assert idle["windows"]["1h"]["tx_count"] == 0
+
+    def test_quiet_wallets_are_low(self, in_memory_db, rpc) -> None:
+        activity = WhaleTracker(in_memory_db, rpc).activity()
+        assert activity["whale_activity_level"] == "low"
+        assert activity["windows"]["24h"]["tx_count"] == 0